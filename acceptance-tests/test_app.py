@@ -1,4 +1,5 @@
 import requests
+import time
 import uuid
 import psycopg2
 import bcrypt
@@ -461,10 +462,10 @@ class TestUserSearch:
 class TestFriends:
     """Тесты функциональности друзей"""
 
-    def test_add_friend_not_implemented(self):
-        """Тест, что эндпоинт добавления в друзья возвращает 501 (Not Implemented)"""
+    def test_add_list_and_delete_friend(self):
+        """Тест добавления друга, списка друзей и удаления из друзей"""
 
-        # 1. Регистрируем пользователя
+        # 1. Регистрируем пользователя и его будущих друзей
         user_data = {
             "first_name": "Тест",
             "second_name": "Друзей",
@@ -474,30 +475,64 @@ class TestFriends:
             "password": "friendpass123",
         }
         user_id = register_user(user_data)
+        friend_ids = sorted(register_user({**user_data, "first_name": f"Друг{i}"}) for i in range(3))
 
         # 2. Аутентифицируемся и получаем токен
         credentials = {"id": user_id, "password": "friendpass123"}
         token = assert_authenticated(credentials)
+        headers = {"Authorization": f"Bearer {token}"}
 
-        # 3. Генерируем тестовый user_id для добавления в друзья
-        test_user_id = str(uuid.uuid4())
+        # 3. Добавляем друзей, повторное добавление тоже успешно
+        for friend_id in friend_ids + friend_ids[:1]:
+            response = requests.put(f"http://app:8000/friend/set/{friend_id}", headers=headers)
+            assert response.status_code == 200, (
+                f"Expected status 200, got {response.status_code}"
+            )
 
-        # 4. URL для тестирования
-        url = f"http://app:8000/friend/set/{test_user_id}"
+        # 4. Получаем список друзей по страницам из двух анкет
+        listed = []
+        params = {"limit": 2}
+        while True:
+            response = requests.get("http://app:8000/friend/list", params=params, headers=headers)
+            assert response.status_code == 200, (
+                f"Expected status 200, got {response.status_code}"
+            )
+            listed.extend(user["id"] for user in response.json())
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["after"] = response.headers["X-Next-Cursor"]
+        assert listed == friend_ids, f"Expected friends {friend_ids}, got {listed}"
+
+        # 5. Удаляем друга, повторное удаление тоже успешно
+        for _ in range(2):
+            response = requests.put(f"http://app:8000/friend/delete/{friend_ids[0]}", headers=headers)
+            assert response.status_code == 200, (
+                f"Expected status 200, got {response.status_code}"
+            )
+
+        response = requests.get("http://app:8000/friend/list", headers=headers)
+        assert [user["id"] for user in response.json()] == friend_ids[1:]
 
-        # 5. Выполняем PUT запрос с токеном аутентификации
-        response = requests.put(url, headers={"Authorization": f"Bearer {token}"})
+    def test_add_unknown_friend(self):
+        """Тест, что добавление несуществующего пользователя в друзья возвращает 404"""
+
+        user_data = {
+            "first_name": "Тест",
+            "second_name": "Друзей",
+            "birthdate": "1990-01-01",
+            "biography": "Тестовый пользователь для проверки друзей",
+            "city": "Москва",
+            "password": "friendpass123",
+        }
+        user_id = register_user(user_data)
+        token = assert_authenticated({"id": user_id, "password": "friendpass123"})
 
-        # 6. Проверяем статус 501 (Not Implemented)
-        assert response.status_code == 501, (
-            f"Expected status 501, got {response.status_code}"
+        response = requests.put(
+            f"http://app:8000/friend/set/{uuid.uuid4()}", headers={"Authorization": f"Bearer {token}"}
         )
 
-        # 7. Проверяем тело ответа
-        response_data = response.json()
-        assert "error" in response_data, "Response should contain 'error' field"
-        assert "не реализован" in response_data["error"], (
-            f"Expected error message about not implemented, got {response_data['error']}"
+        assert response.status_code == 404, (
+            f"Expected status 404, got {response.status_code}"
         )
 
     def test_add_friend_invalid_token(self):
@@ -553,6 +588,198 @@ class TestFriends:
         }
 
 
+class TestPosts:
+    """Тесты постов и ленты"""
+
+    def test_create_update_and_delete_post(self):
+        """Тест создания, изменения, получения и удаления поста"""
+
+        user_data = {
+            "first_name": "Тест",
+            "second_name": "Постов",
+            "birthdate": "1990-01-01",
+            "biography": "Тестовый пользователь для проверки постов",
+            "city": "Москва",
+            "password": "postpass123",
+        }
+        user_id = register_user(user_data)
+        token = assert_authenticated({"id": user_id, "password": "postpass123"})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = requests.post("http://app:8000/post/create", json={"text": "Первый пост"}, headers=headers)
+        assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
+        post = response.json()
+        assert post["text"] == "Первый пост" and post["author_user_id"] == user_id
+
+        response = requests.put(
+            "http://app:8000/post/update", json={"id": post["id"], "text": "Исправленный пост"}, headers=headers
+        )
+        assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
+
+        response = requests.get(f"http://app:8000/post/get/{post['id']}", headers=headers)
+        assert response.json() == {**post, "text": "Исправленный пост"}
+
+        response = requests.put(f"http://app:8000/post/delete/{post['id']}", headers=headers)
+        assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
+
+        response = requests.get(f"http://app:8000/post/get/{post['id']}", headers=headers)
+        assert response.status_code == 404, f"Expected status 404, got {response.status_code}"
+
+    def test_feed_contains_friend_posts(self):
+        """Тест, что в ленту попадают посты друзей: построенные из БД и разложенные fan-out"""
+
+        user_data = {
+            "first_name": "Тест",
+            "second_name": "Ленты",
+            "birthdate": "1990-01-01",
+            "biography": "Тестовый пользователь для проверки ленты",
+            "city": "Москва",
+            "password": "feedpass123",
+        }
+        reader_id = register_user(user_data)
+        author_id = register_user({**user_data, "first_name": "Автор"})
+        reader_headers = {
+            "Authorization": f"Bearer {assert_authenticated({'id': reader_id, 'password': 'feedpass123'})}"
+        }
+        author_headers = {
+            "Authorization": f"Bearer {assert_authenticated({'id': author_id, 'password': 'feedpass123'})}"
+        }
+
+        # 1. Пост, опубликованный до первого чтения, попадает в ленту при ее построении
+        requests.put(f"http://app:8000/friend/set/{author_id}", headers=reader_headers)
+        first = requests.post("http://app:8000/post/create", json={"text": "Пост 1"}, headers=author_headers).json()
+
+        response = requests.get("http://app:8000/post/feed", headers=reader_headers)
+        assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
+        assert [post["id"] for post in response.json()] == [first["id"]]
+
+        # 2. Следующий пост раскладывается в построенную ленту процессом fan-out
+        second = requests.post("http://app:8000/post/create", json={"text": "Пост 2"}, headers=author_headers).json()
+        feed = []
+        for _ in range(50):
+            feed = [post["id"] for post in requests.get("http://app:8000/post/feed", headers=reader_headers).json()]
+            if len(feed) == 2:
+                break
+            time.sleep(0.2)
+        assert feed == [second["id"], first["id"]], f"Expected newest post first, got {feed}"
+
+        # 3. Страницы ленты по одному посту
+        response = requests.get("http://app:8000/post/feed", params={"limit": 1}, headers=reader_headers)
+        assert [post["id"] for post in response.json()] == [second["id"]]
+        response = requests.get(
+            "http://app:8000/post/feed",
+            params={"limit": 1, "after": response.headers["X-Next-Cursor"]},
+            headers=reader_headers,
+        )
+        assert [post["id"] for post in response.json()] == [first["id"]]
+
+
+
+# Шарды диалогов из docker-compose (DIALOG_SHARD_URLS приложения)
+DIALOG_SHARD_HOSTS = ["dialog-shard-1", "dialog-shard-2"]
+
+
+def count_dialog_messages(host: str, message_ids: list) -> dict:
+    """Количество найденных в шарде сообщений по ID"""
+    conn = psycopg2.connect(host=host, port=5432, database="dialogs", user="postgres", password="password")
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT id::text, count(*) FROM dialog_messages WHERE id = ANY(%s::uuid[]) GROUP BY id",
+                (message_ids,),
+            )
+            return dict(cursor.fetchall())
+    finally:
+        conn.close()
+
+
+class TestDialogs:
+    """Тесты диалогов, сообщения которых распределены по шардам"""
+
+    user_data = {
+        "first_name": "Тест",
+        "second_name": "Диалогов",
+        "birthdate": "1990-01-01",
+        "biography": "Тестовый пользователь для проверки диалогов",
+        "city": "Москва",
+        "password": "dialogpass123",
+    }
+
+    def login(self, user_id: str) -> dict:
+        return {"Authorization": f"Bearer {assert_authenticated({'id': user_id, 'password': 'dialogpass123'})}"}
+
+    def test_send_and_list_messages(self):
+        """Тест переписки: оба собеседника видят один диалог от новых сообщений к старым"""
+
+        alice_id = register_user(self.user_data)
+        bob_id = register_user({**self.user_data, "first_name": "Собеседник"})
+        alice_headers, bob_headers = self.login(alice_id), self.login(bob_id)
+
+        response = requests.post(
+            f"http://app:8000/dialog/{bob_id}/send", json={"text": "Привет"}, headers=alice_headers
+        )
+        assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
+        first = response.json()
+        assert {key: first[key] for key in ("from", "to", "text")} == {"from": alice_id, "to": bob_id, "text": "Привет"}
+        second = requests.post(
+            f"http://app:8000/dialog/{alice_id}/send", json={"text": "Привет, как дела?"}, headers=bob_headers
+        ).json()
+
+        for headers, other_id in ((alice_headers, bob_id), (bob_headers, alice_id)):
+            response = requests.get(f"http://app:8000/dialog/{other_id}/list", headers=headers)
+            assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
+            assert response.json() == [second, first]
+
+        # Страницы диалога по одному сообщению
+        response = requests.get(f"http://app:8000/dialog/{bob_id}/list", params={"limit": 1}, headers=alice_headers)
+        assert response.json() == [second]
+        response = requests.get(
+            f"http://app:8000/dialog/{bob_id}/list",
+            params={"limit": 1, "after": response.headers["X-Next-Cursor"]},
+            headers=alice_headers,
+        )
+        assert response.json() == [first]
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_send_message_errors(self):
+        """Тест отправки сообщения несуществующему пользователю и самому себе"""
+
+        user_id = register_user(self.user_data)
+        headers = self.login(user_id)
+
+        response = requests.post(
+            f"http://app:8000/dialog/{uuid.uuid4()}/send", json={"text": "Кто здесь?"}, headers=headers
+        )
+        assert response.status_code == 404, f"Expected status 404, got {response.status_code}"
+
+        response = requests.post(f"http://app:8000/dialog/{user_id}/send", json={"text": "Заметка"}, headers=headers)
+        assert response.status_code == 400, f"Expected status 400, got {response.status_code}"
+
+        response = requests.post(f"http://app:8000/dialog/{user_id}/send", json={"text": "Без токена"})
+        assert response.status_code == 401, f"Expected status 401, got {response.status_code}"
+
+    def test_dialogs_are_spread_across_shards(self):
+        """Тест, что каждый диалог хранится ровно в одном шарде, а диалоги распределены по обоим шардам"""
+
+        sender_id = register_user(self.user_data)
+        headers = self.login(sender_id)
+        message_ids = []
+        for i in range(16):
+            recipient_id = register_user({**self.user_data, "first_name": f"Получатель{i}"})
+            response = requests.post(
+                f"http://app:8000/dialog/{recipient_id}/send", json={"text": f"Сообщение {i}"}, headers=headers
+            )
+            assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
+            message_ids.append(response.json()["id"])
+
+        counts = [count_dialog_messages(host, message_ids) for host in DIALOG_SHARD_HOSTS]
+        for message_id in message_ids:
+            copies = sum(shard.get(message_id, 0) for shard in counts)
+            assert copies == 1, f"Expected message {message_id} in exactly one shard, got {copies}"
+        # Вероятность, что 16 диалогов попадут в один шард из двух, - около 1/30000
+        assert all(counts), f"Expected dialogs on every shard, got {[len(shard) for shard in counts]}"
+
+
 def get_user_from_db(user_id: str) -> dict:
     """
     Получает пользователя из базы данных по ID
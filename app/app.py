@@ -3,9 +3,12 @@ import sys
 import logging
 import os
 import subprocess
+from application import injector
 from infra.db.config import init_db
-from infra.rest.config import create_connexion_app
+from infra.rest.config import create_connexion_app, is_async_mode
 from infra.logging import setup_logging
+from infra.metrics.registry import MULTIPROCESS_DIR_ENV, prepare_multiprocess_dir
+from infra.search import NameIndexSearch
 
 # Настройка логирования
 setup_logging()
@@ -13,10 +16,18 @@ logger = logging.getLogger(__name__)
 
 # Создание приложения
 connexion_app = create_connexion_app()
-app = connexion_app.app
 
-# Инициализация БД
-init_db(app)
+# Инициализация БД. Flask-SQLAlchemy нужен только синхронному режиму,
+# асинхронный режим получает AsyncEngine напрямую из DatabaseModule
+if not is_async_mode():
+    app = connexion_app.app
+    init_db(app)
+
+# Индекс имен проверяет настройки в конструкторе: несовместимая конфигурация
+# (NAME_INDEX_PATH с USER_ID_VERSION=v4) останавливает запуск, а не первый поиск.
+# Модуль импортируется в каждом worker-е после fork-а, поэтому поток обновления
+# запускается уже в worker-е и загружает снимок, не задерживая первые запросы
+injector.get(NameIndexSearch).start()
 
 if __name__ == '__main__':
     logger.info("Starting OTUS Highload Architect application...")
@@ -24,14 +35,20 @@ if __name__ == '__main__':
     # Проверяем переменную среды FLASK_ENV
     if os.getenv('FLASK_ENV') == 'production':
         logger.info("Production mode detected, starting with gunicorn...")
+        # Каталог для метрик worker-ов: /metrics собирает их со всех процессов
+        prepare_multiprocess_dir(os.getenv(MULTIPROCESS_DIR_ENV, '/tmp/prometheus_multiproc'))
+        # Количество worker-ов передается им через WEB_CONCURRENCY: по нему
+        # HashingExecutor делит ядра между пулами процессов worker-ов
+        workers = os.getenv('WEB_CONCURRENCY', '8')
         try:
             subprocess.run([
                 'gunicorn', 
                 '--bind', '0.0.0.0:8000',
                 '-k', 'uvicorn.workers.UvicornWorker',
-                '--workers', '8',
+                '--workers', workers,
+                '--config', 'python:infra.metrics.gunicorn_config',
                 'app:connexion_app'
-            ], check=True)
+            ], check=True, env={**os.environ, 'WEB_CONCURRENCY': workers})
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to start gunicorn: {e}", exc_info=True)
             sys.exit(1)
@@ -0,0 +1,114 @@
+import logging
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, List, Optional, Tuple, Union
+
+from model.user import User
+
+logger = logging.getLogger(__name__)
+
+# Максимальное количество анкет в одном запросе пакетной регистрации
+MAX_BATCH_SIZE = int(os.getenv('REGISTER_BATCH_MAX_SIZE', '1000'))
+
+# Поля анкеты, как в одиночной регистрации (User.create_for_registration)
+REGISTRATION_FIELDS = ('first_name', 'second_name', 'birthdate', 'biography', 'city', 'password')
+
+
+@dataclass
+class BatchItemResult:
+    """Результат регистрации одной анкеты: ID пользователя или причина ошибки"""
+    user_id: Optional[uuid.UUID] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchRegistrationResult:
+    """Результаты пакетной регистрации в порядке анкет запроса"""
+    items: List[BatchItemResult] = field(default_factory=list)
+    consistency_token: Optional[str] = None
+
+
+def validate_registration_item(item: Any) -> dict:
+    """
+    Проверяет анкету пакетной регистрации до хэширования пароля, чтобы ошибка
+    в одной анкете не отменяла COPY всего пакета
+
+    Args:
+        item: Анкета из запроса
+
+    Returns:
+        dict: Аргументы User.create_for_registration, дата рождения типа date
+
+    Raises:
+        ValueError: Если анкета невалидна
+    """
+    if not isinstance(item, dict):
+        raise ValueError("Анкета должна быть JSON объектом")
+    unknown = sorted(set(item) - set(REGISTRATION_FIELDS))
+    if unknown:
+        raise ValueError(f"Неизвестные поля: {', '.join(unknown)}")
+    missing = [name for name in REGISTRATION_FIELDS if item.get(name) is None]
+    if missing:
+        raise ValueError(f"Не заполнены поля: {', '.join(missing)}")
+    for name in REGISTRATION_FIELDS:
+        if not isinstance(item[name], str):
+            raise ValueError(f"Поле {name} должно быть строкой")
+    if not item['password']:
+        raise ValueError("Пароль не должен быть пустым")
+    try:
+        birthdate = date.fromisoformat(item['birthdate'])
+    except ValueError:
+        raise ValueError(f"Невалидная дата рождения: {item['birthdate']}")
+    return {**item, 'birthdate': birthdate}
+
+
+def prepare_batch(items: List[Any]) -> Tuple[BatchRegistrationResult, List[Tuple[int, dict]]]:
+    """
+    Проверяет все анкеты пакета
+
+    Returns:
+        Tuple[BatchRegistrationResult, List[Tuple[int, dict]]]: Результат с ошибками
+        невалидных анкет и валидные анкеты вместе с их позицией в запросе
+
+    Raises:
+        ValueError: Если пакет пуст или больше MAX_BATCH_SIZE
+    """
+    if not items:
+        raise ValueError("Пакет не содержит анкет")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"Пакет содержит {len(items)} анкет, допускается не больше {MAX_BATCH_SIZE}")
+
+    result = BatchRegistrationResult(items=[BatchItemResult() for _ in items])
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, validate_registration_item(item)))
+        except ValueError as e:
+            result.items[index].error = str(e)
+    return result, valid
+
+
+def build_batch_users(
+    result: BatchRegistrationResult,
+    valid: List[Tuple[int, dict]],
+    hashes: List[Union[str, BaseException]],
+) -> List[User]:
+    """
+    Создает пользователей из валидных анкет и хэшей их паролей,
+    записывая ID или ошибку хэширования в результат
+
+    Returns:
+        List[User]: Пользователи для вставки
+    """
+    users = []
+    for (index, data), hashed in zip(valid, hashes):
+        if isinstance(hashed, BaseException):
+            logger.error(f"Ошибка хэширования пароля анкеты {index}: {hashed}")
+            result.items[index].error = "Не удалось обработать пароль"
+            continue
+        user = User.create_for_registration(**{**data, 'password': hashed})
+        result.items[index].user_id = user.id
+        users.append(user)
+    return users
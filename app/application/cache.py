@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+@dataclass
+class CacheStats:
+    """Снимок счетчиков кэша"""
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+
+class LRUCache:
+    """
+    Потокобезопасный in-process LRU кэш с ограничением размера и временем жизни записей.
+
+    При превышении max_size вытесняется давно не использованная запись,
+    просроченные записи удаляются при обращении к ним.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Возвращает значение из кэша
+
+        Args:
+            key: Ключ
+
+        Returns:
+            Tuple[bool, Any]: (найдено ли значение, значение). Значение может быть None,
+            поэтому наличие записи возвращается отдельно
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Сохраняет значение в кэш
+
+        Args:
+            key: Ключ
+            value: Значение (допускается None)
+            ttl: Время жизни записи в секундах, по умолчанию ttl кэша
+        """
+        if self.max_size <= 0:
+            return
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key: Hashable):
+        """Удаляет запись из кэша, если она есть"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Удаляет все записи"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Возвращает текущие значения счетчиков"""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._entries),
+            )
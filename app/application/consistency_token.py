@@ -0,0 +1,43 @@
+import base64
+import binascii
+
+from infra.db.config.replica_router import lsn_to_int
+
+
+def encode_consistency_token(lsn: str) -> str:
+    """
+    Кодирует позицию записи в WAL в непрозрачный токен согласованности,
+    который клиент передает в последующих запросах чтения
+
+    Args:
+        lsn: LSN мастера после записи
+
+    Returns:
+        str: Токен в виде base64url строки без padding
+    """
+    return base64.urlsafe_b64encode(lsn.encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_consistency_token(token: str) -> int:
+    """
+    Декодирует токен согласованности в минимальный LSN, который должна
+    применить реплика, чтобы клиент увидел свою запись
+
+    Args:
+        token: Токен, ранее выданный encode_consistency_token
+
+    Returns:
+        int: LSN в виде числа
+
+    Raises:
+        ValueError: Если токен поврежден
+    """
+    try:
+        padding = '=' * (-len(token) % 4)
+        lsn = base64.urlsafe_b64decode(token + padding).decode('ascii')
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Невалидный токен согласованности: {token}") from e
+    try:
+        return lsn_to_int(lsn)
+    except ValueError as e:
+        raise ValueError(f"Невалидный токен согласованности: {token}") from e
@@ -0,0 +1,39 @@
+import base64
+import binascii
+import uuid
+
+
+def encode_cursor(item_id) -> str:
+    """
+    Кодирует ID последней записи страницы (пользователя, поста, сообщения)
+    в непрозрачный курсор keyset-пагинации
+
+    Args:
+        item_id: ID записи (UUID или строка)
+
+    Returns:
+        str: Курсор в виде base64url строки без padding
+    """
+    raw = str(item_id).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Декодирует курсор, полученный от клиента, обратно в ID записи
+
+    Args:
+        cursor: Курсор, ранее выданный encode_cursor
+
+    Returns:
+        str: ID записи
+
+    Raises:
+        ValueError: Если курсор поврежден
+    """
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(cursor + padding).decode('utf-8')
+        return str(uuid.UUID(raw))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Невалидный курсор: {cursor}") from e
@@ -0,0 +1,159 @@
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from injector import inject, singleton
+
+from application.cursor import decode_cursor, encode_cursor
+from application.users import UserNotFoundError
+from infra.db.repository.dialogs import AsyncDialogRepository, DialogRepository
+from infra.db.repository.users import AsyncUserRepository, UserRepository
+from model.dialog import DialogKey, Message, new_message_id
+
+logger = logging.getLogger(__name__)
+
+# Размер страницы диалога по умолчанию и жесткий предел
+DEFAULT_DIALOG_LIMIT = 20
+MAX_DIALOG_LIMIT = 100
+
+
+@dataclass
+class DialogPage:
+    """
+    Страница диалога.
+    next_cursor равен None, если следующей страницы нет.
+    """
+    messages: List[Message]
+    next_cursor: Optional[str] = None
+
+
+def _message_text(text: str) -> str:
+    """
+    Raises:
+        ValueError: Если текст пустой
+    """
+    if not text or not text.strip():
+        raise ValueError("Пустой текст сообщения")
+    return text
+
+
+def _dialog_key(user_id: str, other_user_id: str) -> Tuple[uuid.UUID, uuid.UUID, DialogKey]:
+    """
+    Raises:
+        ValueError: Если ID невалидны или пользователь указывает себя
+    """
+    user_uuid, other_uuid = uuid.UUID(user_id), uuid.UUID(other_user_id)
+    return user_uuid, other_uuid, DialogKey.of(user_uuid, other_uuid)
+
+
+def _list_params(
+    user_id: str, other_user_id: str, limit: int, cursor: Optional[str]
+) -> Tuple[DialogKey, int, Optional[uuid.UUID]]:
+    """
+    Разбирает параметры страницы диалога. Из репозитория запрашивается
+    на одно сообщение больше limit: лишнее сообщение означает, что есть следующая страница
+
+    Raises:
+        ValueError: Если ID или курсор невалидны
+    """
+    before = uuid.UUID(decode_cursor(cursor)) if cursor else None
+    _, _, key = _dialog_key(user_id, other_user_id)
+    return key, max(1, min(limit, MAX_DIALOG_LIMIT)) + 1, before
+
+
+def _build_dialog_page(messages: List[Message], limit: int) -> DialogPage:
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = encode_cursor(messages[-1].id)
+    return DialogPage(messages=messages, next_cursor=next_cursor)
+
+
+@singleton
+class DialogService:
+    """
+    Сервис диалогов: пользователи обмениваются личными сообщениями.
+    Сообщения хранятся в шардах, диалог целиком лежит в одном шарде.
+    """
+
+    @inject
+    def __init__(self, dialog_repository: DialogRepository, user_repository: UserRepository):
+        logger.info("DialogService initialized")
+        self.dialog_repository = dialog_repository
+        self.user_repository = user_repository
+
+    def send_message(self, user_id: str, to_user_id: str, text: str) -> Message:
+        """
+        Отправка сообщения пользователю
+
+        Args:
+            user_id (str): ID отправителя
+            to_user_id (str): ID получателя
+            text (str): Текст сообщения
+
+        Returns:
+            Message: Отправленное сообщение
+
+        Raises:
+            ValueError: Если ID невалидны, пользователь пишет себе или текст пустой
+            UserNotFoundError: Если получателя нет
+        """
+        from_uuid, to_uuid, key = _dialog_key(user_id, to_user_id)
+        text = _message_text(text)
+        # Пользователи и шарды - разные базы, поэтому получатель проверяется отдельным запросом
+        if self.user_repository.get_user(to_uuid) is None:
+            raise UserNotFoundError(f"Пользователь с ID {to_user_id} не найден")
+        message_id = new_message_id()
+        self.dialog_repository.insert_message(key, message_id, from_uuid, text)
+        return Message(str(message_id), str(from_uuid), str(to_uuid), text)
+
+    def list_messages(
+        self, user_id: str, other_user_id: str, limit: int = DEFAULT_DIALOG_LIMIT, cursor: Optional[str] = None
+    ) -> DialogPage:
+        """
+        Страница диалога с пользователем от новых сообщений к старым (keyset-пагинация)
+
+        Args:
+            user_id (str): ID текущего пользователя
+            other_user_id (str): ID собеседника
+            limit (int): Размер страницы, не больше MAX_DIALOG_LIMIT
+            cursor (Optional[str]): Курсор из предыдущей страницы
+
+        Returns:
+            DialogPage: Сообщения и курсор следующей страницы
+
+        Raises:
+            ValueError: Если ID или курсор невалидны
+        """
+        key, fetch_limit, before = _list_params(user_id, other_user_id, limit, cursor)
+        messages = self.dialog_repository.list_messages(key, fetch_limit, before)
+        return _build_dialog_page(messages, fetch_limit - 1)
+
+
+@singleton
+class AsyncDialogService:
+    """Асинхронный вариант DialogService поверх AsyncDialogRepository"""
+
+    @inject
+    def __init__(self, dialog_repository: AsyncDialogRepository, user_repository: AsyncUserRepository):
+        logger.info("AsyncDialogService initialized")
+        self.dialog_repository = dialog_repository
+        self.user_repository = user_repository
+
+    async def send_message(self, user_id: str, to_user_id: str, text: str) -> Message:
+        """Асинхронный аналог DialogService.send_message"""
+        from_uuid, to_uuid, key = _dialog_key(user_id, to_user_id)
+        text = _message_text(text)
+        if await self.user_repository.get_user(to_uuid) is None:
+            raise UserNotFoundError(f"Пользователь с ID {to_user_id} не найден")
+        message_id = new_message_id()
+        await self.dialog_repository.insert_message(key, message_id, from_uuid, text)
+        return Message(str(message_id), str(from_uuid), str(to_uuid), text)
+
+    async def list_messages(
+        self, user_id: str, other_user_id: str, limit: int = DEFAULT_DIALOG_LIMIT, cursor: Optional[str] = None
+    ) -> DialogPage:
+        """Асинхронный аналог DialogService.list_messages"""
+        key, fetch_limit, before = _list_params(user_id, other_user_id, limit, cursor)
+        messages = await self.dialog_repository.list_messages(key, fetch_limit, before)
+        return _build_dialog_page(messages, fetch_limit - 1)
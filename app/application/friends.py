@@ -0,0 +1,176 @@
+import logging
+import uuid
+from typing import List, Optional, Tuple
+from injector import inject, singleton
+
+from application.cursor import decode_cursor, encode_cursor
+from application.user_search_query import UserSearchPage
+from infra.db.repository.friends import AsyncFriendRepository, FriendRepository
+from model.user import FriendRecommendation, UserCard
+
+logger = logging.getLogger(__name__)
+
+# Размер страницы списка друзей по умолчанию и жесткий предел
+DEFAULT_FRIENDS_LIMIT = 100
+MAX_FRIENDS_LIMIT = 1000
+
+# Количество рекомендаций друзей по умолчанию и жесткий предел
+DEFAULT_SUGGEST_FRIENDS_LIMIT = 10
+MAX_SUGGEST_FRIENDS_LIMIT = 100
+
+
+class FriendNotFoundError(Exception):
+    """Исключение, возникающее когда добавляемого в друзья пользователя нет"""
+    pass
+
+
+def _friend_ids(user_id: str, friend_id: str) -> Tuple[uuid.UUID, uuid.UUID]:
+    """
+    Разбирает ID пользователя и друга
+
+    Raises:
+        ValueError: Если ID невалидны или пользователь указывает себя
+    """
+    user_uuid, friend_uuid = uuid.UUID(user_id), uuid.UUID(friend_id)
+    if user_uuid == friend_uuid:
+        raise ValueError("Нельзя добавить в друзья самого себя")
+    return user_uuid, friend_uuid
+
+
+def _list_params(user_id: str, limit: int, cursor: Optional[str]) -> Tuple[uuid.UUID, int, Optional[uuid.UUID]]:
+    """
+    Разбирает параметры страницы списка друзей. Из репозитория запрашивается
+    на одну запись больше limit: лишняя запись означает, что есть следующая страница
+
+    Raises:
+        ValueError: Если ID или курсор невалидны
+    """
+    after = uuid.UUID(decode_cursor(cursor)) if cursor else None
+    return uuid.UUID(user_id), max(1, min(limit, MAX_FRIENDS_LIMIT)) + 1, after
+
+
+def _build_friends_page(friends: List[UserCard], limit: int) -> UserSearchPage:
+    next_cursor = None
+    if len(friends) > limit:
+        friends = friends[:limit]
+        next_cursor = encode_cursor(friends[-1].id)
+    return UserSearchPage(users=friends, next_cursor=next_cursor)
+
+
+@singleton
+class FriendService:
+    """
+    Сервис дружбы: пользователь указывает других пользователей своими друзьями
+    (направленная связь) и получает список своих друзей по страницам.
+    """
+
+    @inject
+    def __init__(self, friend_repository: FriendRepository):
+        logger.info("FriendService initialized")
+        self.friend_repository = friend_repository
+
+    def add_friend(self, user_id: str, friend_id: str):
+        """
+        Добавление друга. Повторное добавление ничего не меняет.
+
+        Args:
+            user_id (str): ID текущего пользователя
+            friend_id (str): ID добавляемого друга
+
+        Raises:
+            ValueError: Если ID невалидны или пользователь добавляет себя
+            FriendNotFoundError: Если добавляемого пользователя нет
+        """
+        logger.info("Пользователь %s добавляет в друзья %s", user_id, friend_id)
+        if not self.friend_repository.add_friend(*_friend_ids(user_id, friend_id)):
+            raise FriendNotFoundError(f"Пользователь с ID {friend_id} не найден")
+
+    def delete_friend(self, user_id: str, friend_id: str):
+        """
+        Удаление друга. Удаление пользователя, которого нет в друзьях, ничего не меняет.
+
+        Args:
+            user_id (str): ID текущего пользователя
+            friend_id (str): ID удаляемого друга
+
+        Raises:
+            ValueError: Если ID невалидны
+        """
+        logger.info("Пользователь %s удаляет из друзей %s", user_id, friend_id)
+        self.friend_repository.delete_friend(*_friend_ids(user_id, friend_id))
+
+    def list_friends(
+        self, user_id: str, limit: int = DEFAULT_FRIENDS_LIMIT, cursor: Optional[str] = None
+    ) -> UserSearchPage:
+        """
+        Страница друзей пользователя в порядке ID (keyset-пагинация)
+
+        Args:
+            user_id (str): ID текущего пользователя
+            limit (int): Размер страницы, не больше MAX_FRIENDS_LIMIT
+            cursor (Optional[str]): Курсор из предыдущей страницы
+
+        Returns:
+            UserSearchPage: Анкеты друзей и курсор следующей страницы
+
+        Raises:
+            ValueError: Если ID или курсор невалидны
+        """
+        user_uuid, fetch_limit, after = _list_params(user_id, limit, cursor)
+        friends = self.friend_repository.list_friends(user_uuid, fetch_limit, after)
+        return _build_friends_page(friends, fetch_limit - 1)
+
+    def suggest_friends(self, user_id: str, limit: int = DEFAULT_SUGGEST_FRIENDS_LIMIT) -> List[FriendRecommendation]:
+        """
+        Рекомендации друзей друзей по убыванию числа общих друзей.
+        Рекомендации рассчитываются заранее фоновым заданием infra.recommendations.job,
+        запрос только читает готовый список.
+
+        Args:
+            user_id (str): ID текущего пользователя
+            limit (int): Количество рекомендаций, не больше MAX_SUGGEST_FRIENDS_LIMIT
+
+        Returns:
+            List[FriendRecommendation]: Анкеты кандидатов и количество общих друзей
+
+        Raises:
+            ValueError: Если ID невалиден
+        """
+        return self.friend_repository.list_recommendations(
+            uuid.UUID(user_id), max(1, min(limit, MAX_SUGGEST_FRIENDS_LIMIT))
+        )
+
+
+@singleton
+class AsyncFriendService:
+    """Асинхронный вариант FriendService поверх AsyncFriendRepository"""
+
+    @inject
+    def __init__(self, friend_repository: AsyncFriendRepository):
+        logger.info("AsyncFriendService initialized")
+        self.friend_repository = friend_repository
+
+    async def add_friend(self, user_id: str, friend_id: str):
+        """Асинхронный аналог FriendService.add_friend"""
+        logger.info("Пользователь %s добавляет в друзья %s", user_id, friend_id)
+        if not await self.friend_repository.add_friend(*_friend_ids(user_id, friend_id)):
+            raise FriendNotFoundError(f"Пользователь с ID {friend_id} не найден")
+
+    async def delete_friend(self, user_id: str, friend_id: str):
+        """Асинхронный аналог FriendService.delete_friend"""
+        logger.info("Пользователь %s удаляет из друзей %s", user_id, friend_id)
+        await self.friend_repository.delete_friend(*_friend_ids(user_id, friend_id))
+
+    async def list_friends(
+        self, user_id: str, limit: int = DEFAULT_FRIENDS_LIMIT, cursor: Optional[str] = None
+    ) -> UserSearchPage:
+        """Асинхронный аналог FriendService.list_friends"""
+        user_uuid, fetch_limit, after = _list_params(user_id, limit, cursor)
+        friends = await self.friend_repository.list_friends(user_uuid, fetch_limit, after)
+        return _build_friends_page(friends, fetch_limit - 1)
+
+    async def suggest_friends(self, user_id: str, limit: int = DEFAULT_SUGGEST_FRIENDS_LIMIT) -> List[FriendRecommendation]:
+        """Асинхронный аналог FriendService.suggest_friends"""
+        return await self.friend_repository.list_recommendations(
+            uuid.UUID(user_id), max(1, min(limit, MAX_SUGGEST_FRIENDS_LIMIT))
+        )
@@ -0,0 +1,282 @@
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+from injector import singleton
+
+from application.password_hasher import PasswordHasher
+from infra.metrics import BCRYPT_DURATION, BCRYPT_QUEUE_DEPTH, BCRYPT_QUEUE_WAIT, BCRYPT_REJECTED
+
+logger = logging.getLogger(__name__)
+
+# Процессы пула не наследуют fork-ом worker: к моменту создания пула в нем уже работают
+# потоки (слушатель логов, монитор реплик), и их блокировки могли бы остаться захваченными в потомке
+_MP_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class HashingQueueFullError(Exception):
+    """Исключение, возникающее когда очередь задач хэширования переполнена"""
+    pass
+
+
+@dataclass
+class HashingStats:
+    """Снимок метрик исполнителя хэширования"""
+    queue_depth: int
+    max_queue_depth: int
+    completed: int
+    rejected: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+    @property
+    def avg_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.completed if self.completed else 0.0
+
+
+def default_pool_size() -> int:
+    """
+    Размер пула по умолчанию: ядра делятся между worker-ами gunicorn (WEB_CONCURRENCY),
+    иначе каждый worker запустил бы по процессу на ядро и bcrypt конкурировал бы за ядра
+    """
+    workers = max(int(os.getenv('WEB_CONCURRENCY', '1')), 1)
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def _run_timed(fn, *args):
+    """
+    Выполняется в процессе пула: запускает fn и возвращает результат вместе
+    с моментами начала и окончания выполнения, чтобы посчитать время ожидания
+    в очереди и время самого bcrypt
+    """
+    started_at = time.time()
+    return fn(*args), started_at, time.time()
+
+
+@singleton
+class HashingExecutor:
+    """
+    Исполнитель bcrypt хэширования и проверки паролей в пуле процессов.
+
+    bcrypt намеренно нагружает CPU, поэтому выполнение в потоке запроса блокирует worker.
+    Пул процессов позволяет задействовать все доступные ядра, а ограниченная очередь
+    не дает накопить бесконечный хвост задач: если очередь заполнена дольше
+    queue_timeout секунд, бросается HashingQueueFullError.
+
+    Настройки из переменных среды:
+        HASHING_POOL_SIZE - количество процессов (по умолчанию число ядер, деленное на WEB_CONCURRENCY,
+            0 - выполнять в текущем потоке)
+        HASHING_QUEUE_SIZE - максимальное количество задач в очереди и в работе
+        HASHING_QUEUE_TIMEOUT - сколько секунд ждать места в очереди
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ):
+        if pool_size is None:
+            pool_size = int(os.getenv('HASHING_POOL_SIZE', str(default_pool_size())))
+        if queue_size is None:
+            queue_size = int(os.getenv('HASHING_QUEUE_SIZE', str(max(pool_size, 1) * 8)))
+        if queue_timeout is None:
+            queue_timeout = float(os.getenv('HASHING_QUEUE_TIMEOUT', '5'))
+
+        self.pool_size = pool_size
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._shutdown_registered = False
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        logger.info(
+            "HashingExecutor initialized: pool_size=%s, queue_size=%s, queue_timeout=%s",
+            pool_size, queue_size, queue_timeout,
+        )
+
+    def hash(self, password: str) -> str:
+        """Хэширует пароль в пуле процессов (см. PasswordHasher.hash)"""
+        return self.submit(PasswordHasher.hash, password).result()
+
+    def check(self, password: str, hashed_password: str) -> bool:
+        """Проверяет пароль в пуле процессов (см. PasswordHasher.check)"""
+        return self.submit(PasswordHasher.check, password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        """Асинхронный вариант hash: ожидание результата не блокирует event loop"""
+        future = await asyncio.to_thread(self.submit, PasswordHasher.hash, password)
+        return await asyncio.wrap_future(future)
+
+    async def check_async(self, password: str, hashed_password: str) -> bool:
+        """Асинхронный вариант check: ожидание результата не блокирует event loop"""
+        future = await asyncio.to_thread(self.submit, PasswordHasher.check, password, hashed_password)
+        return await asyncio.wrap_future(future)
+
+    def hash_many(self, passwords: List[str]) -> List[Union[str, Exception]]:
+        """
+        Хэширует несколько паролей параллельно на всех процессах пула
+
+        Args:
+            passwords: Пароли
+
+        Returns:
+            List[Union[str, Exception]]: Хэши в порядке паролей; для пароля,
+            который не удалось захэшировать, - исключение
+
+        Raises:
+            HashingQueueFullError: Если место в очереди не освободилось за queue_timeout
+        """
+        futures = [self.submit(PasswordHasher.hash, password) for password in passwords]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def hash_many_async(self, passwords: List[str]) -> List[Union[str, Exception]]:
+        """Асинхронный вариант hash_many"""
+        # submit может ждать места в очереди, поэтому задачи ставятся из отдельного потока
+        futures = await asyncio.to_thread(
+            lambda: [self.submit(PasswordHasher.hash, password) for password in passwords]
+        )
+        return await asyncio.gather(*(asyncio.wrap_future(f) for f in futures), return_exceptions=True)
+
+    def submit(self, fn, *args) -> Future:
+        """
+        Ставит задачу в очередь пула процессов
+
+        Args:
+            fn: Функция, доступная для pickle (например, PasswordHasher.hash)
+            *args: Аргументы функции
+
+        Returns:
+            Future: Future с результатом fn
+
+        Raises:
+            HashingQueueFullError: Если место в очереди не освободилось за queue_timeout
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._rejected += 1
+            BCRYPT_REJECTED.inc()
+            logger.warning("Очередь хэширования переполнена (%s задач)", self.queue_size)
+            raise HashingQueueFullError("Очередь хэширования паролей переполнена")
+
+        with self._lock:
+            self._queue_depth += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+        BCRYPT_QUEUE_DEPTH.inc()
+
+        submitted_at = time.time()
+        result = Future()
+
+        if self.pool_size <= 0:
+            # Пул отключен: выполняем в текущем потоке
+            try:
+                timed_result = _run_timed(fn, *args)
+            except Exception as e:
+                self._release()
+                result.set_exception(e)
+            else:
+                result.set_result(self._complete(fn, submitted_at, timed_result))
+            return result
+
+        pool = self._get_pool()
+
+        def on_done(pool_future: Future):
+            try:
+                result.set_result(self._complete(fn, submitted_at, pool_future.result()))
+            except Exception as e:
+                self._release()
+                if isinstance(e, BrokenProcessPool):
+                    self._discard_pool(pool)
+                result.set_exception(e)
+
+        try:
+            pool_future = pool.submit(_run_timed, fn, *args)
+        except Exception as e:
+            # Задача не поставлена: место в очереди освобождается, а сломанный пул
+            # (процесс завершился или убит OOM killer-ом) заменяется при следующем вызове
+            self._release()
+            if isinstance(e, BrokenProcessPool):
+                self._discard_pool(pool)
+            raise
+        pool_future.add_done_callback(on_done)
+        return result
+
+    def stats(self) -> HashingStats:
+        """Возвращает текущие метрики очереди и времени ожидания"""
+        with self._lock:
+            return HashingStats(
+                queue_depth=self._queue_depth,
+                max_queue_depth=self._max_queue_depth,
+                completed=self._completed,
+                rejected=self._rejected,
+                total_wait_seconds=self._total_wait,
+                max_wait_seconds=self._max_wait,
+            )
+
+    def shutdown(self):
+        """Останавливает пул процессов"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _complete(self, fn, submitted_at: float, timed_result):
+        value, started_at, finished_at = timed_result
+        wait = max(0.0, started_at - submitted_at)
+        BCRYPT_QUEUE_WAIT.labels(operation=fn.__name__).observe(wait)
+        BCRYPT_DURATION.labels(operation=fn.__name__).observe(max(0.0, finished_at - started_at))
+        with self._lock:
+            self._completed += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        self._release()
+        return value
+
+    def _release(self):
+        with self._lock:
+            self._queue_depth -= 1
+        BCRYPT_QUEUE_DEPTH.dec()
+        self._slots.release()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Пул создается лениво, уже после fork-а worker-а gunicorn
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.pool_size, mp_context=multiprocessing.get_context(_MP_START_METHOD)
+                )
+                if not self._shutdown_registered:
+                    atexit.register(self.shutdown)
+                    self._shutdown_registered = True
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        """Забывает сломанный пул, чтобы следующая задача создала новый"""
+        with self._lock:
+            if self._pool is not pool:
+                return
+            self._pool = None
+        logger.warning("Пул процессов хэширования сломан и будет создан заново")
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,5 +1,6 @@
 from injector import Injector
 from infra.db.config.database import DatabaseModule
+from infra.db.config.sharding import ShardingModule
 
-# Инициализация инжектора с модулем базы данных
-injector = Injector([DatabaseModule()])
+# Инициализация инжектора с модулями базы данных и шардов диалогов
+injector = Injector([DatabaseModule(), ShardingModule()])
@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import os
 
+from infra.metrics import JWT_DURATION, observe_duration
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +24,7 @@ class JWTService:
     ACCESS_TOKEN_EXPIRE_HOURS = 24
     
     @classmethod
+    @observe_duration(JWT_DURATION.labels(operation='create'))
     def create_access_token(cls, user_id: str, additional_claims: Optional[Dict[str, Any]] = None) -> str:
         """
         Создает JWT токен для пользователя
@@ -52,14 +55,15 @@ class JWTService:
             # Создаем токен
             encoded_jwt = jwt.encode(to_encode, cls.SECRET_KEY, algorithm=cls.ALGORITHM)
             
-            logger.info(f"JWT токен создан для пользователя: {user_id}")
+            logger.info("JWT токен создан для пользователя: %s", user_id)
             return encoded_jwt
             
         except Exception as e:
-            logger.error(f"Ошибка при создании JWT токена: {e}")
+            logger.error("Ошибка при создании JWT токена: %s", e)
             raise
     
     @classmethod
+    @observe_duration(JWT_DURATION.labels(operation='verify'))
     def verify_token(cls, token: str) -> Optional[Dict[str, Any]]:
         """
         Проверяет и декодирует JWT токен
@@ -79,17 +83,17 @@ class JWTService:
                 logger.warning("Неверный тип токена")
                 return None
             
-            logger.info(f"JWT токен успешно проверен для пользователя: {payload.get('sub')}")
+            logger.info("JWT токен успешно проверен для пользователя: %s", payload.get('sub'))
             return payload
             
         except jwt.ExpiredSignatureError:
             logger.warning("JWT токен истек")
             return None
         except jwt.InvalidTokenError as e:
-            logger.warning(f"Невалидный JWT токен: {e}")
+            logger.warning("Невалидный JWT токен: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Ошибка при проверке JWT токена: {e}")
+            logger.error("Ошибка при проверке JWT токена: %s", e)
             return None
     
     @classmethod
@@ -0,0 +1,166 @@
+import heapq
+import logging
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from injector import inject, singleton
+
+from infra.db.repository.users import NameFrequencyRepository
+
+logger = logging.getLogger(__name__)
+
+# Размер подсказки по умолчанию и жесткий предел
+DEFAULT_SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 50
+
+# Верхняя граница диапазона префикса: любая строка с префиксом меньше prefix + U+10FFFF
+_PREFIX_END = '\U0010ffff'
+
+# Диапазоны префиксов длиннее этого порога (короткие префиксы вроде "а") запоминаются,
+# чтобы не выбирать лучшие из тысяч имен на каждый запрос
+_MEMO_RANGE_SIZE = 1000
+
+
+class NameSuggestionsNotReadyError(Exception):
+    """Исключение, возникающее, пока частоты имен еще не загружены"""
+    pass
+
+
+@dataclass
+class NameSuggestion:
+    """Дополненное имя или фамилия и количество пользователей с ним"""
+    name: str
+    count: int
+
+
+@dataclass
+class NameSuggestions:
+    """Подсказки по префиксу: самые частые имена и фамилии"""
+    first_names: List[NameSuggestion]
+    last_names: List[NameSuggestion]
+
+
+class NameFrequencies:
+    """
+    Неизменяемая таблица частот имен: имена в нижнем регистре упорядочены,
+    поэтому имена с префиксом занимают непрерывный диапазон, который находится
+    бинарным поиском. Из диапазона выбираются самые частые имена.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[str, str, int]]):
+        """
+        Args:
+            rows: Строки (имя в нижнем регистре, написание для ответа, количество)
+        """
+        rows = sorted(rows)
+        self._keys = [row[0] for row in rows]
+        self._names = [row[1] for row in rows]
+        self._counts = array('q', (row[2] for row in rows))
+        self._memo: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def top(self, prefix: str, limit: int) -> List[NameSuggestion]:
+        """
+        Самые частые имена, начинающиеся с префикса, по убыванию частоты
+        (при равной частоте - по алфавиту)
+
+        Args:
+            prefix: Префикс в нижнем регистре
+            limit: Количество имен, не больше MAX_SUGGEST_LIMIT
+        """
+        rows = self._memo.get(prefix)
+        if rows is None:
+            low = bisect_left(self._keys, prefix)
+            high = bisect_left(self._keys, prefix + _PREFIX_END, lo=low)
+            # nlargest устойчив: при равной частоте раньше идет имя, которое раньше по алфавиту
+            if high - low > _MEMO_RANGE_SIZE:
+                rows = heapq.nlargest(MAX_SUGGEST_LIMIT, range(low, high), key=self._counts.__getitem__)
+                self._memo[prefix] = rows
+            else:
+                rows = heapq.nlargest(limit, range(low, high), key=self._counts.__getitem__)
+        return [NameSuggestion(self._names[row], self._counts[row]) for row in rows[:limit]]
+
+
+@singleton
+class NameSuggestionService:
+    """
+    Подсказки для поиска: самые частые имена и фамилии, начинающиеся с введенного префикса,
+    и количество пользователей с каждым из них.
+
+    Частоты считаются запросом к БД по всей таблице users и хранятся в памяти worker-а.
+    Фоновый поток пересчитывает их раз в NAME_SUGGEST_REFRESH_INTERVAL секунд
+    (по умолчанию 300): подсказки отстают от регистраций не больше чем на этот период.
+    """
+
+    @inject
+    def __init__(self, frequency_repository: NameFrequencyRepository):
+        self.frequency_repository = frequency_repository
+        self.refresh_interval = float(os.getenv('NAME_SUGGEST_REFRESH_INTERVAL', '300'))
+        self._frequencies: Optional[Tuple[NameFrequencies, NameFrequencies]] = None
+        self._lock = threading.Lock()
+        self._started = False
+        self._stopped = threading.Event()
+
+        logger.info("NameSuggestionService initialized: refresh_interval=%s", self.refresh_interval)
+
+    def suggest(self, prefix: str, limit: int = DEFAULT_SUGGEST_LIMIT) -> NameSuggestions:
+        """
+        Подсказки по префиксу (регистронезависимо)
+
+        Args:
+            prefix: Начало имени или фамилии
+            limit: Количество имен и фамилий в ответе, не больше MAX_SUGGEST_LIMIT
+
+        Returns:
+            NameSuggestions: Самые частые имена и фамилии с префиксом
+
+        Raises:
+            ValueError: Если префикс пустой
+            NameSuggestionsNotReadyError: Если частоты еще загружаются
+        """
+        prefix = prefix.strip().lower()
+        if not prefix:
+            raise ValueError("Пустой префикс")
+        limit = max(1, min(limit, MAX_SUGGEST_LIMIT))
+
+        self._ensure_started()
+        frequencies = self._frequencies
+        if frequencies is None:
+            raise NameSuggestionsNotReadyError("Частоты имен еще загружаются")
+        first_names, last_names = frequencies
+        return NameSuggestions(first_names=first_names.top(prefix, limit), last_names=last_names.top(prefix, limit))
+
+    def refresh(self):
+        """Пересчитывает частоты имен и фамилий"""
+        first_names, last_names = self.frequency_repository.get_name_frequencies()
+        self._frequencies = (NameFrequencies(first_names), NameFrequencies(last_names))
+        logger.info("Частоты для подсказок обновлены: %s имен, %s фамилий", len(first_names), len(last_names))
+
+    def stop(self):
+        """Останавливает фоновое обновление"""
+        self._stopped.set()
+
+    def _ensure_started(self):
+        # Поток запускается при первом запросе, уже после fork-а worker-а
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._run, name="name-suggest-refresh", daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("Ошибка обновления частот для подсказок: %s", e)
+            if self._stopped.wait(self.refresh_interval if self._frequencies is not None else 1):
+                return
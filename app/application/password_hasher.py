@@ -1,5 +1,6 @@
 import bcrypt
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -9,20 +10,24 @@ class PasswordHasher:
     Класс для хэширования и проверки паролей с использованием bcrypt
     """
     
+    # Стоимость (log2 количества раундов) bcrypt для новых хэшей
+    ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+    
     @staticmethod
-    def hash(password: str) -> str:
+    def hash(password: str, rounds: int = None) -> str:
         """
         Хэширует пароль с использованием bcrypt
         
         Args:
             password: Пароль для хэширования
+            rounds: Стоимость bcrypt, по умолчанию PasswordHasher.ROUNDS
             
         Returns:
             str: Хэшированный пароль в виде строки
         """
         try:
             # Генерируем соль и хэшируем пароль
-            salt = bcrypt.gensalt()
+            salt = bcrypt.gensalt(rounds=rounds or PasswordHasher.ROUNDS)
             hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
             
             # Возвращаем как строку
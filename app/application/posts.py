@@ -0,0 +1,188 @@
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from injector import inject, singleton
+
+from application.cursor import decode_cursor, encode_cursor
+from infra.db.repository.posts import AsyncPostRepository, PostRepository
+from model.post import Post, new_post_id
+
+logger = logging.getLogger(__name__)
+
+# Размер страницы ленты по умолчанию и жесткий предел
+DEFAULT_FEED_LIMIT = 10
+MAX_FEED_LIMIT = 100
+
+
+class PostNotFoundError(Exception):
+    """Исключение, возникающее когда поста нет (или он принадлежит другому автору)"""
+    pass
+
+
+@dataclass
+class FeedPage:
+    """
+    Страница ленты постов.
+    next_cursor равен None, если следующей страницы нет.
+    """
+    posts: List[Post]
+    next_cursor: Optional[str] = None
+
+
+def _post_text(text: str) -> str:
+    """
+    Raises:
+        ValueError: Если текст пустой
+    """
+    if not text or not text.strip():
+        raise ValueError("Пустой текст поста")
+    return text
+
+
+def _feed_params(user_id: str, limit: int, cursor: Optional[str]) -> Tuple[uuid.UUID, int, Optional[uuid.UUID]]:
+    """
+    Разбирает параметры страницы ленты. Из репозитория запрашивается
+    на один пост больше limit: лишний пост означает, что есть следующая страница
+
+    Raises:
+        ValueError: Если ID или курсор невалидны
+    """
+    after = uuid.UUID(decode_cursor(cursor)) if cursor else None
+    return uuid.UUID(user_id), max(1, min(limit, MAX_FEED_LIMIT)) + 1, after
+
+
+def _build_feed_page(posts: List[Post], limit: int) -> FeedPage:
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1].id)
+    return FeedPage(posts=posts, next_cursor=next_cursor)
+
+
+@singleton
+class PostService:
+    """
+    Сервис постов: автор создает, изменяет и удаляет свои посты,
+    пользователь читает ленту последних постов своих друзей.
+    """
+
+    @inject
+    def __init__(self, post_repository: PostRepository):
+        logger.info("PostService initialized")
+        self.post_repository = post_repository
+
+    def create_post(self, user_id: str, text: str) -> Post:
+        """
+        Создание поста. В ленты друзей пост попадает асинхронно (процесс fan-out).
+
+        Args:
+            user_id (str): ID автора
+            text (str): Текст поста
+
+        Returns:
+            Post: Созданный пост
+
+        Raises:
+            ValueError: Если ID невалиден или текст пустой
+        """
+        author_id, post_id = uuid.UUID(user_id), new_post_id()
+        self.post_repository.insert_post(post_id, author_id, _post_text(text))
+        logger.info("Пользователь %s создал пост %s", user_id, post_id)
+        return Post(str(post_id), text, str(author_id))
+
+    def update_post(self, user_id: str, post_id: str, text: str):
+        """
+        Изменение текста своего поста
+
+        Raises:
+            ValueError: Если ID невалидны или текст пустой
+            PostNotFoundError: Если у пользователя нет такого поста
+        """
+        if not self.post_repository.update_post(uuid.UUID(post_id), uuid.UUID(user_id), _post_text(text)):
+            raise PostNotFoundError(f"Пост с ID {post_id} не найден")
+
+    def delete_post(self, user_id: str, post_id: str):
+        """
+        Удаление своего поста, в том числе из лент
+
+        Raises:
+            ValueError: Если ID невалидны
+            PostNotFoundError: Если у пользователя нет такого поста
+        """
+        if not self.post_repository.delete_post(uuid.UUID(post_id), uuid.UUID(user_id)):
+            raise PostNotFoundError(f"Пост с ID {post_id} не найден")
+        logger.info("Пользователь %s удалил пост %s", user_id, post_id)
+
+    def get_post(self, post_id: str) -> Post:
+        """
+        Получение поста по ID
+
+        Raises:
+            ValueError: Если ID невалиден
+            PostNotFoundError: Если поста нет
+        """
+        post = self.post_repository.get_post(uuid.UUID(post_id))
+        if post is None:
+            raise PostNotFoundError(f"Пост с ID {post_id} не найден")
+        return post
+
+    def get_feed(self, user_id: str, limit: int = DEFAULT_FEED_LIMIT, cursor: Optional[str] = None) -> FeedPage:
+        """
+        Страница ленты: последние посты друзей от новых к старым (keyset-пагинация)
+
+        Args:
+            user_id (str): ID текущего пользователя
+            limit (int): Размер страницы, не больше MAX_FEED_LIMIT
+            cursor (Optional[str]): Курсор из предыдущей страницы
+
+        Returns:
+            FeedPage: Посты и курсор следующей страницы
+
+        Raises:
+            ValueError: Если ID или курсор невалидны
+        """
+        user_uuid, fetch_limit, after = _feed_params(user_id, limit, cursor)
+        posts = self.post_repository.get_feed(user_uuid, fetch_limit, after)
+        return _build_feed_page(posts, fetch_limit - 1)
+
+
+@singleton
+class AsyncPostService:
+    """Асинхронный вариант PostService поверх AsyncPostRepository"""
+
+    @inject
+    def __init__(self, post_repository: AsyncPostRepository):
+        logger.info("AsyncPostService initialized")
+        self.post_repository = post_repository
+
+    async def create_post(self, user_id: str, text: str) -> Post:
+        """Асинхронный аналог PostService.create_post"""
+        author_id, post_id = uuid.UUID(user_id), new_post_id()
+        await self.post_repository.insert_post(post_id, author_id, _post_text(text))
+        logger.info("Пользователь %s создал пост %s", user_id, post_id)
+        return Post(str(post_id), text, str(author_id))
+
+    async def update_post(self, user_id: str, post_id: str, text: str):
+        """Асинхронный аналог PostService.update_post"""
+        if not await self.post_repository.update_post(uuid.UUID(post_id), uuid.UUID(user_id), _post_text(text)):
+            raise PostNotFoundError(f"Пост с ID {post_id} не найден")
+
+    async def delete_post(self, user_id: str, post_id: str):
+        """Асинхронный аналог PostService.delete_post"""
+        if not await self.post_repository.delete_post(uuid.UUID(post_id), uuid.UUID(user_id)):
+            raise PostNotFoundError(f"Пост с ID {post_id} не найден")
+        logger.info("Пользователь %s удалил пост %s", user_id, post_id)
+
+    async def get_post(self, post_id: str) -> Post:
+        """Асинхронный аналог PostService.get_post"""
+        post = await self.post_repository.get_post(uuid.UUID(post_id))
+        if post is None:
+            raise PostNotFoundError(f"Пост с ID {post_id} не найден")
+        return post
+
+    async def get_feed(self, user_id: str, limit: int = DEFAULT_FEED_LIMIT, cursor: Optional[str] = None) -> FeedPage:
+        """Асинхронный аналог PostService.get_feed"""
+        user_uuid, fetch_limit, after = _feed_params(user_id, limit, cursor)
+        posts = await self.post_repository.get_feed(user_uuid, fetch_limit, after)
+        return _build_feed_page(posts, fetch_limit - 1)
@@ -0,0 +1,346 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from injector import singleton
+
+from application.cache import LRUCache
+from model.user import User
+
+logger = logging.getLogger(__name__)
+
+# Значение в общем кэше, означающее, что пользователя с таким ID нет
+_MISSING_MARKER = '{"missing": true}'
+
+
+class CacheBackend(ABC):
+    """
+    Общий для всех worker-ов кэш профилей (например, Redis).
+    Хранит строки с ограниченным временем жизни.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: float):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Локальная замена общего кэша для тестов и разработки"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[float, str]] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._values.pop(key, None)
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl: float):
+        with self._lock:
+            self._values[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Общий кэш профилей в Redis. Требует установленного пакета redis.
+    Таймауты конечные: недоступный Redis должен превращаться в промах кэша, а не в зависший запрос.
+    """
+
+    def __init__(self, url: str, timeout: float):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("Для PROFILE_CACHE_REDIS_URL требуется пакет redis") from e
+        self._client = redis.Redis.from_url(
+            url, decode_responses=True, socket_timeout=timeout, socket_connect_timeout=timeout
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: str, ttl: float):
+        self._client.set(key, value, px=int(ttl * 1000))
+
+    def delete(self, key: str):
+        self._client.delete(key)
+
+
+@dataclass
+class ProfileCacheStats:
+    """Снимок счетчиков кэша профилей"""
+    hits: int
+    negative_hits: int
+    shared_hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+def _user_to_json(user: User) -> str:
+    return json.dumps({
+        "id": str(user.id),
+        "first_name": user.first_name,
+        "second_name": user.second_name,
+        "birthdate": user.birthdate.isoformat() if user.birthdate else None,
+        "biography": user.biography,
+        "city": user.city,
+    })
+
+
+def _user_from_json(value: str) -> User:
+    data = json.loads(value)
+    return User(
+        user_id=uuid.UUID(data["id"]),
+        first_name=data["first_name"],
+        second_name=data["second_name"],
+        birthdate=date.fromisoformat(data["birthdate"]) if data["birthdate"] else None,
+        biography=data["biography"],
+        city=data["city"],
+        password=None,
+    )
+
+
+def _cacheable_copy(user: User) -> User:
+    """
+    Копия пользователя для кэша: без хэша пароля и с датой рождения типа date,
+    как при чтении из БД (при регистрации дата приходит строкой из JSON)
+    """
+    birthdate = user.birthdate
+    if isinstance(birthdate, str):
+        birthdate = date.fromisoformat(birthdate)
+    return User(
+        user_id=user.id,
+        first_name=user.first_name,
+        second_name=user.second_name,
+        birthdate=birthdate,
+        biography=user.biography,
+        city=user.city,
+        password=None,
+    )
+
+
+@singleton
+class ProfileCache:
+    """
+    Read-through кэш профилей пользователей для UserService.get_user_profile.
+
+    Первый уровень - in-process LRU с TTL, второй (опционально) - общий для всех
+    worker-ов CacheBackend. Отсутствующие пользователи тоже кэшируются (negative caching)
+    с более коротким временем жизни, чтобы повторные запросы несуществующих ID не доходили до БД.
+
+    Настройки из переменных среды:
+        PROFILE_CACHE_SIZE - максимальное количество профилей в памяти worker-а (0 - кэш выключен)
+        PROFILE_CACHE_TTL - время жизни профиля в секундах
+        PROFILE_CACHE_NEGATIVE_TTL - время жизни записи об отсутствующем пользователе
+        PROFILE_CACHE_REDIS_URL - URL общего кэша в Redis (необязательно)
+        PROFILE_CACHE_REDIS_TIMEOUT - таймаут подключения и операций Redis в секундах
+
+    Синхронный CacheBackend в асинхронном режиме вызывается через *_async методы
+    в отдельном потоке, чтобы сетевые обращения не блокировали event loop.
+    """
+
+    KEY_PREFIX = "profile:"
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+        shared_backend: Optional[CacheBackend] = None,
+    ):
+        if max_size is None:
+            max_size = int(os.getenv('PROFILE_CACHE_SIZE', '10000'))
+        if ttl is None:
+            ttl = float(os.getenv('PROFILE_CACHE_TTL', '60'))
+        if negative_ttl is None:
+            negative_ttl = float(os.getenv('PROFILE_CACHE_NEGATIVE_TTL', '5'))
+        if shared_backend is None and os.getenv('PROFILE_CACHE_REDIS_URL'):
+            shared_backend = RedisCacheBackend(
+                os.getenv('PROFILE_CACHE_REDIS_URL'), float(os.getenv('PROFILE_CACHE_REDIS_TIMEOUT', '0.5'))
+            )
+
+        self.enabled = max_size > 0
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._local = LRUCache(max_size=max_size, ttl=ttl)
+        self._shared = shared_backend
+        self._lock = threading.Lock()
+        self._negative_hits = 0
+        self._shared_hits = 0
+
+        logger.info(
+            f"ProfileCache initialized: max_size={max_size}, ttl={ttl}, "
+            f"negative_ttl={negative_ttl}, shared={type(shared_backend).__name__ if shared_backend else None}"
+        )
+
+    def lookup(self, user_id: uuid.UUID) -> Tuple[bool, Optional[User]]:
+        """
+        Ищет профиль в кэше
+
+        Args:
+            user_id: ID пользователя
+
+        Returns:
+            Tuple[bool, Optional[User]]: (есть ли запись в кэше, профиль).
+            (True, None) означает закэшированное отсутствие пользователя
+        """
+        if not self.enabled:
+            return False, None
+
+        found, user = self._lookup_local(user_id)
+        if found or self._shared is None:
+            return found, user
+        return self._lookup_shared(user_id)
+
+    async def lookup_many_async(self, user_ids: List[uuid.UUID]) -> List[Tuple[bool, Optional[User]]]:
+        """
+        Асинхронный вариант lookup для нескольких профилей. Промахи первого уровня
+        ищутся в общем кэше одним переходом в отдельный поток.
+
+        Args:
+            user_ids: ID пользователей
+
+        Returns:
+            List[Tuple[bool, Optional[User]]]: Результаты lookup в порядке user_ids
+        """
+        if not self.enabled:
+            return [(False, None)] * len(user_ids)
+
+        results = [self._lookup_local(user_id) for user_id in user_ids]
+        missed = [i for i, (found, _) in enumerate(results) if not found]
+        if missed and self._shared is not None:
+            shared = await asyncio.to_thread(lambda: [self._lookup_shared(user_ids[i]) for i in missed])
+            for i, result in zip(missed, shared):
+                results[i] = result
+        return results
+
+    async def lookup_async(self, user_id: uuid.UUID) -> Tuple[bool, Optional[User]]:
+        """Асинхронный вариант lookup"""
+        return (await self.lookup_many_async([user_id]))[0]
+
+    def store(self, user_id: uuid.UUID, user: Optional[User]):
+        """
+        Сохраняет профиль в кэш. None сохраняется как отсутствующий пользователь.
+
+        Args:
+            user_id: ID пользователя
+            user: Профиль или None
+        """
+        if not self.enabled:
+            return
+
+        if user is None:
+            self._local.put(user_id, None, ttl=self.negative_ttl)
+            self._set_shared(user_id, _MISSING_MARKER, self.negative_ttl)
+            return
+
+        try:
+            user = _cacheable_copy(user)
+        except ValueError:
+            # Дату не удалось разобрать так же, как это делает БД: профиль прочитаем из БД
+            self.invalidate(user_id)
+            return
+        self._local.put(user_id, user)
+        self._set_shared(user_id, _user_to_json(user), self.ttl)
+
+    async def store_many_async(self, profiles: Dict[uuid.UUID, Optional[User]]):
+        """
+        Асинхронный вариант store для нескольких профилей. При наличии общего кэша
+        запись выполняется в отдельном потоке.
+
+        Args:
+            profiles: Профили по ID, None - отсутствующий пользователь
+        """
+        if not self.enabled or not profiles:
+            return
+        if self._shared is None:
+            for user_id, user in profiles.items():
+                self.store(user_id, user)
+            return
+        await asyncio.to_thread(lambda: [self.store(user_id, user) for user_id, user in profiles.items()])
+
+    async def store_async(self, user_id: uuid.UUID, user: Optional[User]):
+        """Асинхронный вариант store"""
+        await self.store_many_async({user_id: user})
+
+    def invalidate(self, user_id: uuid.UUID):
+        """Удаляет профиль из всех уровней кэша"""
+        self._local.delete(user_id)
+        if self._shared is not None:
+            try:
+                self._shared.delete(self.KEY_PREFIX + str(user_id))
+            except Exception as e:
+                logger.warning(f"Ошибка удаления профиля из общего кэша: {e}")
+
+    def stats(self) -> ProfileCacheStats:
+        """Возвращает текущие значения счетчиков"""
+        local = self._local.stats()
+        with self._lock:
+            return ProfileCacheStats(
+                hits=local.hits,
+                negative_hits=self._negative_hits,
+                shared_hits=self._shared_hits,
+                misses=local.misses - self._shared_hits,
+                evictions=local.evictions,
+                size=local.size,
+            )
+
+    def _lookup_local(self, user_id: uuid.UUID) -> Tuple[bool, Optional[User]]:
+        found, user = self._local.get(user_id)
+        if found and user is None:
+            with self._lock:
+                self._negative_hits += 1
+        return found, user
+
+    def _lookup_shared(self, user_id: uuid.UUID) -> Tuple[bool, Optional[User]]:
+        value = self._get_shared(user_id)
+        if value is None:
+            return False, None
+        with self._lock:
+            self._shared_hits += 1
+        if value == _MISSING_MARKER:
+            self._local.put(user_id, None, ttl=self.negative_ttl)
+            return True, None
+        user = _user_from_json(value)
+        self._local.put(user_id, user)
+        return True, user
+
+    def _get_shared(self, user_id: uuid.UUID) -> Optional[str]:
+        # Недоступность общего кэша не должна ломать чтение профиля
+        try:
+            return self._shared.get(self.KEY_PREFIX + str(user_id))
+        except Exception as e:
+            logger.warning(f"Ошибка чтения профиля из общего кэша: {e}")
+            return None
+
+    def _set_shared(self, user_id: uuid.UUID, value: str, ttl: float):
+        if self._shared is None:
+            return
+        try:
+            self._shared.set(self.KEY_PREFIX + str(user_id), value, ttl)
+        except Exception as e:
+            logger.warning(f"Ошибка записи профиля в общий кэш: {e}")
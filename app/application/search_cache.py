@@ -0,0 +1,106 @@
+import logging
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from injector import singleton
+
+from application.cache import LRUCache
+from application.single_flight import AsyncSingleFlight, SingleFlight
+from application.user_search_query import UserSearchPage, UserSearchQuery
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SearchCacheStats:
+    """Снимок счетчиков кэша результатов поиска"""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    coalesced: int
+
+
+def _cache_key(search_query: UserSearchQuery):
+    return (search_query.first_name, search_query.last_name, search_query.limit, search_query.after)
+
+
+@singleton
+class SearchCache:
+    """
+    Кэш страниц результатов поиска пользователей с коротким временем жизни.
+
+    Ключ - нормализованный UserSearchQuery (см. UserSearchQuery.normalized).
+    Одновременные промахи по одному ключу объединяются: в БД уходит только
+    один запрос, остальные запросы ждут его результат.
+
+    Настройки из переменных среды:
+        SEARCH_CACHE_SIZE - максимальное количество страниц в памяти worker-а (0 - без кэширования,
+            одинаковые одновременные запросы все равно объединяются)
+        SEARCH_CACHE_TTL - время жизни страницы в секундах
+    """
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None):
+        if max_size is None:
+            max_size = int(os.getenv('SEARCH_CACHE_SIZE', '1000'))
+        if ttl is None:
+            ttl = float(os.getenv('SEARCH_CACHE_TTL', '5'))
+
+        self._cache = LRUCache(max_size=max_size, ttl=ttl)
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+
+        logger.info(f"SearchCache initialized: max_size={max_size}, ttl={ttl}")
+
+    def get_or_load(
+        self, search_query: UserSearchQuery, loader: Callable[[], UserSearchPage]
+    ) -> UserSearchPage:
+        """
+        Возвращает страницу из кэша или загружает ее через loader
+
+        Args:
+            search_query: Нормализованные параметры поиска
+            loader: Функция загрузки страницы из БД
+
+        Returns:
+            UserSearchPage: Страница результатов поиска
+        """
+        key = _cache_key(search_query)
+        found, page = self._cache.get(key)
+        if found:
+            return page
+
+        def load():
+            loaded_page = loader()
+            self._cache.put(key, loaded_page)
+            return loaded_page
+
+        return self._flight.do(key, load)
+
+    async def get_or_load_async(
+        self, search_query: UserSearchQuery, loader: Callable[[], Awaitable[UserSearchPage]]
+    ) -> UserSearchPage:
+        """Асинхронный вариант get_or_load"""
+        key = _cache_key(search_query)
+        found, page = self._cache.get(key)
+        if found:
+            return page
+
+        async def load():
+            loaded_page = await loader()
+            self._cache.put(key, loaded_page)
+            return loaded_page
+
+        return await self._async_flight.do(key, load)
+
+    def stats(self) -> SearchCacheStats:
+        """Возвращает текущие значения счетчиков"""
+        cache_stats = self._cache.stats()
+        return SearchCacheStats(
+            hits=cache_stats.hits,
+            misses=cache_stats.misses,
+            evictions=cache_stats.evictions,
+            size=cache_stats.size,
+            coalesced=self._flight.coalesced + self._async_flight.coalesced,
+        )
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """Выполняющийся вызов, результат которого ждут остальные потоки"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых вызовов (request coalescing) для потоков.
+
+    Если вызов с таким ключом уже выполняется, остальные потоки не выполняют fn,
+    а ждут результат первого вызова (в том числе его исключение).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Выполняет fn или ждет результат уже выполняющегося вызова с тем же ключом
+
+        Args:
+            key: Ключ вызова
+            fn: Функция без аргументов
+
+        Returns:
+            Any: Результат fn
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Объединение одновременных одинаковых вызовов для корутин одного event loop.
+    Аналог SingleFlight для асинхронного режима.
+
+    Загрузка выполняется в отдельной задаче, а не в корутине первого запроса:
+    если клиент первого запроса отключился и его обработчик отменен, остальные
+    ожидающие все равно получают результат.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполняет корутину fn() или ждет результат уже выполняющегося вызова с тем же ключом
+
+        Args:
+            key: Ключ вызова
+            fn: Функция без аргументов, возвращающая awaitable
+
+        Returns:
+            Any: Результат fn
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        # shield: отмена любого ожидающего запроса (в том числе первого) не отменяет общую загрузку
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Помечаем исключение полученным, даже если все ожидающие уже отменены
+        if not task.cancelled():
+            task.exception()
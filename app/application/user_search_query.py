@@ -1,11 +1,44 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+from model.user import UserCard
+
+# Размер страницы по умолчанию и жесткий предел размера страницы поиска
+DEFAULT_SEARCH_LIMIT = 100
+MAX_SEARCH_LIMIT = 1000
 
 
 @dataclass
 class UserSearchQuery:
     """
     Класс для представления параметров поиска пользователей.
-    Содержит критерии поиска по имени и фамилии.
+    Содержит критерии поиска по имени и фамилии и параметры
+    keyset-пагинации: размер страницы и ID последнего пользователя
+    предыдущей страницы.
     """
     first_name: str
     last_name: str
+    limit: int = DEFAULT_SEARCH_LIMIT
+    after: Optional[str] = None
+
+    def normalized(self) -> "UserSearchQuery":
+        """
+        Возвращает запрос с префиксами без пробелов по краям и в нижнем регистре.
+        Поиск регистронезависимый, поэтому результат не меняется,
+        а одинаковые по смыслу запросы получают одинаковый ключ кэша.
+        """
+        return replace(
+            self,
+            first_name=self.first_name.strip().lower(),
+            last_name=self.last_name.strip().lower(),
+        )
+
+
+@dataclass
+class UserSearchPage:
+    """
+    Страница результатов поиска пользователей.
+    next_cursor равен None, если следующей страницы нет.
+    """
+    users: List[UserCard]
+    next_cursor: Optional[str] = None
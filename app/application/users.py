@@ -1,20 +1,136 @@
 import logging
+import os
 import uuid
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from injector import inject, singleton
 
-from application.password_hasher import PasswordHasher
-from application.user_search_query import UserSearchQuery
-from infra.db.repository.users import UserRepository
-from model.user import User
+from application.batch_registration import BatchRegistrationResult, build_batch_users, prepare_batch
+from application.consistency_token import decode_consistency_token, encode_consistency_token
+from application.hashing_executor import HashingExecutor
+from application.profile_cache import ProfileCache
+from application.search_cache import SearchCache
+from application.cursor import encode_cursor
+from application.user_search_query import MAX_SEARCH_LIMIT, UserSearchPage, UserSearchQuery
+from infra.db.repository.users import AsyncUserRepository, IdempotencyKeyExistsError, UserRepository
+from model.user import User, UserCard
 
 logger = logging.getLogger(__name__)
 
+# Максимальное количество ID в одном запросе пачки профилей
+MAX_PROFILE_BATCH_SIZE = int(os.getenv('PROFILE_BATCH_MAX_SIZE', '100'))
+
 
 class UserNotFoundError(Exception):
     """Исключение, возникающее когда пользователь не найден"""
     pass
 
 
+@dataclass
+class UserProfiles:
+    """
+    Результат получения пачки профилей: найденные пользователи в порядке запроса
+    и ID, которых нет
+    """
+    users: List[User]
+    missing: List[str]
+
+
+def _page_limit(search_query: UserSearchQuery) -> int:
+    """Жесткий предел размера страницы, даже если клиент запросил больше"""
+    return max(1, min(search_query.limit, MAX_SEARCH_LIMIT))
+
+
+def _min_lsn(consistency_token: Optional[str]) -> Optional[int]:
+    """
+    Минимальный LSN, который должна применить реплика для чтения по токену согласованности
+
+    Raises:
+        ValueError: Если токен поврежден
+    """
+    return decode_consistency_token(consistency_token) if consistency_token else None
+
+
+def _registration_result(user_id: uuid.UUID, lsn: Optional[str]) -> dict:
+    return {
+        "user_id": user_id,
+        "consistency_token": encode_consistency_token(lsn) if lsn else None,
+    }
+
+
+def _parse_profile_ids(user_ids: List[str]) -> List[uuid.UUID]:
+    """
+    Разбирает ID пачки профилей, повторяющиеся ID остаются в одном экземпляре
+
+    Raises:
+        ValueError: Если ID невалиден, пачка пуста или больше MAX_PROFILE_BATCH_SIZE
+    """
+    if not user_ids:
+        raise ValueError("Пачка не содержит ID")
+    if len(user_ids) > MAX_PROFILE_BATCH_SIZE:
+        raise ValueError(f"Пачка содержит {len(user_ids)} ID, допускается не больше {MAX_PROFILE_BATCH_SIZE}")
+    return list(dict.fromkeys(uuid.UUID(user_id) for user_id in user_ids))
+
+
+def _split_cached_profiles(
+    user_uuids: List[uuid.UUID], lookups: List[Tuple[bool, Optional[User]]], min_lsn: Optional[int]
+) -> Tuple[Dict[uuid.UUID, Optional[User]], List[uuid.UUID]]:
+    """
+    Разделяет пачку по результатам поиска в кэше
+
+    Returns:
+        Tuple[Dict[uuid.UUID, Optional[User]], List[uuid.UUID]]: Профили из кэша
+        (None - закэшированное отсутствие) и ID, которые нужно прочитать из БД
+    """
+    cached, to_load = {}, []
+    for user_uuid, (found, user) in zip(user_uuids, lookups):
+        # Закэшированное отсутствие могло быть получено до записи клиента
+        if not found or (user is None and min_lsn is not None):
+            to_load.append(user_uuid)
+        else:
+            cached[user_uuid] = user
+    return cached, to_load
+
+
+def _merge_loaded_profiles(
+    profiles: Dict[uuid.UUID, Optional[User]], to_load: List[uuid.UUID], users: List[User]
+) -> Dict[uuid.UUID, Optional[User]]:
+    """
+    Добавляет прочитанные из БД профили к найденным в кэше
+
+    Returns:
+        Dict[uuid.UUID, Optional[User]]: Прочитанные профили для сохранения в кэш
+    """
+    # ID из БД сравниваются как строки: asyncpg возвращает собственный тип UUID
+    by_id = {str(user.id): user for user in users}
+    loaded = {user_uuid: by_id.get(str(user_uuid)) for user_uuid in to_load}
+    profiles.update(loaded)
+    return loaded
+
+
+def _build_user_profiles(user_uuids: List[uuid.UUID], profiles: Dict[uuid.UUID, Optional[User]]) -> UserProfiles:
+    result = UserProfiles(users=[], missing=[])
+    for user_uuid in user_uuids:
+        user = profiles.get(user_uuid)
+        if user is None:
+            result.missing.append(str(user_uuid))
+        else:
+            result.users.append(user)
+    return result
+
+
+def _build_search_page(users: List[UserCard], limit: int) -> UserSearchPage:
+    """
+    Формирует страницу поиска из результата, запрошенного с limit + 1 записями:
+    лишняя запись означает, что есть следующая страница.
+    """
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(users[-1].id)
+    return UserSearchPage(users=users, next_cursor=next_cursor)
+
+
 @singleton
 class UserService:
     """
@@ -23,74 +139,330 @@ class UserService:
     """
 
     @inject
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        hashing_executor: HashingExecutor,
+        profile_cache: ProfileCache,
+        search_cache: SearchCache,
+    ):
         logger.info("UserService initialized")
         self.user_repository = user_repository
+        self.hashing_executor = hashing_executor
+        self.profile_cache = profile_cache
+        self.search_cache = search_cache
 
-    def register_user(self, user_data):
+    def register_user(self, user_data, idempotency_key: Optional[str] = None):
         """
         Регистрация нового пользователя.
 
         Args:
             user_data (dict): Данные пользователя для регистрации
+            idempotency_key (Optional[str]): Ключ идемпотентности. Повторный запрос
+                с тем же ключом возвращает ранее зарегистрированного пользователя
 
         Returns:
-            dict: Результат регистрации с user_id или ошибкой
+            dict: Результат регистрации с user_id и токеном согласованности consistency_token.
+                Токен передается в последующих запросах чтения, чтобы они не ушли
+                на реплику, которая еще не получила новую запись
         """
         logger.info("Обработка запроса на регистрацию пользователя")
 
+        if idempotency_key:
+            # Повтор уже выполненного запроса: пароль не хэшируем, пользователя не создаем
+            registration = self.user_repository.find_registration(idempotency_key)
+            if registration is not None:
+                logger.info("Повтор регистрации по ключу идемпотентности, user_id: %s", registration[0])
+                return _registration_result(*registration)
+
         # Хэшируем пароль только если ключ "password" присутствует
         if "password" in user_data:
             logger.info("Хэшируем пароль")
-            hashed_password = PasswordHasher.hash(user_data["password"])
+            hashed_password = self.hashing_executor.hash(user_data["password"])
             user_data["password"] = hashed_password
         else:
             logger.warning("Пароль не присутствует в данных пользователя")
         user = User.create_for_registration(**user_data)
-        self.user_repository.insert_user(user)
+        try:
+            lsn = self.user_repository.insert_user(user, idempotency_key=idempotency_key or None)
+        except IdempotencyKeyExistsError as e:
+            # Параллельный запрос с тем же ключом успел зарегистрировать пользователя раньше
+            logger.info("Регистрация с этим ключом идемпотентности уже выполнена, user_id: %s", e.user_id)
+            return _registration_result(e.user_id, e.lsn)
+        # Новый профиль сразу кладем в кэш: следующий запрос профиля обычно идет сразу после регистрации
+        self.profile_cache.store(user.id, user)
+
+        logger.info("Регистрация пользователя успешно обработана, user_id: %s", user.id)
+        return _registration_result(user.id, lsn)
+
+    def register_users_batch(self, items: List[Any]) -> BatchRegistrationResult:
+        """
+        Пакетная регистрация пользователей.
+        Пароли хэшируются параллельно в пуле процессов, пользователи сохраняются
+        одной командой COPY в одной транзакции. Невалидные анкеты не регистрируются
+        и не мешают регистрации остальных.
 
-        logger.info(f"Регистрация пользователя успешно обработана, user_id: {user.id}")
-        return {"user_id": user.id}
+        Args:
+            items (List[Any]): Анкеты пользователей
+
+        Returns:
+            BatchRegistrationResult: ID или ошибка для каждой анкеты и токен согласованности
+
+        Raises:
+            ValueError: Если пакет пуст или слишком большой
+        """
+        result, valid = prepare_batch(items)
+        logger.info("Пакетная регистрация: %s анкет, валидных %s", len(items), len(valid))
+
+        hashes = self.hashing_executor.hash_many([data["password"] for _, data in valid])
+        users = build_batch_users(result, valid, hashes)
+        if users:
+            # Профили пакета в кэш не кладем: их редко читают сразу, а вытеснять горячие записи незачем
+            lsn = self.user_repository.insert_users(users)
+            result.consistency_token = encode_consistency_token(lsn) if lsn else None
 
-    def get_user_profile(self, user_id: str):
+        logger.info("Пакетная регистрация завершена, зарегистрировано %s пользователей", len(users))
+        return result
+
+    def get_user_profile(self, user_id: str, consistency_token: Optional[str] = None):
         """
         Получение профиля пользователя по ID.
 
         Args:
             user_id (str): ID пользователя
+            consistency_token (Optional[str]): Токен согласованности, полученный при записи
 
         Returns:
             User: Экземпляр пользователя
 
         Raises:
-            ValueError: Если user_id не является валидным UUID
+            ValueError: Если user_id или токен невалидны
             UserNotFoundError: Если пользователь не найден
         """
-        logger.info(f"Обработка запроса на получение профиля пользователя: {user_id}")
+        logger.info("Обработка запроса на получение профиля пользователя: %s", user_id)
         
         user_uuid = uuid.UUID(user_id)
-        user = self.user_repository.get_user(user_uuid)
+        min_lsn = _min_lsn(consistency_token)
+        found, user = self.profile_cache.lookup(user_uuid)
+        # Закэшированное отсутствие могло быть получено до записи клиента
+        if not found or (user is None and min_lsn is not None):
+            user = self.user_repository.get_user(user_uuid, min_lsn=min_lsn)
+            self.profile_cache.store(user_uuid, user)
         
         if user is None:
-            logger.warning(f"Пользователь с ID {user_id} не найден")
+            logger.warning("Пользователь с ID %s не найден", user_id)
             raise UserNotFoundError(f"Пользователь с ID {user_id} не найден")
         
         logger.info("Профиль пользователя успешно получен")
         return user
 
-    def search_users(self, search_query: UserSearchQuery):
+    def get_user_profiles(self, user_ids: List[str], consistency_token: Optional[str] = None) -> UserProfiles:
+        """
+        Получение профилей нескольких пользователей.
+        Профили ищутся в кэше, остальные читаются из БД одним запросом.
+
+        Args:
+            user_ids (List[str]): ID пользователей, не больше MAX_PROFILE_BATCH_SIZE
+            consistency_token (Optional[str]): Токен согласованности, полученный при записи
+
+        Returns:
+            UserProfiles: Найденные пользователи в порядке запроса и отсутствующие ID
+
+        Raises:
+            ValueError: Если ID или токен невалидны или пачка слишком большая
+        """
+        logger.info("Обработка запроса на получение %s профилей", len(user_ids))
+
+        user_uuids = _parse_profile_ids(user_ids)
+        min_lsn = _min_lsn(consistency_token)
+        lookups = [self.profile_cache.lookup(user_uuid) for user_uuid in user_uuids]
+        profiles, to_load = _split_cached_profiles(user_uuids, lookups, min_lsn)
+        if to_load:
+            users = self.user_repository.get_users(to_load, min_lsn=min_lsn)
+            for user_uuid, user in _merge_loaded_profiles(profiles, to_load, users).items():
+                self.profile_cache.store(user_uuid, user)
+
+        result = _build_user_profiles(user_uuids, profiles)
+        logger.info("Найдено %s профилей, из кэша %s", len(result.users), len(user_uuids) - len(to_load))
+        return result
+
+    def search_users(
+        self, search_query: UserSearchQuery, consistency_token: Optional[str] = None
+    ) -> UserSearchPage:
+        """
+        Поиск пользователей по критериям с keyset-пагинацией по ID.
+
+        Args:
+            search_query (UserSearchQuery): Критерии поиска и параметры страницы
+            consistency_token (Optional[str]): Токен согласованности, полученный при записи
+
+        Returns:
+            UserSearchPage: Найденные пользователи и курсор следующей страницы
+        """
+        logger.info("Обработка запроса на поиск пользователей: %s", search_query)
+        
+        min_lsn = _min_lsn(consistency_token)
+        search_query = replace(search_query.normalized(), limit=_page_limit(search_query))
+        
+        def load_page():
+            # Запрашиваем на одну запись больше, чтобы понять, есть ли следующая страница
+            users = self.user_repository.search_users(
+                replace(search_query, limit=search_query.limit + 1), min_lsn=min_lsn
+            )
+            return _build_search_page(users, search_query.limit)
+        
+        if min_lsn is not None:
+            # Страница в кэше могла быть загружена до записи клиента
+            page = load_page()
+        else:
+            # Одинаковые запросы обслуживаются из кэша, одновременные промахи объединяются
+            page = self.search_cache.get_or_load(search_query, load_page)
+        
+        logger.info("Найдено %s пользователей", len(page.users))
+        return page
+
+    def stream_search_users(
+        self, search_query: UserSearchQuery, consistency_token: Optional[str] = None
+    ) -> Iterator[UserCard]:
         """
-        Поиск пользователей по критериям.
+        Потоковый поиск пользователей по критериям без ограничения размера выдачи.
+        Предназначен для клиентов, которым нужен полный результат: пользователи
+        читаются из БД пачками и отдаются по одному, не накапливаясь в памяти.
 
         Args:
-            search_query (UserSearchQuery): Критерии поиска
+            search_query (UserSearchQuery): Критерии поиска (limit не применяется)
+            consistency_token (Optional[str]): Токен согласованности, полученный при записи
 
         Returns:
-            List[User]: Список найденных пользователей
+            Iterator[UserCard]: Ленивый итератор анкет найденных пользователей
         """
-        logger.info(f"Обработка запроса на поиск пользователей: {search_query}")
+        logger.info("Обработка запроса на потоковый поиск пользователей: %s", search_query)
+        return self.user_repository.iter_search_users(search_query, min_lsn=_min_lsn(consistency_token))
+
+
+@singleton
+class AsyncUserService:
+    """
+    Асинхронный вариант UserService для асинхронного режима приложения.
+    Обращения к БД выполняются через AsyncUserRepository, а хэширование
+    пароля bcrypt - в пуле процессов HashingExecutor, чтобы не блокировать event loop.
+    """
+
+    @inject
+    def __init__(
+        self,
+        user_repository: AsyncUserRepository,
+        hashing_executor: HashingExecutor,
+        profile_cache: ProfileCache,
+        search_cache: SearchCache,
+    ):
+        logger.info("AsyncUserService initialized")
+        self.user_repository = user_repository
+        self.hashing_executor = hashing_executor
+        self.profile_cache = profile_cache
+        self.search_cache = search_cache
+
+    async def register_user(self, user_data, idempotency_key: Optional[str] = None):
+        """Асинхронный аналог UserService.register_user"""
+        logger.info("Обработка запроса на регистрацию пользователя")
+
+        if idempotency_key:
+            registration = await self.user_repository.find_registration(idempotency_key)
+            if registration is not None:
+                logger.info("Повтор регистрации по ключу идемпотентности, user_id: %s", registration[0])
+                return _registration_result(*registration)
+
+        # Хэшируем пароль только если ключ "password" присутствует
+        if "password" in user_data:
+            logger.info("Хэшируем пароль")
+            user_data["password"] = await self.hashing_executor.hash_async(user_data["password"])
+        else:
+            logger.warning("Пароль не присутствует в данных пользователя")
+        user = User.create_for_registration(**user_data)
+        try:
+            lsn = await self.user_repository.insert_user(user, idempotency_key=idempotency_key or None)
+        except IdempotencyKeyExistsError as e:
+            logger.info("Регистрация с этим ключом идемпотентности уже выполнена, user_id: %s", e.user_id)
+            return _registration_result(e.user_id, e.lsn)
+        await self.profile_cache.store_async(user.id, user)
+
+        logger.info("Регистрация пользователя успешно обработана, user_id: %s", user.id)
+        return _registration_result(user.id, lsn)
+
+    async def register_users_batch(self, items: List[Any]) -> BatchRegistrationResult:
+        """Асинхронный аналог UserService.register_users_batch"""
+        result, valid = prepare_batch(items)
+        logger.info("Пакетная регистрация: %s анкет, валидных %s", len(items), len(valid))
+
+        hashes = await self.hashing_executor.hash_many_async([data["password"] for _, data in valid])
+        users = build_batch_users(result, valid, hashes)
+        if users:
+            lsn = await self.user_repository.insert_users(users)
+            result.consistency_token = encode_consistency_token(lsn) if lsn else None
+
+        logger.info("Пакетная регистрация завершена, зарегистрировано %s пользователей", len(users))
+        return result
+
+    async def get_user_profile(self, user_id: str, consistency_token: Optional[str] = None):
+        """Асинхронный аналог UserService.get_user_profile"""
+        logger.info("Обработка запроса на получение профиля пользователя: %s", user_id)
+        
+        user_uuid = uuid.UUID(user_id)
+        min_lsn = _min_lsn(consistency_token)
+        found, user = await self.profile_cache.lookup_async(user_uuid)
+        if not found or (user is None and min_lsn is not None):
+            user = await self.user_repository.get_user(user_uuid, min_lsn=min_lsn)
+            await self.profile_cache.store_async(user_uuid, user)
         
-        users = self.user_repository.search_users(search_query)
+        if user is None:
+            logger.warning("Пользователь с ID %s не найден", user_id)
+            raise UserNotFoundError(f"Пользователь с ID {user_id} не найден")
+        
+        logger.info("Профиль пользователя успешно получен")
+        return user
+
+    async def get_user_profiles(self, user_ids: List[str], consistency_token: Optional[str] = None) -> UserProfiles:
+        """Асинхронный аналог UserService.get_user_profiles"""
+        logger.info("Обработка запроса на получение %s профилей", len(user_ids))
+
+        user_uuids = _parse_profile_ids(user_ids)
+        min_lsn = _min_lsn(consistency_token)
+        lookups = await self.profile_cache.lookup_many_async(user_uuids)
+        profiles, to_load = _split_cached_profiles(user_uuids, lookups, min_lsn)
+        if to_load:
+            users = await self.user_repository.get_users(to_load, min_lsn=min_lsn)
+            await self.profile_cache.store_many_async(_merge_loaded_profiles(profiles, to_load, users))
+
+        result = _build_user_profiles(user_uuids, profiles)
+        logger.info("Найдено %s профилей, из кэша %s", len(result.users), len(user_uuids) - len(to_load))
+        return result
+
+    async def search_users(
+        self, search_query: UserSearchQuery, consistency_token: Optional[str] = None
+    ) -> UserSearchPage:
+        """Асинхронный аналог UserService.search_users"""
+        logger.info("Обработка запроса на поиск пользователей: %s", search_query)
+        
+        min_lsn = _min_lsn(consistency_token)
+        search_query = replace(search_query.normalized(), limit=_page_limit(search_query))
+        
+        async def load_page():
+            users = await self.user_repository.search_users(
+                replace(search_query, limit=search_query.limit + 1), min_lsn=min_lsn
+            )
+            return _build_search_page(users, search_query.limit)
         
-        logger.info(f"Найдено {len(users)} пользователей")
-        return users
\ No newline at end of file
+        if min_lsn is not None:
+            page = await load_page()
+        else:
+            page = await self.search_cache.get_or_load_async(search_query, load_page)
+        
+        logger.info("Найдено %s пользователей", len(page.users))
+        return page
+
+    def stream_search_users(
+        self, search_query: UserSearchQuery, consistency_token: Optional[str] = None
+    ) -> AsyncIterator[UserCard]:
+        """Асинхронный аналог UserService.stream_search_users"""
+        logger.info("Обработка запроса на потоковый поиск пользователей: %s", search_query)
+        return self.user_repository.iter_search_users(search_query, min_lsn=_min_lsn(consistency_token))
@@ -0,0 +1,4 @@
+"""
+Микробенчмарки горячих путей приложения. Запускаются вручную, например:
+    python -m benchmarks.prepared_statements --help
+"""
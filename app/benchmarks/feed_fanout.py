@@ -0,0 +1,156 @@
+"""
+Бенчмарк fan-out ленты на графе с перекосом подписчиков: чистый fan-out на запись
+против гибридной схемы, где посты знаменитостей сливаются с лентой при чтении.
+
+База не нужна, граф и посты моделируются в памяти:
+    python -m benchmarks.feed_fanout --users 20000 --threshold 1000
+
+Пользователи - сочетания имен и фамилий из first-names.csv и last-names.csv
+нагрузочных тестов. Каждый подписывается на --follows пользователей, выбранных
+с весом 1 / rank^skew (закон Ципфа), поэтому у нескольких пользователей
+подписчиков на порядки больше, чем у остальных. Затем публикуется --posts постов
+случайных авторов и читается --reads страниц лент.
+
+Для каждой схемы выводится:
+    - вставок в ленты всего и на самый дорогой пост: пока fan-out раскладывает
+      такой пост, очередь за ним стоит;
+    - время раскладки всей очереди;
+    - время чтения страницы (материализованная лента + k-way слияние с постами
+      друзей-знаменитостей, как в merge_feed) и число источников слияния.
+Страницы обеих схем сравниваются: гибридная схема должна выдавать ту же ленту.
+"""
+import argparse
+import random
+import statistics
+import time
+from collections import deque
+from itertools import accumulate, islice
+from pathlib import Path
+
+from infra.feed import FEED_MAX_SIZE, merge_feed
+from model.ids import UUIDv7Generator
+from model.post import Post
+
+LOAD_TESTS_DIR = Path(__file__).resolve().parents[2] / 'load-tests' / 'hw-09'
+
+
+def _read_names(path):
+    with open(path, encoding='utf-8') as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def _make_users(first_names_path, last_names_path, count, rng):
+    names = [f"{first} {last}" for first in _read_names(first_names_path) for last in _read_names(last_names_path)]
+    if count > len(names):
+        raise SystemExit(f"Сочетаний имен и фамилий только {len(names)}, уменьшите --users")
+    return rng.sample(names, count)
+
+
+def _make_graph(users, follows, skew, rng):
+    """
+    Returns:
+        (friends, followers): на кого подписан пользователь и кто подписан на автора
+    """
+    # Популярность не связана с порядком имен: ранги раздаются случайной перестановкой
+    ranked = rng.sample(range(len(users)), len(users))
+    cum_weights = list(accumulate(1 / (rank + 1) ** skew for rank in range(len(users))))
+    friends = []
+    followers = [[] for _ in users]
+    for user in range(len(users)):
+        chosen = {ranked[i] for i in rng.choices(range(len(users)), cum_weights=cum_weights, k=follows)}
+        chosen.discard(user)
+        friends.append(chosen)
+        for author in chosen:
+            followers[author].append(user)
+    return friends, followers
+
+
+def _make_posts(users, count, rng):
+    clock = iter(range(1_700_000_000_000, 1_700_000_000_000 + count))
+    generator = UUIDv7Generator(clock=lambda: next(clock) * 1_000_000)
+    return [Post(str(generator()), "", rng.randrange(len(users))) for _ in range(count)]
+
+
+def _fanout(posts, followers, celebrities, users_count):
+    """Раскладывает посты по лентам; посты знаменитостей остаются только у автора"""
+    feeds = [deque(maxlen=FEED_MAX_SIZE) for _ in range(users_count)]
+    authored = [[] for _ in range(users_count)]
+    inserts, per_post = 0, []
+    started_at = time.perf_counter()
+    for post in posts:
+        author = post.author_user_id
+        authored[author].append(post)
+        if author in celebrities:
+            per_post.append(0)
+            continue
+        for follower in followers[author]:
+            feeds[follower].appendleft(post)
+        inserts += len(followers[author])
+        per_post.append(len(followers[author]))
+    return feeds, authored, inserts, max(per_post), time.perf_counter() - started_at
+
+
+def _read_page(reader, feeds, authored, friends, celebrities, limit):
+    materialized = list(islice(feeds[reader], limit))
+    celebrity_posts = [
+        post
+        for author in sorted(friends[reader] & celebrities)
+        for post in reversed(authored[author][-limit:])
+    ]
+    return merge_feed(materialized, celebrity_posts, limit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20000, help='количество пользователей')
+    parser.add_argument('--follows', type=int, default=50, help='подписок на пользователя')
+    parser.add_argument('--skew', type=float, default=1.0, help='показатель закона Ципфа для популярности')
+    parser.add_argument('--posts', type=int, default=20000, help='количество постов')
+    parser.add_argument('--reads', type=int, default=2000, help='количество прочитанных страниц ленты')
+    parser.add_argument('--limit', type=int, default=10, help='размер страницы ленты')
+    parser.add_argument('--threshold', type=int, default=1000, help='подписчиков, после которых автор - знаменитость')
+    parser.add_argument('--first-names', default=LOAD_TESTS_DIR / 'first-names.csv', help='файл имен')
+    parser.add_argument('--last-names', default=LOAD_TESTS_DIR / 'last-names.csv', help='файл фамилий')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    users = _make_users(args.first_names, args.last_names, args.users, rng)
+    friends, followers = _make_graph(users, args.follows, args.skew, rng)
+    posts = _make_posts(users, args.posts, rng)
+    readers = rng.sample(range(len(users)), min(args.reads, len(users)))
+
+    counts = sorted((len(f) for f in followers), reverse=True)
+    celebrities = {author for author, f in enumerate(followers) if len(f) > args.threshold}
+    print(
+        f"{len(users)} пользователей, {sum(counts)} подписок, подписчиков: медиана {statistics.median(counts):.0f}, "
+        f"максимум {counts[0]}; знаменитостей (> {args.threshold}): {len(celebrities)}"
+    )
+    top = sorted(range(len(users)), key=lambda author: len(followers[author]), reverse=True)[:3]
+    print("Самые популярные: " + ", ".join(f"{users[author]} ({len(followers[author])})" for author in top))
+    print(f"{len(posts)} постов, {len(readers)} чтений страниц по {args.limit} постов")
+
+    pages = {}
+    for name, schema_celebrities in (('fan-out на запись', set()), ('гибридная схема', celebrities)):
+        feeds, authored, inserts, max_inserts, fanout_seconds = _fanout(posts, followers, schema_celebrities, len(users))
+        durations, sources = [], []
+        pages[name] = []
+        for reader in readers:
+            started_at = time.perf_counter()
+            page = _read_page(reader, feeds, authored, friends, schema_celebrities, args.limit)
+            durations.append((time.perf_counter() - started_at) * 1_000_000)
+            sources.append(1 + len(friends[reader] & schema_celebrities))
+            pages[name].append([post.id for post in page])
+        durations.sort()
+        print(
+            f"{name:<18} вставок {inserts:>9}   на пост макс. {max_inserts:>6}   fan-out {fanout_seconds:6.2f} s   "
+            f"чтение mean {statistics.mean(durations):7.1f} us   p99 {durations[int(len(durations) * 0.99)]:7.1f} us   "
+            f"источников {statistics.mean(sources):5.2f}"
+        )
+
+    # Ленты обеих схем совпадают, пока страница короче материализованной ленты
+    assert pages['fan-out на запись'] == pages['гибридная схема']
+
+
+if __name__ == '__main__':
+    main()
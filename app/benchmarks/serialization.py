@@ -0,0 +1,100 @@
+"""
+Бенчмарк сериализации страницы поиска: объекты User + json.dumps против UserCard + orjson.
+
+База не нужна, строки результата генерируются в памяти:
+    python -m benchmarks.serialization --rows 10000
+
+Сравниваются пути от строки результата запроса до байтов тела ответа:
+    - прежний: строка -> User (разбор UUID) -> dict (str, isoformat) -> json.dumps -> encode;
+    - текущий: строка (id и дата уже текстом из SQL) -> UserCard -> dump_user_cards.
+Кроме времени выводится пиковый объем памяти (tracemalloc) на одну сериализацию.
+"""
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+
+from infra.rest.serialization import dump_user_cards
+from model.user import User, UserCard
+
+
+def _make_rows(count):
+    """Строки в том виде, в котором их возвращает драйвер для каждого из путей"""
+    typed, textual = [], []
+    for i in range(count):
+        user_id = str(uuid.uuid4())
+        birthdate = date(1970, 1, 1) + timedelta(days=i % 15000)
+        fields = (f"Имя{i}", f"Фамилия{i}")
+        tail = ("Биография " * 5, "Москва")
+        typed.append((user_id, *fields, birthdate, *tail))
+        textual.append((user_id, *fields, birthdate.isoformat(), *tail))
+    return typed, textual
+
+
+def _old_path(rows):
+    users = [
+        User(
+            user_id=uuid.UUID(row[0]),
+            first_name=row[1],
+            second_name=row[2],
+            birthdate=row[3],
+            biography=row[4],
+            city=row[5],
+            password=None,
+        )
+        for row in rows
+    ]
+    return json.dumps([
+        {
+            "id": str(user.id),
+            "first_name": user.first_name,
+            "second_name": user.second_name,
+            "birthdate": user.birthdate.isoformat() if user.birthdate else None,
+            "biography": user.biography,
+            "city": user.city,
+        }
+        for user in users
+    ], ensure_ascii=False).encode()
+
+
+def _new_path(rows):
+    return dump_user_cards([UserCard._make(row) for row in rows])
+
+
+def _measure(path, rows, iterations):
+    durations = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        path(rows)
+        durations.append((time.perf_counter() - started_at) * 1000)
+    tracemalloc.start()
+    path(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return durations, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help='количество анкет на странице')
+    parser.add_argument('--iterations', type=int, default=50, help='количество сериализаций в каждом режиме')
+    args = parser.parse_args()
+
+    typed, textual = _make_rows(args.rows)
+    # Оба пути должны давать одинаковый JSON
+    assert json.loads(_old_path(typed)) == json.loads(_new_path(textual))
+
+    print(f"Сериализация {args.rows} анкет, {args.iterations} повторов")
+    for name, path, rows in (('User + json.dumps', _old_path, typed), ('UserCard + orjson', _new_path, textual)):
+        durations, peak = _measure(path, rows, args.iterations)
+        print(
+            f"{name:<20} mean {statistics.mean(durations):8.2f} ms   "
+            f"median {statistics.median(durations):8.2f} ms   peak {peak / 1024 / 1024:6.2f} MiB"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Подготовленные на сервере запросы (PREPARE/EXECUTE)
+"""
+import os
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+
+from infra.metrics import DB_STATEMENT_EXECUTIONS, DB_STATEMENT_PREPARES
+
+# Подготовленные запросы живут в сессии PostgreSQL. Через PgBouncer в режиме
+# transaction/statement сессия не закреплена за клиентом, поэтому там их нужно отключить
+PREPARED_STATEMENTS_ENABLED = os.getenv('DB_PREPARED_STATEMENTS', 'true').lower() not in ('0', 'false', 'no')
+
+# Ключ в Connection.info: словарь живет столько же, сколько DBAPI соединение в пуле,
+# и очищается, когда соединение инвалидируется и заменяется новым
+PREPARED_INFO_KEY = 'prepared_statements'
+
+# Для подготовленного запроса PostgreSQL после пяти выполнений может перейти на общий план,
+# построенный без значений параметров. Для LIKE с префиксом в параметре такой план не может
+# превратить префикс в диапазон индекса, поэтому запросам поиска нужен план под каждое значение.
+# SET LOCAL действует до конца текущей транзакции
+FORCE_CUSTOM_PLAN_QUERY = text("SET LOCAL plan_cache_mode = force_custom_plan")
+
+# Именованный параметр SQLAlchemy (:name), но не приведение типа (::text)
+_BIND_PARAMETER = re.compile(r'(?<![:\w]):(\w+)')
+
+
+def to_positional(sql: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Заменяет именованные параметры (:name) на позиционные ($1, $2, ...) для PREPARE
+
+    Args:
+        sql: SQL с именованными параметрами
+
+    Returns:
+        Tuple[str, Tuple[str, ...]]: SQL с позиционными параметрами и имена параметров по позициям
+    """
+    names = []
+
+    def replace(match):
+        name = match.group(1)
+        if name not in names:
+            names.append(name)
+        return f'${names.index(name) + 1}'
+
+    return _BIND_PARAMETER.sub(replace, sql), tuple(names)
+
+
+class PreparedStatement:
+    """
+    Запрос, который подготавливается на сервере один раз для каждого соединения пула.
+
+    При первом выполнении в соединении выполняется PREPARE, дальше - EXECUTE:
+    PostgreSQL не разбирает SQL заново, а после нескольких выполнений может
+    переиспользовать общий план. Текст запроса и объекты text() строятся один раз
+    при импорте модуля.
+
+    asyncpg сам подготавливает запросы и кэширует их в соединении
+    (prepared_statement_cache_size диалекта), поэтому асинхронный вариант
+    выполняет обычный запрос и только считает выполнения.
+
+    Запросы, план которых зависит от значений параметров (например, LIKE по префиксу),
+    создаются с custom_plan=True: перед выполнением в транзакции включается
+    plan_cache_mode = force_custom_plan, и сервер не переходит на общий план.
+    """
+
+    def __init__(self, name: str, sql: str, custom_plan: bool = False):
+        self.name = name
+        self.custom_plan = custom_plan
+        self.query = text(sql)
+        positional_sql, self.parameters = to_positional(sql)
+        self._prepare_query = text(f"PREPARE {name} AS {positional_sql}")
+        arguments = ', '.join(f':{parameter}' for parameter in self.parameters)
+        self._execute_query = text(f"EXECUTE {name}({arguments})" if arguments else f"EXECUTE {name}")
+        self._executions = DB_STATEMENT_EXECUTIONS.labels(statement=name)
+        self._prepares = DB_STATEMENT_PREPARES.labels(statement=name)
+
+    def execute(self, connection, params: Optional[dict] = None):
+        """
+        Выполняет запрос в синхронном соединении
+
+        Args:
+            connection: Connection SQLAlchemy
+            params: Значения именованных параметров
+
+        Returns:
+            Результат выполнения (CursorResult)
+        """
+        self._executions.inc()
+        if not PREPARED_STATEMENTS_ENABLED:
+            return connection.execute(self.query, params)
+        if self.custom_plan:
+            connection.execute(FORCE_CUSTOM_PLAN_QUERY)
+        prepared = connection.info.setdefault(PREPARED_INFO_KEY, set())
+        if self.name not in prepared:
+            # PREPARE не отменяется откатом транзакции и действует до конца сессии
+            connection.execute(self._prepare_query)
+            prepared.add(self.name)
+            self._prepares.inc()
+        return connection.execute(self._execute_query, params)
+
+    async def execute_async(self, connection, params: Optional[dict] = None):
+        """Выполняет запрос в асинхронном соединении (подготовку выполняет asyncpg)"""
+        self._executions.inc()
+        if self.custom_plan:
+            await connection.execute(FORCE_CUSTOM_PLAN_QUERY)
+        return await connection.execute(self.query, params)
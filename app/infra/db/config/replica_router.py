@@ -0,0 +1,340 @@
+"""
+Маршрутизация чтения по репликам с учетом отставания репликации
+"""
+import logging
+import os
+import random
+import re
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Позиция в WAL, до которой данные видны на сервере: на реплике - примененный WAL,
+# на мастере (если его указали среди реплик) - текущая позиция записи
+_VISIBLE_LSN_EXPRESSION = """
+    (CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() ELSE pg_current_wal_lsn() END)::text
+"""
+
+# Отставание реплики в секундах и примененный LSN. Если все полученные WAL уже применены,
+# отставания нет, даже если на мастере давно не было транзакций. Но если WAL receiver
+# не подключен к мастеру (строки в pg_stat_wal_receiver нет), реплика применила все полученное
+# и дальше не двигается: такая реплика отстает на неизвестное время, и отставание равно NULL
+REPLICATION_LAG_QUERY = text(f"""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver) OR pg_last_wal_receive_lsn() IS NULL THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END, {_VISIBLE_LSN_EXPRESSION}
+""")
+
+REPLAY_LSN_QUERY = text(f"SELECT {_VISIBLE_LSN_EXPRESSION}")
+
+# Позиция в WAL PostgreSQL в текстовом виде: две шестнадцатеричные половины через "/"
+_LSN_PATTERN = re.compile(r'^([0-9A-Fa-f]{1,8})/([0-9A-Fa-f]{1,8})$')
+
+
+def lsn_to_int(lsn: str) -> int:
+    """
+    Преобразует LSN из текстового вида PostgreSQL (например, 0/16B3748) в число,
+    чтобы позиции в WAL можно было сравнивать
+
+    Args:
+        lsn: LSN в текстовом виде
+
+    Returns:
+        int: LSN в виде 64-битного числа
+
+    Raises:
+        ValueError: Если строка не является LSN
+    """
+    match = _LSN_PATTERN.match(lsn)
+    if not match:
+        raise ValueError(f"Невалидный LSN: {lsn}")
+    return (int(match.group(1), 16) << 32) | int(match.group(2), 16)
+
+
+def parse_replica_urls(value: Optional[str]) -> List[str]:
+    """
+    Разбирает список URL реплик из переменной среды READ_REPLICA_URLS.
+    URL разделяются точкой с запятой, так как запятые встречаются внутри URL.
+    """
+    if not value:
+        return []
+    return [url.strip() for url in value.split(';') if url.strip()]
+
+
+class ReplicaDisconnectedError(Exception):
+    """Исключение, возникающее когда реплика доступна, но не подключена к мастеру"""
+    pass
+
+
+@dataclass
+class Replica:
+    """Реплика и ее последнее известное состояние"""
+    name: str
+    url: str
+    engine: Engine
+    lag_seconds: Optional[float] = None
+    replay_lsn: Optional[int] = None
+    healthy: bool = False
+    last_error: Optional[str] = None
+
+
+class ReplicaMonitor:
+    """
+    Периодически проверяет доступность реплик и их отставание
+    через pg_last_xact_replay_timestamp() и выбирает реплику для чтения.
+
+    Реплика исключается из выбора, если проверка завершилась ошибкой, реплика
+    не получает WAL от мастера или отставание больше max_lag_seconds. Проверки выполняются
+    в фоновом потоке, который запускается при первом выборе реплики (уже после fork-а worker-а).
+    Выбор не ждет первой проверки: пока она не завершилась, подходящих реплик нет
+    и чтение идет на мастер, а event loop асинхронного режима не блокируется подключениями.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        max_lag_seconds: float,
+        probe_interval: float,
+    ):
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self._started = False
+        self._stopped = threading.Event()
+
+    @classmethod
+    def from_env(cls, urls: List[str]) -> "ReplicaMonitor":
+        """
+        Создает монитор по списку URL реплик и настройкам из переменных среды:
+            REPLICA_MAX_LAG_SECONDS - допустимое отставание реплики (по умолчанию 5)
+            REPLICA_PROBE_INTERVAL - период проверки реплик в секундах (по умолчанию 1)
+            REPLICA_PROBE_TIMEOUT - таймаут подключения при проверке в секундах (по умолчанию 2)
+        """
+        probe_timeout = int(os.getenv('REPLICA_PROBE_TIMEOUT', '2'))
+        replicas = [
+            Replica(
+                name=f"replica-{i + 1}",
+                url=url,
+                engine=create_engine(url, pool_pre_ping=True, connect_args={'connect_timeout': probe_timeout}),
+            )
+            for i, url in enumerate(urls)
+        ]
+        return cls(
+            replicas=replicas,
+            max_lag_seconds=float(os.getenv('REPLICA_MAX_LAG_SECONDS', '5')),
+            probe_interval=float(os.getenv('REPLICA_PROBE_INTERVAL', '1')),
+        )
+
+    def choose(self, min_lsn: Optional[int] = None) -> Optional[int]:
+        """
+        Выбирает случайную подходящую реплику
+
+        Args:
+            min_lsn: Минимальный LSN, который должна применить реплика. Предпочтение
+                отдается репликам, которые по последней проверке его уже применили;
+                если таких нет, возвращается любая подходящая реплика для проверки на месте
+
+        Returns:
+            Optional[int]: Индекс реплики или None, если подходящих реплик нет
+        """
+        self._ensure_started()
+        eligible = [i for i, replica in enumerate(self.replicas) if self._is_eligible(replica)]
+        if not eligible:
+            return None
+        if min_lsn is not None:
+            caught_up = [i for i in eligible if self.is_caught_up(i, min_lsn)]
+            if caught_up:
+                return random.choice(caught_up)
+        return random.choice(eligible)
+
+    def is_caught_up(self, index: int, min_lsn: int) -> bool:
+        """Проверяет по последнему известному состоянию, применила ли реплика min_lsn"""
+        replay_lsn = self.replicas[index].replay_lsn
+        return replay_lsn is not None and replay_lsn >= min_lsn
+
+    def update_replay_lsn(self, index: int, lsn: Optional[str]):
+        """Запоминает примененный репликой LSN, полученный вне фоновой проверки"""
+        if lsn is None:
+            return
+        replica = self.replicas[index]
+        value = lsn_to_int(lsn)
+        if replica.replay_lsn is None or value > replica.replay_lsn:
+            replica.replay_lsn = value
+
+    def mark_failed(self, index: int, error: Exception):
+        """Исключает реплику из выбора до следующей успешной проверки"""
+        replica = self.replicas[index]
+        if replica.healthy:
+            logger.warning("Реплика %s помечена недоступной: %s", replica.name, error)
+        replica.healthy = False
+        replica.last_error = str(error)
+
+    def probe_once(self):
+        """Проверяет все реплики один раз"""
+        for index, replica in enumerate(self.replicas):
+            try:
+                with replica.engine.connect() as connection:
+                    lag, replay_lsn = connection.execute(REPLICATION_LAG_QUERY).one()
+                replica.replay_lsn = lsn_to_int(replay_lsn) if replay_lsn else None
+                if lag is None:
+                    raise ReplicaDisconnectedError("Реплика не получает WAL от мастера")
+                replica.lag_seconds = float(lag)
+                if not replica.healthy:
+                    logger.info("Реплика %s доступна, отставание %.3f с", replica.name, replica.lag_seconds)
+                replica.healthy = True
+                replica.last_error = None
+            except Exception as e:
+                self.mark_failed(index, e)
+
+    def stop(self):
+        """Останавливает фоновые проверки"""
+        self._stopped.set()
+
+    def _is_eligible(self, replica: Replica) -> bool:
+        return (
+            replica.healthy
+            and replica.lag_seconds is not None
+            and replica.lag_seconds <= self.max_lag_seconds
+        )
+
+    def _ensure_started(self):
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            # Первая проверка выполняется уже в фоновом потоке: до ее завершения
+            # реплики не считаются подходящими и чтение идет на мастер
+            thread = threading.Thread(target=self._run, name="replica-monitor", daemon=True)
+            thread.start()
+            self._started = True
+
+    def _run(self):
+        while True:
+            try:
+                self.probe_once()
+            except Exception as e:
+                logger.error("Ошибка проверки реплик: %s", e, exc_info=True)
+            if self._stopped.wait(self.probe_interval):
+                return
+
+
+class ReplicaRouter:
+    """
+    Замена ReadOnlyEngine: connect() открывает соединение с подходящей репликой,
+    а если подходящих реплик нет - с мастером
+    """
+
+    def __init__(self, monitor: ReplicaMonitor, primary_engine: Engine):
+        self.monitor = monitor
+        self.primary_engine = primary_engine
+
+    def connect(self, min_lsn: Optional[int] = None):
+        """
+        Открывает соединение для чтения
+
+        Args:
+            min_lsn: Минимальный LSN из токена согласованности. Если реплика
+                по последней проверке его еще не применила, позиция проверяется
+                в открытом соединении, и при отставании чтение уходит на мастер
+        """
+        index = self.monitor.choose(min_lsn)
+        if index is None:
+            logger.debug("Нет подходящих реплик, чтение выполняется на мастере")
+            return self.primary_engine.connect()
+        try:
+            connection = self.monitor.replicas[index].engine.connect()
+        except Exception as e:
+            # Реплика упала между проверками: исключаем ее и читаем с мастера
+            self.monitor.mark_failed(index, e)
+            return self.primary_engine.connect()
+
+        if min_lsn is None or self.monitor.is_caught_up(index, min_lsn):
+            return connection
+        try:
+            self.monitor.update_replay_lsn(index, connection.execute(REPLAY_LSN_QUERY).scalar())
+        except Exception as e:
+            connection.close()
+            self.monitor.mark_failed(index, e)
+            return self.primary_engine.connect()
+        if self.monitor.is_caught_up(index, min_lsn):
+            return connection
+        connection.close()
+        logger.debug("Реплика еще не применила запись клиента, чтение выполняется на мастере")
+        return self.primary_engine.connect()
+
+
+class AsyncReplicaRouter:
+    """
+    Замена AsyncReadOnlyEngine: использует состояние реплик из ReplicaMonitor,
+    а запросы выполняет через отдельные асинхронные Engine реплик
+    """
+
+    def __init__(self, monitor: ReplicaMonitor, primary_engine: AsyncEngine, engines: List[AsyncEngine]):
+        self.monitor = monitor
+        self.primary_engine = primary_engine
+        self.engines = engines
+
+    def connect(self, min_lsn: Optional[int] = None):
+        """Асинхронный аналог ReplicaRouter.connect, возвращает асинхронный контекстный менеджер"""
+        index = self.monitor.choose(min_lsn)
+        if index is None:
+            return self.primary_engine.connect()
+        if min_lsn is None or self.monitor.is_caught_up(index, min_lsn):
+            return self.engines[index].connect()
+        return self._connect_caught_up(index, min_lsn)
+
+    @asynccontextmanager
+    async def _connect_caught_up(self, index: int, min_lsn: int):
+        try:
+            connection = await self.engines[index].connect().start()
+        except Exception as e:
+            self.monitor.mark_failed(index, e)
+            connection = None
+        if connection is not None:
+            try:
+                self.monitor.update_replay_lsn(index, (await connection.execute(REPLAY_LSN_QUERY)).scalar())
+                caught_up = self.monitor.is_caught_up(index, min_lsn)
+            except Exception as e:
+                await connection.close()
+                self.monitor.mark_failed(index, e)
+                caught_up = False
+            if caught_up:
+                try:
+                    yield connection
+                finally:
+                    await connection.close()
+                return
+            await connection.close()
+        async with self.primary_engine.connect() as connection:
+            yield connection
+
+
+def connect_for_read(read_only_engine, write_engine, min_lsn: Optional[int] = None):
+    """
+    Открывает соединение для чтения с учетом токена согласованности (read-your-writes)
+
+    Args:
+        read_only_engine: ReadOnlyEngine или ReplicaRouter (синхронные или асинхронные)
+        write_engine: Engine мастера того же вида
+        min_lsn: Минимальный LSN из токена согласованности или None
+
+    Returns:
+        Соединение (или асинхронный контекстный менеджер соединения) для чтения
+    """
+    if min_lsn is None:
+        return read_only_engine.connect()
+    if isinstance(read_only_engine, (ReplicaRouter, AsyncReplicaRouter)):
+        return read_only_engine.connect(min_lsn=min_lsn)
+    # Без монитора реплик нельзя узнать, применила ли реплика запись: читаем с мастера
+    return write_engine.connect()
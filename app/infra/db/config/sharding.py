@@ -0,0 +1,86 @@
+"""
+Конфигурация шардов диалогов
+"""
+import logging
+import os
+from typing import Dict, NewType, Optional
+
+from injector import Module, provider, singleton
+from sqlalchemy import create_engine
+
+from infra.db.sharding.directory import LayoutDirectory
+from infra.db.sharding.router import ShardRouter
+from infra.metrics import instrument_engine
+from .database import DEFAULT_DATABASE_URL, _create_async_engine, to_async_url
+
+logger = logging.getLogger(__name__)
+
+# Маршрутизаторы по синхронным и асинхронным Engine шардов
+DialogShardRouter = NewType("DialogShardRouter", ShardRouter)
+AsyncDialogShardRouter = NewType("AsyncDialogShardRouter", ShardRouter)
+
+# Шард по умолчанию - основная база
+DEFAULT_SHARD_NAME = "main"
+
+
+def parse_shard_urls(value: Optional[str]) -> Dict[str, str]:
+    """
+    Разбирает шарды из переменной среды DIALOG_SHARD_URLS: пары имя=URL через точку с запятой,
+    например shard-1=postgresql://...;shard-2=postgresql://... Без настройки
+    все диалоги хранятся в основной базе (DATABASE_URL) в шарде main.
+
+    Raises:
+        ValueError: Если у шарда нет имени или URL или имя повторяется
+    """
+    if not value:
+        return {DEFAULT_SHARD_NAME: os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)}
+    shards = {}
+    for item in value.split(';'):
+        if not item.strip():
+            continue
+        # URL может содержать "=" в параметрах, имя шарда - нет
+        name, _, url = item.partition('=')
+        name, url = name.strip(), url.strip()
+        if not name or not url:
+            raise ValueError(f"Шард задается как имя=URL: {item.strip()}")
+        if name in shards:
+            raise ValueError(f"Шард {name} указан дважды")
+        shards[name] = url
+    return shards
+
+
+class ShardingModule(Module):
+    """Модуль для предоставления шардов диалогов через Injector"""
+
+    def __init__(self):
+        self.shard_urls = parse_shard_urls(os.getenv("DIALOG_SHARD_URLS"))
+
+    @provider
+    @singleton
+    def provide_layout_directory(self) -> LayoutDirectory:
+        """Предоставляет кэш раскладки диалогов, которая хранится в основной базе"""
+        engine = create_engine(
+            os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL), pool_size=1, max_overflow=0, pool_pre_ping=True
+        )
+        return LayoutDirectory.from_env(instrument_engine(engine, "dialog_layout"), self.shard_urls)
+
+    @provider
+    @singleton
+    def provide_dialog_shard_router(self, directory: LayoutDirectory) -> DialogShardRouter:
+        """Предоставляет маршрутизатор по Engine шардов диалогов"""
+        logger.info("Диалоги распределяются по шардам: %s", ", ".join(self.shard_urls))
+        engines = {
+            name: instrument_engine(create_engine(url, pool_pre_ping=True), f"shard-{name}")
+            for name, url in self.shard_urls.items()
+        }
+        return DialogShardRouter(ShardRouter(directory, engines))
+
+    @provider
+    @singleton
+    def provide_async_dialog_shard_router(self, directory: LayoutDirectory) -> AsyncDialogShardRouter:
+        """Предоставляет маршрутизатор по асинхронным Engine шардов диалогов"""
+        engines = {
+            name: instrument_engine(_create_async_engine(to_async_url(url)), f"async-shard-{name}")
+            for name, url in self.shard_urls.items()
+        }
+        return AsyncDialogShardRouter(ShardRouter(directory, engines))
@@ -0,0 +1,131 @@
+"""
+Повторение записи при переключении мастера (failover)
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from injector import singleton
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# SQLSTATE ошибок, после которых соединение с мастером нужно пересоздать:
+# 25006 - сервер стал репликой (read-only транзакция), 57P01-57P03 - остановка сервера
+FAILOVER_SQLSTATES = {"25006", "57P01", "57P02", "57P03"}
+
+
+class DatabaseUnavailableError(Exception):
+    """Исключение, возникающее когда мастер недоступен после всех повторов"""
+    pass
+
+
+def is_failover_error(error: BaseException) -> bool:
+    """
+    Проверяет, вызвана ли ошибка потерей соединения с мастером или тем,
+    что сервер по другую сторону соединения больше не мастер
+
+    Args:
+        error: Исключение, полученное при обращении к БД
+
+    Returns:
+        bool: True, если запрос можно повторить после переподключения
+    """
+    if not isinstance(error, DBAPIError):
+        return False
+    if error.connection_invalidated:
+        return True
+    sqlstate = getattr(error.orig, "pgcode", None) or getattr(error.orig, "sqlstate", None)
+    if sqlstate is None:
+        # Ошибки без SQLSTATE драйвер выдает, когда сервер недоступен или разорвал соединение
+        return isinstance(error, OperationalError)
+    return sqlstate in FAILOVER_SQLSTATES or sqlstate.startswith("08")
+
+
+@singleton
+class WriteRetryPolicy:
+    """
+    Повторяет операцию записи, если соединение с мастером разорвано
+    или оказалось соединением с репликой.
+
+    Перед повтором пул соединений сбрасывается (Engine.dispose), поэтому новое соединение
+    устанавливается заново по мульти-хостовому URL с target_session_attrs=primary
+    и попадает на новый мастер. Между попытками - экспоненциальная задержка со случайным
+    разбросом. Повторяемые операции должны быть идемпотентными.
+
+    Настройки из переменных среды:
+        WRITE_RETRY_ATTEMPTS - максимальное количество попыток (по умолчанию 6)
+        WRITE_RETRY_BASE_DELAY - задержка перед первым повтором в секундах (по умолчанию 0.2)
+        WRITE_RETRY_MAX_DELAY - максимальная задержка между попытками в секундах (по умолчанию 2)
+    """
+
+    def __init__(
+        self,
+        attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if attempts is None:
+            attempts = int(os.getenv("WRITE_RETRY_ATTEMPTS", "6"))
+        if base_delay is None:
+            base_delay = float(os.getenv("WRITE_RETRY_BASE_DELAY", "0.2"))
+        if max_delay is None:
+            max_delay = float(os.getenv("WRITE_RETRY_MAX_DELAY", "2"))
+
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+
+    def run(self, engine, operation: Callable[[], T]) -> T:
+        """
+        Выполняет операцию с повторами при переключении мастера
+
+        Args:
+            engine: Engine мастера, пул которого сбрасывается перед повтором
+            operation: Операция без аргументов
+
+        Returns:
+            T: Результат операции
+
+        Raises:
+            DatabaseUnavailableError: Если мастер недоступен после всех попыток
+        """
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return operation()
+            except DBAPIError as e:
+                if not is_failover_error(e):
+                    raise
+                if attempt == self.attempts:
+                    raise DatabaseUnavailableError(f"Мастер недоступен после {attempt} попыток: {e}") from e
+                delay = self._delay(attempt)
+                logger.warning(f"Ошибка соединения с мастером (попытка {attempt}), повтор через {delay:.2f} с: {e}")
+                engine.dispose()
+                self._sleep(delay)
+
+    async def run_async(self, engine, operation: Callable[[], Awaitable[T]]) -> T:
+        """Асинхронный аналог run для AsyncEngine"""
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return await operation()
+            except DBAPIError as e:
+                if not is_failover_error(e):
+                    raise
+                if attempt == self.attempts:
+                    raise DatabaseUnavailableError(f"Мастер недоступен после {attempt} попыток: {e}") from e
+                delay = self._delay(attempt)
+                logger.warning(f"Ошибка соединения с мастером (попытка {attempt}), повтор через {delay:.2f} с: {e}")
+                await engine.dispose()
+                await asyncio.sleep(delay)
+
+    def _delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        # Разброс, чтобы worker-ы не переподключались к новому мастеру одновременно
+        return delay * random.uniform(0.5, 1.0)
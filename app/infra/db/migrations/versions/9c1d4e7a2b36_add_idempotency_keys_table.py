@@ -0,0 +1,34 @@
+"""add_idempotency_keys_table
+
+Revision ID: 9c1d4e7a2b36
+Revises: 52604aa85467
+Create Date: 2026-10-18 12:40:11.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1d4e7a2b36'
+down_revision: Union[str, None] = '52604aa85467'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Ключи идемпотентности регистрации: повтор запроса с тем же ключом возвращает того же пользователя
+    op.execute("""
+        CREATE TABLE idempotency_keys (
+            key VARCHAR(255) PRIMARY KEY,
+            user_id VARCHAR(50) NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT now()
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP TABLE IF EXISTS idempotency_keys
+    """)
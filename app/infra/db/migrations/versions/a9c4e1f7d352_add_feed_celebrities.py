@@ -0,0 +1,35 @@
+"""add_feed_celebrities
+
+Revision ID: a9c4e1f7d352
+Revises: f2a6d8b4c107
+Create Date: 2026-10-18 23:02:51.840317
+
+Авторы, у которых больше FEED_CELEBRITY_THRESHOLD подписчиков. Их посты
+не раскладываются по лентам, а добавляются в ленту при чтении. Таблицу
+ведет процесс fan-out (python -m infra.feed.fanout), когда автор публикует пост.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e1f7d352'
+down_revision: Union[str, None] = 'f2a6d8b4c107'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE feed_celebrities (
+            user_id uuid PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+            promoted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP TABLE IF EXISTS feed_celebrities
+    """)
@@ -0,0 +1,140 @@
+"""convert_user_id_to_uuid
+
+Revision ID: b3f7a91c4d20
+Revises: 9c1d4e7a2b36
+Create Date: 2026-10-18 14:05:37.512904
+
+Перевод users.id из VARCHAR(50) в uuid без долгой блокировки таблицы:
+    1. добавляется колонка id_uuid, триггер заполняет ее для новых и измененных строк;
+    2. существующие строки заполняются пачками, каждая пачка - в своей транзакции;
+    3. уникальный индекс по id_uuid строится CONCURRENTLY, NOT NULL подтверждается
+       проверкой NOT VALID + VALIDATE, которая не блокирует запись;
+    4. в короткой транзакции старая колонка удаляется, id_uuid переименовывается в id,
+       а готовый индекс становится первичным ключом.
+
+Шаги 1-3 можно безопасно повторить, если миграция прервалась.
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f7a91c4d20'
+down_revision: Union[str, None] = '9c1d4e7a2b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Количество строк, заполняемых одной транзакцией
+BATCH_SIZE = int(os.getenv('UUID_MIGRATION_BATCH_SIZE', '10000'))
+
+# Сколько ждать блокировку таблицы при переключении колонок, чтобы не задерживать очередь запросов
+LOCK_TIMEOUT = os.getenv('UUID_MIGRATION_LOCK_TIMEOUT', '5s')
+
+NEXT_BATCH_END_QUERY = text("""
+    SELECT max(id) FROM (
+        SELECT id FROM users WHERE id > :after ORDER BY id LIMIT :batch_size
+    ) batch
+""")
+
+FILL_BATCH_QUERY = text("""
+    UPDATE users SET id_uuid = id::uuid
+    WHERE id > :after AND id <= :until AND id_uuid IS NULL
+""")
+
+
+def _backfill(connection) -> None:
+    # Пачки идут по первичному ключу, поэтому каждая читает только свой диапазон индекса
+    after = ''
+    while True:
+        until = connection.execute(NEXT_BATCH_END_QUERY, {'after': after, 'batch_size': BATCH_SIZE}).scalar()
+        if until is None:
+            return
+        connection.execute(FILL_BATCH_QUERY, {'after': after, 'until': until})
+        after = until
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("""
+            ALTER TABLE users ADD COLUMN IF NOT EXISTS id_uuid uuid
+        """)
+        # Триггер поддерживает id_uuid для строк, записанных во время миграции
+        op.execute("""
+            CREATE OR REPLACE FUNCTION users_fill_id_uuid() RETURNS trigger AS $$
+            BEGIN
+                NEW.id_uuid := NEW.id::uuid;
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute("""
+            DROP TRIGGER IF EXISTS users_fill_id_uuid ON users
+        """)
+        op.execute("""
+            CREATE TRIGGER users_fill_id_uuid BEFORE INSERT OR UPDATE OF id ON users
+            FOR EACH ROW EXECUTE FUNCTION users_fill_id_uuid()
+        """)
+
+        _backfill(op.get_bind())
+
+        # Индекс, прерванный на середине, остается невалидным: строим его заново
+        op.execute("""
+            DROP INDEX CONCURRENTLY IF EXISTS users_id_uuid_idx
+        """)
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY users_id_uuid_idx ON users (id_uuid)
+        """)
+
+        op.execute("""
+            ALTER TABLE users DROP CONSTRAINT IF EXISTS users_id_uuid_not_null
+        """)
+        op.execute("""
+            ALTER TABLE users ADD CONSTRAINT users_id_uuid_not_null CHECK (id_uuid IS NOT NULL) NOT VALID
+        """)
+        # VALIDATE берет SHARE UPDATE EXCLUSIVE: чтение и запись продолжаются во время проверки
+        op.execute("""
+            ALTER TABLE users VALIDATE CONSTRAINT users_id_uuid_not_null
+        """)
+
+    # Переключение выполняется в транзакции миграции и занимает доли секунды:
+    # SET NOT NULL использует проверенное ограничение и не сканирует таблицу
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute("""
+        ALTER TABLE users ALTER COLUMN id_uuid SET NOT NULL
+    """)
+    op.execute("""
+        ALTER TABLE users DROP CONSTRAINT users_id_uuid_not_null
+    """)
+    op.execute("""
+        DROP TRIGGER users_fill_id_uuid ON users
+    """)
+    op.execute("""
+        DROP FUNCTION users_fill_id_uuid()
+    """)
+    op.execute("""
+        ALTER TABLE users DROP COLUMN id
+    """)
+    op.execute("""
+        ALTER TABLE users RENAME COLUMN id_uuid TO id
+    """)
+    op.execute("""
+        ALTER TABLE users ADD CONSTRAINT users_pkey PRIMARY KEY USING INDEX users_id_uuid_idx
+    """)
+    # idempotency_keys не читается при входе, просмотре профиля и поиске:
+    # перезапись одной командой задерживает только регистрацию с ключом
+    op.execute("""
+        ALTER TABLE idempotency_keys ALTER COLUMN user_id TYPE uuid USING user_id::uuid
+    """)
+
+
+def downgrade() -> None:
+    # Откат перезаписывает таблицу под блокировкой: он нужен только для отката неудачного релиза
+    op.execute("""
+        ALTER TABLE idempotency_keys ALTER COLUMN user_id TYPE VARCHAR(50) USING user_id::text
+    """)
+    op.execute("""
+        ALTER TABLE users ALTER COLUMN id TYPE VARCHAR(50) USING id::text
+    """)
@@ -0,0 +1,57 @@
+"""create_dialog_layout
+
+Revision ID: b5e2d7f0c819
+Revises: a9c4e1f7d352
+Create Date: 2026-10-19 01:14:07.502916
+
+Раскладка диалогов по шардам. Сами сообщения хранятся в шардах
+(таблицу dialog_messages в них создает python -m infra.db.sharding.schema),
+а в основной базе - кольцо шардов и диалоги, закрепленные за шардами в обход
+кольца. Обе таблицы меняет инструмент переезда (python -m infra.db.sharding.reshard).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2d7f0c819'
+down_revision: Union[str, None] = 'a9c4e1f7d352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Единственная строка: шарды кольца и, пока кольцо меняется, новые шарды и состояние смены.
+    # Пока строки нет, в кольце все шарды из DIALOG_SHARD_URLS
+    op.execute("""
+        CREATE TABLE dialog_ring (
+            id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+            shards TEXT[] NOT NULL,
+            next_shards TEXT[],
+            state TEXT CHECK (state IN ('copying', 'switched')),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CHECK ((next_shards IS NULL) = (state IS NULL))
+        )
+    """)
+    op.execute("""
+        CREATE TABLE dialog_placements (
+            user_low uuid NOT NULL,
+            user_high uuid NOT NULL,
+            shard TEXT NOT NULL,
+            source_shard TEXT,
+            state TEXT NOT NULL CHECK (state IN ('copying', 'switched', 'moved')),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (user_low, user_high),
+            CHECK ((source_shard IS NULL) = (state = 'moved'))
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP TABLE IF EXISTS dialog_placements
+    """)
+    op.execute("""
+        DROP TABLE IF EXISTS dialog_ring
+    """)
@@ -0,0 +1,64 @@
+"""add_lowercase_name_columns
+
+Revision ID: c6e2d84f1a57
+Revises: b3f7a91c4d20
+Create Date: 2026-10-18 16:22:09.874310
+
+Поиск по префиксам имени и фамилии переводится на хранимые генерируемые колонки
+first_name_lower и second_name_lower и узкий индекс по ним с id в INCLUDE:
+страница поиска отбирается сканированием только индекса (Index Only Scan),
+а строки таблицы читаются по первичному ключу только для найденной страницы.
+
+Добавление хранимой генерируемой колонки перезаписывает таблицу под блокировкой
+ACCESS EXCLUSIVE, поэтому миграцию нужно выполнять в окно обслуживания.
+Индексы создаются и удаляются CONCURRENTLY.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e2d84f1a57'
+down_revision: Union[str, None] = 'b3f7a91c4d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE users
+        ADD COLUMN first_name_lower TEXT GENERATED ALWAYS AS (LOWER(first_name)) STORED,
+        ADD COLUMN second_name_lower TEXT GENERATED ALWAYS AS (LOWER(second_name)) STORED
+    """)
+
+    with op.get_context().autocommit_block():
+        # id в INCLUDE: отбор и сортировка страницы по id не обращаются к таблице
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_name_lower_search ON users (
+                second_name_lower text_pattern_ops, first_name_lower text_pattern_ops) INCLUDE (id)
+        """)
+        op.execute("""
+            DROP INDEX CONCURRENTLY IF EXISTS idx_users_name_search
+        """)
+        # Index Only Scan не проверяет таблицу только для страниц, отмеченных в карте видимости
+        op.execute("""
+            VACUUM (ANALYZE) users
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_name_search ON users (
+                LOWER(second_name) varchar_pattern_ops, LOWER(first_name) varchar_pattern_ops)
+        """)
+        op.execute("""
+            DROP INDEX CONCURRENTLY IF EXISTS idx_users_name_lower_search
+        """)
+
+    op.execute("""
+        ALTER TABLE users
+        DROP COLUMN first_name_lower,
+        DROP COLUMN second_name_lower
+    """)
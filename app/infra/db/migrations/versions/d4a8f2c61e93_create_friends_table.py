@@ -0,0 +1,42 @@
+"""create_friends_table
+
+Revision ID: d4a8f2c61e93
+Revises: c6e2d84f1a57
+Create Date: 2026-10-18 18:05:37.412906
+
+Таблица друзей: ребро user_id -> friend_id означает, что user_id указал friend_id
+своим другом. Первичный ключ (user_id, friend_id) обслуживает список друзей
+пользователя с keyset-пагинацией по friend_id, индекс (friend_id, user_id) -
+обратное направление: у кого пользователь в друзьях.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8f2c61e93'
+down_revision: Union[str, None] = 'c6e2d84f1a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE friends (
+            user_id uuid NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            friend_id uuid NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (user_id, friend_id),
+            CHECK (user_id <> friend_id)
+        )
+    """)
+    op.execute("""
+        CREATE INDEX idx_friends_friend_id ON friends (friend_id, user_id)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP TABLE IF EXISTS friends
+    """)
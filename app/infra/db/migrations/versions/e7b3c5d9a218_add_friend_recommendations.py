@@ -0,0 +1,76 @@
+"""add_friend_recommendations
+
+Revision ID: e7b3c5d9a218
+Revises: d4a8f2c61e93
+Create Date: 2026-10-18 19:12:48.530117
+
+Рекомендации друзей друзей, заранее рассчитанные фоновым заданием
+(python -m infra.recommendations.job), и очередь изменений дружбы для их
+инкрементального пересчета. Очередь заполняет триггер на friends, поэтому
+добавление и удаление друга по-прежнему выполняются одним запросом.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3c5d9a218'
+down_revision: Union[str, None] = 'd4a8f2c61e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE friend_recommendations (
+            user_id uuid NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            candidate_id uuid NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            mutual_count INTEGER NOT NULL,
+            PRIMARY KEY (user_id, candidate_id)
+        )
+    """)
+    # Пользователи, у которых изменился список друзей. Задание удаляет обработанные записи
+    op.execute("""
+        CREATE TABLE friend_changes (
+            id BIGSERIAL PRIMARY KEY,
+            user_id uuid NOT NULL,
+            changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        CREATE FUNCTION record_friend_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO friend_changes (user_id) VALUES (OLD.user_id);
+            ELSE
+                INSERT INTO friend_changes (user_id) VALUES (NEW.user_id);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER friends_record_change
+        AFTER INSERT OR DELETE ON friends
+        FOR EACH ROW EXECUTE FUNCTION record_friend_change()
+    """)
+    # Дружба, созданная до миграции, попадает в рекомендации при первом пересчете
+    op.execute("""
+        INSERT INTO friend_changes (user_id) SELECT DISTINCT user_id FROM friends
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP TRIGGER IF EXISTS friends_record_change ON friends
+    """)
+    op.execute("""
+        DROP FUNCTION IF EXISTS record_friend_change()
+    """)
+    op.execute("""
+        DROP TABLE IF EXISTS friend_changes
+    """)
+    op.execute("""
+        DROP TABLE IF EXISTS friend_recommendations
+    """)
@@ -0,0 +1,117 @@
+"""create_posts_and_feeds
+
+Revision ID: f2a6d8b4c107
+Revises: e7b3c5d9a218
+Create Date: 2026-10-18 21:34:06.271954
+
+Посты и материализованные ленты. Лента пользователя - строки feed_entries
+(ID постов друзей, не больше FEED_MAX_SIZE), которые заполняет процесс fan-out
+(python -m infra.feed.fanout) из очереди post_fanout. Строка feeds отмечает,
+что лента пользователя построена: ленты без нее строятся из posts при первом чтении.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6d8b4c107'
+down_revision: Union[str, None] = 'e7b3c5d9a218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ID постов - UUIDv7, поэтому порядок ID - порядок публикации
+    op.execute("""
+        CREATE TABLE posts (
+            id uuid PRIMARY KEY,
+            author_id uuid NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            text TEXT NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    # Последние посты автора - для построения ленты из БД
+    op.execute("""
+        CREATE INDEX idx_posts_author_id ON posts (author_id, id)
+    """)
+    op.execute("""
+        CREATE TABLE feeds (
+            user_id uuid PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+            built_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    # Удаление отметки о построении удаляет и ленту, удаление поста - его строки в лентах
+    op.execute("""
+        CREATE TABLE feed_entries (
+            user_id uuid NOT NULL REFERENCES feeds (user_id) ON DELETE CASCADE,
+            post_id uuid NOT NULL REFERENCES posts (id) ON DELETE CASCADE,
+            PRIMARY KEY (user_id, post_id)
+        )
+    """)
+    op.execute("""
+        CREATE INDEX idx_feed_entries_post_id ON feed_entries (post_id)
+    """)
+    op.execute("""
+        CREATE TABLE post_fanout (
+            id BIGSERIAL PRIMARY KEY,
+            post_id uuid NOT NULL,
+            author_id uuid NOT NULL
+        )
+    """)
+    op.execute("""
+        CREATE FUNCTION enqueue_post_fanout() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO post_fanout (post_id, author_id) VALUES (NEW.id, NEW.author_id);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_enqueue_fanout
+        AFTER INSERT ON posts
+        FOR EACH ROW EXECUTE FUNCTION enqueue_post_fanout()
+    """)
+    # Лента пользователя, изменившего список друзей, строится заново при следующем чтении
+    op.execute("""
+        CREATE FUNCTION invalidate_feed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM feeds WHERE user_id = OLD.user_id;
+            ELSE
+                DELETE FROM feeds WHERE user_id = NEW.user_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER friends_invalidate_feed
+        AFTER INSERT OR DELETE ON friends
+        FOR EACH ROW EXECUTE FUNCTION invalidate_feed()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP TRIGGER IF EXISTS friends_invalidate_feed ON friends
+    """)
+    op.execute("""
+        DROP FUNCTION IF EXISTS invalidate_feed()
+    """)
+    op.execute("""
+        DROP TABLE IF EXISTS post_fanout
+    """)
+    op.execute("""
+        DROP TABLE IF EXISTS feed_entries
+    """)
+    op.execute("""
+        DROP TABLE IF EXISTS feeds
+    """)
+    op.execute("""
+        DROP TABLE IF EXISTS posts
+    """)
+    op.execute("""
+        DROP FUNCTION IF EXISTS enqueue_post_fanout()
+    """)
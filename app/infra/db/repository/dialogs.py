@@ -0,0 +1,140 @@
+import uuid
+from typing import List, Optional
+from injector import inject, singleton
+from sqlalchemy import text
+from infra.db.config.prepared_statements import PreparedStatement
+from infra.db.config.sharding import AsyncDialogShardRouter, DialogShardRouter
+from infra.db.config.write_failover import WriteRetryPolicy
+from infra.metrics import timed_repository_method
+from model.dialog import DialogKey, Message
+
+# Повтор после разрыва соединения и запись в оба шарда во время переезда не создают дубликат
+INSERT_MESSAGE_QUERY = text("""
+    INSERT INTO dialog_messages (user_low, user_high, id, from_user_id, text)
+    VALUES (:user_low, :user_high, :id, :from_user_id, :text)
+    ON CONFLICT DO NOTHING
+""")
+
+
+def _list_messages_sql(before: bool) -> str:
+    """
+    Страница диалога от новых сообщений к старым: диапазон первичного ключа
+    (user_low, user_high, id) до ID последнего сообщения предыдущей страницы
+    """
+    before_condition = "AND id < :before" if before else ""
+    return f"""
+        SELECT id::text, from_user_id::text,
+               (CASE WHEN from_user_id = user_low THEN user_high ELSE user_low END)::text, text
+        FROM dialog_messages
+        WHERE user_low = :user_low AND user_high = :user_high {before_condition}
+        ORDER BY id DESC
+        LIMIT :limit
+    """
+
+
+# Первая и следующие страницы диалога
+LIST_MESSAGES_STATEMENTS = {
+    False: PreparedStatement('list_dialog_messages', _list_messages_sql(before=False)),
+    True: PreparedStatement('list_dialog_messages_before', _list_messages_sql(before=True)),
+}
+
+
+def _insert_params(key: DialogKey, message_id: uuid.UUID, from_user_id: uuid.UUID, text: str) -> dict:
+    return {
+        'user_low': key.user_low, 'user_high': key.user_high,
+        'id': message_id, 'from_user_id': from_user_id, 'text': text,
+    }
+
+
+def _list_params(key: DialogKey, limit: int, before: Optional[uuid.UUID]) -> dict:
+    params = {'user_low': key.user_low, 'user_high': key.user_high, 'limit': limit}
+    if before is not None:
+        params['before'] = before
+    return params
+
+
+@singleton
+class DialogRepository:
+    """
+    Хранение сообщений диалогов в шардах: все сообщения диалога лежат в одном шарде,
+    который выбирает ShardRouter по ключу диалога.
+
+    Пока диалог переезжает между шардами, сообщение записывается в оба шарда:
+    сначала в тот, с которого диалог читается. Запись идемпотентна
+    и повторяется через WriteRetryPolicy при переключении мастера шарда.
+    """
+
+    @inject
+    def __init__(self, router: DialogShardRouter, write_retry: WriteRetryPolicy):
+        self.router = router
+        self.write_retry = write_retry
+
+    @timed_repository_method
+    def insert_message(self, key: DialogKey, message_id: uuid.UUID, from_user_id: uuid.UUID, text: str):
+        """
+        Сохраняет сообщение диалога
+
+        Args:
+            key: Ключ диалога
+            message_id: ID сообщения (UUIDv7)
+            from_user_id: ID отправителя
+            text: Текст сообщения
+        """
+        params = _insert_params(key, message_id, from_user_id, text)
+        for _, engine in self.router.write_engines(key):
+            def insert():
+                with engine.connect() as connection:
+                    connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                    connection.execute(INSERT_MESSAGE_QUERY, params)
+
+            self.write_retry.run(engine, insert)
+
+    @timed_repository_method
+    def list_messages(self, key: DialogKey, limit: int, before: Optional[uuid.UUID] = None) -> List[Message]:
+        """
+        Страница диалога (keyset-пагинация по ID сообщения)
+
+        Args:
+            key: Ключ диалога
+            limit: Максимальное количество сообщений
+            before: ID последнего сообщения предыдущей страницы
+
+        Returns:
+            List[Message]: Сообщения от новых к старым
+        """
+        statement = LIST_MESSAGES_STATEMENTS[before is not None]
+        _, engine = self.router.read_engine(key)
+        with engine.connect() as connection:
+            result = statement.execute(connection, _list_params(key, limit, before))
+            return [Message._make(row) for row in result]
+
+
+@singleton
+class AsyncDialogRepository:
+    """Асинхронный вариант DialogRepository поверх asyncpg"""
+
+    @inject
+    def __init__(self, router: AsyncDialogShardRouter, write_retry: WriteRetryPolicy):
+        self.router = router
+        self.write_retry = write_retry
+
+    @timed_repository_method
+    async def insert_message(self, key: DialogKey, message_id: uuid.UUID, from_user_id: uuid.UUID, text: str):
+        """Асинхронный аналог DialogRepository.insert_message"""
+        params = _insert_params(key, message_id, from_user_id, text)
+        for _, engine in self.router.write_engines(key):
+            async def insert():
+                async with engine.connect() as connection:
+                    connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                    await connection.execute(INSERT_MESSAGE_QUERY, params)
+
+            await self.write_retry.run_async(engine, insert)
+
+    @timed_repository_method
+    async def list_messages(self, key: DialogKey, limit: int, before: Optional[uuid.UUID] = None) -> List[Message]:
+        """Асинхронный аналог DialogRepository.list_messages"""
+        statement = LIST_MESSAGES_STATEMENTS[before is not None]
+        _, engine = self.router.read_engine(key)
+        async with engine.connect() as connection:
+            result = await statement.execute_async(connection, _list_params(key, limit, before))
+            return [Message._make(row) for row in result]
@@ -0,0 +1,221 @@
+import uuid
+from typing import List, Optional
+from injector import inject, singleton
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from infra.db.config.database import WriteEngine, ReadOnlyEngine, AsyncWriteEngine, AsyncReadOnlyEngine
+from infra.db.config.prepared_statements import PreparedStatement
+from infra.db.config.replica_router import connect_for_read
+from infra.db.config.write_failover import WriteRetryPolicy
+from infra.metrics import timed_repository_method
+from model.user import FriendRecommendation, UserCard
+
+# SQLSTATE нарушения внешнего ключа: пользователя, которого добавляют в друзья, нет
+FOREIGN_KEY_VIOLATION = '23503'
+
+# Повтор после разрыва соединения не создает дубликат и не приводит к ошибке
+ADD_FRIEND_QUERY = text("""
+    INSERT INTO friends (user_id, friend_id) VALUES (:user_id, :friend_id)
+    ON CONFLICT DO NOTHING
+""")
+
+DELETE_FRIEND_QUERY = text("""
+    DELETE FROM friends WHERE user_id = :user_id AND friend_id = :friend_id
+""")
+
+
+def _list_friends_sql(after: bool) -> str:
+    """
+    Страница друзей в порядке ID: диапазон первичного ключа (user_id, friend_id)
+    после friend_id последнего друга предыдущей страницы, анкеты - по первичному ключу users
+    """
+    after_condition = "AND f.friend_id > :after" if after else ""
+    return f"""
+        SELECT u.id::text, u.first_name, u.second_name, to_char(u.birthdate, 'YYYY-MM-DD'), u.biography, u.city
+        FROM friends f
+        JOIN users u ON u.id = f.friend_id
+        WHERE f.user_id = :user_id {after_condition}
+        ORDER BY f.friend_id
+        LIMIT :limit
+    """
+
+
+# Первая и следующие страницы списка друзей
+LIST_FRIENDS_STATEMENTS = {
+    False: PreparedStatement('list_friends', _list_friends_sql(after=False)),
+    True: PreparedStatement('list_friends_after', _list_friends_sql(after=True)),
+}
+
+
+# Рассчитанные заданием рекомендации без тех, кого пользователь уже добавил после расчета
+LIST_RECOMMENDATIONS_STATEMENT = PreparedStatement('list_friend_recommendations', """
+    SELECT u.id::text, u.first_name, u.second_name, to_char(u.birthdate, 'YYYY-MM-DD'), u.biography, u.city,
+           r.mutual_count
+    FROM friend_recommendations r
+    JOIN users u ON u.id = r.candidate_id
+    WHERE r.user_id = :user_id
+      AND NOT EXISTS (SELECT 1 FROM friends f WHERE f.user_id = r.user_id AND f.friend_id = r.candidate_id)
+    ORDER BY r.mutual_count DESC, r.candidate_id
+    LIMIT :limit
+""")
+
+
+def _row_to_recommendation(row) -> FriendRecommendation:
+    return FriendRecommendation(UserCard._make(row[:6]), row[6])
+
+
+def _sqlstate(error: IntegrityError) -> Optional[str]:
+    return getattr(error.orig, "pgcode", None) or getattr(error.orig, "sqlstate", None)
+
+
+def _list_params(user_id: uuid.UUID, limit: int, after: Optional[uuid.UUID]) -> dict:
+    params = {'user_id': user_id, 'limit': limit}
+    if after is not None:
+        params['after'] = after
+    return params
+
+
+@singleton
+class FriendRepository:
+    """
+    Хранение дружбы - направленных ребер user_id -> friend_id в таблице friends.
+
+    Изменения выполняются одним запросом в режиме autocommit: без BEGIN и COMMIT
+    добавление и удаление друга - один обмен с сервером. Оба запроса идемпотентны,
+    поэтому при переключении мастера повторяются через WriteRetryPolicy.
+    """
+
+    @inject
+    def __init__(self, write_engine: WriteEngine, read_only_engine: ReadOnlyEngine, write_retry: WriteRetryPolicy):
+        self.write_engine = write_engine
+        self.read_only_engine = read_only_engine
+        self.write_retry = write_retry
+
+    @timed_repository_method
+    def add_friend(self, user_id: uuid.UUID, friend_id: uuid.UUID) -> bool:
+        """
+        Добавляет друга. Повторное добавление ничего не меняет.
+
+        Args:
+            user_id: ID пользователя
+            friend_id: ID добавляемого друга
+
+        Returns:
+            bool: False, если пользователя friend_id (или user_id) нет
+        """
+        def add():
+            with self.write_engine.connect() as connection:
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                connection.execute(ADD_FRIEND_QUERY, {'user_id': user_id, 'friend_id': friend_id})
+
+        try:
+            self.write_retry.run(self.write_engine, add)
+        except IntegrityError as e:
+            if _sqlstate(e) == FOREIGN_KEY_VIOLATION:
+                return False
+            raise
+        return True
+
+    @timed_repository_method
+    def delete_friend(self, user_id: uuid.UUID, friend_id: uuid.UUID):
+        """
+        Удаляет друга. Удаление отсутствующего друга ничего не меняет.
+
+        Args:
+            user_id: ID пользователя
+            friend_id: ID удаляемого друга
+        """
+        def delete():
+            with self.write_engine.connect() as connection:
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                connection.execute(DELETE_FRIEND_QUERY, {'user_id': user_id, 'friend_id': friend_id})
+
+        self.write_retry.run(self.write_engine, delete)
+
+    @timed_repository_method
+    def list_friends(self, user_id: uuid.UUID, limit: int, after: Optional[uuid.UUID] = None) -> List[UserCard]:
+        """
+        Страница друзей пользователя (keyset-пагинация по ID друга)
+
+        Args:
+            user_id: ID пользователя
+            limit: Максимальное количество друзей
+            after: ID последнего друга предыдущей страницы
+
+        Returns:
+            List[UserCard]: Анкеты друзей в порядке возрастания ID
+        """
+        statement = LIST_FRIENDS_STATEMENTS[after is not None]
+        with connect_for_read(self.read_only_engine, self.write_engine) as connection:
+            result = statement.execute(connection, _list_params(user_id, limit, after))
+            return [UserCard._make(row) for row in result]
+
+    @timed_repository_method
+    def list_recommendations(self, user_id: uuid.UUID, limit: int) -> List[FriendRecommendation]:
+        """
+        Рекомендации друзей друзей, рассчитанные заданием infra.recommendations.job
+
+        Args:
+            user_id: ID пользователя
+            limit: Максимальное количество рекомендаций
+
+        Returns:
+            List[FriendRecommendation]: Кандидаты по убыванию числа общих друзей
+        """
+        with connect_for_read(self.read_only_engine, self.write_engine) as connection:
+            result = LIST_RECOMMENDATIONS_STATEMENT.execute(connection, {'user_id': user_id, 'limit': limit})
+            return [_row_to_recommendation(row) for row in result]
+
+
+@singleton
+class AsyncFriendRepository:
+    """Асинхронный вариант FriendRepository поверх asyncpg"""
+
+    @inject
+    def __init__(
+        self, write_engine: AsyncWriteEngine, read_only_engine: AsyncReadOnlyEngine, write_retry: WriteRetryPolicy
+    ):
+        self.write_engine = write_engine
+        self.read_only_engine = read_only_engine
+        self.write_retry = write_retry
+
+    @timed_repository_method
+    async def add_friend(self, user_id: uuid.UUID, friend_id: uuid.UUID) -> bool:
+        """Асинхронный аналог FriendRepository.add_friend"""
+        async def add():
+            async with self.write_engine.connect() as connection:
+                connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                await connection.execute(ADD_FRIEND_QUERY, {'user_id': user_id, 'friend_id': friend_id})
+
+        try:
+            await self.write_retry.run_async(self.write_engine, add)
+        except IntegrityError as e:
+            if _sqlstate(e) == FOREIGN_KEY_VIOLATION:
+                return False
+            raise
+        return True
+
+    @timed_repository_method
+    async def delete_friend(self, user_id: uuid.UUID, friend_id: uuid.UUID):
+        """Асинхронный аналог FriendRepository.delete_friend"""
+        async def delete():
+            async with self.write_engine.connect() as connection:
+                connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                await connection.execute(DELETE_FRIEND_QUERY, {'user_id': user_id, 'friend_id': friend_id})
+
+        await self.write_retry.run_async(self.write_engine, delete)
+
+    @timed_repository_method
+    async def list_friends(self, user_id: uuid.UUID, limit: int, after: Optional[uuid.UUID] = None) -> List[UserCard]:
+        """Асинхронный аналог FriendRepository.list_friends"""
+        statement = LIST_FRIENDS_STATEMENTS[after is not None]
+        async with connect_for_read(self.read_only_engine, self.write_engine) as connection:
+            result = await statement.execute_async(connection, _list_params(user_id, limit, after))
+            return [UserCard._make(row) for row in result]
+
+    @timed_repository_method
+    async def list_recommendations(self, user_id: uuid.UUID, limit: int) -> List[FriendRecommendation]:
+        """Асинхронный аналог FriendRepository.list_recommendations"""
+        async with connect_for_read(self.read_only_engine, self.write_engine) as connection:
+            result = await LIST_RECOMMENDATIONS_STATEMENT.execute_async(connection, {'user_id': user_id, 'limit': limit})
+            return [_row_to_recommendation(row) for row in result]
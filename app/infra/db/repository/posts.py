@@ -0,0 +1,359 @@
+import logging
+import uuid
+from typing import List, Optional
+from injector import inject, singleton
+from sqlalchemy import text
+from infra.db.config.database import WriteEngine, ReadOnlyEngine, AsyncWriteEngine, AsyncReadOnlyEngine
+from infra.db.config.prepared_statements import PreparedStatement
+from infra.db.config.replica_router import connect_for_read
+from infra.db.config.write_failover import WriteRetryPolicy
+from infra.feed import FEED_MAX_SIZE, merge_feed
+from infra.metrics import timed_repository_method
+from model.post import Post
+
+logger = logging.getLogger(__name__)
+
+# ID создается приложением, поэтому повтор после разрыва соединения не создает дубликат
+INSERT_POST_QUERY = text("""
+    INSERT INTO posts (id, author_id, text) VALUES (:id, :author_id, :text)
+    ON CONFLICT (id) DO NOTHING
+""")
+
+UPDATE_POST_QUERY = text("""
+    UPDATE posts SET text = :text, updated_at = now() WHERE id = :id AND author_id = :author_id
+""")
+
+DELETE_POST_QUERY = text("""
+    DELETE FROM posts WHERE id = :id AND author_id = :author_id
+""")
+
+GET_POST_STATEMENT = PreparedStatement('get_post', """
+    SELECT id::text, text, author_id::text FROM posts WHERE id = :id
+""")
+
+
+def _feed_sql(after: bool) -> str:
+    """
+    Страница ленты: диапазон первичного ключа (user_id, post_id) в обратном порядке
+    до post_id последнего поста предыдущей страницы, посты - по первичному ключу posts
+    """
+    after_condition = "AND e.post_id < :after" if after else ""
+    return f"""
+        SELECT p.id::text, p.text, p.author_id::text
+        FROM feed_entries e
+        JOIN posts p ON p.id = e.post_id
+        WHERE e.user_id = :user_id {after_condition}
+        ORDER BY e.post_id DESC
+        LIMIT :limit
+    """
+
+
+# Первая и следующие страницы ленты
+FEED_STATEMENTS = {
+    False: PreparedStatement('get_feed', _feed_sql(after=False)),
+    True: PreparedStatement('get_feed_after', _feed_sql(after=True)),
+}
+
+
+def _celebrity_posts_sql(after: bool) -> str:
+    """
+    Последние посты друзей-знаменитостей (их посты не раскладываются по лентам):
+    знаменитостей немного, для каждой дружба проверяется по первичному ключу friends,
+    посты читаются по индексу (author_id, id). Строки сгруппированы по автору для слияния
+    """
+    after_condition = "AND id < :after" if after else ""
+    return f"""
+        SELECT p.id::text, p.text, p.author_id::text
+        FROM feed_celebrities c
+        JOIN friends f ON f.user_id = :user_id AND f.friend_id = c.user_id
+        CROSS JOIN LATERAL (
+            SELECT id, text, author_id FROM posts
+            WHERE author_id = c.user_id {after_condition}
+            ORDER BY id DESC
+            LIMIT :limit
+        ) p
+        ORDER BY p.author_id, p.id DESC
+    """
+
+
+CELEBRITY_POSTS_STATEMENTS = {
+    False: PreparedStatement('get_celebrity_posts', _celebrity_posts_sql(after=False)),
+    True: PreparedStatement('get_celebrity_posts_after', _celebrity_posts_sql(after=True)),
+}
+
+FEED_EXISTS_STATEMENT = PreparedStatement('feed_exists', """
+    SELECT EXISTS (SELECT 1 FROM feeds WHERE user_id = :user_id)
+""")
+
+# Отметка о построении ленты фиксируется до заполнения: с этого момента fan-out добавляет
+# в ленту новые посты. Конкурирующее построение ждет фиксации первого и ничего не делает
+MARK_FEED_QUERY = text("""
+    INSERT INTO feeds (user_id) VALUES (:user_id)
+    ON CONFLICT DO NOTHING
+    RETURNING user_id
+""")
+
+UNMARK_FEED_QUERY = text("""
+    DELETE FROM feeds WHERE user_id = :user_id
+""")
+
+# Последние посты каждого друга по индексу (author_id, id), из них - самые новые.
+# Посты, уже добавленные fan-out, пропускаются. Посты знаменитостей добавляются при чтении
+FILL_FEED_QUERY = text("""
+    INSERT INTO feed_entries (user_id, post_id)
+    SELECT :user_id, p.id
+    FROM friends f
+    CROSS JOIN LATERAL (
+        SELECT id FROM posts WHERE author_id = f.friend_id ORDER BY id DESC LIMIT :max_size
+    ) p
+    WHERE f.user_id = :user_id
+      AND NOT EXISTS (SELECT 1 FROM feed_celebrities c WHERE c.user_id = f.friend_id)
+    ORDER BY p.id DESC
+    LIMIT :max_size
+    ON CONFLICT DO NOTHING
+""")
+
+# Вместе с постами от fan-out лента могла стать длиннее FEED_MAX_SIZE
+TRIM_FEED_QUERY = text("""
+    DELETE FROM feed_entries
+    WHERE user_id = :user_id AND post_id <= (
+        SELECT post_id FROM feed_entries
+        WHERE user_id = :user_id
+        ORDER BY post_id DESC
+        OFFSET :max_size LIMIT 1
+    )
+""")
+
+
+def _feed_params(user_id: uuid.UUID, limit: int, after: Optional[uuid.UUID]) -> dict:
+    params = {'user_id': user_id, 'limit': limit}
+    if after is not None:
+        params['after'] = after
+    return params
+
+
+@singleton
+class PostRepository:
+    """
+    Хранение постов и чтение материализованных лент.
+
+    Лента пользователя - ID постов друзей в feed_entries, которые добавляет процесс
+    fan-out (infra.feed.fanout). Страница ленты - диапазон первичного ключа,
+    поэтому чтение не зависит от количества друзей. Ленту, которой еще нет
+    (новый пользователь, изменился список друзей), репозиторий строит из posts
+    при чтении: сначала фиксирует отметку в feeds, чтобы fan-out начал добавлять
+    в ленту новые посты, затем отдельной транзакцией заполняет ленту и обрезает ее
+    до FEED_MAX_SIZE. Пост, опубликованный во время построения, попадает в ленту
+    либо через fan-out, либо при заполнении; повтор отсекается первичным ключом.
+    Пока лента заполняется, конкурирующее чтение может получить ее неполной.
+    Если заполнение не удалось, отметка снимается и лента строится заново.
+
+    Посты знаменитостей (feed_celebrities) в ленты не раскладываются: страница
+    материализованной ленты сливается с последними постами друзей-знаменитостей
+    (merge_feed), по limit постов от каждой.
+    """
+
+    @inject
+    def __init__(self, write_engine: WriteEngine, read_only_engine: ReadOnlyEngine, write_retry: WriteRetryPolicy):
+        self.write_engine = write_engine
+        self.read_only_engine = read_only_engine
+        self.write_retry = write_retry
+
+    @timed_repository_method
+    def insert_post(self, post_id: uuid.UUID, author_id: uuid.UUID, text: str):
+        """
+        Сохраняет пост. Триггер ставит его в очередь fan-out.
+
+        Args:
+            post_id: ID поста
+            author_id: ID автора
+            text: Текст поста
+        """
+        def insert():
+            with self.write_engine.connect() as connection:
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                connection.execute(INSERT_POST_QUERY, {'id': post_id, 'author_id': author_id, 'text': text})
+
+        self.write_retry.run(self.write_engine, insert)
+
+    @timed_repository_method
+    def update_post(self, post_id: uuid.UUID, author_id: uuid.UUID, text: str) -> bool:
+        """
+        Изменяет текст поста. Ленты хранят только ID постов, поэтому их менять не нужно.
+
+        Returns:
+            bool: False, если у автора нет такого поста
+        """
+        def update():
+            with self.write_engine.connect() as connection:
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                result = connection.execute(UPDATE_POST_QUERY, {'id': post_id, 'author_id': author_id, 'text': text})
+                return result.rowcount > 0
+
+        return self.write_retry.run(self.write_engine, update)
+
+    @timed_repository_method
+    def delete_post(self, post_id: uuid.UUID, author_id: uuid.UUID) -> bool:
+        """
+        Удаляет пост, внешний ключ удаляет его и из лент
+
+        Returns:
+            bool: False, если у автора нет такого поста
+        """
+        def delete():
+            with self.write_engine.connect() as connection:
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                result = connection.execute(DELETE_POST_QUERY, {'id': post_id, 'author_id': author_id})
+                return result.rowcount > 0
+
+        return self.write_retry.run(self.write_engine, delete)
+
+    @timed_repository_method
+    def get_post(self, post_id: uuid.UUID) -> Optional[Post]:
+        with connect_for_read(self.read_only_engine, self.write_engine) as connection:
+            row = GET_POST_STATEMENT.execute(connection, {'id': post_id}).fetchone()
+            return Post._make(row) if row else None
+
+    @timed_repository_method
+    def get_feed(self, user_id: uuid.UUID, limit: int, after: Optional[uuid.UUID] = None) -> List[Post]:
+        """
+        Страница ленты пользователя, от новых постов к старым
+
+        Args:
+            user_id: ID пользователя
+            limit: Максимальное количество постов
+            after: ID последнего поста предыдущей страницы
+
+        Returns:
+            List[Post]: Посты друзей в порядке убывания ID
+        """
+        statement = FEED_STATEMENTS[after is not None]
+        celebrity_statement = CELEBRITY_POSTS_STATEMENTS[after is not None]
+        params = _feed_params(user_id, limit, after)
+
+        with connect_for_read(self.read_only_engine, self.write_engine) as connection:
+            posts = [Post._make(row) for row in statement.execute(connection, params)]
+            # Неполная страница - конец ленты или лента еще не построена
+            if len(posts) == limit or FEED_EXISTS_STATEMENT.execute(connection, {'user_id': user_id}).scalar():
+                celebrity_posts = map(Post._make, celebrity_statement.execute(connection, params))
+                return merge_feed(posts, celebrity_posts, limit)
+
+        def build():
+            with self.write_engine.connect() as connection:
+                created = connection.execute(MARK_FEED_QUERY, {'user_id': user_id}).fetchone() is not None
+                connection.commit()
+                if created:
+                    try:
+                        fill_params = {'user_id': user_id, 'max_size': FEED_MAX_SIZE}
+                        connection.execute(FILL_FEED_QUERY, fill_params)
+                        connection.execute(TRIM_FEED_QUERY, fill_params)
+                        connection.commit()
+                    except Exception:
+                        self._unmark_feed(user_id)
+                        raise
+                posts = [Post._make(row) for row in statement.execute(connection, params)]
+                celebrity_posts = map(Post._make, celebrity_statement.execute(connection, params))
+                return merge_feed(posts, celebrity_posts, limit)
+
+        return self.write_retry.run(self.write_engine, build)
+
+    def _unmark_feed(self, user_id: uuid.UUID):
+        # Без отметки лента построится заново при следующем чтении
+        try:
+            with self.write_engine.begin() as connection:
+                connection.execute(UNMARK_FEED_QUERY, {'user_id': user_id})
+        except Exception as e:
+            logger.warning("Не удалось снять отметку ленты %s: %s", user_id, e)
+
+
+@singleton
+class AsyncPostRepository:
+    """Асинхронный вариант PostRepository поверх asyncpg"""
+
+    @inject
+    def __init__(
+        self, write_engine: AsyncWriteEngine, read_only_engine: AsyncReadOnlyEngine, write_retry: WriteRetryPolicy
+    ):
+        self.write_engine = write_engine
+        self.read_only_engine = read_only_engine
+        self.write_retry = write_retry
+
+    @timed_repository_method
+    async def insert_post(self, post_id: uuid.UUID, author_id: uuid.UUID, text: str):
+        """Асинхронный аналог PostRepository.insert_post"""
+        async def insert():
+            async with self.write_engine.connect() as connection:
+                connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                await connection.execute(INSERT_POST_QUERY, {'id': post_id, 'author_id': author_id, 'text': text})
+
+        await self.write_retry.run_async(self.write_engine, insert)
+
+    @timed_repository_method
+    async def update_post(self, post_id: uuid.UUID, author_id: uuid.UUID, text: str) -> bool:
+        """Асинхронный аналог PostRepository.update_post"""
+        async def update():
+            async with self.write_engine.connect() as connection:
+                connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                result = await connection.execute(
+                    UPDATE_POST_QUERY, {'id': post_id, 'author_id': author_id, 'text': text}
+                )
+                return result.rowcount > 0
+
+        return await self.write_retry.run_async(self.write_engine, update)
+
+    @timed_repository_method
+    async def delete_post(self, post_id: uuid.UUID, author_id: uuid.UUID) -> bool:
+        """Асинхронный аналог PostRepository.delete_post"""
+        async def delete():
+            async with self.write_engine.connect() as connection:
+                connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                result = await connection.execute(DELETE_POST_QUERY, {'id': post_id, 'author_id': author_id})
+                return result.rowcount > 0
+
+        return await self.write_retry.run_async(self.write_engine, delete)
+
+    @timed_repository_method
+    async def get_post(self, post_id: uuid.UUID) -> Optional[Post]:
+        async with connect_for_read(self.read_only_engine, self.write_engine) as connection:
+            row = (await GET_POST_STATEMENT.execute_async(connection, {'id': post_id})).fetchone()
+            return Post._make(row) if row else None
+
+    @timed_repository_method
+    async def get_feed(self, user_id: uuid.UUID, limit: int, after: Optional[uuid.UUID] = None) -> List[Post]:
+        """Асинхронный аналог PostRepository.get_feed"""
+        statement = FEED_STATEMENTS[after is not None]
+        celebrity_statement = CELEBRITY_POSTS_STATEMENTS[after is not None]
+        params = _feed_params(user_id, limit, after)
+        async with connect_for_read(self.read_only_engine, self.write_engine) as connection:
+            posts = [Post._make(row) for row in await statement.execute_async(connection, params)]
+            if len(posts) == limit or (
+                await FEED_EXISTS_STATEMENT.execute_async(connection, {'user_id': user_id})
+            ).scalar():
+                celebrity_posts = map(Post._make, await celebrity_statement.execute_async(connection, params))
+                return merge_feed(posts, celebrity_posts, limit)
+
+        async def build():
+            async with self.write_engine.connect() as connection:
+                created = (await connection.execute(MARK_FEED_QUERY, {'user_id': user_id})).fetchone() is not None
+                await connection.commit()
+                if created:
+                    try:
+                        fill_params = {'user_id': user_id, 'max_size': FEED_MAX_SIZE}
+                        await connection.execute(FILL_FEED_QUERY, fill_params)
+                        await connection.execute(TRIM_FEED_QUERY, fill_params)
+                        await connection.commit()
+                    except Exception:
+                        await self._unmark_feed(user_id)
+                        raise
+                posts = [Post._make(row) for row in await statement.execute_async(connection, params)]
+                celebrity_posts = map(Post._make, await celebrity_statement.execute_async(connection, params))
+                return merge_feed(posts, celebrity_posts, limit)
+
+        return await self.write_retry.run_async(self.write_engine, build)
+
+    async def _unmark_feed(self, user_id: uuid.UUID):
+        try:
+            async with self.write_engine.begin() as connection:
+                await connection.execute(UNMARK_FEED_QUERY, {'user_id': user_id})
+        except Exception as e:
+            logger.warning("Не удалось снять отметку ленты %s: %s", user_id, e)
@@ -1,102 +1,590 @@
+import io
+import os
 import uuid
+from datetime import date
+from typing import List, Optional, Tuple
 from injector import inject, singleton
 from sqlalchemy import text
-from infra.db.config.database import WriteEngine, ReadOnlyEngine
+from infra.db.config.database import (
+    AsyncReadOnlyEngine,
+    AsyncWriteEngine,
+    BackgroundEngine,
+    ReadOnlyEngine,
+    WriteEngine,
+)
+from infra.db.config.prepared_statements import FORCE_CUSTOM_PLAN_QUERY, PreparedStatement
+from infra.db.config.replica_router import connect_for_read
+from infra.db.config.write_failover import WriteRetryPolicy
+from infra.metrics import timed_repository_method
+from infra.search import NameIndexSearch
 from application.user_search_query import UserSearchQuery
-from model.user import User
+from model.user import User, UserCard
+
+# Размер пачки строк, читаемых из серверного курсора при потоковом поиске
+STREAM_BATCH_SIZE = int(os.getenv('SEARCH_STREAM_BATCH_SIZE', '1000'))
+
+# ON CONFLICT делает вставку идемпотентной: повтор после разрыва соединения
+# во время COMMIT не приводит к ошибке, если первая попытка успела зафиксироваться
+INSERT_USER_QUERY = text("""
+    INSERT INTO users (id, password, first_name, second_name, birthdate, biography, city)
+    VALUES (:id, :password, :first_name, :second_name, :birthdate, :biography, :city)
+    ON CONFLICT (id) DO NOTHING
+""")
+
+# Колонки пакетной вставки через COPY, в порядке полей строки
+COPY_USER_COLUMNS = ('id', 'password', 'first_name', 'second_name', 'birthdate', 'biography', 'city')
+
+# Пакет копируется во временную таблицу, удаляемую при COMMIT, а из нее вставляется
+# в users с ON CONFLICT: так повтор после разрыва соединения во время COMMIT безопасен
+CREATE_USERS_BATCH_TABLE_QUERY = text("""
+    CREATE TEMP TABLE users_batch (LIKE users) ON COMMIT DROP
+""")
+
+INSERT_USERS_FROM_BATCH_QUERY = text(f"""
+    INSERT INTO users ({', '.join(COPY_USER_COLUMNS)})
+    SELECT {', '.join(COPY_USER_COLUMNS)} FROM users_batch
+    ON CONFLICT (id) DO NOTHING
+""")
+
+INSERT_IDEMPOTENCY_KEY_QUERY = text("""
+    INSERT INTO idempotency_keys (key, user_id) VALUES (:key, :user_id)
+    ON CONFLICT (key) DO NOTHING
+    RETURNING user_id
+""")
+
+GET_IDEMPOTENCY_KEY_QUERY = text("""
+    SELECT user_id, pg_current_wal_lsn()::text FROM idempotency_keys WHERE key = :key
+""")
+
+# Позиция в WAL мастера после записи: реплика, применившая ее, видит записанные данные
+CURRENT_WAL_LSN_QUERY = text("""
+    SELECT pg_current_wal_lsn()::text
+""")
+
+# Запросы горячих путей (вход, профиль, поиск) подготавливаются на сервере один раз на соединение
+GET_USER_PASSWORD_STATEMENT = PreparedStatement('get_user_password', """
+    SELECT password FROM users WHERE id = :id
+""")
+
+GET_USER_STATEMENT = PreparedStatement('get_user', """
+    SELECT id, password, first_name, second_name, birthdate, biography, city 
+    FROM users WHERE id = :id
+""")
+
+# Профили пачки пользователей одним запросом (ANY по массиву uuid[])
+GET_USERS_STATEMENT = PreparedStatement('get_users', """
+    SELECT id, password, first_name, second_name, birthdate, biography, city
+    FROM users WHERE id = ANY(:ids)
+""")
+
+# Частоты имен и фамилий для подсказок: имя в нижнем регистре, самое частое написание
+# и количество пользователей
+NAME_FREQUENCIES_QUERIES = {
+    column: text(f"""
+        SELECT {column}_lower, mode() WITHIN GROUP (ORDER BY {column}), count(*)
+        FROM users
+        WHERE {column}_lower <> ''
+        GROUP BY {column}_lower
+    """)
+    for column in ('first_name', 'second_name')
+}
+
+
+class IdempotencyKeyExistsError(Exception):
+    """
+    Исключение, возникающее когда ключ идемпотентности уже использован
+    (например, параллельным запросом с тем же ключом)
+    """
+
+    def __init__(self, user_id: uuid.UUID, lsn: str):
+        super().__init__(f"Ключ идемпотентности уже использован для пользователя {user_id}")
+        self.user_id = user_id
+        self.lsn = lsn
+
+
+def _user_to_params(user: User) -> dict:
+    """Подготавливает данные для всех полей таблицы"""
+    return {
+        'id': user.id,
+        'password': user.password,
+        'first_name': user.first_name,
+        'second_name': user.second_name,
+        'birthdate': user.birthdate,
+        'biography': user.biography,
+        'city': user.city
+    }
+
+
+def _copy_value(value) -> str:
+    """Значение поля в текстовом формате COPY (разделитель - табуляция)"""
+    if value is None:
+        return '\\N'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def _users_to_copy_buffer(users: List[User]) -> io.StringIO:
+    """Формирует данные для COPY FROM в том же формате, что и load-tests/hw-09/insert_people.py"""
+    buffer = io.StringIO()
+    for user in users:
+        params = _user_to_params(user)
+        buffer.write('\t'.join(_copy_value(params[column]) for column in COPY_USER_COLUMNS))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+def _user_to_copy_record(user: User) -> tuple:
+    """Строка для COPY через asyncpg: значения в типах колонок"""
+    params = _user_to_params(user)
+    return tuple(params[column] for column in COPY_USER_COLUMNS)
+
+
+def _row_to_user(row) -> User:
+    return User(
+        user_id=row[0],
+        password=row[1],
+        first_name=row[2],
+        second_name=row[3],
+        birthdate=row[4],
+        biography=row[5],
+        city=row[6]
+    )
+
+
+def _search_sql(after: bool, limited: bool) -> str:
+    """Формирует SQL запрос поиска"""
+    # Условие по курсору добавляем только при наличии курсора,
+    # чтобы планировщик не получал лишнее OR-условие
+    after_condition = "AND id > :after" if after else ""
+    name_condition = (
+        "second_name_lower LIKE LOWER(:last_name_prefix) AND first_name_lower LIKE LOWER(:first_name_prefix)"
+    )
+    # ID и дата форматируются в БД: строка результата без преобразований становится UserCard
+    columns = "users.id::text, first_name, second_name, to_char(birthdate, 'YYYY-MM-DD'), biography, city"
+    if not limited:
+        # Поток отдает все найденные строки, поэтому таблица читается сразу
+        return f"""
+            SELECT {columns}
+            FROM users
+            WHERE {name_condition}
+            {after_condition}
+            ORDER BY id
+        """
+    # Страница отбирается только по индексу idx_users_name_lower_search (id в INCLUDE),
+    # а остальные колонки читаются по первичному ключу для строк этой страницы
+    return f"""
+        WITH page AS MATERIALIZED (
+            SELECT id
+            FROM users
+            WHERE {name_condition}
+            {after_condition}
+            ORDER BY id
+            LIMIT :limit
+        )
+        SELECT {columns}
+        FROM page JOIN users USING (id)
+        ORDER BY id
+    """
+
+
+# Вариантов запроса поиска всего четыре (с курсором и без, с лимитом и без), поэтому
+# они строятся один раз. Страницы поиска выполняются подготовленными запросами,
+# а потоковый поиск - обычными: серверный курсор нельзя объявить для EXECUTE.
+# Префиксы LIKE становятся диапазоном индекса только в плане под конкретные значения,
+# поэтому общий план для запросов поиска отключен (custom_plan)
+SEARCH_USERS_STATEMENTS = {
+    after: PreparedStatement(
+        'search_users_after' if after else 'search_users', _search_sql(after, limited=True), custom_plan=True
+    )
+    for after in (False, True)
+}
+
+STREAM_SEARCH_USERS_QUERIES = {after: text(_search_sql(after, limited=False)) for after in (False, True)}
+
+
+def _search_params(search_query: UserSearchQuery, limited: bool) -> dict:
+    """Формирует параметры запроса поиска"""
+    # Добавляем символ % для поиска по префиксу
+    params = {
+        'first_name_prefix': f"{search_query.first_name}%",
+        'last_name_prefix': f"{search_query.last_name}%",
+    }
+    if limited:
+        params['limit'] = search_query.limit
+    if search_query.after:
+        params['after'] = search_query.after
+    return params
+
+
+@singleton
+class NameFrequencyRepository:
+    """
+    Частоты имен для подсказок. Читаются фоновым потоком через отдельный BackgroundEngine,
+    поэтому репозиторий работает одинаково в синхронном и асинхронном режимах приложения
+    """
+
+    @inject
+    def __init__(self, engine: BackgroundEngine):
+        self.engine = engine
+
+    @timed_repository_method
+    def get_name_frequencies(self) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Частоты имен и фамилий всех пользователей
+
+        Returns:
+            Tuple[List[tuple], List[tuple]]: Строки (имя в нижнем регистре, самое частое
+            написание, количество пользователей) для имен и для фамилий
+        """
+        with self.engine.connect() as connection:
+            return tuple(
+                [tuple(row) for row in connection.execute(NAME_FREQUENCIES_QUERIES[column])]
+                for column in ('first_name', 'second_name')
+            )
+
 
 @singleton
 class UserRepository:
 
     @inject
-    def __init__(self, write_engine: WriteEngine, read_only_engine: ReadOnlyEngine):
+    def __init__(
+        self,
+        write_engine: WriteEngine,
+        read_only_engine: ReadOnlyEngine,
+        write_retry: WriteRetryPolicy,
+        name_index: NameIndexSearch,
+    ):
         self.write_engine = write_engine
         self.read_only_engine = read_only_engine
+        self.write_retry = write_retry
+        self.name_index = name_index
 
-    def insert_user(self, user: User):
-        # Подготавливаем данные для всех полей таблицы
-        user_data = {
-            'id': user.id,
-            'password': user.password,
-            'first_name': user.first_name,
-            'second_name': user.second_name,
-            'birthdate': user.birthdate,
-            'biography': user.biography,
-            'city': user.city
-        }
-        query = text("""
-            INSERT INTO users (id, password, first_name, second_name, birthdate, biography, city)
-            VALUES (:id, :password, :first_name, :second_name, :birthdate, :biography, :city)
-        """)
-        
-        with self.write_engine.connect() as connection:
-            connection.execute(query, user_data)
-            connection.commit()
+    @timed_repository_method
+    def insert_user(self, user: User, idempotency_key: Optional[str] = None) -> str:
+        """
+        Сохраняет пользователя. При переключении мастера запись повторяется.
+
+        Args:
+            user: Пользователь
+            idempotency_key: Ключ идемпотентности, сохраняемый в той же транзакции
+
+        Returns:
+            str: LSN мастера после фиксации транзакции (для токена согласованности)
+
+        Raises:
+            IdempotencyKeyExistsError: Если ключ уже использован
+        """
+        params = _user_to_params(user)
+
+        def insert():
+            with self.write_engine.connect() as connection:
+                if idempotency_key is not None:
+                    inserted = connection.execute(
+                        INSERT_IDEMPOTENCY_KEY_QUERY, {'key': idempotency_key, 'user_id': user.id}
+                    ).fetchone()
+                    if inserted is None:
+                        connection.rollback()
+                        user_id, lsn = connection.execute(GET_IDEMPOTENCY_KEY_QUERY, {'key': idempotency_key}).one()
+                        raise IdempotencyKeyExistsError(user_id, lsn)
+                connection.execute(INSERT_USER_QUERY, params)
+                connection.commit()
+                return connection.execute(CURRENT_WAL_LSN_QUERY).scalar()
+
+        return self.write_retry.run(self.write_engine, insert)
+
+    @timed_repository_method
+    def insert_users(self, users: List[User]) -> str:
+        """
+        Сохраняет пакет пользователей одной командой COPY в одной транзакции.
+        При переключении мастера пакет повторяется целиком.
 
+        Args:
+            users: Пользователи
+
+        Returns:
+            str: LSN мастера после фиксации транзакции (для токена согласованности)
+        """
+        def insert():
+            with self.write_engine.connect() as connection:
+                connection.execute(CREATE_USERS_BATCH_TABLE_QUERY)
+                # COPY выполняется курсором psycopg2 в той же транзакции
+                cursor = connection.connection.cursor()
+                try:
+                    cursor.copy_from(
+                        _users_to_copy_buffer(users), 'users_batch', sep='\t', null='\\N', columns=COPY_USER_COLUMNS
+                    )
+                finally:
+                    cursor.close()
+                connection.execute(INSERT_USERS_FROM_BATCH_QUERY)
+                connection.commit()
+                return connection.execute(CURRENT_WAL_LSN_QUERY).scalar()
+
+        return self.write_retry.run(self.write_engine, insert)
+
+    @timed_repository_method
+    def find_registration(self, idempotency_key: str) -> Optional[Tuple[uuid.UUID, str]]:
+        """
+        Ищет пользователя, зарегистрированного с ключом идемпотентности
+
+        Returns:
+            Optional[Tuple[uuid.UUID, str]]: ID пользователя и текущий LSN мастера или None
+        """
+        def find():
+            with self.write_engine.connect() as connection:
+                row = connection.execute(GET_IDEMPOTENCY_KEY_QUERY, {'key': idempotency_key}).fetchone()
+                return (row[0], row[1]) if row else None
+
+        return self.write_retry.run(self.write_engine, find)
+
+    @timed_repository_method
     def get_user_password(self, user_id: uuid.UUID):
-        query = text("""
-            SELECT password FROM users WHERE id = :id
-        """)
-        with self.write_engine.connect() as connection:
-            result = connection.execute(query, {'id': str(user_id)})
-            row = result.fetchone()
-            return row[0] if row else None
-
-    def get_user(self, user_id: uuid.UUID):
-        query = text("""
-            SELECT id, password, first_name, second_name, birthdate, biography, city 
-            FROM users WHERE id = :id
-        """)
-        with self.read_only_engine.connect() as connection:
-            result = connection.execute(query, {'id': str(user_id)})
+        def get_password():
+            with self.write_engine.connect() as connection:
+                result = GET_USER_PASSWORD_STATEMENT.execute(connection, {'id': user_id})
+                row = result.fetchone()
+                return row[0] if row else None
+
+        return self.write_retry.run(self.write_engine, get_password)
+
+    @timed_repository_method
+    def get_user(self, user_id: uuid.UUID, min_lsn: Optional[int] = None):
+        with connect_for_read(self.read_only_engine, self.write_engine, min_lsn) as connection:
+            result = GET_USER_STATEMENT.execute(connection, {'id': user_id})
             row = result.fetchone()
-            if row:
-                return User(
-                    user_id=uuid.UUID(row[0]),
-                    password=row[1],
-                    first_name=row[2],
-                    second_name=row[3],
-                    birthdate=row[4],
-                    biography=row[5],
-                    city=row[6]
-                )
-            return None
+            return _row_to_user(row) if row else None
+
+    @timed_repository_method
+    def get_users(self, user_ids: List[uuid.UUID], min_lsn: Optional[int] = None) -> List[User]:
+        """
+        Получает профили нескольких пользователей одним запросом
+
+        Args:
+            user_ids: ID пользователей
+            min_lsn: Минимальный LSN из токена согласованности
+
+        Returns:
+            List[User]: Найденные пользователи (в произвольном порядке, отсутствующих нет)
+        """
+        if not user_ids:
+            return []
+        with connect_for_read(self.read_only_engine, self.write_engine, min_lsn) as connection:
+            result = GET_USERS_STATEMENT.execute(connection, {'ids': list(user_ids)})
+            return [_row_to_user(row) for row in result]
 
-    def search_users(self, search_query: UserSearchQuery):
+    @timed_repository_method
+    def search_users(self, search_query: UserSearchQuery, min_lsn: Optional[int] = None):
         """
         Поиск пользователей по префиксу имени и фамилии (регистронезависимый).
+        Возвращает не более search_query.limit пользователей с ID больше
+        search_query.after (keyset-пагинация по id).
+        Если включен индекс имен (NAME_INDEX_PATH), поиск выполняется в памяти без
+        обращения к БД; с токеном согласованности - всегда в БД.
         
         Args:
             search_query: Объект с критериями поиска
+            min_lsn: Минимальный LSN из токена согласованности (читать только с догнавшей реплики)
             
         Returns:
-            List[User]: Список найденных пользователей
+            List[UserCard]: Анкеты найденных пользователей
         """
-        query = text("""
-            SELECT id, first_name, second_name, birthdate, biography, city 
-            FROM users 
-            WHERE LOWER(second_name) LIKE LOWER(:last_name_prefix) and LOWER(first_name) LIKE LOWER(:first_name_prefix)
-            ORDER BY id
-        """)
+        if min_lsn is None:
+            cards = self.name_index.search(search_query)
+            if cards is not None:
+                return cards
+
+        statement = SEARCH_USERS_STATEMENTS[bool(search_query.after)]
+        params = _search_params(search_query, limited=True)
+        
+        with connect_for_read(self.read_only_engine, self.write_engine, min_lsn) as connection:
+            result = statement.execute(connection, params)
+            return [UserCard._make(row) for row in result]
+
+    @timed_repository_method
+    def iter_search_users(
+        self,
+        search_query: UserSearchQuery,
+        batch_size: int = STREAM_BATCH_SIZE,
+        min_lsn: Optional[int] = None,
+    ):
+        """
+        Потоковый поиск пользователей без ограничения количества результатов.
+        Строки читаются через именованный (серверный) курсор psycopg2 пачками
+        по batch_size, поэтому в памяти одновременно находится не больше одной пачки.
+        Соединение удерживается, пока генератор не будет исчерпан или закрыт.
+        
+        Args:
+            search_query: Объект с критериями поиска (limit игнорируется)
+            batch_size: Количество строк, запрашиваемых у сервера за раз
+            min_lsn: Минимальный LSN из токена согласованности
+            
+        Yields:
+            UserCard: Анкеты найденных пользователей в порядке возрастания ID
+        """
+        if min_lsn is None:
+            cards = self.name_index.iter_search(search_query)
+            if cards is not None:
+                yield from cards
+                return
+
+        query = STREAM_SEARCH_USERS_QUERIES[bool(search_query.after)]
+        params = _search_params(search_query, limited=False)
         
-        # Добавляем символ % для поиска по префиксу
-        params = {
-            'first_name_prefix': f"{search_query.first_name}%",
-            'last_name_prefix': f"{search_query.last_name}%"
-        }
+        with connect_for_read(self.read_only_engine, self.write_engine, min_lsn) as connection:
+            # stream_results включает серверный курсор в psycopg2
+            result = connection.execution_options(
+                stream_results=True, max_row_buffer=batch_size
+            ).execute(query, params)
+            for partition in result.partitions(batch_size):
+                for row in partition:
+                    yield UserCard._make(row)
+
+
+@singleton
+class AsyncUserRepository:
+    """
+    Асинхронный вариант UserRepository поверх asyncpg.
+    Использует те же SQL запросы, но не блокирует event loop на время обращения к БД.
+    """
+
+    @inject
+    def __init__(
+        self,
+        write_engine: AsyncWriteEngine,
+        read_only_engine: AsyncReadOnlyEngine,
+        write_retry: WriteRetryPolicy,
+        name_index: NameIndexSearch,
+    ):
+        self.write_engine = write_engine
+        self.read_only_engine = read_only_engine
+        self.write_retry = write_retry
+        self.name_index = name_index
+
+    @timed_repository_method
+    async def insert_user(self, user: User, idempotency_key: Optional[str] = None) -> str:
+        """Асинхронный аналог UserRepository.insert_user"""
+        params = _user_to_params(user)
+        # asyncpg не приводит типы сам: дата должна быть date
+        if isinstance(params['birthdate'], str):
+            params['birthdate'] = date.fromisoformat(params['birthdate'])
         
-        with self.read_only_engine.connect() as connection:
-            result = connection.execute(query, params)
-            users = []
-            for row in result:
-                user = User(
-                    user_id=uuid.UUID(row[0]),
-                    password=None,  # Пароль не возвращается при поиске
-                    first_name=row[1],
-                    second_name=row[2],
-                    birthdate=row[3],
-                    biography=row[4],
-                    city=row[5]
+        async def insert():
+            async with self.write_engine.connect() as connection:
+                if idempotency_key is not None:
+                    inserted = (await connection.execute(
+                        INSERT_IDEMPOTENCY_KEY_QUERY, {'key': idempotency_key, 'user_id': user.id}
+                    )).fetchone()
+                    if inserted is None:
+                        await connection.rollback()
+                        user_id, lsn = (
+                            await connection.execute(GET_IDEMPOTENCY_KEY_QUERY, {'key': idempotency_key})
+                        ).one()
+                        raise IdempotencyKeyExistsError(user_id, lsn)
+                await connection.execute(INSERT_USER_QUERY, params)
+                await connection.commit()
+                return (await connection.execute(CURRENT_WAL_LSN_QUERY)).scalar()
+
+        return await self.write_retry.run_async(self.write_engine, insert)
+
+    @timed_repository_method
+    async def insert_users(self, users: List[User]) -> str:
+        """Асинхронный аналог UserRepository.insert_users (COPY через asyncpg)"""
+        records = [_user_to_copy_record(user) for user in users]
+
+        async def insert():
+            async with self.write_engine.connect() as connection:
+                await connection.execute(CREATE_USERS_BATCH_TABLE_QUERY)
+                raw_connection = await connection.get_raw_connection()
+                # Транзакция уже открыта на этом соединении asyncpg, COPY выполняется в ней
+                await raw_connection.driver_connection.copy_records_to_table(
+                    'users_batch', records=records, columns=COPY_USER_COLUMNS
                 )
-                users.append(user)
-            return users
\ No newline at end of file
+                await connection.execute(INSERT_USERS_FROM_BATCH_QUERY)
+                await connection.commit()
+                return (await connection.execute(CURRENT_WAL_LSN_QUERY)).scalar()
+
+        return await self.write_retry.run_async(self.write_engine, insert)
+
+    @timed_repository_method
+    async def find_registration(self, idempotency_key: str) -> Optional[Tuple[uuid.UUID, str]]:
+        """Асинхронный аналог UserRepository.find_registration"""
+        async def find():
+            async with self.write_engine.connect() as connection:
+                row = (await connection.execute(GET_IDEMPOTENCY_KEY_QUERY, {'key': idempotency_key})).fetchone()
+                return (row[0], row[1]) if row else None
+
+        return await self.write_retry.run_async(self.write_engine, find)
+
+    @timed_repository_method
+    async def get_user_password(self, user_id: uuid.UUID):
+        async def get_password():
+            async with self.write_engine.connect() as connection:
+                result = await GET_USER_PASSWORD_STATEMENT.execute_async(connection, {'id': user_id})
+                row = result.fetchone()
+                return row[0] if row else None
+
+        return await self.write_retry.run_async(self.write_engine, get_password)
+
+    @timed_repository_method
+    async def get_user(self, user_id: uuid.UUID, min_lsn: Optional[int] = None):
+        async with connect_for_read(self.read_only_engine, self.write_engine, min_lsn) as connection:
+            result = await GET_USER_STATEMENT.execute_async(connection, {'id': user_id})
+            row = result.fetchone()
+            return _row_to_user(row) if row else None
+
+    @timed_repository_method
+    async def get_users(self, user_ids: List[uuid.UUID], min_lsn: Optional[int] = None) -> List[User]:
+        """Асинхронный аналог UserRepository.get_users"""
+        if not user_ids:
+            return []
+        async with connect_for_read(self.read_only_engine, self.write_engine, min_lsn) as connection:
+            result = await GET_USERS_STATEMENT.execute_async(connection, {'ids': list(user_ids)})
+            return [_row_to_user(row) for row in result]
+
+    @timed_repository_method
+    async def search_users(self, search_query: UserSearchQuery, min_lsn: Optional[int] = None):
+        """Асинхронный аналог UserRepository.search_users"""
+        if min_lsn is None:
+            cards = self.name_index.search(search_query)
+            if cards is not None:
+                return cards
+
+        statement = SEARCH_USERS_STATEMENTS[bool(search_query.after)]
+        params = _search_params(search_query, limited=True)
+        
+        async with connect_for_read(self.read_only_engine, self.write_engine, min_lsn) as connection:
+            result = await statement.execute_async(connection, params)
+            return [UserCard._make(row) for row in result]
+
+    @timed_repository_method
+    async def iter_search_users(
+        self,
+        search_query: UserSearchQuery,
+        batch_size: int = STREAM_BATCH_SIZE,
+        min_lsn: Optional[int] = None,
+    ):
+        """Асинхронный аналог UserRepository.iter_search_users (серверный курсор asyncpg)"""
+        if min_lsn is None:
+            cards = self.name_index.iter_search(search_query)
+            if cards is not None:
+                for card in cards:
+                    yield card
+                return
+
+        query = STREAM_SEARCH_USERS_QUERIES[bool(search_query.after)]
+        params = _search_params(search_query, limited=False)
+        
+        async with connect_for_read(self.read_only_engine, self.write_engine, min_lsn) as connection:
+            # asyncpg подготавливает и потоковый запрос, поэтому общий план отключается и здесь
+            await connection.execute(FORCE_CUSTOM_PLAN_QUERY)
+            result = await connection.stream(
+                query.execution_options(yield_per=batch_size), params
+            )
+            async for partition in result.partitions(batch_size):
+                for row in partition:
+                    yield UserCard._make(row)
@@ -0,0 +1,12 @@
+"""
+Шардирование диалогов: кольцо консистентного хеширования, раскладка диалогов
+по шардам и маршрутизация запросов к Engine шардов
+"""
+from .directory import LayoutDirectory
+from .layout import COPYING, MOVED, SWITCHED, DialogPlacement, ShardLayout
+from .ring import HashRing
+from .router import ShardRouter
+
+__all__ = [
+    'COPYING', 'MOVED', 'SWITCHED', 'DialogPlacement', 'HashRing', 'LayoutDirectory', 'ShardLayout', 'ShardRouter',
+]
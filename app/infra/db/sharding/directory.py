@@ -0,0 +1,134 @@
+"""
+Раскладка диалогов по шардам, которая хранится в основной базе
+"""
+import logging
+import os
+import threading
+import time
+from typing import Iterable, Optional
+
+from sqlalchemy import Engine, text
+
+from infra.db.config.write_failover import DatabaseUnavailableError
+from .layout import DialogPlacement, ShardLayout
+from .ring import HashRing
+
+logger = logging.getLogger(__name__)
+
+# Кольцо - единственная строка dialog_ring. Пока ее нет, в кольце все настроенные шарды
+RING_QUERY = text("""
+    SELECT shards, next_shards, state FROM dialog_ring
+""")
+
+PLACEMENTS_QUERY = text("""
+    SELECT user_low::text || ':' || user_high::text, shard, source_shard, state FROM dialog_placements
+""")
+
+
+def load_layout(connection, shard_names: Iterable[str]) -> ShardLayout:
+    """
+    Читает раскладку из dialog_ring и dialog_placements
+
+    Args:
+        connection: Соединение с основной базой
+        shard_names: Настроенные шарды - кольцо, пока кольцо не сохранено в базе
+
+    Raises:
+        ValueError: Если раскладка ссылается на шард, которого нет в shard_names
+    """
+    shard_names = set(shard_names)
+    row = connection.execute(RING_QUERY).first()
+    shards, next_shards, ring_state = row if row is not None else (shard_names, None, None)
+    placements = {
+        routing_key: DialogPlacement(shard, source_shard, state)
+        for routing_key, shard, source_shard, state in connection.execute(PLACEMENTS_QUERY)
+    }
+    layout = ShardLayout(HashRing(shards), HashRing(next_shards) if next_shards else None, ring_state, placements)
+    unknown = layout.shards() - shard_names
+    if unknown:
+        raise ValueError(f"Шарды {', '.join(sorted(unknown))} не настроены в DIALOG_SHARD_URLS")
+    return layout
+
+
+class LayoutDirectory:
+    """
+    Кэш раскладки диалогов по шардам, который периодически перечитывается
+    из основной базы в фоновом потоке. Поток запускается при первом обращении
+    (уже после fork-а worker-а), первая загрузка синхронная.
+
+    Инструмент переезда (infra.db.sharding.reshard) меняет раскладку и ждет,
+    пока все экземпляры приложения ее перечитают. Поэтому экземпляр, который
+    не смог перечитать раскладку дольше max_staleness секунд, не маршрутизирует
+    запросы по устаревшей раскладке, а отвечает, что база недоступна.
+    """
+
+    def __init__(self, engine: Engine, shard_names: Iterable[str], refresh_interval: float, max_staleness: float):
+        self.engine = engine
+        self.shard_names = sorted(shard_names)
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self._layout: Optional[ShardLayout] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._started = False
+        self._stopped = threading.Event()
+
+    @classmethod
+    def from_env(cls, engine: Engine, shard_names: Iterable[str]) -> "LayoutDirectory":
+        """
+        Создает кэш раскладки с настройками из переменных среды:
+            DIALOG_LAYOUT_REFRESH_INTERVAL - период перечитывания раскладки в секундах (по умолчанию 1)
+            DIALOG_LAYOUT_MAX_STALENESS - возраст раскладки, после которого запросы к диалогам
+                отклоняются (по умолчанию 10)
+        """
+        return cls(
+            engine,
+            shard_names,
+            refresh_interval=float(os.getenv('DIALOG_LAYOUT_REFRESH_INTERVAL', '1')),
+            max_staleness=float(os.getenv('DIALOG_LAYOUT_MAX_STALENESS', '10')),
+        )
+
+    def current(self) -> ShardLayout:
+        """
+        Текущая раскладка
+
+        Raises:
+            DatabaseUnavailableError: Если раскладку не удалось перечитать дольше max_staleness секунд
+        """
+        self._ensure_started()
+        layout = self._layout
+        if layout is None or time.monotonic() - self._loaded_at > self.max_staleness:
+            raise DatabaseUnavailableError("Раскладка диалогов по шардам устарела: основная база недоступна")
+        return layout
+
+    def refresh(self):
+        """Перечитывает раскладку. При ошибке остается прежняя раскладка"""
+        # Момент до запроса: раскладка не старше изменений, зафиксированных до него
+        started_at = time.monotonic()
+        try:
+            with self.engine.connect() as connection:
+                layout = load_layout(connection, self.shard_names)
+        except Exception as e:
+            logger.error("Не удалось перечитать раскладку диалогов: %s", e)
+            return
+        self._layout = layout
+        self._loaded_at = started_at
+
+    def stop(self):
+        """Останавливает фоновое перечитывание"""
+        self._stopped.set()
+
+    def _ensure_started(self):
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            self.refresh()
+            thread = threading.Thread(target=self._run, name="dialog-layout", daemon=True)
+            thread.start()
+            self._started = True
+
+    def _run(self):
+        while not self._stopped.wait(self.refresh_interval):
+            self.refresh()
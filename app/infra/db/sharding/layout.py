@@ -0,0 +1,89 @@
+"""
+Раскладка диалогов по шардам: кольцо, его смена и переезды отдельных диалогов
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from model.dialog import DialogKey
+from .ring import HashRing
+
+# Состояния переезда диалога (и смены кольца) между шардами:
+#   copying  - данные копируются: чтение со старого шарда, запись в оба
+#   switched - данные скопированы: чтение с нового шарда, запись в оба,
+#              чтобы экземпляры со старой раскладкой не потеряли сообщения
+#   moved    - переезд завершен: чтение и запись только на новом шарде
+COPYING = 'copying'
+SWITCHED = 'switched'
+MOVED = 'moved'
+
+
+class DialogPlacement(NamedTuple):
+    """Шард диалога, закрепленный в обход кольца, и шард, с которого диалог переезжает"""
+    shard: str
+    source_shard: Optional[str]
+    state: str
+
+
+def _route(source: str, target: str, state: str) -> Tuple[str, List[str]]:
+    if source == target:
+        return target, [target]
+    if state == COPYING:
+        return source, [source, target]
+    if state == SWITCHED:
+        return target, [target, source]
+    return target, [target]
+
+
+@dataclass(frozen=True)
+class ShardLayout:
+    """
+    Снимок раскладки диалогов по шардам.
+
+    Диалог принадлежит шарду по кольцу консистентного хеширования ring.
+    Пока кольцо меняется, next_ring - новое кольцо, а ring_state - состояние
+    переезда (copying или switched) всех диалогов, у которых по новому кольцу другой шард.
+    placements закрепляют отдельные диалоги за шардами в обход колец
+    (ключ - DialogKey.routing_key()).
+    """
+    ring: HashRing
+    next_ring: Optional[HashRing] = None
+    ring_state: Optional[str] = None
+    placements: Dict[str, DialogPlacement] = field(default_factory=dict)
+
+    def owner(self, key: DialogKey) -> str:
+        """Шард диалога по кольцу (по новому кольцу, если кольцо меняется)"""
+        ring = self.next_ring or self.ring
+        return ring.shard_for(key.routing_key())
+
+    def route(self, key: DialogKey) -> Tuple[str, List[str]]:
+        """
+        Returns:
+            Tuple[str, List[str]]: Шард для чтения диалога и шарды для записи
+        """
+        routing_key = key.routing_key()
+        placement = self.placements.get(routing_key)
+        if placement is not None:
+            return _route(placement.source_shard or placement.shard, placement.shard, placement.state)
+        shard = self.ring.shard_for(routing_key)
+        if self.next_ring is not None:
+            return _route(shard, self.next_ring.shard_for(routing_key), self.ring_state)
+        return shard, [shard]
+
+    def read_shard(self, key: DialogKey) -> str:
+        """Шард, с которого читается диалог"""
+        return self.route(key)[0]
+
+    def write_shards(self, key: DialogKey) -> List[str]:
+        """Шарды, в которые записываются сообщения диалога"""
+        return self.route(key)[1]
+
+    def shards(self) -> Set[str]:
+        """Все шарды, которые упоминаются в раскладке"""
+        shards = set(self.ring.shards)
+        if self.next_ring is not None:
+            shards.update(self.next_ring.shards)
+        for placement in self.placements.values():
+            shards.add(placement.shard)
+            if placement.source_shard:
+                shards.add(placement.source_shard)
+        return shards
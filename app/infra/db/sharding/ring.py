@@ -0,0 +1,35 @@
+"""
+Консистентное хеширование ключей по шардам
+"""
+import hashlib
+from bisect import bisect_right
+from typing import Iterable, List
+
+
+def _hash(value: str) -> int:
+    # Встроенный hash() строк зависит от процесса (PYTHONHASHSEED), нужен стабильный
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """
+    Кольцо консистентного хеширования: каждый шард занимает vnodes точек кольца,
+    ключ принадлежит шарду первой точки по часовой стрелке от хеша ключа.
+
+    Расположение зависит только от имен шардов, а не от их порядка в настройках.
+    При добавлении шарда к нему переходит примерно 1/N ключей, остальные
+    остаются на своих шардах.
+    """
+
+    def __init__(self, shards: Iterable[str], vnodes: int = 160):
+        self.shards: List[str] = sorted(set(shards))
+        if not self.shards:
+            raise ValueError("Нужен хотя бы один шард")
+        points = sorted((_hash(f"{shard}#{i}"), shard) for shard in self.shards for i in range(vnodes))
+        self._hashes = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def shard_for(self, key: str) -> str:
+        """Шард, которому принадлежит ключ"""
+        index = bisect_right(self._hashes, _hash(key))
+        return self._owners[index % len(self._owners)]
@@ -0,0 +1,36 @@
+"""
+Маршрутизация запросов к диалогам по шардам
+"""
+from typing import Dict, Generic, List, Tuple, TypeVar
+
+from model.dialog import DialogKey
+from .directory import LayoutDirectory
+
+E = TypeVar("E")
+
+
+class ShardRouter(Generic[E]):
+    """
+    Выбирает Engine шарда для чтения и записи диалога по текущей раскладке.
+    Один и тот же класс маршрутизирует синхронные и асинхронные Engine
+    """
+
+    def __init__(self, directory: LayoutDirectory, engines: Dict[str, E]):
+        self.directory = directory
+        self.engines = engines
+
+    def read_engine(self, key: DialogKey) -> Tuple[str, E]:
+        """
+        Returns:
+            Tuple[str, E]: Имя и Engine шарда, с которого читается диалог
+        """
+        shard = self.directory.current().read_shard(key)
+        return shard, self.engines[shard]
+
+    def write_engines(self, key: DialogKey) -> List[Tuple[str, E]]:
+        """
+        Returns:
+            List[Tuple[str, E]]: Имена и Engine шардов, в которые записываются сообщения диалога.
+            Во время переезда диалога шардов два, первым идет шард, с которого диалог читается
+        """
+        return [(shard, self.engines[shard]) for shard in self.directory.current().write_shards(key)]
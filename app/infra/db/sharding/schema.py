@@ -0,0 +1,63 @@
+"""
+Схема шардов диалогов.
+
+Основная база мигрируется Alembic, а шарды - отдельные базы, поэтому таблицу
+сообщений в них создает этот модуль (init_app.py запускает его после миграций):
+    DIALOG_SHARD_URLS='shard-1=postgresql+psycopg2://...;shard-2=postgresql+psycopg2://...' \
+        python -m infra.db.sharding.schema
+"""
+import argparse
+import logging
+import os
+
+from sqlalchemy import create_engine, text
+
+from infra.db.config.sharding import parse_shard_urls
+
+logger = logging.getLogger(__name__)
+
+# Сообщения диалога лежат рядом по первичному ключу: страница диалога - диапазон индекса.
+# ID - UUIDv7, поэтому порядок ID - порядок отправки. Пользователи хранятся в основной базе,
+# внешних ключей между базами нет
+CREATE_DIALOG_MESSAGES_QUERY = text("""
+    CREATE TABLE IF NOT EXISTS dialog_messages (
+        user_low uuid NOT NULL,
+        user_high uuid NOT NULL,
+        id uuid NOT NULL,
+        from_user_id uuid NOT NULL,
+        text TEXT NOT NULL,
+        PRIMARY KEY (user_low, user_high, id),
+        CHECK (user_low < user_high),
+        CHECK (from_user_id IN (user_low, user_high))
+    )
+""")
+
+# Экземпляры приложения стартуют одновременно, а CREATE TABLE IF NOT EXISTS не защищен от гонки
+SCHEMA_LOCK_QUERY = text("""
+    SELECT pg_advisory_xact_lock(hashtext('dialog_messages'))
+""")
+
+
+def create_schema(engine):
+    """Создает таблицы диалогов в шарде, если их нет"""
+    with engine.begin() as connection:
+        connection.execute(SCHEMA_LOCK_QUERY)
+        connection.execute(CREATE_DIALOG_MESSAGES_QUERY)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for name, url in parse_shard_urls(os.getenv('DIALOG_SHARD_URLS')).items():
+        engine = create_engine(url)
+        try:
+            create_schema(engine)
+        finally:
+            engine.dispose()
+        logger.info("Схема диалогов в шарде %s готова", name)
+
+
+if __name__ == '__main__':
+    main()
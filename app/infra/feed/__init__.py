@@ -0,0 +1,8 @@
+"""
+Материализованные ленты постов: fan-out новых постов в ленты подписчиков
+и слияние с постами знаменитостей при чтении
+"""
+from .fanout import FEED_CELEBRITY_THRESHOLD, FEED_MAX_SIZE, FanoutWorker
+from .merge import merge_feed
+
+__all__ = ['FEED_CELEBRITY_THRESHOLD', 'FEED_MAX_SIZE', 'FanoutWorker', 'merge_feed']
@@ -0,0 +1,44 @@
+"""
+Слияние материализованной ленты с постами знаменитостей при чтении
+"""
+import heapq
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, List
+
+from model.post import Post
+
+
+def merge_feed(materialized: List[Post], celebrity_posts: Iterable[Post], limit: int) -> List[Post]:
+    """
+    k-way слияние страницы материализованной ленты и последних постов знаменитостей
+    от новых постов к старым. ID постов - UUIDv7 в каноническом виде, поэтому
+    порядок строк ID совпадает с порядком времени публикации.
+
+    Пост, разложенный по лентам до того, как автор стал знаменитостью,
+    может прийти из обоих источников - в странице он остается один раз.
+
+    Args:
+        materialized: Страница материализованной ленты в порядке убывания ID
+        celebrity_posts: Посты знаменитостей, сгруппированные по автору,
+            внутри автора - в порядке убывания ID
+        limit: Размер страницы
+
+    Returns:
+        List[Post]: Не больше limit постов в порядке убывания ID
+    """
+    sources = [materialized]
+    sources.extend(list(posts) for _, posts in groupby(celebrity_posts, key=itemgetter(2)))
+    if len(sources) == 1:
+        return materialized[:limit]
+
+    page: List[Post] = []
+    last_id = None
+    for post in heapq.merge(*sources, key=itemgetter(0), reverse=True):
+        if post[0] == last_id:
+            continue
+        page.append(post)
+        last_id = post[0]
+        if len(page) == limit:
+            break
+    return page
@@ -1,6 +1,6 @@
 """
 Модуль логирования
 """
-from .config import setup_logging
+from .config import set_log_level, setup_logging, shutdown_logging
 
-__all__ = ['setup_logging']
+__all__ = ['setup_logging', 'set_log_level', 'shutdown_logging']
@@ -1,28 +1,151 @@
 """
 Конфигурация системы логирования
 """
+import atexit
 import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .formatters import JsonFormatter
+
+TEXT_FORMAT = '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
+
+# Логгеры, уровень которых следует за уровнем приложения
+FRAMEWORK_LOGGERS = ('werkzeug', 'connexion')
+
+_listener: Optional[QueueListener] = None
+_level_watcher: Optional["LogLevelWatcher"] = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler, который не форматирует запись в потоке запроса.
+
+    Стандартный QueueHandler.prepare форматирует сообщение до постановки в очередь,
+    чтобы запись можно было передать в другой процесс. Очередь здесь внутри процесса,
+    поэтому запись передается как есть, а подстановка аргументов, форматирование
+    и запись в поток выполняются в потоке QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class LogLevelWatcher:
+    """
+    Меняет уровень логирования во время работы: раз в interval секунд читает
+    уровень из файла LOG_LEVEL_FILE. Каждый worker gunicorn следит за файлом сам,
+    поэтому новый уровень применяется во всех worker-ах.
+    """
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._current = None
+
+    def start(self):
+        self.check_once()
+        thread = threading.Thread(target=self._run, name="log-level-watcher", daemon=True)
+        thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def check_once(self):
+        """Применяет уровень из файла, если он изменился"""
+        try:
+            with open(self.path) as file:
+                level = file.read().strip().upper()
+        except OSError:
+            return
+        if not level or level == self._current:
+            return
+        try:
+            set_log_level(level)
+        except ValueError as e:
+            logging.getLogger(__name__).warning("Уровень логирования из %s не применен: %s", self.path, e)
+        self._current = level
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.check_once()
+
+
+def _create_formatter(log_format: str) -> logging.Formatter:
+    if log_format == 'json':
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def set_log_level(level):
+    """
+    Устанавливает уровень логирования приложения во время работы
+
+    Args:
+        level: Имя уровня (DEBUG, INFO, WARNING, ...) или его числовое значение
+
+    Raises:
+        ValueError: Если уровень неизвестен
+    """
+    if isinstance(level, str):
+        level = level.upper()
+        if not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"Неизвестный уровень логирования: {level}")
+    logging.getLogger().setLevel(level)
+    for name in FRAMEWORK_LOGGERS:
+        logging.getLogger(name).setLevel(level)
+
 
 def setup_logging():
-    """Настройка системы логирования"""
-    formatter = logging.Formatter(
-        '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
-    )
-    
-    # Хендлер для консоли
+    """
+    Настройка системы логирования.
+
+    Логгеры только ставят записи в очередь, а форматирование и вывод выполняются
+    в фоновом потоке QueueListener, поэтому запись лога не задерживает ответ.
+
+    Настройки из переменных среды:
+        LOG_LEVEL - уровень логирования (по умолчанию INFO)
+        LOG_FORMAT - text (по умолчанию) или json (одна JSON запись на строку)
+        LOG_LEVEL_FILE - файл, из которого уровень перечитывается во время работы
+        LOG_LEVEL_POLL_INTERVAL - период проверки LOG_LEVEL_FILE в секундах (по умолчанию 5)
+    """
+    global _listener, _level_watcher
+
+    # Хендлер для консоли работает в потоке QueueListener
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    console_handler.setLevel(logging.INFO)
-    
-    # Настраиваем корневой логгер
+    console_handler.setFormatter(_create_formatter(os.getenv('LOG_FORMAT', 'text').lower()))
+
+    # Повторная настройка заменяет очередь, созданную ранее
+    shutdown_logging()
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    root_logger.addHandler(console_handler)
-    
-    # Настраиваем логгер Flask
-    flask_logger = logging.getLogger('werkzeug')
-    flask_logger.setLevel(logging.INFO)
-    
-    # Настраиваем логгер Connexion
-    connexion_logger = logging.getLogger('connexion')
-    connexion_logger.setLevel(logging.INFO)
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            root_logger.removeHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(DeferredQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    set_log_level(os.getenv('LOG_LEVEL', 'INFO'))
+
+    level_file = os.getenv('LOG_LEVEL_FILE')
+    if level_file:
+        _level_watcher = LogLevelWatcher(level_file, float(os.getenv('LOG_LEVEL_POLL_INTERVAL', '5')))
+        _level_watcher.start()
+
+
+def shutdown_logging():
+    """Останавливает фоновый поток, предварительно выведя все записи из очереди"""
+    global _listener, _level_watcher
+    if _level_watcher is not None:
+        _level_watcher.stop()
+        _level_watcher = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,40 @@
+"""
+Модуль метрик в формате Prometheus
+"""
+from .registry import (
+    BCRYPT_DURATION,
+    BCRYPT_QUEUE_DEPTH,
+    BCRYPT_QUEUE_WAIT,
+    BCRYPT_REJECTED,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CONNECTIONS_IN_USE,
+    DB_STATEMENT_EXECUTIONS,
+    DB_STATEMENT_PREPARES,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_PROGRESS,
+    JWT_DURATION,
+    REPOSITORY_METHOD_DURATION,
+    METRICS_CONTENT_TYPE,
+    render_metrics,
+)
+from .instrumentation import instrument_engine, observe_duration, timed_repository_method
+
+__all__ = [
+    'BCRYPT_DURATION',
+    'BCRYPT_QUEUE_DEPTH',
+    'BCRYPT_QUEUE_WAIT',
+    'BCRYPT_REJECTED',
+    'DB_POOL_CHECKOUT_WAIT',
+    'DB_POOL_CONNECTIONS_IN_USE',
+    'DB_STATEMENT_EXECUTIONS',
+    'DB_STATEMENT_PREPARES',
+    'HTTP_REQUEST_DURATION',
+    'HTTP_REQUESTS_IN_PROGRESS',
+    'JWT_DURATION',
+    'REPOSITORY_METHOD_DURATION',
+    'METRICS_CONTENT_TYPE',
+    'render_metrics',
+    'instrument_engine',
+    'observe_duration',
+    'timed_repository_method',
+]
@@ -0,0 +1,9 @@
+"""
+Настройки gunicorn для сбора метрик со всех worker-ов (gunicorn -c python:infra.metrics.gunicorn_config)
+"""
+from infra.metrics.registry import mark_process_dead
+
+
+def child_exit(server, worker):
+    """Удаляет gauge-метрики завершившегося worker-а"""
+    mark_process_dead(worker.pid)
@@ -0,0 +1,114 @@
+"""
+Измерение времени операций: декораторы и подключение метрик к пулам соединений
+"""
+import functools
+import inspect
+import time
+
+from sqlalchemy import event
+
+from .registry import DB_POOL_CHECKOUT_WAIT, DB_POOL_CONNECTIONS_IN_USE, REPOSITORY_METHOD_DURATION
+
+
+def observe_duration(histogram):
+    """
+    Декоратор, записывающий время выполнения функции в гистограмму
+    (в том числе при исключении). Поддерживает обычные и асинхронные функции.
+
+    Args:
+        histogram: Гистограмма без меток или с уже заданными метками (Histogram.labels(...))
+    """
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started_at = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - started_at)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started_at)
+        return wrapper
+
+    return decorator
+
+
+def timed_repository_method(fn):
+    """
+    Декоратор метода репозитория: время выполнения записывается в
+    repository_method_duration_seconds с меткой method=<Класс>.<метод>.
+    Для генераторов измеряется время до исчерпания или закрытия генератора.
+    """
+    histogram = REPOSITORY_METHOD_DURATION.labels(method=fn.__qualname__)
+
+    if inspect.isasyncgenfunction(fn):
+        @functools.wraps(fn)
+        async def async_gen_wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                async for item in fn(*args, **kwargs):
+                    yield item
+            finally:
+                histogram.observe(time.perf_counter() - started_at)
+        return async_gen_wrapper
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def gen_wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                yield from fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started_at)
+        return gen_wrapper
+
+    return observe_duration(histogram)(fn)
+
+
+def instrument_engine(engine, name: str):
+    """
+    Подключает метрики пула соединений к Engine или AsyncEngine:
+    время получения соединения из пула и количество выданных соединений.
+    Повторный вызов для того же Engine ничего не делает.
+
+    Args:
+        engine: Engine или AsyncEngine
+        name: Значение метки engine (write, read_only, replica-1, ...)
+
+    Returns:
+        Тот же engine
+    """
+    sync_engine = getattr(engine, 'sync_engine', engine)
+    if getattr(sync_engine, '_metrics_engine_name', None) is not None:
+        return engine
+    sync_engine._metrics_engine_name = name
+
+    checkout_wait = DB_POOL_CHECKOUT_WAIT.labels(engine=name)
+    in_use = DB_POOL_CONNECTIONS_IN_USE.labels(engine=name)
+
+    # У пула нет события начала ожидания соединения, поэтому измеряется Engine.connect:
+    # его время - ожидание свободного соединения в пуле или установка нового.
+    # Атрибут экземпляра сохраняется и после Engine.dispose, который пересоздает пул
+    connect = sync_engine.connect
+
+    def timed_connect():
+        started_at = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            checkout_wait.observe(time.perf_counter() - started_at)
+
+    sync_engine.connect = timed_connect
+
+    # События пула, подписанные через Engine, переносятся и в пересозданный пул
+    event.listen(sync_engine, 'checkout', lambda *args: in_use.inc())
+    event.listen(sync_engine, 'checkin', lambda *args: in_use.dec())
+    return engine
@@ -0,0 +1,142 @@
+"""
+Метрики приложения и их выдача.
+
+Если задана переменная среды PROMETHEUS_MULTIPROC_DIR, prometheus_client пишет значения
+метрик каждого процесса в файлы в этом каталоге (shared memory через mmap), а /metrics
+собирает их со всех worker-ов gunicorn. Переменная должна быть задана до импорта
+prometheus_client, поэтому app.py выставляет ее перед запуском gunicorn.
+"""
+import os
+import shutil
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+MULTIPROCESS_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Границы корзин подобраны под ответы API: от единиц миллисекунд до нескольких секунд
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Время обработки HTTP запроса',
+    ['operation', 'method', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress',
+    'Количество обрабатываемых HTTP запросов',
+    ['operation'],
+    multiprocess_mode='livesum',
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Время получения соединения из пула (включая установку нового соединения)',
+    ['engine'],
+    buckets=LATENCY_BUCKETS,
+)
+
+DB_POOL_CONNECTIONS_IN_USE = Gauge(
+    'db_pool_connections_in_use',
+    'Количество соединений, выданных из пула',
+    ['engine'],
+    multiprocess_mode='livesum',
+)
+
+DB_STATEMENT_EXECUTIONS = Counter(
+    'db_statement_executions',
+    'Количество выполнений подготовленного запроса',
+    ['statement'],
+)
+
+DB_STATEMENT_PREPARES = Counter(
+    'db_statement_prepares',
+    'Количество подготовок запроса (PREPARE) в соединениях пула',
+    ['statement'],
+)
+
+REPOSITORY_METHOD_DURATION = Histogram(
+    'repository_method_duration_seconds',
+    'Время выполнения метода репозитория',
+    ['method'],
+    buckets=LATENCY_BUCKETS,
+)
+
+BCRYPT_DURATION = Histogram(
+    'bcrypt_duration_seconds',
+    'Время выполнения bcrypt в пуле процессов хэширования',
+    ['operation'],
+    buckets=LATENCY_BUCKETS,
+)
+
+BCRYPT_QUEUE_WAIT = Histogram(
+    'bcrypt_queue_wait_seconds',
+    'Время ожидания задачи bcrypt в очереди пула процессов',
+    ['operation'],
+    buckets=LATENCY_BUCKETS,
+)
+
+BCRYPT_QUEUE_DEPTH = Gauge(
+    'bcrypt_queue_depth',
+    'Количество задач bcrypt в очереди и в работе',
+    multiprocess_mode='livesum',
+)
+
+BCRYPT_REJECTED = Counter(
+    'bcrypt_rejected',
+    'Количество задач bcrypt, отклоненных из-за переполнения очереди',
+)
+
+JWT_DURATION = Histogram(
+    'jwt_duration_seconds',
+    'Время создания и проверки JWT токена',
+    ['operation'],
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
+
+
+def is_multiprocess_mode() -> bool:
+    """Проверяет, собираются ли метрики со всех процессов через PROMETHEUS_MULTIPROC_DIR"""
+    return bool(os.getenv(MULTIPROCESS_DIR_ENV))
+
+
+def prepare_multiprocess_dir(path: str):
+    """
+    Создает пустой каталог для файлов метрик worker-ов и задает PROMETHEUS_MULTIPROC_DIR.
+    Вызывается до запуска worker-ов: файлы предыдущего запуска исказили бы счетчики.
+    """
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+    os.environ[MULTIPROCESS_DIR_ENV] = path
+
+
+def mark_process_dead(pid: int):
+    """Удаляет gauge-метрики завершившегося worker-а, чтобы они не учитывались в livesum"""
+    if is_multiprocess_mode():
+        multiprocess.mark_process_dead(pid)
+
+
+def render_metrics() -> bytes:
+    """
+    Формирует ответ /metrics в текстовом формате Prometheus
+
+    Returns:
+        bytes: Метрики всех worker-ов (в режиме multiprocess) или текущего процесса
+    """
+    if is_multiprocess_mode():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
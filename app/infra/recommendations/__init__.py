@@ -0,0 +1,4 @@
+from .graph import FriendGraph
+from .job import RecommendationJob
+
+__all__ = ['FriendGraph', 'RecommendationJob']
@@ -0,0 +1,89 @@
+"""
+Граф дружбы в компактных массивах смежности и подбор друзей друзей
+"""
+import heapq
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+
+class FriendGraph:
+    """
+    Неизменяемый направленный граф дружбы в формате CSR: пользователи пронумерованы
+    в порядке ID, друзья пользователя i - срез targets[offsets[i]:offsets[i + 1]],
+    упорядоченный по номеру. На ребро приходится 4 байта вместо объектов Python.
+    """
+
+    def __init__(self, edges: Iterable[Tuple[str, str]]):
+        """
+        Args:
+            edges: Ребра (ID пользователя, ID друга)
+        """
+        edges = list(edges)
+        self.ids: List[str] = sorted({user_id for edge in edges for user_id in edge})
+        index: Dict[str, int] = {user_id: i for i, user_id in enumerate(self.ids)}
+        pairs = sorted((index[user_id], index[friend_id]) for user_id, friend_id in edges)
+
+        self.offsets = array('I', [0] * (len(self.ids) + 1))
+        self.targets = array('I', (friend for _, friend in pairs))
+        for user, _ in pairs:
+            self.offsets[user + 1] += 1
+        for i in range(len(self.ids)):
+            self.offsets[i + 1] += self.offsets[i]
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index_of(self, user_id: str) -> int:
+        """Номер пользователя или -1, если у него нет ребер"""
+        return self._index.get(user_id, -1)
+
+    def friends(self, user: int) -> Sequence[int]:
+        """Номера друзей пользователя с номером user"""
+        return self.targets[self.offsets[user]:self.offsets[user + 1]]
+
+    def degree(self, user: int) -> int:
+        return self.offsets[user + 1] - self.offsets[user]
+
+    def recommend(self, user: int, top_k: int, max_degree: int) -> List[Tuple[int, int]]:
+        """
+        Друзья друзей, которых еще нет в друзьях, по убыванию числа общих друзей
+        (при равенстве - по ID)
+
+        Args:
+            user: Номер пользователя
+            top_k: Количество рекомендаций
+            max_degree: Друзья с большим числом друзей не учитываются как общие:
+                через популярного пользователя рекомендуются все его друзья, а работа
+                растет как квадрат степени
+
+        Returns:
+            List[Tuple[int, int]]: Пары (номер кандидата, число общих друзей)
+        """
+        friends = self.friends(user)
+        counts = Counter()
+        for friend in friends:
+            if self.degree(friend) <= max_degree:
+                counts.update(self.friends(friend))
+        counts.pop(user, None)
+        for friend in friends:
+            counts.pop(friend, None)
+        return heapq.nsmallest(top_k, counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def recommend_all(
+        self, user_ids: Iterable[str], top_k: int, max_degree: int
+    ) -> Iterator[Tuple[str, List[Tuple[str, int]]]]:
+        """
+        Рекомендации для пользователей
+
+        Yields:
+            Tuple[str, List[Tuple[str, int]]]: ID пользователя и пары (ID кандидата, число общих друзей).
+            Пользователь без рекомендаций получает пустой список
+        """
+        for user_id in user_ids:
+            user = self.index_of(user_id)
+            if user < 0:
+                yield user_id, []
+                continue
+            yield user_id, [(self.ids[candidate], mutual) for candidate, mutual in self.recommend(user, top_k, max_degree)]
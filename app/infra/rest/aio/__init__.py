@@ -0,0 +1 @@
+# Асинхронные обработчики REST API (connexion AsyncApp, APP_MODE=async)
@@ -0,0 +1,50 @@
+import logging
+import uuid
+from application import injector
+from application.hashing_executor import HashingExecutor, HashingQueueFullError
+from application.jwt_service import JWTService
+from infra.db.config.write_failover import DatabaseUnavailableError
+from infra.db.repository.users import AsyncUserRepository
+from infra.rest.auth import DATABASE_RETRY_AFTER, HASHING_RETRY_AFTER
+
+logger = logging.getLogger(__name__)
+
+
+async def authenticate_user(body: dict = None):
+    """
+    Асинхронная функция аутентификации пользователя.
+    Соответствует operationId: authenticate_user в OpenAPI спецификации.
+    """
+    try:
+        logger.info("Processing authentication request")
+
+        if not body or 'id' not in body or 'password' not in body:
+            logger.warning("Authentication failed: missing id or password")
+            return {'error': 'Missing id or password'}, 400
+
+        user_id = uuid.UUID(body['id'])
+        password = body['password']
+        
+        logger.info("Authenticating user: %s", user_id)
+
+        password_from_db = await injector.get(AsyncUserRepository).get_user_password(user_id)
+
+        # Проверяем пароль с использованием bcrypt в пуле процессов, не блокируя event loop
+        if password_from_db and await injector.get(HashingExecutor).check_async(password, password_from_db):
+            # Создаем уникальный JWT токен для пользователя
+            token = JWTService.create_access_token(str(user_id))
+            logger.info("Authentication successful for user: %s", user_id)
+            return {'token': token}
+        else:
+            logger.warning("Authentication failed for user: %s - invalid credentials", user_id)
+            return {'error': 'Invalid credentials'}, 401
+
+    except HashingQueueFullError as e:
+        logger.warning("Authentication rejected: %s", e)
+        return {'message': str(e)}, 503, {'Retry-After': HASHING_RETRY_AFTER}
+    except DatabaseUnavailableError as e:
+        logger.error("Authentication rejected: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Authentication error: %s", e, exc_info=True)
+        return {'error': str(e)}, 500
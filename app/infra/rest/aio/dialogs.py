@@ -0,0 +1,65 @@
+import logging
+from connexion.context import context
+from starlette.responses import Response
+from application import injector
+from application.dialogs import AsyncDialogService, DEFAULT_DIALOG_LIMIT
+from application.users import UserNotFoundError
+from infra.db.config.write_failover import DatabaseUnavailableError
+from infra.rest.auth import DATABASE_RETRY_AFTER
+from infra.rest.serialization import JSON_MIMETYPE, dump_dialog, dump_message
+from infra.rest.users import NEXT_CURSOR_HEADER
+
+logger = logging.getLogger(__name__)
+
+
+def _current_user_id() -> str:
+    """Идентификатор текущего пользователя - subject токена, проверенного по схеме bearerAuth"""
+    return context['user']
+
+
+async def send_message(user_id: str, body: dict):
+    """
+    Асинхронная функция отправки сообщения пользователю user_id от текущего пользователя.
+    Соответствует operationId: send_message в OpenAPI спецификации.
+    """
+    logger.info("Запрос на отправку сообщения пользователю %s", user_id)
+
+    try:
+        message = await injector.get(AsyncDialogService).send_message(_current_user_id(), user_id, body.get('text'))
+        return Response(dump_message(message), media_type=JSON_MIMETYPE)
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': str(e)}, 400
+    except UserNotFoundError as e:
+        logger.warning("Получатель не найден: %s", e)
+        return {'message': 'Пользователь не найден'}, 404
+    except DatabaseUnavailableError as e:
+        logger.error("Отправка сообщения не выполнена: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка отправки сообщения: %s", e, exc_info=True)
+        return {'message': 'Ошибка отправки сообщения'}, 500
+
+
+async def list_messages(user_id: str, limit: int = DEFAULT_DIALOG_LIMIT, after: str = None):
+    """
+    Асинхронная функция получения диалога текущего пользователя с пользователем user_id.
+    Соответствует operationId: list_messages в OpenAPI спецификации.
+    """
+    logger.info("Запрос диалога с %s: limit=%s, after='%s'", user_id, limit, after)
+
+    try:
+        page = await injector.get(AsyncDialogService).list_messages(_current_user_id(), user_id, limit, after)
+        headers = {}
+        if page.next_cursor:
+            headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        return Response(dump_dialog(page), media_type=JSON_MIMETYPE, headers=headers)
+    except ValueError as e:
+        logger.warning("Невалидные параметры диалога: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except DatabaseUnavailableError as e:
+        logger.error("Чтение диалога не выполнено: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка получения диалога: %s", e, exc_info=True)
+        return {'message': 'Ошибка получения диалога'}, 500
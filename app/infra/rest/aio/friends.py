@@ -0,0 +1,106 @@
+import logging
+from connexion import NoContent
+from connexion.context import context
+from starlette.responses import Response
+from application import injector
+from application.friends import (
+    AsyncFriendService, DEFAULT_FRIENDS_LIMIT, DEFAULT_SUGGEST_FRIENDS_LIMIT, FriendNotFoundError,
+)
+from infra.db.config.write_failover import DatabaseUnavailableError
+from infra.rest.auth import DATABASE_RETRY_AFTER
+from infra.rest.serialization import JSON_MIMETYPE, dump_friend_recommendations, dump_user_cards
+from infra.rest.users import NEXT_CURSOR_HEADER
+
+logger = logging.getLogger(__name__)
+
+
+def _current_user_id() -> str:
+    """
+    Идентификатор текущего пользователя. Flask-декоратор require_auth в асинхронном
+    режиме недоступен, поэтому берется subject токена, проверенного по схеме bearerAuth
+    """
+    return context['user']
+
+
+async def add_friend(user_id: str):
+    """
+    Асинхронная функция добавления пользователя в друзья текущего пользователя.
+    Соответствует operationId: add_friend в OpenAPI спецификации.
+    """
+    logger.info("Запрос на добавление в друзья пользователя: %s", user_id)
+
+    try:
+        await injector.get(AsyncFriendService).add_friend(_current_user_id(), user_id)
+        return NoContent, 200
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': str(e)}, 400
+    except FriendNotFoundError as e:
+        logger.warning("Пользователь не найден: %s", e)
+        return {'message': 'Пользователь не найден'}, 404
+    except DatabaseUnavailableError as e:
+        logger.error("Добавление в друзья не выполнено: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка добавления в друзья: %s", e, exc_info=True)
+        return {'message': 'Ошибка добавления в друзья'}, 500
+
+
+async def delete_friend(user_id: str):
+    """
+    Асинхронная функция удаления пользователя из друзей текущего пользователя.
+    Соответствует operationId: delete_friend в OpenAPI спецификации.
+    """
+    logger.info("Запрос на удаление из друзей пользователя: %s", user_id)
+
+    try:
+        await injector.get(AsyncFriendService).delete_friend(_current_user_id(), user_id)
+        return NoContent, 200
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': str(e)}, 400
+    except DatabaseUnavailableError as e:
+        logger.error("Удаление из друзей не выполнено: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка удаления из друзей: %s", e, exc_info=True)
+        return {'message': 'Ошибка удаления из друзей'}, 500
+
+
+async def list_friends(limit: int = DEFAULT_FRIENDS_LIMIT, after: str = None):
+    """
+    Асинхронная функция получения списка друзей текущего пользователя.
+    Соответствует operationId: list_friends в OpenAPI спецификации.
+    """
+    logger.info("Запрос списка друзей: limit=%s, after='%s'", limit, after)
+
+    try:
+        page = await injector.get(AsyncFriendService).list_friends(_current_user_id(), limit, after)
+        headers = {}
+        if page.next_cursor:
+            headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        return Response(dump_user_cards(page.users), media_type=JSON_MIMETYPE, headers=headers)
+    except ValueError as e:
+        logger.warning("Невалидные параметры списка друзей: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except Exception as e:
+        logger.error("Ошибка получения списка друзей: %s", e, exc_info=True)
+        return {'message': 'Ошибка получения списка друзей'}, 500
+
+
+async def suggest_friends(limit: int = DEFAULT_SUGGEST_FRIENDS_LIMIT):
+    """
+    Асинхронная функция получения рекомендаций друзей текущего пользователя.
+    Соответствует operationId: suggest_friends в OpenAPI спецификации.
+    """
+    logger.info("Запрос рекомендаций друзей: limit=%s", limit)
+
+    try:
+        recommendations = await injector.get(AsyncFriendService).suggest_friends(_current_user_id(), limit)
+        return Response(dump_friend_recommendations(recommendations), media_type=JSON_MIMETYPE)
+    except ValueError as e:
+        logger.warning("Невалидные параметры рекомендаций друзей: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except Exception as e:
+        logger.error("Ошибка получения рекомендаций друзей: %s", e, exc_info=True)
+        return {'message': 'Ошибка получения рекомендаций друзей'}, 500
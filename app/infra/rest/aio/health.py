@@ -0,0 +1,12 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def health_check():
+    """
+    Асинхронная функция проверки состояния сервиса.
+    Соответствует operationId: health_check в OpenAPI спецификации.
+    """
+    logger.info("Health check requested")
+    return {'status': 'healthy'}
@@ -0,0 +1,11 @@
+from starlette.responses import Response
+
+from infra.metrics import METRICS_CONTENT_TYPE, render_metrics
+
+
+async def get_metrics():
+    """
+    Асинхронная функция выдачи метрик в текстовом формате Prometheus.
+    Соответствует operationId: get_metrics в OpenAPI спецификации.
+    """
+    return Response(render_metrics(), headers={'Content-Type': METRICS_CONTENT_TYPE})
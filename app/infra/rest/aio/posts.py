@@ -0,0 +1,131 @@
+import logging
+from connexion import NoContent
+from connexion.context import context
+from starlette.responses import Response
+from application import injector
+from application.posts import AsyncPostService, DEFAULT_FEED_LIMIT, PostNotFoundError
+from infra.db.config.write_failover import DatabaseUnavailableError
+from infra.rest.auth import DATABASE_RETRY_AFTER
+from infra.rest.serialization import JSON_MIMETYPE, dump_feed, dump_post
+from infra.rest.users import NEXT_CURSOR_HEADER
+
+logger = logging.getLogger(__name__)
+
+
+def _current_user_id() -> str:
+    """Идентификатор текущего пользователя - subject токена, проверенного по схеме bearerAuth"""
+    return context['user']
+
+
+async def create_post(body: dict):
+    """
+    Асинхронная функция создания поста текущего пользователя.
+    Соответствует operationId: create_post в OpenAPI спецификации.
+    """
+    logger.info("Запрос на создание поста")
+
+    try:
+        post = await injector.get(AsyncPostService).create_post(_current_user_id(), body.get('text'))
+        return Response(dump_post(post), media_type=JSON_MIMETYPE)
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': str(e)}, 400
+    except DatabaseUnavailableError as e:
+        logger.error("Создание поста не выполнено: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка создания поста: %s", e, exc_info=True)
+        return {'message': 'Ошибка создания поста'}, 500
+
+
+async def update_post(body: dict):
+    """
+    Асинхронная функция изменения поста текущего пользователя.
+    Соответствует operationId: update_post в OpenAPI спецификации.
+    """
+    logger.info("Запрос на изменение поста: %s", body.get('id'))
+
+    try:
+        await injector.get(AsyncPostService).update_post(_current_user_id(), body.get('id'), body.get('text'))
+        return NoContent, 200
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': str(e)}, 400
+    except PostNotFoundError as e:
+        logger.warning("Пост не найден: %s", e)
+        return {'message': 'Пост не найден'}, 404
+    except DatabaseUnavailableError as e:
+        logger.error("Изменение поста не выполнено: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка изменения поста: %s", e, exc_info=True)
+        return {'message': 'Ошибка изменения поста'}, 500
+
+
+async def delete_post(id: str):
+    """
+    Асинхронная функция удаления поста текущего пользователя.
+    Соответствует operationId: delete_post в OpenAPI спецификации.
+    """
+    logger.info("Запрос на удаление поста: %s", id)
+
+    try:
+        await injector.get(AsyncPostService).delete_post(_current_user_id(), id)
+        return NoContent, 200
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': str(e)}, 400
+    except PostNotFoundError as e:
+        logger.warning("Пост не найден: %s", e)
+        return {'message': 'Пост не найден'}, 404
+    except DatabaseUnavailableError as e:
+        logger.error("Удаление поста не выполнено: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка удаления поста: %s", e, exc_info=True)
+        return {'message': 'Ошибка удаления поста'}, 500
+
+
+async def get_post(id: str):
+    """
+    Асинхронная функция получения поста по ID.
+    Соответствует operationId: get_post в OpenAPI спецификации.
+    """
+    logger.info("Запрос поста: %s", id)
+
+    try:
+        post = await injector.get(AsyncPostService).get_post(id)
+        return Response(dump_post(post), media_type=JSON_MIMETYPE)
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except PostNotFoundError as e:
+        logger.warning("Пост не найден: %s", e)
+        return {'message': 'Пост не найден'}, 404
+    except Exception as e:
+        logger.error("Ошибка получения поста: %s", e, exc_info=True)
+        return {'message': 'Ошибка получения поста'}, 500
+
+
+async def get_feed(limit: int = DEFAULT_FEED_LIMIT, after: str = None):
+    """
+    Асинхронная функция получения ленты постов друзей текущего пользователя.
+    Соответствует operationId: get_feed в OpenAPI спецификации.
+    """
+    logger.info("Запрос ленты: limit=%s, after='%s'", limit, after)
+
+    try:
+        page = await injector.get(AsyncPostService).get_feed(_current_user_id(), limit, after)
+        headers = {}
+        if page.next_cursor:
+            headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        return Response(dump_feed(page), media_type=JSON_MIMETYPE, headers=headers)
+    except ValueError as e:
+        logger.warning("Невалидные параметры ленты: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except DatabaseUnavailableError as e:
+        logger.error("Построение ленты не выполнено: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка получения ленты: %s", e, exc_info=True)
+        return {'message': 'Ошибка получения ленты'}, 500
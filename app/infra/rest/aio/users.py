@@ -0,0 +1,239 @@
+import logging
+from connexion import request
+from starlette.responses import Response, StreamingResponse
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+from application import injector
+from application.hashing_executor import HashingQueueFullError
+from application.name_suggestions import (
+    DEFAULT_SUGGEST_LIMIT,
+    NameSuggestionService,
+    NameSuggestionsNotReadyError,
+)
+from application.users import AsyncUserService, UserNotFoundError
+from application.cursor import decode_cursor
+from application.user_search_query import DEFAULT_SEARCH_LIMIT, UserSearchQuery
+from infra.db.config.write_failover import DatabaseUnavailableError
+from infra.rest.auth import DATABASE_RETRY_AFTER, HASHING_RETRY_AFTER
+from infra.rest.users import (
+    CONSISTENCY_TOKEN_HEADER,
+    IDEMPOTENCY_KEY_HEADER,
+    NDJSON_MIMETYPE,
+    NEXT_CURSOR_HEADER,
+    SUGGEST_RETRY_AFTER,
+    _serialize_batch_result,
+)
+from infra.rest.config.validators import parse_ndjson
+from infra.rest.serialization import (
+    JSON_MIMETYPE,
+    dump_name_suggestions,
+    dump_user,
+    dump_user_card_line,
+    dump_user_profiles,
+    dump_user_cards,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _stream_users_as_ndjson(users):
+    """
+    Асинхронный генератор NDJSON ответа, аналог infra.rest.users._stream_users_as_ndjson
+    
+    Args:
+        users: Асинхронный итератор анкет UserCard
+        
+    Yields:
+        bytes: Строка NDJSON с данными одного пользователя
+    """
+    count = 0
+    try:
+        async for user in users:
+            yield dump_user_card_line(user)
+            count += 1
+    except Exception as e:
+        # Статус ответа уже отправлен, поэтому остается только прервать поток
+        logger.error("Ошибка потокового поиска пользователей: %s", e, exc_info=True)
+        raise
+    logger.info("Потоковый поиск завершен, отправлено %s пользователей", count)
+
+
+def _accepts_ndjson() -> bool:
+    """Проверяет, запросил ли клиент потоковый NDJSON ответ"""
+    accept = parse_accept_header(request.headers.get('accept'), MIMEAccept)
+    return accept.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+async def register_user(body: dict):
+    """
+    Асинхронная функция регистрации нового пользователя.
+    Соответствует operationId: register_user в OpenAPI спецификации.
+    """
+    # Создаем копию для логирования с маскированием пароля
+    log_data = body.copy()
+    if "password" in log_data and log_data["password"]:
+        log_data["password"] = "***"
+    logger.info("Регистрация пользователя: %s", log_data)
+    
+    try:
+        user_service = injector.get(AsyncUserService)
+        result = await user_service.register_user(body, request.headers.get(IDEMPOTENCY_KEY_HEADER))
+        headers = {}
+        if result["consistency_token"]:
+            headers[CONSISTENCY_TOKEN_HEADER] = result["consistency_token"]
+        return {'user_id': str(result['user_id'])}, 200, headers
+    except TypeError as e:
+        logger.error("Ошибка регистрации: %s", e, exc_info=True)
+        return {'message': str(e)}, 400
+    except HashingQueueFullError as e:
+        logger.warning("Регистрация отклонена: %s", e)
+        return {'message': str(e)}, 503, {'Retry-After': HASHING_RETRY_AFTER}
+    except DatabaseUnavailableError as e:
+        logger.error("Регистрация не выполнена: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка регистрации: %s", e, exc_info=True)
+        return {'message': str(e)}, 500
+
+
+async def register_users_batch(body=None):
+    """
+    Асинхронная функция пакетной регистрации пользователей.
+    Соответствует operationId: register_users_batch в OpenAPI спецификации.
+    """
+    try:
+        if request.mimetype == NDJSON_MIMETYPE:
+            items = parse_ndjson(body or b"")
+        else:
+            items = body
+        logger.info("Пакетная регистрация пользователей: %s анкет", len(items))
+        
+        user_service = injector.get(AsyncUserService)
+        result = await user_service.register_users_batch(items)
+        
+        headers = {}
+        if result.consistency_token:
+            headers[CONSISTENCY_TOKEN_HEADER] = result.consistency_token
+        
+        return _serialize_batch_result(result), 200, headers
+    except ValueError as e:
+        logger.warning("Невалидный пакет регистрации: %s", e)
+        return {'message': str(e)}, 400
+    except HashingQueueFullError as e:
+        logger.warning("Пакетная регистрация отклонена: %s", e)
+        return {'message': str(e)}, 503, {'Retry-After': HASHING_RETRY_AFTER}
+    except DatabaseUnavailableError as e:
+        logger.error("Пакетная регистрация не выполнена: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка пакетной регистрации: %s", e, exc_info=True)
+        return {'message': 'Ошибка пакетной регистрации'}, 500
+
+
+async def get_user_profile(id: str):
+    """
+    Асинхронная функция получения профиля пользователя по ID.
+    Соответствует operationId: get_user_profile в OpenAPI спецификации.
+    """
+    logger.info("Получение профиля пользователя: %s", id)
+    
+    try:
+        user_service = injector.get(AsyncUserService)
+        user = await user_service.get_user_profile(id, request.headers.get(CONSISTENCY_TOKEN_HEADER))
+        return Response(dump_user(user), media_type=JSON_MIMETYPE)
+        
+    except ValueError as e:
+        logger.error("Невалидные данные: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except UserNotFoundError as e:
+        logger.warning("Пользователь не найден: %s", e)
+        return {'message': 'Анкета не найдена'}, 404
+    except Exception as e:
+        logger.error("Ошибка получения профиля: %s", e, exc_info=True)
+        return {'message': 'Ошибка получения профиля'}, 500
+
+
+async def get_user_profiles(body: dict):
+    """
+    Асинхронная функция получения профилей нескольких пользователей одним запросом.
+    Соответствует operationId: get_user_profiles в OpenAPI спецификации.
+    """
+    user_ids = body.get('ids', [])
+    logger.info("Получение %s профилей пользователей", len(user_ids))
+
+    try:
+        user_service = injector.get(AsyncUserService)
+        profiles = await user_service.get_user_profiles(user_ids, request.headers.get(CONSISTENCY_TOKEN_HEADER))
+        return Response(dump_user_profiles(profiles), media_type=JSON_MIMETYPE)
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': str(e)}, 400
+    except Exception as e:
+        logger.error("Ошибка получения профилей: %s", e, exc_info=True)
+        return {'message': 'Ошибка получения профилей'}, 500
+
+
+async def search_users(first_name: str, last_name: str, limit: int = DEFAULT_SEARCH_LIMIT, after: str = None):
+    """
+    Асинхронная функция поиска пользователей по имени и фамилии.
+    Соответствует operationId: search_users в OpenAPI спецификации.
+    """
+    logger.info(
+        "Поиск пользователей: first_name='%s', last_name='%s', limit=%s, after='%s'",
+        first_name, last_name, limit, after,
+    )
+    
+    try:
+        search_query = UserSearchQuery(
+            first_name=first_name,
+            last_name=last_name,
+            limit=limit,
+            after=decode_cursor(after) if after else None,
+        )
+    except ValueError as e:
+        logger.warning("Невалидные параметры поиска: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    
+    try:
+        user_service = injector.get(AsyncUserService)
+        consistency_token = request.headers.get(CONSISTENCY_TOKEN_HEADER)
+        
+        if _accepts_ndjson():
+            users = user_service.stream_search_users(search_query, consistency_token)
+            return StreamingResponse(_stream_users_as_ndjson(users), media_type=NDJSON_MIMETYPE)
+        
+        page = await user_service.search_users(search_query, consistency_token)
+        headers = {}
+        if page.next_cursor:
+            headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        
+        # Анкеты сериализуются сразу в байты JSON
+        return Response(dump_user_cards(page.users), media_type=JSON_MIMETYPE, headers=headers)
+        
+    except ValueError as e:
+        logger.warning("Невалидный токен согласованности: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except Exception as e:
+        logger.error("Ошибка поиска пользователей: %s", e, exc_info=True)
+        return {'message': 'Ошибка поиска пользователей'}, 500
+
+
+async def suggest_names(q: str, limit: int = DEFAULT_SUGGEST_LIMIT):
+    """
+    Асинхронный аналог infra.rest.users.suggest_names.
+    Подсказки отдаются из памяти, частоты пересчитываются в фоновом потоке
+    """
+    logger.info("Подсказки имен: q='%s', limit=%s", q, limit)
+
+    try:
+        suggestions = injector.get(NameSuggestionService).suggest(q, limit)
+        return Response(dump_name_suggestions(suggestions), media_type=JSON_MIMETYPE)
+    except ValueError as e:
+        logger.warning("Невалидный префикс подсказки: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except NameSuggestionsNotReadyError as e:
+        logger.warning("Подсказки недоступны: %s", e)
+        return {'message': str(e)}, 503, {'Retry-After': SUGGEST_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка подсказок имен: %s", e, exc_info=True)
+        return {'message': 'Ошибка подсказок имен'}, 500
@@ -1,13 +1,20 @@
 from flask import request, jsonify
 import logging
 from application import injector
-from application.password_hasher import PasswordHasher
+from application.hashing_executor import HashingExecutor, HashingQueueFullError
 from application.jwt_service import JWTService
+from infra.db.config.write_failover import DatabaseUnavailableError
 from infra.db.repository.users import UserRepository
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Через сколько секунд клиенту стоит повторить запрос при переполненной очереди хэширования
+HASHING_RETRY_AFTER = '1'
+
+# Через сколько секунд клиенту стоит повторить запрос, если мастер БД недоступен (failover)
+DATABASE_RETRY_AFTER = '2'
+
 def authenticate_user():
     """
     Функция аутентификации пользователя.
@@ -24,20 +31,26 @@ def authenticate_user():
         user_id = uuid.UUID(data['id'])
         password = data['password']
         
-        logger.info(f"Authenticating user: {user_id}")
+        logger.info("Authenticating user: %s", user_id)
 
         password_from_db = injector.get(UserRepository).get_user_password(user_id)
 
-        # Проверяем пароль с использованием bcrypt
-        if password_from_db and PasswordHasher.check(password, password_from_db):
+        # Проверяем пароль с использованием bcrypt в пуле процессов
+        if password_from_db and injector.get(HashingExecutor).check(password, password_from_db):
             # Создаем уникальный JWT токен для пользователя
             token = JWTService.create_access_token(str(user_id))
-            logger.info(f"Authentication successful for user: {user_id}")
+            logger.info("Authentication successful for user: %s", user_id)
             return jsonify({'token': token})
         else:
-            logger.warning(f"Authentication failed for user: {user_id} - invalid credentials")
+            logger.warning("Authentication failed for user: %s - invalid credentials", user_id)
             return jsonify({'error': 'Invalid credentials'}), 401
 
+    except HashingQueueFullError as e:
+        logger.warning("Authentication rejected: %s", e)
+        return jsonify({'message': str(e)}), 503, {'Retry-After': HASHING_RETRY_AFTER}
+    except DatabaseUnavailableError as e:
+        logger.error("Authentication rejected: %s", e)
+        return jsonify({'message': 'База данных временно недоступна'}), 503, {'Retry-After': DATABASE_RETRY_AFTER}
     except Exception as e:
-        logger.error(f"Authentication error: {str(e)}", exc_info=True)
+        logger.error("Authentication error: %s", e, exc_info=True)
         return jsonify({'error': str(e)}), 500
@@ -1,6 +1,6 @@
 """
 Конфигурация веб-сервисов
 """
-from .web import create_connexion_app
+from .web import create_connexion_app, is_async_mode
 
-__all__ = ['create_connexion_app']
+__all__ = ['create_connexion_app', 'is_async_mode']
@@ -0,0 +1,72 @@
+"""
+Валидация тел запросов, для которых в connexion нет встроенного валидатора
+"""
+import json
+import typing as t
+
+from connexion.datastructures import MediaTypeDict
+from connexion.exceptions import BadRequestProblem
+from connexion.validators import VALIDATOR_MAP as CONNEXION_VALIDATOR_MAP
+from connexion.validators import JSONRequestBodyValidator
+
+# MIME-тип тел запросов и ответов из JSON объектов по одному на строку
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def parse_ndjson(body: t.Union[str, bytes]) -> t.List[t.Any]:
+    """
+    Разбирает NDJSON: каждая непустая строка - отдельный JSON документ
+
+    Args:
+        body: Тело запроса (байты декодируются как UTF-8)
+
+    Returns:
+        List[Any]: Документы в порядке строк
+
+    Raises:
+        ValueError: Если строка не является JSON
+    """
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+    items = []
+    for line_number, line in enumerate(body.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Строка {line_number}: {e}") from e
+    return items
+
+
+class NDJSONRequestBodyValidator(JSONRequestBodyValidator):
+    """
+    Валидатор NDJSON тела запроса: каждая строка проверяется по схеме из спецификации.
+    Без него connexion разбирает application/x-ndjson как один JSON документ
+    (шаблон */*json) и отклоняет запрос.
+    """
+
+    async def _parse(self, stream, scope) -> t.Any:
+        body = b"".join([message async for message in stream]).decode(self._encoding)
+        if not body:
+            return None
+        try:
+            return parse_ndjson(body)
+        except ValueError as e:
+            raise BadRequestProblem(detail=str(e))
+
+    def _validate(self, body: t.Any) -> t.Optional[dict]:
+        if body is None:
+            raise BadRequestProblem("Request body must not be empty")
+        for item in body:
+            super()._validate(item)
+        return None
+
+
+VALIDATOR_MAP = {
+    **CONNEXION_VALIDATOR_MAP,
+    "body": MediaTypeDict({
+        **CONNEXION_VALIDATOR_MAP["body"],
+        NDJSON_MIMETYPE: NDJSONRequestBodyValidator,
+    }),
+}
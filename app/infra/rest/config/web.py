@@ -1,20 +1,72 @@
 """
 Конфигурация веб-сервисов
 """
+import os
 import connexion
-from ..middleware import setup_request_logging
-from ..handlers import setup_error_handlers
+from connexion.middleware import MiddlewarePosition
+from connexion.resolver import Resolver
+from ..middleware import setup_request_logging, MetricsMiddleware, RequestLoggingMiddleware
+from ..handlers import setup_error_handlers, setup_async_error_handlers
+from .validators import VALIDATOR_MAP
+
+# Пакет REST обработчиков и пакет их асинхронных аналогов
+REST_PACKAGE = 'infra.rest.'
+ASYNC_REST_PACKAGE = 'infra.rest.aio.'
+
+
+def is_async_mode() -> bool:
+    """
+    Режим работы приложения задается переменной среды APP_MODE:
+    sync (по умолчанию) - connexion.FlaskApp, async - connexion.AsyncApp
+    """
+    return os.getenv('APP_MODE', 'sync').lower() == 'async'
+
+
+class AsyncControllerResolver(Resolver):
+    """
+    Резолвер, направляющий операции из спецификации на асинхронные обработчики:
+    x-openapi-router-controller infra.rest.users -> infra.rest.aio.users
+    """
+
+    def resolve_operation_id(self, operation):
+        operation_id = super().resolve_operation_id(operation)
+        if operation_id.startswith(REST_PACKAGE):
+            return ASYNC_REST_PACKAGE + operation_id[len(REST_PACKAGE):]
+        return operation_id
+
 
 def create_connexion_app():
     """Создание Connexion приложения"""
-    connexion_app = connexion.FlaskApp(__name__, specification_dir='../spec/')
+    if is_async_mode():
+        return create_async_connexion_app()
+
+    connexion_app = connexion.FlaskApp(__name__, specification_dir='../spec/', validator_map=VALIDATOR_MAP)
     connexion_app.add_api('openapi.json', arguments={'title': 'OTUS Highload Architect'})
-    
+    # Метрикам нужен operationId, поэтому middleware ставится после маршрутизации
+    connexion_app.add_middleware(MetricsMiddleware, position=MiddlewarePosition.BEFORE_SECURITY)
+
     # Получаем Flask приложение из Connexion
     app = connexion_app.app
-    
+
     # Настройка middleware и обработчиков
     setup_request_logging(app)
     setup_error_handlers(app)
-    
+
+    return connexion_app
+
+
+def create_async_connexion_app():
+    """Создание асинхронного Connexion приложения"""
+    connexion_app = connexion.AsyncApp(__name__, specification_dir='../spec/', validator_map=VALIDATOR_MAP)
+    connexion_app.add_api(
+        'openapi.json',
+        arguments={'title': 'OTUS Highload Architect'},
+        resolver=AsyncControllerResolver(),
+    )
+
+    # Настройка middleware и обработчиков
+    connexion_app.add_middleware(RequestLoggingMiddleware, position=MiddlewarePosition.BEFORE_EXCEPTION)
+    connexion_app.add_middleware(MetricsMiddleware, position=MiddlewarePosition.BEFORE_SECURITY)
+    setup_async_error_handlers(connexion_app)
+
     return connexion_app
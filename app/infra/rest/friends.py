@@ -1,16 +1,105 @@
-from flask import jsonify
+from connexion import NoContent
+from flask import Response
 import logging
+from application import injector
+from application.friends import (
+    DEFAULT_FRIENDS_LIMIT, DEFAULT_SUGGEST_FRIENDS_LIMIT, FriendNotFoundError, FriendService,
+)
+from infra.db.config.write_failover import DatabaseUnavailableError
+from infra.rest.auth import DATABASE_RETRY_AFTER
+from infra.rest.middleware.auth import get_current_user_id, require_auth
+from infra.rest.serialization import JSON_MIMETYPE, dump_friend_recommendations, dump_user_cards
+from infra.rest.users import NEXT_CURSOR_HEADER
 
 logger = logging.getLogger(__name__)
 
 
+@require_auth
 def add_friend(user_id: str):
     """
-    Функция добавления пользователя в друзья.
+    Функция добавления пользователя в друзья текущего пользователя.
     Соответствует operationId: add_friend в OpenAPI спецификации.
-    Пока не реализована - возвращает 501.
+    Повторное добавление того же друга не является ошибкой.
     """
-    logger.info(f"Запрос на добавление в друзья пользователя: {user_id}")
-    
-    # Заглушка - сервис пока не реализован
-    return jsonify({'error': 'Сервис добавления друзей пока не реализован'}), 501
+    logger.info("Запрос на добавление в друзья пользователя: %s", user_id)
+
+    try:
+        injector.get(FriendService).add_friend(get_current_user_id(), user_id)
+        return NoContent, 200
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': str(e)}, 400
+    except FriendNotFoundError as e:
+        logger.warning("Пользователь не найден: %s", e)
+        return {'message': 'Пользователь не найден'}, 404
+    except DatabaseUnavailableError as e:
+        logger.error("Добавление в друзья не выполнено: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка добавления в друзья: %s", e, exc_info=True)
+        return {'message': 'Ошибка добавления в друзья'}, 500
+
+
+@require_auth
+def delete_friend(user_id: str):
+    """
+    Функция удаления пользователя из друзей текущего пользователя.
+    Соответствует operationId: delete_friend в OpenAPI спецификации.
+    """
+    logger.info("Запрос на удаление из друзей пользователя: %s", user_id)
+
+    try:
+        injector.get(FriendService).delete_friend(get_current_user_id(), user_id)
+        return NoContent, 200
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': str(e)}, 400
+    except DatabaseUnavailableError as e:
+        logger.error("Удаление из друзей не выполнено: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка удаления из друзей: %s", e, exc_info=True)
+        return {'message': 'Ошибка удаления из друзей'}, 500
+
+
+@require_auth
+def list_friends(limit: int = DEFAULT_FRIENDS_LIMIT, after: str = None):
+    """
+    Функция получения списка друзей текущего пользователя.
+    Соответствует operationId: list_friends в OpenAPI спецификации.
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor.
+    """
+    logger.info("Запрос списка друзей: limit=%s, after='%s'", limit, after)
+
+    try:
+        page = injector.get(FriendService).list_friends(get_current_user_id(), limit, after)
+        headers = {}
+        if page.next_cursor:
+            headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        return Response(dump_user_cards(page.users), status=200, mimetype=JSON_MIMETYPE, headers=headers)
+    except ValueError as e:
+        logger.warning("Невалидные параметры списка друзей: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except Exception as e:
+        logger.error("Ошибка получения списка друзей: %s", e, exc_info=True)
+        return {'message': 'Ошибка получения списка друзей'}, 500
+
+
+@require_auth
+def suggest_friends(limit: int = DEFAULT_SUGGEST_FRIENDS_LIMIT):
+    """
+    Функция получения рекомендаций друзей текущего пользователя: друзья друзей
+    по убыванию числа общих друзей.
+    Соответствует operationId: suggest_friends в OpenAPI спецификации.
+    """
+    logger.info("Запрос рекомендаций друзей: limit=%s", limit)
+
+    try:
+        recommendations = injector.get(FriendService).suggest_friends(get_current_user_id(), limit)
+        return Response(dump_friend_recommendations(recommendations), status=200, mimetype=JSON_MIMETYPE)
+    except ValueError as e:
+        logger.warning("Невалидные параметры рекомендаций друзей: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except Exception as e:
+        logger.error("Ошибка получения рекомендаций друзей: %s", e, exc_info=True)
+        return {'message': 'Ошибка получения рекомендаций друзей'}, 500
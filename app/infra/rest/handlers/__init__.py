@@ -1,6 +1,6 @@
 """
 Обработчики для веб-сервисов
 """
-from .errors import setup_error_handlers
+from .errors import setup_error_handlers, setup_async_error_handlers
 
-__all__ = ['setup_error_handlers']
+__all__ = ['setup_error_handlers', 'setup_async_error_handlers']
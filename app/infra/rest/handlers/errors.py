@@ -1,7 +1,9 @@
 """
 Обработчики ошибок для веб-сервисов
 """
+from connexion.lifecycle import ConnexionResponse
 from flask import jsonify
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,3 +29,16 @@ def setup_error_handlers(app):
     def handle_exception(e):
         logger.error(f"Unhandled exception: {str(e)}", exc_info=True)
         return jsonify({'error': 'Internal server error', 'message': 'An unexpected error occurred'}), 500
+
+
+def setup_async_error_handlers(connexion_app):
+    """Настройка обработчиков ошибок для асинхронного приложения"""
+    async def handle_exception(request, e):
+        logger.error(f"Unhandled exception: {str(e)}", exc_info=e)
+        return ConnexionResponse(
+            status_code=500,
+            mimetype='application/json',
+            body=json.dumps({'error': 'Internal server error', 'message': 'An unexpected error occurred'}),
+        )
+
+    connexion_app.add_error_handler(Exception, handle_exception)
@@ -0,0 +1,11 @@
+from flask import Response
+
+from infra.metrics import METRICS_CONTENT_TYPE, render_metrics
+
+
+def get_metrics():
+    """
+    Функция выдачи метрик в текстовом формате Prometheus.
+    Соответствует operationId: get_metrics в OpenAPI спецификации.
+    """
+    return Response(render_metrics(), content_type=METRICS_CONTENT_TYPE)
@@ -1,6 +1,7 @@
 """
 Middleware для веб-сервисов
 """
-from .logging import setup_request_logging
+from .logging import setup_request_logging, RequestLoggingMiddleware
+from .metrics import MetricsMiddleware
 
-__all__ = ['setup_request_logging']
+__all__ = ['setup_request_logging', 'RequestLoggingMiddleware', 'MetricsMiddleware']
@@ -23,7 +23,7 @@ def require_auth(f):
         try:
             scheme, token = auth_header.split(' ', 1)
             if scheme.lower() != 'bearer':
-                logger.warning(f"Неверная схема аутентификации: {scheme}")
+                logger.warning("Неверная схема аутентификации: %s", scheme)
                 return jsonify({'error': 'Неверная схема аутентификации. Используйте Bearer токен'}), 401
         except ValueError:
             logger.warning("Неверный формат заголовка Authorization")
@@ -39,7 +39,7 @@ def require_auth(f):
         g.current_user_id = payload.get('sub')
         g.current_user_payload = payload
         
-        logger.info(f"Пользователь {g.current_user_id} успешно аутентифицирован")
+        logger.info("Пользователь %s успешно аутентифицирован", g.current_user_id)
         
         return f(*args, **kwargs)
     
@@ -63,9 +63,9 @@ def optional_auth(f):
                     if payload:
                         g.current_user_id = payload.get('sub')
                         g.current_user_payload = payload
-                        logger.info(f"Пользователь {g.current_user_id} аутентифицирован (опционально)")
+                        logger.info("Пользователь %s аутентифицирован (опционально)", g.current_user_id)
             except (ValueError, Exception) as e:
-                logger.debug(f"Ошибка при опциональной аутентификации: {e}")
+                logger.debug("Ошибка при опциональной аутентификации: %s", e)
         
         return f(*args, **kwargs)
     
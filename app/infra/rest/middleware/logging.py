@@ -1,18 +1,82 @@
 """
 Middleware для логирования запросов и ответов
 """
-from flask import request
+from flask import g, request
 import logging
+import os
+import random
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+
+class AccessLogSampler:
+    """
+    Выборка запросов для журнала доступа: логируется доля запросов
+    ACCESS_LOG_SAMPLE_RATE (от 0 до 1, по умолчанию 1 - все запросы).
+    Ответы с ошибкой сервера (5xx) логируются всегда.
+    """
+
+    def __init__(self, rate: Optional[float] = None):
+        if rate is None:
+            rate = float(os.getenv('ACCESS_LOG_SAMPLE_RATE', '1'))
+        self.rate = min(max(rate, 0.0), 1.0)
+
+    def sample(self) -> bool:
+        """Решает, попадает ли запрос в журнал"""
+        if not logger.isEnabledFor(logging.INFO):
+            return False
+        return self.rate >= 1.0 or random.random() < self.rate
+
+    @staticmethod
+    def is_error(status: int) -> bool:
+        return status >= 500
+
+
 def setup_request_logging(app):
     """Настройка логирования запросов и ответов"""
+    sampler = AccessLogSampler()
+
     @app.before_request
     def log_request_info():
-        logger.info(f"Request: {request.method} {request.url} from {request.remote_addr}")
+        g.access_log_sampled = sampler.sample()
+        if g.access_log_sampled:
+            logger.info("Request: %s %s from %s", request.method, request.url, request.remote_addr)
 
     @app.after_request
     def log_response_info(response):
-        logger.info(f"Response: {response.status_code} for {request.method} {request.url}")
+        if g.get('access_log_sampled') or sampler.is_error(response.status_code):
+            logger.info("Response: %s for %s %s", response.status_code, request.method, request.url)
         return response
+
+
+class RequestLoggingMiddleware:
+    """
+    ASGI middleware для логирования запросов и ответов в асинхронном режиме,
+    аналог хуков setup_request_logging для Flask приложения.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.sampler = AccessLogSampler()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        sampled = self.sampler.sample()
+        if sampled:
+            client = scope.get("client")
+            logger.info("Request: %s %s from %s", method, path, client[0] if client else None)
+
+        async def send_with_logging(message):
+            if message["type"] == "http.response.start" and (
+                sampled or self.sampler.is_error(message["status"])
+            ):
+                logger.info("Response: %s for %s %s", message["status"], method, path)
+            await send(message)
+
+        await self.app(scope, receive, send_with_logging)
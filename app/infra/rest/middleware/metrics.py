@@ -0,0 +1,60 @@
+"""
+Middleware для метрик HTTP запросов
+"""
+import time
+
+from connexion.middleware.abstract import ROUTING_CONTEXT
+
+from infra.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+
+# Метка запросов, для которых не нашлось операции в спецификации (404, 405)
+UNMATCHED_OPERATION = 'unmatched'
+
+
+def _operation_id(scope) -> str:
+    routing = scope.get("extensions", {}).get(ROUTING_CONTEXT, {})
+    operation_id = routing.get("operation_id")
+    if not operation_id:
+        return UNMATCHED_OPERATION
+    # Резолвер дополняет operationId пакетом контроллера: infra.rest.users.get_user_profile
+    return operation_id.rsplit(".", 1)[-1]
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware, измеряющее время обработки запросов и количество запросов в работе
+    по operationId из OpenAPI спецификации. Подключается после RoutingMiddleware,
+    которое записывает operationId в scope, и работает в обоих режимах приложения.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        operation = _operation_id(scope)
+        status = 500
+        started_at = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(operation=operation)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            # Ошибки валидации и безопасности превращаются в ответ выше по стеку middleware
+            status = getattr(e, "status_code", 500)
+            raise
+        finally:
+            in_progress.dec()
+            HTTP_REQUEST_DURATION.labels(
+                operation=operation, method=scope["method"], status=str(status)
+            ).observe(time.perf_counter() - started_at)
@@ -0,0 +1,140 @@
+"""
+Быстрая сериализация анкет пользователей, постов и сообщений в JSON через orjson
+"""
+from typing import Iterable
+
+import orjson
+
+from application.dialogs import DialogPage
+from application.name_suggestions import NameSuggestions
+from application.posts import FeedPage
+from application.users import UserProfiles
+from model.dialog import Message
+from model.post import Post
+from model.user import FriendRecommendation, User, UserCard
+
+JSON_MIMETYPE = 'application/json'
+
+
+def _user_to_dict(user: User) -> dict:
+    return {
+        "id": str(user.id),
+        "first_name": user.first_name,
+        "second_name": user.second_name,
+        "birthdate": user.birthdate.isoformat() if user.birthdate else None,
+        "biography": user.biography,
+        "city": user.city,
+    }
+
+
+def _card_dict(card: UserCard) -> dict:
+    """Словарь анкеты: поля UserCard уже строки в нужном виде"""
+    return {
+        "id": card[0],
+        "first_name": card[1],
+        "second_name": card[2],
+        "birthdate": card[3],
+        "biography": card[4],
+        "city": card[5],
+    }
+
+
+def _post_dict(post: Post) -> dict:
+    return {"id": post[0], "text": post[1], "author_user_id": post[2]}
+
+
+def _message_dict(message: Message) -> dict:
+    return {"id": message[0], "from": message[1], "to": message[2], "text": message[3]}
+
+
+def dump_user(user: User) -> bytes:
+    """
+    Сериализует профиль пользователя (без пароля)
+
+    Returns:
+        bytes: JSON объект профиля
+    """
+    return orjson.dumps(_user_to_dict(user))
+
+
+def dump_user_profiles(profiles: UserProfiles) -> bytes:
+    """
+    Сериализует пачку профилей (без паролей)
+
+    Returns:
+        bytes: JSON объект с массивом профилей users и массивом ID отсутствующих missing
+    """
+    return orjson.dumps({
+        "users": [_user_to_dict(user) for user in profiles.users],
+        "missing": profiles.missing,
+    })
+
+
+def dump_user_cards(cards: Iterable[UserCard]) -> bytes:
+    """
+    Сериализует анкеты результатов поиска в JSON массив.
+
+    Анкета уже содержит строки в нужном виде, поэтому словарь каждой анкеты
+    живет только до записи в буфер orjson, а ответ сразу получается в байтах
+
+    Returns:
+        bytes: JSON массив анкет
+    """
+    return orjson.dumps([_card_dict(card) for card in cards])
+
+
+def dump_user_card_line(card: UserCard) -> bytes:
+    """Сериализует анкету в строку NDJSON (с переводом строки)"""
+    return orjson.dumps(_card_dict(card), option=orjson.OPT_APPEND_NEWLINE)
+
+
+def dump_name_suggestions(suggestions: NameSuggestions) -> bytes:
+    """
+    Сериализует подсказки имен и фамилий (orjson сериализует dataclass напрямую)
+
+    Returns:
+        bytes: JSON объект с массивами first_names и last_names
+    """
+    return orjson.dumps(suggestions)
+
+
+def dump_friend_recommendations(recommendations: Iterable[FriendRecommendation]) -> bytes:
+    """
+    Сериализует рекомендации друзей: анкета кандидата и число общих друзей
+
+    Returns:
+        bytes: JSON массив анкет с полем mutual_friends
+    """
+    return orjson.dumps([
+        {**_card_dict(card), "mutual_friends": mutual_friends} for card, mutual_friends in recommendations
+    ])
+
+
+def dump_post(post: Post) -> bytes:
+    """Сериализует пост в JSON объект"""
+    return orjson.dumps(_post_dict(post))
+
+
+def dump_feed(page: FeedPage) -> bytes:
+    """
+    Сериализует страницу ленты в JSON массив постов
+
+    Returns:
+        bytes: JSON массив постов
+    """
+    return orjson.dumps([_post_dict(post) for post in page.posts])
+
+
+def dump_message(message: Message) -> bytes:
+    """Сериализует сообщение диалога в JSON объект"""
+    return orjson.dumps(_message_dict(message))
+
+
+def dump_dialog(page: DialogPage) -> bytes:
+    """
+    Сериализует страницу диалога в JSON массив сообщений
+
+    Returns:
+        bytes: JSON массив сообщений
+    """
+    return orjson.dumps([_message_dict(message) for message in page.messages])
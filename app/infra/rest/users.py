@@ -1,113 +1,274 @@
-from flask import jsonify
+from flask import Response, jsonify, request
 import logging
 from application import injector
+from application.hashing_executor import HashingQueueFullError
+from application.name_suggestions import (
+    DEFAULT_SUGGEST_LIMIT,
+    NameSuggestionService,
+    NameSuggestionsNotReadyError,
+)
 from application.users import UserService, UserNotFoundError
-from application.user_search_query import UserSearchQuery
+from application.cursor import decode_cursor
+from application.user_search_query import DEFAULT_SEARCH_LIMIT, UserSearchQuery
+from infra.db.config.write_failover import DatabaseUnavailableError
+from infra.rest.auth import DATABASE_RETRY_AFTER, HASHING_RETRY_AFTER
+from infra.rest.config.validators import NDJSON_MIMETYPE, parse_ndjson
+from infra.rest.serialization import (
+    JSON_MIMETYPE,
+    dump_name_suggestions,
+    dump_user,
+    dump_user_card_line,
+    dump_user_profiles,
+    dump_user_cards,
+)
 
 logger = logging.getLogger(__name__)
 
+# Заголовок ответа с курсором следующей страницы поиска
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
 
-def _serialize_user_to_dict(user):
+# Заголовок с ключом идемпотентности регистрации
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+
+# Заголовок с токеном согласованности: выдается при записи и передается клиентом при чтении
+CONSISTENCY_TOKEN_HEADER = 'X-Consistency-Token'
+
+# Через сколько секунд повторить запрос подсказок, пока частоты имен загружаются
+SUGGEST_RETRY_AFTER = '1'
+
+
+def _stream_users_as_ndjson(users):
     """
-    Вспомогательная функция для сериализации объекта User в словарь.
+    Генератор NDJSON ответа: сериализует анкеты по одной,
+    не собирая ни список анкет, ни список словарей.
     
     Args:
-        user: Объект User для сериализации
+        users: Итератор анкет UserCard
         
-    Returns:
-        dict: Словарь с данными пользователя
+    Yields:
+        bytes: Строка NDJSON с данными одного пользователя
     """
-    return {
-        "id": str(user.id),
-        "first_name": user.first_name,
-        "second_name": user.second_name,
-        "birthdate": user.birthdate.isoformat() if user.birthdate else None,
-        "biography": user.biography,
-        "city": user.city,
-    }
+    count = 0
+    try:
+        for user in users:
+            yield dump_user_card_line(user)
+            count += 1
+    except Exception as e:
+        # Статус ответа уже отправлен, поэтому остается только прервать поток
+        logger.error("Ошибка потокового поиска пользователей: %s", e, exc_info=True)
+        raise
+    logger.info("Потоковый поиск завершен, отправлено %s пользователей", count)
 
 
 def register_user(body: dict):
     """
     Функция регистрации нового пользователя.
     Соответствует operationId: register_user в OpenAPI спецификации.
+    Повтор запроса с тем же заголовком Idempotency-Key возвращает того же пользователя.
     """
     # Создаем копию для логирования с маскированием пароля
     log_data = body.copy()
     if "password" in log_data and log_data["password"]:
         log_data["password"] = "***"
-    logger.info(f"Регистрация пользователя: {log_data}")
+    logger.info("Регистрация пользователя: %s", log_data)
     
     try:
         # Получаем экземпляр UserService через инжектор
         user_service = injector.get(UserService)
         
         # Вызываем метод сервиса для регистрации пользователя
-        result = user_service.register_user(body)
+        result = user_service.register_user(body, request.headers.get(IDEMPOTENCY_KEY_HEADER))
+        
+        # Токен согласованности отдаем в заголовке, тело ответа не меняется
+        headers = {}
+        consistency_token = result.pop("consistency_token", None)
+        if consistency_token:
+            headers[CONSISTENCY_TOKEN_HEADER] = consistency_token
         
-        return jsonify(result)
+        return jsonify(result), 200, headers
     except TypeError as e:
-        logger.error(f"Ошибка регистрации: {str(e)}", exc_info=True)
+        logger.error("Ошибка регистрации: %s", e, exc_info=True)
         return {'message': str(e)}, 400
+    except HashingQueueFullError as e:
+        logger.warning("Регистрация отклонена: %s", e)
+        return {'message': str(e)}, 503, {'Retry-After': HASHING_RETRY_AFTER}
+    except DatabaseUnavailableError as e:
+        # Клиент может безопасно повторить запрос с тем же Idempotency-Key
+        logger.error("Регистрация не выполнена: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
     except Exception as e:
-        logger.error(f"Ошибка регистрации: {str(e)}", exc_info=True)
+        logger.error("Ошибка регистрации: %s", e, exc_info=True)
         return {'message': str(e)}, 500
 
 
+def _serialize_batch_result(result):
+    """Сериализует результаты пакетной регистрации в порядке анкет запроса"""
+    return [
+        {"user_id": str(item.user_id)} if item.user_id else {"error": item.error}
+        for item in result.items
+    ]
+
+
+def register_users_batch(body=None):
+    """
+    Функция пакетной регистрации пользователей.
+    Соответствует operationId: register_users_batch в OpenAPI спецификации.
+    Анкеты принимаются JSON массивом или в формате NDJSON (application/x-ndjson).
+    """
+    try:
+        if request.mimetype == NDJSON_MIMETYPE:
+            items = parse_ndjson(body or b"")
+        else:
+            items = body
+        logger.info("Пакетная регистрация пользователей: %s анкет", len(items))
+        
+        user_service = injector.get(UserService)
+        result = user_service.register_users_batch(items)
+        
+        headers = {}
+        if result.consistency_token:
+            headers[CONSISTENCY_TOKEN_HEADER] = result.consistency_token
+        
+        return jsonify(_serialize_batch_result(result)), 200, headers
+    except ValueError as e:
+        logger.warning("Невалидный пакет регистрации: %s", e)
+        return {'message': str(e)}, 400
+    except HashingQueueFullError as e:
+        logger.warning("Пакетная регистрация отклонена: %s", e)
+        return {'message': str(e)}, 503, {'Retry-After': HASHING_RETRY_AFTER}
+    except DatabaseUnavailableError as e:
+        logger.error("Пакетная регистрация не выполнена: %s", e)
+        return {'message': 'База данных временно недоступна'}, 503, {'Retry-After': DATABASE_RETRY_AFTER}
+    except Exception as e:
+        logger.error("Ошибка пакетной регистрации: %s", e, exc_info=True)
+        return {'message': 'Ошибка пакетной регистрации'}, 500
+
+
 def get_user_profile(id: str):
     """
     Функция получения профиля пользователя по ID.
     Соответствует operationId: get_user_profile в OpenAPI спецификации.
     """
-    logger.info(f"Получение профиля пользователя: {id}")
+    logger.info("Получение профиля пользователя: %s", id)
     
     try:
         # Получаем экземпляр UserService через инжектор
         user_service = injector.get(UserService)
         
         # Вызываем метод сервиса для получения профиля пользователя
-        user = user_service.get_user_profile(id)
-        
-        # Сериализуем объект User в JSON
-        profile_data = _serialize_user_to_dict(user)
+        user = user_service.get_user_profile(id, request.headers.get(CONSISTENCY_TOKEN_HEADER))
         
-        # Возвращаем данные со статусом 200
-        return jsonify(profile_data)
+        # Сериализуем объект User сразу в байты JSON
+        return Response(dump_user(user), status=200, mimetype=JSON_MIMETYPE)
         
     except ValueError as e:
-        logger.error(f"Невалидные данные: {str(e)}")
+        logger.error("Невалидные данные: %s", e)
         return {'message': 'Невалидные данные'}, 400
     except UserNotFoundError as e:
-        logger.warning(f"Пользователь не найден: {str(e)}")
+        logger.warning("Пользователь не найден: %s", e)
         return {'message': 'Анкета не найдена'}, 404
     except Exception as e:
-        logger.error(f"Ошибка получения профиля: {str(e)}", exc_info=True)
+        logger.error("Ошибка получения профиля: %s", e, exc_info=True)
         return {'message': 'Ошибка получения профиля'}, 500
 
 
-def search_users(first_name: str, last_name: str):
+def get_user_profiles(body: dict):
+    """
+    Функция получения профилей нескольких пользователей одним запросом.
+    Соответствует operationId: get_user_profiles в OpenAPI спецификации.
+    Найденные профили возвращаются в порядке запроса, отсутствующие ID - отдельным списком.
+    """
+    user_ids = body.get('ids', [])
+    logger.info("Получение %s профилей пользователей", len(user_ids))
+
+    try:
+        user_service = injector.get(UserService)
+        profiles = user_service.get_user_profiles(user_ids, request.headers.get(CONSISTENCY_TOKEN_HEADER))
+        return Response(dump_user_profiles(profiles), status=200, mimetype=JSON_MIMETYPE)
+    except ValueError as e:
+        logger.warning("Невалидные данные: %s", e)
+        return {'message': str(e)}, 400
+    except Exception as e:
+        logger.error("Ошибка получения профилей: %s", e, exc_info=True)
+        return {'message': 'Ошибка получения профилей'}, 500
+
+
+def _accepts_ndjson() -> bool:
+    """Проверяет, запросил ли клиент потоковый NDJSON ответ"""
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def search_users(first_name: str, last_name: str, limit: int = DEFAULT_SEARCH_LIMIT, after: str = None):
     """
     Функция поиска пользователей по имени и фамилии.
     Соответствует operationId: search_users в OpenAPI спецификации.
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor.
+    Если клиент запрашивает application/x-ndjson, весь результат
+    (без ограничения limit) отдается потоком.
+    Заголовок X-Consistency-Token направляет чтение на реплику, уже применившую запись клиента.
     """
-    logger.info(f"Поиск пользователей: first_name='{first_name}', last_name='{last_name}'")
+    logger.info(
+        "Поиск пользователей: first_name='%s', last_name='%s', limit=%s, after='%s'",
+        first_name, last_name, limit, after,
+    )
     
     try:
         # Создаем объект UserSearchQuery из параметров запроса
-        search_query = UserSearchQuery(first_name=first_name, last_name=last_name)
-        
+        search_query = UserSearchQuery(
+            first_name=first_name,
+            last_name=last_name,
+            limit=limit,
+            after=decode_cursor(after) if after else None,
+        )
+    except ValueError as e:
+        logger.warning("Невалидные параметры поиска: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    
+    try:
         # Получаем экземпляр UserService через инжектор
         user_service = injector.get(UserService)
+        consistency_token = request.headers.get(CONSISTENCY_TOKEN_HEADER)
+        
+        if _accepts_ndjson():
+            users = user_service.stream_search_users(search_query, consistency_token)
+            return Response(_stream_users_as_ndjson(users), status=200, mimetype=NDJSON_MIMETYPE)
         
         # Вызываем метод сервиса для поиска пользователей
-        users = user_service.search_users(search_query)
+        page = user_service.search_users(search_query, consistency_token)
         
-        # Сериализуем объекты User в JSON
-        users_data = [_serialize_user_to_dict(user) for user in users]
+        headers = {}
+        if page.next_cursor:
+            headers[NEXT_CURSOR_HEADER] = page.next_cursor
         
-        # Возвращаем данные со статусом 200
-        return jsonify(users_data)
+        # Анкеты сериализуются сразу в байты JSON, минуя jsonify
+        return Response(dump_user_cards(page.users), status=200, mimetype=JSON_MIMETYPE, headers=headers)
         
+    except ValueError as e:
+        logger.warning("Невалидный токен согласованности: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except Exception as e:
+        logger.error("Ошибка поиска пользователей: %s", e, exc_info=True)
+        return {'message': 'Ошибка поиска пользователей'}, 500
+
+
+def suggest_names(q: str, limit: int = DEFAULT_SUGGEST_LIMIT):
+    """
+    Функция подсказок для поиска: самые частые имена и фамилии с префиксом q
+    и количество пользователей с каждым из них.
+    Соответствует operationId: suggest_names в OpenAPI спецификации.
+    """
+    logger.info("Подсказки имен: q='%s', limit=%s", q, limit)
+
+    try:
+        suggestions = injector.get(NameSuggestionService).suggest(q, limit)
+        return Response(dump_name_suggestions(suggestions), status=200, mimetype=JSON_MIMETYPE)
+    except ValueError as e:
+        logger.warning("Невалидный префикс подсказки: %s", e)
+        return {'message': 'Невалидные данные'}, 400
+    except NameSuggestionsNotReadyError as e:
+        logger.warning("Подсказки недоступны: %s", e)
+        return {'message': str(e)}, 503, {'Retry-After': SUGGEST_RETRY_AFTER}
     except Exception as e:
-        logger.error(f"Ошибка поиска пользователей: {str(e)}", exc_info=True)
-        return {'message': 'Ошибка поиска пользователей'}, 500
\ No newline at end of file
+        logger.error("Ошибка подсказок имен: %s", e, exc_info=True)
+        return {'message': 'Ошибка подсказок имен'}, 500
@@ -0,0 +1,4 @@
+from .backend import NameIndexSearch, uuid7_bound
+from .name_index import NameIndex, write_name_index
+
+__all__ = ['NameIndex', 'NameIndexSearch', 'uuid7_bound', 'write_name_index']
@@ -0,0 +1,242 @@
+"""
+Поиск пользователей по индексу имен в памяти с догрузкой новых пользователей из БД
+"""
+import heapq
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from injector import singleton
+from sqlalchemy import create_engine, text
+
+from application.user_search_query import UserSearchQuery
+from infra.db.config.database import DEFAULT_DATABASE_URL
+from model import ids
+from model.user import UserCard
+from .name_index import NameIndex
+
+logger = logging.getLogger(__name__)
+
+# Новые пользователи, зарегистрированные после построения снимка. ID - UUIDv7, поэтому
+# окно по времени регистрации задается диапазоном ID
+FEED_QUERY = text("""
+    SELECT id::text, first_name, second_name, to_char(birthdate, 'YYYY-MM-DD'), biography, city
+    FROM users
+    WHERE id > :after AND id <= :until
+    ORDER BY id
+""")
+
+# Насколько вперед от текущего времени читать ID: запас на расхождение часов серверов приложения
+_FEED_CLOCK_SKEW_MS = 60_000
+
+
+def uuid7_bound(timestamp_ms: int, upper: bool = False) -> str:
+    """
+    Наименьший (или наибольший) UUIDv7 с заданным временем в миллисекундах
+
+    Args:
+        timestamp_ms: Время в миллисекундах
+        upper: True - верхняя граница миллисекунды
+
+    Returns:
+        str: UUID в текстовом виде
+    """
+    low_bits = (1 << 80) - 1 if upper else 0
+    return str(uuid.UUID(int=(max(timestamp_ms, 0) & 0xFFFF_FFFF_FFFF) << 80 | low_bits))
+
+
+def _uuid7_timestamp_ms(user_id: str) -> int:
+    return uuid.UUID(user_id).int >> 80
+
+
+def _matches(entry: Tuple[UserCard, str, str], first_name_prefix: str, last_name_prefix: str) -> bool:
+    return entry[1].startswith(first_name_prefix) and entry[2].startswith(last_name_prefix)
+
+
+@singleton
+class NameIndexSearch:
+    """
+    Поиск по префиксам имени и фамилии без обращения к БД.
+
+    Снимок пользователей строится отдельно (python -m infra.search.build) в файл,
+    который все worker-ы отображают в память. Пользователи, зарегистрированные после
+    построения снимка, каждый worker догружает из БД в фоновом потоке: раз в
+    NAME_INDEX_REFRESH_INTERVAL секунд читаются ID из окна по времени регистрации
+    (ID - UUIDv7). Окно начинается на NAME_INDEX_FEED_OVERLAP секунд раньше последнего
+    прочитанного пользователя, чтобы не пропустить транзакции, зафиксированные позже
+    транзакций с большими ID. Новый файл снимка подхватывается при следующем обновлении.
+
+    Фоновое обновление запускается при старте приложения (start) и первым делом
+    загружает снимок. Пока снимок не загружен, search возвращает None и поиск
+    выполняется в БД: запрос не ждет чтения файла и догрузки из БД.
+
+    Настройки из переменных среды:
+        NAME_INDEX_PATH - путь к файлу снимка (не задан - поиск по индексу выключен)
+        NAME_INDEX_DATABASE_URL - БД для догрузки новых пользователей
+            (по умолчанию READ_ONLY_DATABASE_URL, затем DATABASE_URL)
+        NAME_INDEX_REFRESH_INTERVAL - период догрузки и проверки файла в секундах (по умолчанию 1)
+        NAME_INDEX_FEED_OVERLAP - перекрытие окна догрузки в секундах (по умолчанию 5)
+
+    Окно догрузки и водяной знак берутся из времени в ID, поэтому индекс работает только
+    с USER_ID_VERSION=v7: со случайными UUIDv4 новые пользователи не попали бы в окно.
+    При другой версии ID конструктор выбрасывает ValueError.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        database_url: Optional[str] = None,
+        refresh_interval: Optional[float] = None,
+        feed_overlap: Optional[float] = None,
+    ):
+        if path is None:
+            path = os.getenv('NAME_INDEX_PATH')
+        if database_url is None:
+            database_url = (
+                os.getenv('NAME_INDEX_DATABASE_URL')
+                or os.getenv('READ_ONLY_DATABASE_URL')
+                or os.getenv('DATABASE_URL', DEFAULT_DATABASE_URL)
+            )
+        if refresh_interval is None:
+            refresh_interval = float(os.getenv('NAME_INDEX_REFRESH_INTERVAL', '1'))
+        if feed_overlap is None:
+            feed_overlap = float(os.getenv('NAME_INDEX_FEED_OVERLAP', '5'))
+
+        if path and ids.USER_ID_VERSION != 'v7':
+            raise ValueError(
+                f"NAME_INDEX_PATH требует USER_ID_VERSION=v7: новые пользователи догружаются по времени в ID,"
+                f" а задана версия {ids.USER_ID_VERSION}"
+            )
+
+        self.enabled = bool(path)
+        self.path = path
+        self.database_url = database_url
+        self.refresh_interval = refresh_interval
+        self.feed_overlap_ms = int(feed_overlap * 1000)
+        self._snapshot: Optional[NameIndex] = None
+        # Новые пользователи: ID -> (анкета, имя и фамилия в нижнем регистре)
+        self._recent: Dict[str, Tuple[UserCard, str, str]] = {}
+        self._watermark_ms = 0
+        self._engine = None
+        self._lock = threading.Lock()
+        self._started = False
+        self._stopped = threading.Event()
+
+        if self.enabled:
+            logger.info("NameIndexSearch initialized: path=%s, refresh_interval=%s", path, refresh_interval)
+
+    def search(self, search_query: UserSearchQuery) -> Optional[List[UserCard]]:
+        """
+        Ищет страницу анкет по индексу
+
+        Args:
+            search_query: Префиксы, размер страницы и ID, после которого начинается страница
+
+        Returns:
+            Optional[List[UserCard]]: Анкеты в порядке возрастания ID или None,
+            если индекс недоступен и искать нужно в БД
+        """
+        return self._search(search_query, search_query.limit)
+
+    def iter_search(self, search_query: UserSearchQuery) -> Optional[Iterator[UserCard]]:
+        """Все анкеты, подходящие под запрос (без limit), или None, если индекс недоступен"""
+        cards = self._search(search_query, None)
+        return iter(cards) if cards is not None else None
+
+    def add(self, cards: List[UserCard]):
+        """Добавляет пользователей, которых еще нет в снимке"""
+        with self._lock:
+            snapshot = self._snapshot
+            for card in cards:
+                if card.id in self._recent or (snapshot is not None and snapshot.contains(card.id)):
+                    continue
+                self._recent[card.id] = (
+                    card, (card.first_name or '').lower(), (card.second_name or '').lower()
+                )
+                self._watermark_ms = max(self._watermark_ms, _uuid7_timestamp_ms(card.id))
+
+    def refresh_once(self):
+        """Перечитывает файл снимка, если его заменили, и догружает новых пользователей"""
+        self._reload_snapshot()
+        if self._snapshot is not None:
+            self._poll_feed()
+
+    def start(self):
+        """Запускает фоновое обновление, если индекс включен. Повторный вызов ничего не делает"""
+        if not self.enabled or self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        thread = threading.Thread(target=self._run, name="name-index-refresh", daemon=True)
+        thread.start()
+
+    def stop(self):
+        """Останавливает фоновое обновление"""
+        self._stopped.set()
+
+    def _search(self, search_query: UserSearchQuery, limit: Optional[int]) -> Optional[List[UserCard]]:
+        if not self.enabled:
+            return None
+        self.start()
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+
+        search_query = search_query.normalized()
+        first_name_prefix, last_name_prefix = search_query.first_name, search_query.last_name
+        after = search_query.after
+        cards = snapshot.search(first_name_prefix, last_name_prefix, after, limit)
+        with self._lock:
+            recent = sorted(
+                entry[0] for user_id, entry in self._recent.items()
+                if (after is None or user_id > after) and _matches(entry, first_name_prefix, last_name_prefix)
+            )
+        if not recent:
+            return cards
+        merged = heapq.merge(cards, recent, key=lambda card: card.id)
+        return list(merged) if limit is None else [card for _, card in zip(range(limit), merged)]
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh_once()
+            except Exception as e:
+                logger.warning("Ошибка обновления индекса имен: %s", e)
+            self._stopped.wait(self.refresh_interval)
+
+    def _reload_snapshot(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        current = self._snapshot
+        if current is not None and current.file_version == (stat.st_ino, stat.st_mtime_ns):
+            return
+
+        snapshot = NameIndex(self.path)
+        with self._lock:
+            # Пользователи, попавшие в новый снимок, больше не нужны в памяти worker-а
+            self._recent = {
+                user_id: entry for user_id, entry in self._recent.items() if not snapshot.contains(user_id)
+            }
+            self._watermark_ms = max(
+                [snapshot.built_at_ms] + [_uuid7_timestamp_ms(user_id) for user_id in self._recent]
+            )
+            self._snapshot = snapshot
+        # Старый снимок не закрывается: его могут читать запросы в других потоках
+        logger.info("Загружен индекс имен: %s пользователей", len(snapshot))
+
+    def _poll_feed(self):
+        if self._engine is None:
+            self._engine = create_engine(self.database_url, pool_size=1, max_overflow=0, pool_pre_ping=True)
+        with self._lock:
+            after = uuid7_bound(self._watermark_ms - self.feed_overlap_ms)
+        until = uuid7_bound(time.time_ns() // 1_000_000 + _FEED_CLOCK_SKEW_MS, upper=True)
+        with self._engine.connect() as connection:
+            rows = connection.execute(FEED_QUERY, {'after': after, 'until': until}).fetchall()
+        self.add([UserCard._make(row) for row in rows])
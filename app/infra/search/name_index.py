@@ -0,0 +1,288 @@
+"""
+Индекс имен пользователей в файле, отображаемом в память (mmap)
+"""
+import mmap
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from model.user import UserCard
+
+MAGIC = b'NAMEIDX1'
+
+# Заголовок: сигнатура, количество строк, время построения (мс), смещения массивов
+_HEADER = struct.Struct('<8sQQQQQQ')
+
+# Поля строки в порядке хранения: поля анкеты и имена в нижнем регистре для поиска
+_CARD_FIELDS = len(UserCard._fields)
+_FIRST_NAME_LOWER = _CARD_FIELDS
+_SECOND_NAME_LOWER = _CARD_FIELDS + 1
+_FIELDS = _CARD_FIELDS + 2
+
+# NULL хранится байтом, который не встречается в UTF-8
+_NULL = b'\xff'
+
+# Верхняя граница диапазона префикса: любая строка UTF-8 с префиксом меньше prefix + 0xFF
+_PREFIX_END = b'\xff'
+
+
+def _bisect(
+    rows: Sequence[int], value: bytes, key: Callable[[int], bytes], lo: int = 0, right: bool = False
+) -> int:
+    """
+    Бинарный поиск по строкам, упорядоченным по key: bisect_left (или bisect_right при right=True).
+    Параметр key у bisect появился только в Python 3.10, а образ собирается на 3.9
+    """
+    hi = len(rows)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        current = key(rows[mid])
+        if current < value or (right and current == value):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _encode(value: Optional[str]) -> bytes:
+    return _NULL if value is None else value.encode('utf-8')
+
+
+def _decode(value: bytes) -> Optional[str]:
+    return None if value == _NULL else value.decode('utf-8')
+
+
+def write_name_index(path: str, cards: Iterable[UserCard], built_at_ms: Optional[int] = None) -> int:
+    """
+    Записывает индекс имен в файл. Файл заменяется атомарно: worker-ы, которые
+    уже отобразили старую версию в память, продолжают читать ее до перезагрузки.
+
+    Формат (порядок байт платформы):
+        заголовок;
+        смещения полей - uint64 на каждое поле каждой строки и конечное смещение;
+        перестановки строк, упорядоченные по имени и по фамилии в нижнем регистре - uint32;
+        строки полей в UTF-8.
+
+    Args:
+        path: Путь к файлу индекса
+        cards: Анкеты в порядке возрастания ID (как ORDER BY id в PostgreSQL)
+        built_at_ms: Время снимка в миллисекундах (по умолчанию - текущее).
+            Пользователи, зарегистрированные позже, догружаются из БД
+
+    Returns:
+        int: Количество записанных строк
+
+    Raises:
+        ValueError: Если анкеты не упорядочены по ID
+    """
+    if built_at_ms is None:
+        built_at_ms = time.time_ns() // 1_000_000
+    offsets = array('Q', [0])
+    first_names: List[bytes] = []
+    second_names: List[bytes] = []
+    blob = bytearray()
+    previous_id = None
+    for card in cards:
+        if previous_id is not None and card.id <= previous_id:
+            raise ValueError(f"Анкеты должны быть упорядочены по ID: {card.id} после {previous_id}")
+        previous_id = card.id
+        first_name_lower = (card.first_name or '').lower().encode('utf-8')
+        second_name_lower = (card.second_name or '').lower().encode('utf-8')
+        first_names.append(first_name_lower)
+        second_names.append(second_name_lower)
+        for value in (*map(_encode, card), first_name_lower, second_name_lower):
+            blob += value
+            offsets.append(len(blob))
+
+    rows = len(first_names)
+    # Сортировка устойчивая: строки с одинаковым именем остаются в порядке ID
+    first_order = array('I', sorted(range(rows), key=first_names.__getitem__))
+    second_order = array('I', sorted(range(rows), key=second_names.__getitem__))
+
+    offsets_start = _HEADER.size
+    first_order_start = offsets_start + offsets.itemsize * len(offsets)
+    second_order_start = first_order_start + first_order.itemsize * rows
+    blob_start = second_order_start + second_order.itemsize * rows
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(_HEADER.pack(
+            MAGIC, rows, built_at_ms, offsets_start, first_order_start, second_order_start, blob_start
+        ))
+        offsets.tofile(file)
+        first_order.tofile(file)
+        second_order.tofile(file)
+        file.write(blob)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    return rows
+
+
+class NameIndex:
+    """
+    Неизменяемый снимок индекса имен, отображенный в память.
+
+    Все worker-ы отображают один и тот же файл, поэтому данные лежат в памяти
+    в одном экземпляре (в page cache). Поиск по паре префиксов находит бинарным
+    поиском диапазоны строк в перестановках по имени и по фамилии и пересекает их;
+    номера строк совпадают с порядком ID, поэтому keyset-пагинация - это срез
+    отсортированного пересечения.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(file.fileno())
+        # По inode и времени изменения определяется, что файл заменили новым снимком
+        self.file_version = (stat.st_ino, stat.st_mtime_ns)
+        try:
+            (
+                magic, self.rows, self.built_at_ms,
+                offsets_start, first_order_start, second_order_start, blob_start,
+            ) = _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"Файл {path} не является индексом имен")
+            self._view = memoryview(self._mmap)
+            self._offsets = self._view[offsets_start:first_order_start].cast('Q')
+            self._first_order = self._view[first_order_start:second_order_start].cast('I')
+            self._second_order = self._view[second_order_start:blob_start].cast('I')
+            self._blob_start = blob_start
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self):
+        """
+        Освобождает отображение файла. Снимок, который может читаться из других потоков,
+        не закрывают: отображение освобождается, когда на снимок не остается ссылок
+        """
+        for view in (self._offsets, self._first_order, self._second_order, self._view):
+            view.release()
+        self._mmap.close()
+
+    def _field(self, row: int, field: int) -> bytes:
+        position = row * _FIELDS + field
+        base = self._blob_start
+        return self._mmap[base + self._offsets[position]:base + self._offsets[position + 1]]
+
+    def card(self, row: int) -> UserCard:
+        """Анкета строки с номером row"""
+        position = row * _FIELDS
+        base = self._blob_start
+        start = base + self._offsets[position]
+        values = []
+        for field in range(_CARD_FIELDS):
+            end = base + self._offsets[position + field + 1]
+            values.append(_decode(self._mmap[start:end]))
+            start = end
+        return UserCard._make(values)
+
+    def contains(self, user_id: str) -> bool:
+        """Проверяет, есть ли пользователь в снимке"""
+        row = _bisect(range(self.rows), user_id.encode('utf-8'), lambda r: self._field(r, 0))
+        return row < self.rows and self._field(row, 0) == user_id.encode('utf-8')
+
+    def _first_row_after(self, after: Optional[str]) -> int:
+        if not after:
+            return 0
+        return _bisect(range(self.rows), after.encode('utf-8'), lambda r: self._field(r, 0), right=True)
+
+    def _prefix_rows(self, order: memoryview, field: int, prefix: str) -> memoryview:
+        prefix = prefix.encode('utf-8')
+        key = lambda r: self._field(r, field)
+        low = _bisect(order, prefix, key)
+        high = _bisect(order, prefix + _PREFIX_END, key, lo=low)
+        return order[low:high]
+
+    def _scan_rows(self, start: int, first_name_prefix: bytes, last_name_prefix: bytes, limit: int, budget: int):
+        """
+        Проверяет строки подряд в порядке ID, пока не наберет limit совпадений.
+        Возвращает None, если совпадений мало и проверено больше budget строк
+        """
+        rows = []
+        for row in range(start, min(self.rows, start + budget)):
+            if (
+                self._field(row, _FIRST_NAME_LOWER).startswith(first_name_prefix)
+                and self._field(row, _SECOND_NAME_LOWER).startswith(last_name_prefix)
+            ):
+                rows.append(row)
+                if len(rows) == limit:
+                    return rows
+        return rows if start + budget >= self.rows else None
+
+    def search_rows(
+        self,
+        first_name_prefix: str,
+        last_name_prefix: str,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Sequence[int]:
+        """
+        Номера строк, имя и фамилия которых начинаются с префиксов (в нижнем регистре),
+        в порядке возрастания ID
+
+        Args:
+            first_name_prefix: Префикс имени в нижнем регистре
+            last_name_prefix: Префикс фамилии в нижнем регистре
+            after: ID, после которого начинается страница
+            limit: Максимальное количество строк (None - все)
+
+        Returns:
+            Sequence[int]: Номера строк
+        """
+        start = self._first_row_after(after)
+        ranges = [
+            self._prefix_rows(self._first_order, _FIRST_NAME_LOWER, first_name_prefix)
+            if first_name_prefix else None,
+            self._prefix_rows(self._second_order, _SECOND_NAME_LOWER, last_name_prefix)
+            if last_name_prefix else None,
+        ]
+        sizes = [self.rows if rows is None else len(rows) for rows in ranges]
+        if min(sizes) == 0:
+            return []
+        if ranges == [None, None]:
+            return range(start, self.rows if limit is None else min(self.rows, start + limit))
+
+        if limit is not None:
+            # Частым префиксам соответствует большая доля строк: как и планировщик PostgreSQL
+            # при ORDER BY id LIMIT, быстрее проверить строки подряд, чем пересекать диапазоны.
+            # Ожидаемое число проверок оценивается по независимости имени и фамилии
+            expected_scan = limit * self.rows * self.rows / (sizes[0] * sizes[1])
+            if expected_scan < min(sizes):
+                rows = self._scan_rows(
+                    start, first_name_prefix.encode('utf-8'), last_name_prefix.encode('utf-8'), limit, min(sizes)
+                )
+                if rows is not None:
+                    return rows
+
+        ranges = sorted((rows for rows in ranges if rows is not None), key=len)
+        rows = set(ranges[0])
+        for other in ranges[1:]:
+            rows.intersection_update(other)
+        rows = sorted(rows)
+        rows = rows[bisect_left(rows, start):]
+        return rows if limit is None else rows[:limit]
+
+    def search(
+        self, first_name_prefix: str, last_name_prefix: str, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[UserCard]:
+        """
+        Ищет анкеты по префиксам имени и фамилии (в нижнем регистре) в порядке возрастания ID
+
+        Args:
+            first_name_prefix: Префикс имени
+            last_name_prefix: Префикс фамилии
+            after: ID, после которого начинается страница
+            limit: Максимальное количество анкет (None - все)
+
+        Returns:
+            List[UserCard]: Найденные анкеты
+        """
+        return [self.card(row) for row in self.search_rows(first_name_prefix, last_name_prefix, after, limit)]
@@ -36,12 +36,31 @@ def run_migrations():
         print(f"❌ Unexpected error during migration: {e}")
         return False
 
+def create_dialog_shards():
+    """Создание таблиц диалогов в шардах (шарды - отдельные базы, Alembic их не мигрирует)"""
+    print("🔄 Creating dialog shard schema...")
+
+    try:
+        subprocess.run([
+            sys.executable, "-m", "infra.db.sharding.schema"
+        ], capture_output=True, text=True, check=True)
+
+        print("✅ Dialog shards are ready!")
+        return True
+
+    except subprocess.CalledProcessError as e:
+        print("❌ Dialog shard schema failed!")
+        print(f"Error: {e}")
+        if e.stderr:
+            print(f"Error output: {e.stderr}")
+        return False
+
 def main():
     """Основная функция"""
     print("🚀 Starting application initialization...")
     
     # Запускаем миграции
-    if run_migrations():
+    if run_migrations() and create_dialog_shards():
         print("✅ Initialization completed successfully!")
         print("🚀 Starting Flask application...")
         
@@ -1,3 +1,9 @@
-from .user import User
+from .dialog import DialogKey, Message, new_message_id
+from .ids import UUIDv7Generator, get_id_generator, new_user_id, uuid7
+from .post import Post, new_post_id
+from .user import FriendRecommendation, User, UserCard
 
-__all__ = ['User']
+__all__ = [
+    'DialogKey', 'FriendRecommendation', 'Message', 'Post', 'User', 'UserCard', 'UUIDv7Generator', 'get_id_generator',
+    'new_message_id', 'new_post_id', 'new_user_id', 'uuid7',
+]
@@ -0,0 +1,47 @@
+import uuid
+from typing import NamedTuple
+
+from .ids import uuid7
+
+
+def new_message_id() -> uuid.UUID:
+    """
+    Создает ID нового сообщения. Всегда UUIDv7: диалог упорядочен по ID сообщений,
+    поэтому ID должны возрастать со временем
+    """
+    return uuid7()
+
+
+class DialogKey(NamedTuple):
+    """
+    Ключ диалога - неупорядоченная пара пользователей: ID упорядочены,
+    поэтому у диалога A с B и B с A один ключ
+    """
+    user_low: uuid.UUID
+    user_high: uuid.UUID
+
+    @classmethod
+    def of(cls, user_id: uuid.UUID, other_user_id: uuid.UUID) -> "DialogKey":
+        """
+        Raises:
+            ValueError: Если пользователь указывает диалог с самим собой
+        """
+        if user_id == other_user_id:
+            raise ValueError("Диалог с самим собой не поддерживается")
+        return cls(*sorted((user_id, other_user_id)))
+
+    def routing_key(self) -> str:
+        """Строка, по которой диалог распределяется по шардам"""
+        return f"{self.user_low}:{self.user_high}"
+
+    def other(self, user_id: uuid.UUID) -> uuid.UUID:
+        """Собеседник пользователя user_id"""
+        return self.user_high if user_id == self.user_low else self.user_low
+
+
+class Message(NamedTuple):
+    """Сообщение диалога: ID - строки, поэтому сообщение сразу сериализуется в ответ"""
+    id: str
+    from_user_id: str
+    to_user_id: str
+    text: str
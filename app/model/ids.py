@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+import uuid
+from typing import Callable
+
+# Версия UUID для новых пользователей: v7 (упорядочены по времени, по умолчанию) или v4 (случайные)
+USER_ID_VERSION = os.getenv('USER_ID_VERSION', 'v7').lower()
+
+_COUNTER_MAX = 0xFFF
+_RAND_B_MASK = (1 << 62) - 1
+
+
+class UUIDv7Generator:
+    """
+    Генератор UUIDv7 (RFC 9562): 48 бит времени в миллисекундах, затем 12-битный счетчик
+    и 62 случайных бита.
+
+    Ключи, созданные подряд, возрастают, поэтому новые записи попадают в правую страницу
+    индекса первичного ключа, а не в случайные страницы по всему B-дереву. Счетчик в пределах
+    одной миллисекунды сохраняет порядок и при нескольких ID за миллисекунду; при его
+    переполнении и при переводе часов назад время ключа берется на миллисекунду позже
+    предыдущего. Уникальность между процессами обеспечивают случайные биты.
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.time_ns):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._counter = 0
+
+    def __call__(self) -> uuid.UUID:
+        random_bits = int.from_bytes(os.urandom(10), 'big')
+        with self._lock:
+            timestamp_ms = self._clock() // 1_000_000
+            if timestamp_ms > self._last_ms:
+                self._last_ms = timestamp_ms
+                # Старший бит счетчика свободен: запас на ID в той же миллисекунде
+                self._counter = random_bits >> 69
+            else:
+                self._counter += 1
+                if self._counter > _COUNTER_MAX:
+                    self._last_ms += 1
+                    self._counter = 0
+            timestamp_ms, counter = self._last_ms, self._counter
+
+        value = (
+            (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+            | 0x7 << 76
+            | counter << 64
+            | 0b10 << 62
+            | random_bits & _RAND_B_MASK
+        )
+        return uuid.UUID(int=value)
+
+
+uuid7 = UUIDv7Generator()
+
+ID_GENERATORS = {
+    'v4': uuid.uuid4,
+    'v7': uuid7,
+}
+
+
+def get_id_generator(version: str) -> Callable[[], uuid.UUID]:
+    """
+    Возвращает генератор ID по версии UUID
+
+    Args:
+        version: v4 или v7
+
+    Returns:
+        Callable[[], uuid.UUID]: Функция, создающая новый ID
+
+    Raises:
+        ValueError: Если версия не поддерживается
+    """
+    try:
+        return ID_GENERATORS[version]
+    except KeyError:
+        raise ValueError(f"Неизвестная версия UUID: {version}, допустимые: {', '.join(ID_GENERATORS)}") from None
+
+
+_new_user_id = get_id_generator(USER_ID_VERSION)
+
+
+def new_user_id() -> uuid.UUID:
+    """Создает ID нового пользователя генератором, выбранным в USER_ID_VERSION"""
+    return _new_user_id()
@@ -0,0 +1,22 @@
+import uuid
+from typing import NamedTuple
+
+from .ids import uuid7
+
+
+def new_post_id() -> uuid.UUID:
+    """
+    Создает ID нового поста. Всегда UUIDv7 (независимо от USER_ID_VERSION):
+    лента упорядочена по ID постов, поэтому ID должны возрастать со временем
+    """
+    return uuid7()
+
+
+class Post(NamedTuple):
+    """
+    Пост пользователя: строка результата запроса, ID - строки,
+    поэтому строка сразу сериализуется в ответ
+    """
+    id: str
+    text: str
+    author_user_id: str
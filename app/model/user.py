@@ -1,10 +1,16 @@
 import uuid
 from datetime import date
+from typing import NamedTuple, Optional
+
+from .ids import new_user_id
 
 
 class User:
     """Модель пользователя"""
 
+    # Без __dict__ экземпляр меньше и создается быстрее: профили лежат в кэше тысячами
+    __slots__ = ('id', 'first_name', 'second_name', 'birthdate', 'biography', 'city', 'password')
+
     def __init__(
         self,
         user_id: uuid.UUID,
@@ -47,8 +53,8 @@ class User:
         Returns:
             User: Новый экземпляр пользователя с сгенерированным UUID
         """
-        # Генерируем уникальный UUID для нового пользователя
-        user_id = uuid.uuid4()
+        # Генерируем уникальный UUID для нового пользователя (по умолчанию UUIDv7)
+        user_id = new_user_id()
 
         # Создаем экземпляр через приватный конструктор
         return User(
@@ -63,3 +69,25 @@ class User:
 
     def __repr__(self) -> str:
         return f"User(id='{self.id}', name='{self.first_name} {self.second_name}')"
+
+
+class UserCard(NamedTuple):
+    """
+    Анкета пользователя в результатах поиска: строка результата запроса без пароля.
+
+    В отличие от User не требует разбора значений: ID остается строкой,
+    а дата рождения приходит из БД уже в формате ISO 8601, поэтому
+    строка сразу сериализуется в ответ.
+    """
+    id: str
+    first_name: str
+    second_name: str
+    birthdate: Optional[str]
+    biography: str
+    city: str
+
+
+class FriendRecommendation(NamedTuple):
+    """Рекомендованный друг друзей и количество общих друзей с ним"""
+    user: UserCard
+    mutual_friends: int
@@ -0,0 +1,70 @@
+from datetime import date
+
+import pytest
+
+from application import batch_registration
+from application.batch_registration import prepare_batch, validate_registration_item
+
+
+def make_item(**overrides):
+    item = {
+        "first_name": "Иван",
+        "second_name": "Иванов",
+        "birthdate": "1990-01-01",
+        "biography": "-",
+        "city": "Москва",
+        "password": "secret123",
+    }
+    item.update(overrides)
+    return item
+
+
+class TestValidateRegistrationItem:
+    """Тесты проверки анкеты пакетной регистрации"""
+
+    def test_valid_item_converts_birthdate(self):
+        """Тест, что дата рождения валидной анкеты преобразуется в date"""
+        data = validate_registration_item(make_item())
+
+        assert data["birthdate"] == date(1990, 1, 1)
+        assert data["password"] == "secret123"
+
+    @pytest.mark.parametrize(
+        "item, message",
+        [
+            ("не объект", "JSON объектом"),
+            (make_item(age="30"), "Неизвестные поля: age"),
+            (make_item(city=None), "Не заполнены поля: city"),
+            (make_item(city=1), "Поле city должно быть строкой"),
+            (make_item(password=""), "Пароль не должен быть пустым"),
+            (make_item(birthdate="1990-13-01"), "Невалидная дата рождения"),
+        ],
+    )
+    def test_invalid_item_is_rejected(self, item, message):
+        """Тест отклонения невалидных анкет"""
+        with pytest.raises(ValueError, match=message):
+            validate_registration_item(item)
+
+
+class TestPrepareBatch:
+    """Тесты проверки пакета анкет"""
+
+    def test_invalid_items_get_errors(self):
+        """Тест, что ошибки невалидных анкет записываются по их позициям в пакете"""
+        result, valid = prepare_batch([make_item(), make_item(password=""), make_item()])
+
+        assert [index for index, _ in valid] == [0, 2]
+        assert result.items[1].error == "Пароль не должен быть пустым"
+        assert result.items[0].error is None
+
+    def test_empty_batch_is_rejected(self):
+        """Тест отклонения пустого пакета"""
+        with pytest.raises(ValueError):
+            prepare_batch([])
+
+    def test_oversized_batch_is_rejected(self, monkeypatch):
+        """Тест отклонения пакета больше REGISTER_BATCH_MAX_SIZE"""
+        monkeypatch.setattr(batch_registration, "MAX_BATCH_SIZE", 2)
+
+        with pytest.raises(ValueError, match="не больше 2"):
+            prepare_batch([make_item()] * 3)
@@ -0,0 +1,67 @@
+from application.cache import LRUCache
+
+
+class FakeClock:
+    """Управляемые часы для проверки TTL"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache:
+    """Тесты in-process LRU кэша с TTL"""
+
+    def test_get_missing_key(self):
+        """Тест промаха по отсутствующему ключу"""
+        cache = LRUCache(max_size=2, ttl=10)
+
+        assert cache.get("a") == (False, None)
+        assert cache.stats().misses == 1
+
+    def test_put_and_get_none_value(self):
+        """Тест, что None можно закэшировать и отличить от промаха"""
+        cache = LRUCache(max_size=2, ttl=10)
+
+        cache.put("a", None)
+
+        assert cache.get("a") == (True, None)
+        assert cache.stats().hits == 1
+
+    def test_evicts_least_recently_used(self):
+        """Тест вытеснения давно не использованной записи"""
+        cache = LRUCache(max_size=2, ttl=10)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+
+        cache.put("c", 3)
+
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.get("c") == (True, 3)
+        assert cache.stats().evictions == 1
+
+    def test_entry_expires_after_ttl(self):
+        """Тест истечения времени жизни записи"""
+        clock = FakeClock()
+        cache = LRUCache(max_size=2, ttl=10, clock=clock)
+        cache.put("a", 1)
+        cache.put("b", 2, ttl=1)
+
+        clock.now = 5
+
+        assert cache.get("a") == (True, 1)
+        assert cache.get("b") == (False, None)
+        assert cache.stats().expirations == 1
+        assert cache.stats().size == 1
+
+    def test_zero_size_disables_cache(self):
+        """Тест, что кэш нулевого размера ничего не хранит"""
+        cache = LRUCache(max_size=0, ttl=10)
+
+        cache.put("a", 1)
+
+        assert cache.get("a") == (False, None)
@@ -0,0 +1,29 @@
+import pytest
+
+from application.consistency_token import (
+    decode_consistency_token,
+    encode_consistency_token,
+    lsn_to_int,
+)
+
+
+class TestConsistencyToken:
+    """Тесты токена согласованности"""
+
+    def test_lsn_to_int(self):
+        """Тест преобразования LSN в сравнимое число"""
+        assert lsn_to_int("0/16B3748") == 0x16B3748
+        assert lsn_to_int("1/0") > lsn_to_int("0/FFFFFFFF")
+
+    def test_round_trip(self):
+        """Тест, что токен декодируется в LSN записи"""
+        token = encode_consistency_token("2/A1B2C3")
+
+        assert "/" not in token
+        assert decode_consistency_token(token) == lsn_to_int("2/A1B2C3")
+
+    @pytest.mark.parametrize("token", ["", "!!!", encode_consistency_token("not-an-lsn")])
+    def test_invalid_token(self, token):
+        """Тест, что поврежденный токен отклоняется"""
+        with pytest.raises(ValueError):
+            decode_consistency_token(token)
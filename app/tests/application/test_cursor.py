@@ -0,0 +1,39 @@
+import uuid
+
+import pytest
+from application.cursor import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """Тесты кодирования курсора keyset-пагинации"""
+
+    def test_encode_decode_roundtrip(self):
+        """Тест, что декодирование курсора возвращает исходный ID"""
+        user_id = uuid.uuid4()
+
+        cursor = encode_cursor(user_id)
+
+        assert decode_cursor(cursor) == str(user_id)
+
+    def test_cursor_is_opaque(self):
+        """Тест, что курсор не содержит ID в открытом виде и безопасен для URL"""
+        user_id = uuid.uuid4()
+
+        cursor = encode_cursor(user_id)
+
+        assert str(user_id) not in cursor
+        assert '=' not in cursor
+        assert '+' not in cursor
+        assert '/' not in cursor
+
+    def test_decode_invalid_cursor(self):
+        """Тест, что поврежденный курсор приводит к ValueError"""
+        with pytest.raises(ValueError, match="Невалидный курсор"):
+            decode_cursor("not-a-cursor")
+
+    def test_decode_cursor_with_non_uuid_payload(self):
+        """Тест, что курсор не из UUID приводит к ValueError"""
+        cursor = encode_cursor("1 OR 1=1")
+
+        with pytest.raises(ValueError, match="Невалидный курсор"):
+            decode_cursor(cursor)
@@ -0,0 +1,96 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from application.cursor import decode_cursor, encode_cursor
+from application.dialogs import MAX_DIALOG_LIMIT, AsyncDialogService, DialogService
+from application.users import UserNotFoundError
+from model.dialog import DialogKey, Message, new_message_id
+
+
+class TestDialogService:
+    """Тесты сервиса диалогов"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.user_id = uuid.uuid4()
+        self.other_id = uuid.uuid4()
+        self.key = DialogKey.of(self.user_id, self.other_id)
+        self.messages = [
+            Message(str(new_message_id()), str(self.user_id), str(self.other_id), f"Сообщение {i}") for i in range(3)
+        ][::-1]
+        self.repository = Mock()
+        self.user_repository = Mock()
+        self.service = DialogService(self.repository, self.user_repository)
+
+    def test_send_message(self):
+        """Тест, что сообщение сохраняется в диалог пары пользователей с новым UUIDv7"""
+        message = self.service.send_message(str(self.user_id), str(self.other_id), "Привет")
+
+        self.user_repository.get_user.assert_called_once_with(self.other_id)
+        key, message_id, from_user_id, text = self.repository.insert_message.call_args.args
+        assert key == self.key and from_user_id == self.user_id and message_id.version == 7
+        assert message == Message(str(message_id), str(self.user_id), str(self.other_id), "Привет")
+
+    def test_send_to_missing_user(self):
+        """Тест, что сообщение несуществующему пользователю не сохраняется"""
+        self.user_repository.get_user.return_value = None
+
+        with pytest.raises(UserNotFoundError):
+            self.service.send_message(str(self.user_id), str(self.other_id), "Привет")
+
+        self.repository.insert_message.assert_not_called()
+
+    @pytest.mark.parametrize("to_self, text", [(True, "Привет"), (False, "   ")])
+    def test_invalid_message(self, to_self, text):
+        """Тест, что сообщение себе и пустое сообщение не сохраняются"""
+        to_user_id = self.user_id if to_self else self.other_id
+
+        with pytest.raises(ValueError):
+            self.service.send_message(str(self.user_id), str(to_user_id), text)
+
+        self.repository.insert_message.assert_not_called()
+
+    def test_list_requests_one_extra_message(self):
+        """Тест, что оба собеседника читают один диалог, а лишнее сообщение превращается в курсор"""
+        self.repository.list_messages.return_value = self.messages
+
+        page = self.service.list_messages(str(self.other_id), str(self.user_id), limit=2)
+
+        self.repository.list_messages.assert_called_once_with(self.key, 3, None)
+        assert page.messages == self.messages[:2]
+        assert decode_cursor(page.next_cursor) == self.messages[1].id
+
+    def test_list_before_cursor_and_limit_cap(self):
+        """Тест передачи курсора и ограничения размера страницы"""
+        self.repository.list_messages.return_value = self.messages[1:]
+
+        page = self.service.list_messages(
+            str(self.user_id), str(self.other_id), limit=MAX_DIALOG_LIMIT * 10,
+            cursor=encode_cursor(self.messages[0].id),
+        )
+
+        self.repository.list_messages.assert_called_once_with(
+            self.key, MAX_DIALOG_LIMIT + 1, uuid.UUID(self.messages[0].id)
+        )
+        assert page.messages == self.messages[1:] and page.next_cursor is None
+
+    def test_async_service(self):
+        """Тест асинхронного сервиса"""
+        repository = Mock()
+        repository.insert_message = AsyncMock()
+        repository.list_messages = AsyncMock(return_value=self.messages[:1])
+        user_repository = Mock()
+        user_repository.get_user = AsyncMock(side_effect=[Mock(), None])
+        service = AsyncDialogService(repository, user_repository)
+
+        message = asyncio.run(service.send_message(str(self.user_id), str(self.other_id), "Привет"))
+        with pytest.raises(UserNotFoundError):
+            asyncio.run(service.send_message(str(self.user_id), str(self.other_id), "Привет"))
+        page = asyncio.run(service.list_messages(str(self.user_id), str(self.other_id), limit=1))
+
+        assert message.from_user_id == str(self.user_id) and message.to_user_id == str(self.other_id)
+        repository.insert_message.assert_awaited_once()
+        assert page.messages == self.messages[:1] and page.next_cursor is None
@@ -0,0 +1,97 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from application.cursor import decode_cursor, encode_cursor
+from application.friends import (
+    MAX_FRIENDS_LIMIT,
+    MAX_SUGGEST_FRIENDS_LIMIT,
+    AsyncFriendService,
+    FriendNotFoundError,
+    FriendService,
+)
+from model.user import FriendRecommendation
+from tests.factories import make_card
+
+
+class TestFriendService:
+    """Тесты сервиса дружбы"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.user_id = uuid.uuid4()
+        self.friend_ids = sorted(uuid.uuid4() for _ in range(3))
+        self.repository = Mock()
+        self.service = FriendService(self.repository)
+
+    def test_add_friend(self):
+        """Тест добавления друга"""
+        self.repository.add_friend.return_value = True
+
+        self.service.add_friend(str(self.user_id), str(self.friend_ids[0]))
+
+        self.repository.add_friend.assert_called_once_with(self.user_id, self.friend_ids[0])
+
+    def test_add_unknown_friend(self):
+        """Тест, что добавление несуществующего пользователя - ошибка"""
+        self.repository.add_friend.return_value = False
+
+        with pytest.raises(FriendNotFoundError):
+            self.service.add_friend(str(self.user_id), str(self.friend_ids[0]))
+
+    def test_self_and_invalid_ids_rejected(self):
+        """Тест, что нельзя добавить себя и невалидный ID"""
+        with pytest.raises(ValueError):
+            self.service.add_friend(str(self.user_id), str(self.user_id))
+        with pytest.raises(ValueError):
+            self.service.delete_friend(str(self.user_id), "не uuid")
+
+        self.repository.add_friend.assert_not_called()
+        self.repository.delete_friend.assert_not_called()
+
+    def test_list_requests_one_extra_row(self):
+        """Тест, что лишняя запись из репозитория превращается в курсор следующей страницы"""
+        self.repository.list_friends.return_value = [make_card(i) for i in self.friend_ids]
+
+        page = self.service.list_friends(str(self.user_id), limit=2)
+
+        self.repository.list_friends.assert_called_once_with(self.user_id, 3, None)
+        assert [card.id for card in page.users] == [str(i) for i in self.friend_ids[:2]]
+        assert decode_cursor(page.next_cursor) == str(self.friend_ids[1])
+
+    def test_list_after_cursor_and_limit_cap(self):
+        """Тест передачи курсора и ограничения размера страницы"""
+        self.repository.list_friends.return_value = []
+
+        page = self.service.list_friends(
+            str(self.user_id), limit=MAX_FRIENDS_LIMIT * 10, cursor=encode_cursor(self.friend_ids[0])
+        )
+
+        self.repository.list_friends.assert_called_once_with(self.user_id, MAX_FRIENDS_LIMIT + 1, self.friend_ids[0])
+        assert page.users == [] and page.next_cursor is None
+
+    def test_async_service(self):
+        """Тест асинхронного сервиса"""
+        repository = Mock()
+        repository.add_friend = AsyncMock(return_value=False)
+        repository.list_friends = AsyncMock(return_value=[make_card(self.friend_ids[0])])
+        service = AsyncFriendService(repository)
+
+        with pytest.raises(FriendNotFoundError):
+            asyncio.run(service.add_friend(str(self.user_id), str(self.friend_ids[0])))
+        page = asyncio.run(service.list_friends(str(self.user_id), limit=1))
+
+        assert [card.id for card in page.users] == [str(self.friend_ids[0])]
+        assert page.next_cursor is None
+
+    def test_suggest_friends_caps_limit(self):
+        """Тест, что рекомендации читаются из репозитория с ограничением количества"""
+        recommendation = FriendRecommendation(make_card(self.friend_ids[0]), 2)
+        self.repository.list_recommendations.return_value = [recommendation]
+
+        recommendations = self.service.suggest_friends(str(self.user_id), limit=MAX_SUGGEST_FRIENDS_LIMIT * 10)
+
+        self.repository.list_recommendations.assert_called_once_with(self.user_id, MAX_SUGGEST_FRIENDS_LIMIT)
+        assert recommendations == [recommendation]
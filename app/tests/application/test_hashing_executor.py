@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock
+
+import pytest
+from application.hashing_executor import HashingExecutor, HashingQueueFullError, default_pool_size
+from application.password_hasher import PasswordHasher
+
+
+def _blocking_task(event):
+    event.wait()
+    return "done"
+
+
+class TestHashingExecutor:
+    """Тесты исполнителя bcrypt хэширования"""
+
+    def test_hash_and_check_in_process_pool(self):
+        """Тест хэширования и проверки пароля в пуле процессов"""
+        executor = HashingExecutor(pool_size=1, queue_size=2, queue_timeout=1)
+        try:
+            hashed = executor.hash("secret123")
+
+            assert hashed.startswith("$2b$")
+            assert executor.check("secret123", hashed) is True
+            assert executor.check("wrong", hashed) is False
+        finally:
+            executor.shutdown()
+
+    def test_async_hash_and_check(self):
+        """Тест асинхронных вариантов хэширования и проверки"""
+        executor = HashingExecutor(pool_size=0)
+
+        async def scenario():
+            hashed = await executor.hash_async("secret123")
+            return await executor.check_async("secret123", hashed)
+
+        assert asyncio.run(scenario()) is True
+
+    def test_stats_count_completed_tasks(self):
+        """Тест метрик: количество выполненных задач и глубина очереди"""
+        executor = HashingExecutor(pool_size=0)
+
+        executor.hash("secret123")
+        executor.check("secret123", "")
+        stats = executor.stats()
+
+        assert stats.completed == 2
+        assert stats.queue_depth == 0
+        assert stats.max_queue_depth == 1
+        assert stats.max_wait_seconds >= 0
+        assert stats.avg_wait_seconds >= 0
+
+    def test_full_queue_rejects_task(self):
+        """Тест, что при заполненной очереди задача отклоняется"""
+        executor = HashingExecutor(pool_size=0, queue_size=1, queue_timeout=0.01)
+        release = threading.Event()
+        worker = threading.Thread(target=executor.submit, args=(_blocking_task, release))
+        worker.start()
+        try:
+            # Ждем, пока первая задача займет единственное место в очереди
+            while executor.stats().queue_depth == 0:
+                pass
+
+            with pytest.raises(HashingQueueFullError):
+                executor.submit(PasswordHasher.hash, "secret123")
+
+            assert executor.stats().rejected == 1
+        finally:
+            release.set()
+            worker.join()
+
+        assert executor.stats().queue_depth == 0
+
+    def test_failed_task_releases_queue_slot(self):
+        """Тест, что упавшая задача освобождает место в очереди"""
+        executor = HashingExecutor(pool_size=0, queue_size=1, queue_timeout=0.01)
+
+        with pytest.raises(TypeError):
+            executor.submit(PasswordHasher.hash).result()
+
+        assert executor.hash("secret123").startswith("$2b$")
+
+    def test_killed_pool_process_is_replaced(self):
+        """Тест, что после гибели процесса пула задачи снова выполняются в новом пуле"""
+        executor = HashingExecutor(pool_size=1, queue_size=2, queue_timeout=1)
+        try:
+            hashed = executor.hash("secret123")
+            pool = executor._pool
+            for process in list(pool._processes.values()):
+                process.kill()
+                process.join()
+
+            # Задача, попавшая в сломанный пул, завершается ошибкой, но не занимает место в очереди
+            with pytest.raises(BrokenProcessPool):
+                executor.hash("secret123")
+
+            assert executor.check("secret123", hashed) is True
+            assert executor._pool is not pool
+            assert executor.stats().queue_depth == 0
+        finally:
+            executor.shutdown()
+
+    def test_failed_submit_releases_queue_slot(self):
+        """Тест, что ошибка постановки задачи в пул освобождает место и сбрасывает сломанный пул"""
+        executor = HashingExecutor(pool_size=1, queue_size=1, queue_timeout=0.01)
+        executor._pool = Mock(submit=Mock(side_effect=BrokenProcessPool("процесс пула завершился")))
+
+        with pytest.raises(BrokenProcessPool):
+            executor.submit(PasswordHasher.hash, "secret123")
+
+        assert executor._pool is None
+        assert executor.stats().queue_depth == 0
+        assert executor._slots.acquire(timeout=0)
+
+    def test_hash_many_keeps_order(self):
+        """Тест пакетного хэширования: хэши в порядке паролей"""
+        executor = HashingExecutor(pool_size=0)
+        passwords = ["first", "second"]
+
+        hashes = executor.hash_many(passwords)
+        async_hashes = asyncio.run(executor.hash_many_async(passwords))
+
+        for password, hashed, async_hashed in zip(passwords, hashes, async_hashes):
+            assert executor.check(password, hashed)
+            assert executor.check(password, async_hashed)
+    @pytest.mark.parametrize("cpu_count, workers, expected", [(16, "8", 2), (4, "8", 1), (None, "8", 1), (8, None, 8)])
+    def test_default_pool_size_shares_cores_between_workers(self, monkeypatch, cpu_count, workers, expected):
+        """Тест, что ядра делятся между worker-ами gunicorn, но пул не бывает пустым"""
+        monkeypatch.setattr("os.cpu_count", lambda: cpu_count)
+        if workers is None:
+            monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+        else:
+            monkeypatch.setenv("WEB_CONCURRENCY", workers)
+
+        assert default_pool_size() == expected
+
+
+class TestPasswordHasherRounds:
+    """Тесты настройки стоимости bcrypt"""
+
+    def test_hash_with_custom_rounds(self):
+        """Тест, что стоимость записывается в хэш"""
+        hashed = PasswordHasher.hash("secret123", rounds=4)
+
+        assert hashed.startswith("$2b$04$")
+        assert PasswordHasher.check("secret123", hashed) is True
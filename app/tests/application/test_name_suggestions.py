@@ -0,0 +1,69 @@
+from unittest.mock import Mock
+
+import pytest
+
+from application.name_suggestions import (
+    MAX_SUGGEST_LIMIT,
+    NameFrequencies,
+    NameSuggestion,
+    NameSuggestionService,
+    NameSuggestionsNotReadyError,
+)
+
+FIRST_NAMES = [('иван', 'Иван', 10), ('игорь', 'Игорь', 3), ('илья', 'Илья', 3), ('анна', 'Анна', 20)]
+LAST_NAMES = [('иванов', 'Иванов', 7), ('ивашкин', 'Ивашкин', 2), ('петров', 'Петров', 5)]
+
+
+class TestNameFrequencies:
+    """Тесты выбора самых частых имен по префиксу"""
+
+    def test_top_by_count_then_alphabet(self):
+        """Тест порядка: по убыванию частоты, при равной частоте - по алфавиту"""
+        frequencies = NameFrequencies(FIRST_NAMES)
+
+        assert frequencies.top('и', 10) == [
+            NameSuggestion('Иван', 10), NameSuggestion('Игорь', 3), NameSuggestion('Илья', 3),
+        ]
+        assert frequencies.top('и', 1) == [NameSuggestion('Иван', 10)]
+        assert frequencies.top('я', 10) == []
+
+    def test_wide_prefix_matches_brute_force(self):
+        """Тест короткого префикса с тысячами имен (запоминаемый диапазон)"""
+        rows = [(f'а{i:05d}', f'А{i:05d}', i % 97) for i in range(5000)]
+        frequencies = NameFrequencies(rows)
+        expected = sorted(rows, key=lambda row: (-row[2], row[0]))
+
+        for limit in (MAX_SUGGEST_LIMIT, 5, 1):
+            assert frequencies.top('а', limit) == [NameSuggestion(row[1], row[2]) for row in expected[:limit]]
+
+
+class TestNameSuggestionService:
+    """Тесты сервиса подсказок"""
+
+    def setup_method(self):
+        self.repository = Mock()
+        self.repository.get_name_frequencies.return_value = (FIRST_NAMES, LAST_NAMES)
+        self.service = NameSuggestionService(self.repository)
+        # Фоновое обновление в тестах не запускается
+        self.service._started = True
+
+    def test_suggest_first_and_last_names(self):
+        """Тест подсказок по нормализованному префиксу"""
+        self.service.refresh()
+
+        suggestions = self.service.suggest(' ИВ ', limit=5)
+
+        assert suggestions.first_names == [NameSuggestion('Иван', 10)]
+        assert suggestions.last_names == [NameSuggestion('Иванов', 7), NameSuggestion('Ивашкин', 2)]
+
+    def test_not_ready_before_first_refresh(self):
+        """Тест, что до загрузки частот подсказки недоступны"""
+        with pytest.raises(NameSuggestionsNotReadyError):
+            self.service.suggest('ив')
+
+    def test_empty_prefix_rejected(self):
+        """Тест, что пустой префикс не принимается"""
+        self.service.refresh()
+
+        with pytest.raises(ValueError):
+            self.service.suggest('   ')
@@ -0,0 +1,94 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from application.cursor import decode_cursor, encode_cursor
+from application.posts import MAX_FEED_LIMIT, AsyncPostService, PostNotFoundError, PostService
+from model.post import Post, new_post_id
+
+
+class TestPostService:
+    """Тесты сервиса постов и ленты"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.user_id = uuid.uuid4()
+        self.author_id = uuid.uuid4()
+        self.posts = [Post(str(new_post_id()), f"Пост {i}", str(self.author_id)) for i in range(3)][::-1]
+        self.repository = Mock()
+        self.service = PostService(self.repository)
+
+    def test_create_post_with_time_ordered_id(self):
+        """Тест, что пост сохраняется с новым UUIDv7, который больше ID прежних постов"""
+        post = self.service.create_post(str(self.user_id), "Текст")
+
+        post_id, author_id, text = self.repository.insert_post.call_args.args
+        assert post == Post(str(post_id), text, str(author_id))
+        assert post_id.version == 7 and post.id > self.posts[0].id
+
+    def test_empty_text_rejected(self):
+        """Тест, что пустой пост не сохраняется"""
+        with pytest.raises(ValueError):
+            self.service.create_post(str(self.user_id), "   ")
+
+        self.repository.insert_post.assert_not_called()
+
+    def test_update_and_delete_foreign_post(self):
+        """Тест, что изменение и удаление чужого или отсутствующего поста - ошибка"""
+        self.repository.update_post.return_value = False
+        self.repository.delete_post.return_value = False
+        post_id = self.posts[0].id
+
+        with pytest.raises(PostNotFoundError):
+            self.service.update_post(str(self.user_id), post_id, "Текст")
+        with pytest.raises(PostNotFoundError):
+            self.service.delete_post(str(self.user_id), post_id)
+
+        self.repository.update_post.assert_called_once_with(uuid.UUID(post_id), self.user_id, "Текст")
+        self.repository.delete_post.assert_called_once_with(uuid.UUID(post_id), self.user_id)
+
+    def test_get_missing_post(self):
+        """Тест получения отсутствующего поста"""
+        self.repository.get_post.return_value = None
+
+        with pytest.raises(PostNotFoundError):
+            self.service.get_post(str(uuid.uuid4()))
+
+    def test_feed_requests_one_extra_post(self):
+        """Тест, что лишний пост из репозитория превращается в курсор следующей страницы"""
+        self.repository.get_feed.return_value = self.posts
+
+        page = self.service.get_feed(str(self.user_id), limit=2)
+
+        self.repository.get_feed.assert_called_once_with(self.user_id, 3, None)
+        assert page.posts == self.posts[:2]
+        assert decode_cursor(page.next_cursor) == self.posts[1].id
+
+    def test_feed_after_cursor_and_limit_cap(self):
+        """Тест передачи курсора и ограничения размера страницы"""
+        self.repository.get_feed.return_value = self.posts[1:]
+
+        page = self.service.get_feed(
+            str(self.user_id), limit=MAX_FEED_LIMIT * 10, cursor=encode_cursor(self.posts[0].id)
+        )
+
+        self.repository.get_feed.assert_called_once_with(self.user_id, MAX_FEED_LIMIT + 1, uuid.UUID(self.posts[0].id))
+        assert page.posts == self.posts[1:] and page.next_cursor is None
+
+    def test_async_service(self):
+        """Тест асинхронного сервиса"""
+        repository = Mock()
+        repository.insert_post = AsyncMock()
+        repository.delete_post = AsyncMock(return_value=False)
+        repository.get_feed = AsyncMock(return_value=self.posts[:1])
+        service = AsyncPostService(repository)
+
+        post = asyncio.run(service.create_post(str(self.user_id), "Текст"))
+        with pytest.raises(PostNotFoundError):
+            asyncio.run(service.delete_post(str(self.user_id), post.id))
+        page = asyncio.run(service.get_feed(str(self.user_id), limit=1))
+
+        assert post.author_user_id == str(self.user_id)
+        assert page.posts == self.posts[:1] and page.next_cursor is None
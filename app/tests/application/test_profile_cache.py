@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import uuid
+from datetime import date
+
+from application.profile_cache import InMemoryCacheBackend, ProfileCache
+from model.user import User
+
+
+def make_user(user_id: uuid.UUID, birthdate=date(1990, 1, 1)) -> User:
+    return User(
+        user_id=user_id,
+        first_name="Иван",
+        second_name="Иванов",
+        birthdate=birthdate,
+        biography="-",
+        city="Москва",
+        password="$2b$12$hash",
+    )
+
+
+class TestProfileCache:
+    """Тесты кэша профилей"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.user_id = uuid.uuid4()
+        self.cache = ProfileCache(max_size=10, ttl=60, negative_ttl=5)
+
+    def test_miss_then_hit(self):
+        """Тест промаха до сохранения и попадания после"""
+        assert self.cache.lookup(self.user_id) == (False, None)
+
+        self.cache.store(self.user_id, make_user(self.user_id))
+        found, user = self.cache.lookup(self.user_id)
+
+        assert found is True
+        assert user.id == self.user_id
+        stats = self.cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+
+    def test_password_is_not_cached(self):
+        """Тест, что хэш пароля не попадает в кэш"""
+        self.cache.store(self.user_id, make_user(self.user_id))
+
+        _, user = self.cache.lookup(self.user_id)
+
+        assert user.password is None
+
+    def test_registration_birthdate_string_is_normalized(self):
+        """Тест, что дата рождения из JSON при регистрации кэшируется как date"""
+        self.cache.store(self.user_id, make_user(self.user_id, birthdate="1990-01-01"))
+
+        _, user = self.cache.lookup(self.user_id)
+
+        assert user.birthdate == date(1990, 1, 1)
+
+    def test_negative_caching(self):
+        """Тест кэширования отсутствующего пользователя"""
+        self.cache.store(self.user_id, None)
+
+        assert self.cache.lookup(self.user_id) == (True, None)
+        assert self.cache.stats().negative_hits == 1
+
+    def test_invalidate(self):
+        """Тест удаления профиля из кэша"""
+        self.cache.store(self.user_id, make_user(self.user_id))
+
+        self.cache.invalidate(self.user_id)
+
+        assert self.cache.lookup(self.user_id) == (False, None)
+
+    def test_shared_backend_is_used_by_other_worker(self):
+        """Тест, что профиль, сохраненный одним worker-ом, виден другому через общий кэш"""
+        shared = InMemoryCacheBackend()
+        worker_1 = ProfileCache(max_size=10, ttl=60, negative_ttl=5, shared_backend=shared)
+        worker_2 = ProfileCache(max_size=10, ttl=60, negative_ttl=5, shared_backend=shared)
+
+        worker_1.store(self.user_id, make_user(self.user_id))
+        found, user = worker_2.lookup(self.user_id)
+
+        assert found is True
+        assert user.first_name == "Иван"
+        assert user.birthdate == date(1990, 1, 1)
+        assert worker_2.stats().shared_hits == 1
+
+    def test_disabled_cache(self):
+        """Тест, что выключенный кэш всегда промахивается"""
+        cache = ProfileCache(max_size=0)
+
+        cache.store(self.user_id, make_user(self.user_id))
+
+        assert cache.lookup(self.user_id) == (False, None)
+
+    def test_async_shared_backend_is_called_outside_event_loop(self):
+        """Тест, что в асинхронном режиме общий кэш вызывается не из потока event loop"""
+        threads = []
+
+        class RecordingBackend(InMemoryCacheBackend):
+            def get(self, key):
+                threads.append(threading.get_ident())
+                return super().get(key)
+
+            def set(self, key, value, ttl):
+                threads.append(threading.get_ident())
+                super().set(key, value, ttl)
+
+        shared = RecordingBackend()
+        worker_1 = ProfileCache(max_size=10, ttl=60, negative_ttl=5, shared_backend=shared)
+        worker_2 = ProfileCache(max_size=10, ttl=60, negative_ttl=5, shared_backend=shared)
+        other_id = uuid.uuid4()
+
+        async def scenario():
+            await worker_1.store_async(self.user_id, make_user(self.user_id))
+            return threading.get_ident(), await worker_2.lookup_many_async([self.user_id, other_id])
+
+        loop_thread, results = asyncio.run(scenario())
+
+        assert results[0][0] is True
+        assert results[0][1].id == self.user_id
+        assert results[1] == (False, None)
+        assert len(threads) == 3
+        assert loop_thread not in threads
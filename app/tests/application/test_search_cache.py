@@ -0,0 +1,49 @@
+from application.search_cache import SearchCache
+from application.user_search_query import UserSearchPage, UserSearchQuery
+
+
+class TestSearchCache:
+    """Тесты кэша результатов поиска"""
+
+    def test_second_request_is_served_from_cache(self):
+        """Тест, что повторный запрос не вызывает загрузку"""
+        cache = SearchCache(max_size=10, ttl=60)
+        query = UserSearchQuery(first_name="ива", last_name="раз")
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return UserSearchPage(users=[])
+
+        first = cache.get_or_load(query, loader)
+        second = cache.get_or_load(UserSearchQuery(first_name="ива", last_name="раз"), loader)
+
+        assert first is second
+        assert len(calls) == 1
+        assert cache.stats().hits == 1
+
+    def test_different_pages_are_cached_separately(self):
+        """Тест, что разные страницы одного запроса кэшируются отдельно"""
+        cache = SearchCache(max_size=10, ttl=60)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return UserSearchPage(users=[])
+
+        cache.get_or_load(UserSearchQuery(first_name="ива", last_name="раз", limit=10), loader)
+        cache.get_or_load(UserSearchQuery(first_name="ива", last_name="раз", limit=20), loader)
+
+        assert len(calls) == 2
+
+
+class TestUserSearchQueryNormalization:
+    """Тесты нормализации параметров поиска"""
+
+    def test_normalized_trims_and_lowercases(self):
+        """Тест приведения префиксов к нижнему регистру и удаления пробелов"""
+        query = UserSearchQuery(first_name=" Ива ", last_name="рАз", limit=5)
+
+        normalized = query.normalized()
+
+        assert normalized == UserSearchQuery(first_name="ива", last_name="раз", limit=5)
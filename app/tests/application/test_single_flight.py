@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import pytest
+from application.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    """Тесты объединения одновременных вызовов в потоках"""
+
+    def test_concurrent_calls_are_coalesced(self):
+        """Тест, что одновременные вызовы с одним ключом выполняют функцию один раз"""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def slow_load():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return "result"
+
+        leader = threading.Thread(target=lambda: results.append(flight.do("key", slow_load)))
+        leader.start()
+        started.wait()
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("key", slow_load)))
+            for _ in range(3)
+        ]
+        for follower in followers:
+            follower.start()
+        # Ждем, пока все ожидающие потоки подпишутся на выполняющийся вызов
+        while flight.coalesced < 3:
+            pass
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ["result"] * 4
+
+    def test_error_is_propagated_and_key_is_released(self):
+        """Тест, что исключение пробрасывается, а следующий вызов выполняется заново"""
+        flight = SingleFlight()
+
+        def failing_load():
+            raise RuntimeError("db error")
+
+        with pytest.raises(RuntimeError, match="db error"):
+            flight.do("key", failing_load)
+
+        assert flight.do("key", lambda: "ok") == "ok"
+
+
+class TestAsyncSingleFlight:
+    """Тесты объединения одновременных вызовов в event loop"""
+
+    def test_concurrent_calls_are_coalesced(self):
+        """Тест, что одновременные корутины с одним ключом выполняют загрузку один раз"""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow_load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def scenario():
+            return await asyncio.gather(*(flight.do("key", slow_load) for _ in range(5)))
+
+        results = asyncio.run(scenario())
+
+        assert results == ["result"] * 5
+        assert len(calls) == 1
+        assert flight.coalesced == 4
+
+    def test_error_is_propagated_to_all_waiters(self):
+        """Тест, что исключение получают все ожидающие корутины"""
+        flight = AsyncSingleFlight()
+
+        async def failing_load():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db error")
+
+        async def scenario():
+            return await asyncio.gather(
+                *(flight.do("key", failing_load) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(scenario())
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_leader_cancellation_does_not_cancel_followers(self):
+        """Тест, что отмена первого запроса (клиент отключился) не отменяет загрузку для остальных"""
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_load():
+            calls.append(1)
+            await release.wait()
+            return "result"
+
+        async def scenario():
+            leader = asyncio.ensure_future(flight.do("key", slow_load))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("key", slow_load))
+            await asyncio.sleep(0)
+            leader.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            result = await follower
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return result
+
+        assert asyncio.run(scenario()) == "result"
+        assert len(calls) == 1
+        assert flight.coalesced == 1
+        assert flight._calls == {}
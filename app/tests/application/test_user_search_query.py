@@ -0,0 +1,12 @@
+from application.user_search_query import DEFAULT_SEARCH_LIMIT, UserSearchQuery
+
+
+class TestUserSearchQuery:
+    """Тесты параметров поиска"""
+
+    def test_default_page_params(self):
+        """Тест значений пагинации по умолчанию"""
+        query = UserSearchQuery(first_name="Ива", last_name="Раз")
+
+        assert query.limit == DEFAULT_SEARCH_LIMIT
+        assert query.after is None
@@ -0,0 +1,437 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from application.consistency_token import decode_consistency_token, lsn_to_int
+from application.cursor import decode_cursor
+from application.hashing_executor import HashingExecutor
+from application.profile_cache import ProfileCache
+from application.search_cache import SearchCache
+from application.user_search_query import MAX_SEARCH_LIMIT, UserSearchQuery
+from application.users import MAX_PROFILE_BATCH_SIZE, AsyncUserService, UserNotFoundError, UserService
+from infra.db.repository.users import IdempotencyKeyExistsError
+from model.user import User
+from tests.factories import make_card
+
+
+def make_user(user_id: uuid.UUID) -> User:
+    return User(
+        user_id=user_id,
+        first_name="Иван",
+        second_name="Иванов",
+        birthdate=None,
+        biography="-",
+        city="Москва",
+        password=None,
+    )
+
+
+class TestUserServiceSearch:
+    """Тесты поиска пользователей с keyset-пагинацией"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.user_ids = sorted((uuid.uuid4() for _ in range(5)), key=str)
+        self.repository = Mock()
+        self.service = UserService(
+            self.repository, HashingExecutor(pool_size=0), ProfileCache(max_size=0), SearchCache(max_size=0)
+        )
+
+    def test_search_requests_one_extra_row(self):
+        """Тест, что из репозитория запрашивается на одну запись больше limit"""
+        self.repository.search_users.return_value = []
+
+        self.service.search_users(UserSearchQuery(first_name="Ива", last_name="Ива", limit=3))
+
+        repository_query = self.repository.search_users.call_args.args[0]
+        assert repository_query.limit == 4
+
+    def test_search_returns_next_cursor_when_more_rows(self):
+        """Тест, что при наличии следующей страницы возвращается курсор на последний ID"""
+        self.repository.search_users.return_value = [make_card(i) for i in self.user_ids[:4]]
+
+        page = self.service.search_users(UserSearchQuery(first_name="Ива", last_name="Ива", limit=3))
+
+        assert [user.id for user in page.users] == [str(i) for i in self.user_ids[:3]]
+        assert decode_cursor(page.next_cursor) == str(self.user_ids[2])
+
+    def test_search_last_page_has_no_cursor(self):
+        """Тест, что у последней страницы нет курсора"""
+        self.repository.search_users.return_value = [make_card(i) for i in self.user_ids[:2]]
+
+        page = self.service.search_users(UserSearchQuery(first_name="Ива", last_name="Ива", limit=3))
+
+        assert len(page.users) == 2
+        assert page.next_cursor is None
+
+    def test_search_limit_is_capped(self):
+        """Тест жесткого ограничения размера страницы"""
+        self.repository.search_users.return_value = []
+
+        self.service.search_users(
+            UserSearchQuery(first_name="А", last_name="А", limit=MAX_SEARCH_LIMIT * 10)
+        )
+
+        repository_query = self.repository.search_users.call_args.args[0]
+        assert repository_query.limit == MAX_SEARCH_LIMIT + 1
+
+    def test_stream_search_delegates_to_repository_iterator(self):
+        """Тест, что потоковый поиск отдает итератор репозитория без материализации"""
+        users = iter([make_card(i) for i in self.user_ids])
+        self.repository.iter_search_users.return_value = users
+        query = UserSearchQuery(first_name="А", last_name="А")
+
+        result = self.service.stream_search_users(query)
+
+        self.repository.iter_search_users.assert_called_once_with(query, min_lsn=None)
+        assert result is users
+
+
+class TestAsyncUserService:
+    """Тесты асинхронного сервиса пользователей"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.user_ids = sorted((uuid.uuid4() for _ in range(3)), key=str)
+        self.repository = Mock()
+        self.service = AsyncUserService(
+            self.repository, HashingExecutor(pool_size=0), ProfileCache(max_size=0), SearchCache(max_size=0)
+        )
+
+    def test_search_returns_page_with_cursor(self):
+        """Тест, что асинхронный поиск использует ту же логику страниц, что и синхронный"""
+        self.repository.search_users = AsyncMock(
+            return_value=[make_card(i) for i in self.user_ids]
+        )
+
+        page = asyncio.run(
+            self.service.search_users(UserSearchQuery(first_name="А", last_name="А", limit=2))
+        )
+
+        assert self.repository.search_users.call_args.args[0].limit == 3
+        assert [user.id for user in page.users] == [str(i) for i in self.user_ids[:2]]
+        assert decode_cursor(page.next_cursor) == str(self.user_ids[1])
+
+    def test_get_user_profile_not_found(self):
+        """Тест, что для отсутствующего пользователя бросается UserNotFoundError"""
+        self.repository.get_user = AsyncMock(return_value=None)
+
+        with pytest.raises(UserNotFoundError):
+            asyncio.run(self.service.get_user_profile(str(self.user_ids[0])))
+
+    def test_register_user_hashes_password(self):
+        """Тест, что при асинхронной регистрации пароль сохраняется в виде хэша"""
+        self.repository.insert_user = AsyncMock(return_value="0/16B3748")
+        user_data = {
+            "first_name": "Иван",
+            "second_name": "Иванов",
+            "birthdate": "1990-01-01",
+            "biography": "-",
+            "city": "Москва",
+            "password": "secret123",
+        }
+
+        result = asyncio.run(self.service.register_user(user_data))
+
+        inserted_user = self.repository.insert_user.call_args.args[0]
+        assert result["user_id"] == inserted_user.id
+        assert decode_consistency_token(result["consistency_token"]) == lsn_to_int("0/16B3748")
+        assert inserted_user.password.startswith("$2b$")
+
+
+class TestUserServiceProfileCache:
+    """Тесты чтения профиля через кэш"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.user_id = uuid.uuid4()
+        self.repository = Mock()
+        self.service = UserService(
+            self.repository,
+            HashingExecutor(pool_size=0),
+            ProfileCache(max_size=10, ttl=60, negative_ttl=5),
+            SearchCache(max_size=0),
+        )
+
+    def test_second_read_is_served_from_cache(self):
+        """Тест, что повторное чтение профиля не обращается к репозиторию"""
+        self.repository.get_user.return_value = make_user(self.user_id)
+
+        self.service.get_user_profile(str(self.user_id))
+        user = self.service.get_user_profile(str(self.user_id))
+
+        assert user.id == self.user_id
+        self.repository.get_user.assert_called_once()
+
+    def test_unknown_user_is_negatively_cached(self):
+        """Тест, что отсутствующий пользователь кэшируется и не запрашивается повторно"""
+        self.repository.get_user.return_value = None
+
+        for _ in range(2):
+            with pytest.raises(UserNotFoundError):
+                self.service.get_user_profile(str(self.user_id))
+
+        self.repository.get_user.assert_called_once()
+
+    def test_registration_populates_cache(self):
+        """Тест, что профиль после регистрации читается без обращения к репозиторию"""
+        self.repository.insert_user.return_value = "0/16B3748"
+        result = self.service.register_user({
+            "first_name": "Иван",
+            "second_name": "Иванов",
+            "birthdate": "1990-01-01",
+            "biography": "-",
+            "city": "Москва",
+            "password": "secret123",
+        })
+
+        user = self.service.get_user_profile(str(result["user_id"]))
+
+        assert user.first_name == "Иван"
+        self.repository.get_user.assert_not_called()
+
+
+class TestUserServiceProfiles:
+    """Тесты получения пачки профилей"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.user_ids = [uuid.uuid4() for _ in range(3)]
+        self.repository = Mock()
+        self.service = UserService(
+            self.repository,
+            HashingExecutor(pool_size=0),
+            ProfileCache(max_size=10, ttl=60, negative_ttl=5),
+            SearchCache(max_size=0),
+        )
+
+    def test_found_and_missing_in_request_order(self):
+        """Тест, что профили читаются одним запросом, а отсутствующие ID возвращаются отдельно"""
+        self.repository.get_users.return_value = [make_user(self.user_ids[2]), make_user(self.user_ids[0])]
+        requested = [str(user_id) for user_id in self.user_ids] + [str(self.user_ids[0])]
+
+        result = self.service.get_user_profiles(requested)
+
+        assert [user.id for user in result.users] == [self.user_ids[0], self.user_ids[2]]
+        assert result.missing == [str(self.user_ids[1])]
+        self.repository.get_users.assert_called_once_with(self.user_ids, min_lsn=None)
+
+    def test_cached_profiles_are_not_loaded(self):
+        """Тест, что из БД читаются только профили, которых нет в кэше"""
+        self.repository.get_user.return_value = make_user(self.user_ids[0])
+        self.service.get_user_profile(str(self.user_ids[0]))
+        self.repository.get_users.return_value = [make_user(self.user_ids[1])]
+
+        result = self.service.get_user_profiles([str(user_id) for user_id in self.user_ids[:2]])
+
+        assert [user.id for user in result.users] == self.user_ids[:2]
+        self.repository.get_users.assert_called_once_with([self.user_ids[1]], min_lsn=None)
+
+    def test_batch_size_is_limited(self):
+        """Тест, что слишком большая пачка и невалидный ID отклоняются"""
+        with pytest.raises(ValueError):
+            self.service.get_user_profiles([str(uuid.uuid4()) for _ in range(MAX_PROFILE_BATCH_SIZE + 1)])
+        with pytest.raises(ValueError):
+            self.service.get_user_profiles(["не uuid"])
+
+        self.repository.get_users.assert_not_called()
+
+    def test_async_profiles(self):
+        """Тест, что асинхронный сервис использует тот же кэш и один запрос к БД"""
+        repository = Mock()
+        repository.get_users = AsyncMock(return_value=[make_user(self.user_ids[0])])
+        service = AsyncUserService(
+            repository, HashingExecutor(pool_size=0), ProfileCache(max_size=10), SearchCache(max_size=0)
+        )
+
+        result = asyncio.run(service.get_user_profiles([str(user_id) for user_id in self.user_ids[:2]]))
+        asyncio.run(service.get_user_profiles([str(user_id) for user_id in self.user_ids[:2]]))
+
+        assert [user.id for user in result.users] == [self.user_ids[0]]
+        assert result.missing == [str(self.user_ids[1])]
+        repository.get_users.assert_awaited_once()
+
+
+class TestUserServiceSearchCache:
+    """Тесты кэширования результатов поиска в сервисе"""
+
+    def test_equivalent_queries_hit_repository_once(self):
+        """Тест, что запросы, отличающиеся регистром и пробелами, обслуживаются одним запросом к БД"""
+        repository = Mock()
+        repository.search_users.return_value = []
+        service = UserService(
+            repository,
+            HashingExecutor(pool_size=0),
+            ProfileCache(max_size=0),
+            SearchCache(max_size=10, ttl=60),
+        )
+
+        service.search_users(UserSearchQuery(first_name="Ива", last_name="Раз"))
+        service.search_users(UserSearchQuery(first_name=" ива", last_name="рАз "))
+
+        repository.search_users.assert_called_once()
+        repository_query = repository.search_users.call_args.args[0]
+        assert (repository_query.first_name, repository_query.last_name) == ("ива", "раз")
+
+
+class TestUserServiceConsistencyToken:
+    """Тесты чтения своих записей по токену согласованности"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.user_id = uuid.uuid4()
+        self.repository = Mock()
+        self.repository.insert_user.return_value = "1/A0"
+        self.service = UserService(
+            self.repository,
+            HashingExecutor(pool_size=0),
+            ProfileCache(max_size=10, ttl=60, negative_ttl=5),
+            SearchCache(max_size=10, ttl=60),
+        )
+        self.token = self.service.register_user({
+            "first_name": "Иван",
+            "second_name": "Иванов",
+            "birthdate": "1990-01-01",
+            "biography": "-",
+            "city": "Москва",
+            "password": "secret123",
+        })["consistency_token"]
+
+    def test_registration_returns_lsn_token(self):
+        """Тест, что регистрация возвращает токен с LSN записи"""
+        assert decode_consistency_token(self.token) == (1 << 32) | 0xA0
+
+    def test_negative_cache_is_bypassed_with_token(self):
+        """Тест, что закэшированное отсутствие не скрывает запись клиента с токеном"""
+        self.repository.get_user.return_value = None
+        with pytest.raises(UserNotFoundError):
+            self.service.get_user_profile(str(self.user_id))
+        self.repository.get_user.return_value = make_user(self.user_id)
+
+        user = self.service.get_user_profile(str(self.user_id), self.token)
+
+        assert user.id == self.user_id
+        assert self.repository.get_user.call_args.kwargs == {"min_lsn": (1 << 32) | 0xA0}
+
+    def test_search_with_token_skips_cache(self):
+        """Тест, что поиск с токеном не использует кэш и передает LSN в репозиторий"""
+        self.repository.search_users.return_value = []
+        query = UserSearchQuery(first_name="Ив", last_name="Ив")
+        self.service.search_users(query)
+
+        self.service.search_users(query, self.token)
+
+        assert self.repository.search_users.call_count == 2
+        assert self.repository.search_users.call_args.kwargs == {"min_lsn": (1 << 32) | 0xA0}
+
+    def test_invalid_token_raises_value_error(self):
+        """Тест, что поврежденный токен отклоняется"""
+        with pytest.raises(ValueError):
+            self.service.get_user_profile(str(self.user_id), "not-a-token")
+
+
+class TestUserServiceIdempotentRegistration:
+    """Тесты регистрации с ключом идемпотентности"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.user_id = uuid.uuid4()
+        self.repository = Mock()
+        self.repository.insert_user.return_value = "0/10"
+        self.hashing_executor = Mock(wraps=HashingExecutor(pool_size=0))
+        self.service = UserService(
+            self.repository, self.hashing_executor, ProfileCache(max_size=0), SearchCache(max_size=0)
+        )
+        self.user_data = {
+            "first_name": "Иван",
+            "second_name": "Иванов",
+            "birthdate": "1990-01-01",
+            "biography": "-",
+            "city": "Москва",
+            "password": "secret123",
+        }
+
+    def test_key_is_stored_with_user(self):
+        """Тест, что ключ передается в репозиторий вместе с пользователем"""
+        self.repository.find_registration.return_value = None
+
+        self.service.register_user(self.user_data, "key-1")
+
+        assert self.repository.insert_user.call_args.kwargs == {"idempotency_key": "key-1"}
+
+    def test_repeated_key_returns_existing_user(self):
+        """Тест, что повтор запроса не хэширует пароль и не создает пользователя"""
+        self.repository.find_registration.return_value = (self.user_id, "0/20")
+
+        result = self.service.register_user(self.user_data, "key-1")
+
+        assert result["user_id"] == self.user_id
+        assert decode_consistency_token(result["consistency_token"]) == 0x20
+        self.repository.insert_user.assert_not_called()
+        self.hashing_executor.hash.assert_not_called()
+
+    def test_concurrent_duplicate_returns_winner(self):
+        """Тест, что при гонке двух запросов с одним ключом возвращается пользователь первого"""
+        self.repository.find_registration.return_value = None
+        self.repository.insert_user.side_effect = IdempotencyKeyExistsError(self.user_id, "0/30")
+
+        result = self.service.register_user(self.user_data, "key-1")
+
+        assert result["user_id"] == self.user_id
+
+
+class TestUserServiceBatchRegistration:
+    """Тесты пакетной регистрации"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.repository = Mock()
+        self.repository.insert_users.return_value = "0/40"
+        self.service = UserService(
+            self.repository, HashingExecutor(pool_size=0), ProfileCache(max_size=0), SearchCache(max_size=0)
+        )
+        self.user_data = {
+            "first_name": "Иван",
+            "second_name": "Иванов",
+            "birthdate": "1990-01-01",
+            "biography": "-",
+            "city": "Москва",
+            "password": "secret123",
+        }
+
+    def test_only_valid_items_are_inserted(self):
+        """Тест, что невалидная анкета получает ошибку и не мешает вставке остальных"""
+        invalid = dict(self.user_data, birthdate="1990-13-01")
+
+        result = self.service.register_users_batch([self.user_data, invalid, self.user_data])
+
+        users = self.repository.insert_users.call_args.args[0]
+        assert [user.id for user in users] == [result.items[0].user_id, result.items[2].user_id]
+        assert all(user.password.startswith("$2b$") for user in users)
+        assert result.items[1].user_id is None
+        assert "дата рождения" in result.items[1].error
+        assert decode_consistency_token(result.consistency_token) == 0x40
+
+    def test_batch_without_valid_items_skips_insert(self):
+        """Тест, что пакет без валидных анкет не обращается к БД"""
+        result = self.service.register_users_batch([{"first_name": "Иван"}])
+
+        self.repository.insert_users.assert_not_called()
+        assert result.items[0].error
+        assert result.consistency_token is None
+
+    def test_async_batch_registration(self):
+        """Тест асинхронной пакетной регистрации"""
+        repository = Mock()
+        repository.insert_users = AsyncMock(return_value="0/50")
+        service = AsyncUserService(
+            repository, HashingExecutor(pool_size=0), ProfileCache(max_size=0), SearchCache(max_size=0)
+        )
+
+        result = asyncio.run(service.register_users_batch([self.user_data, "не объект"]))
+
+        assert len(repository.insert_users.call_args.args[0]) == 1
+        assert result.items[0].user_id is not None
+        assert result.items[1].error
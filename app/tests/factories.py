@@ -0,0 +1,9 @@
+"""
+Общие конструкторы тестовых данных
+"""
+from model.user import UserCard
+
+
+def make_card(user_id, birthdate="1990-01-01") -> UserCard:
+    """Анкета пользователя с фиксированными полями (ID - UUID или строка)"""
+    return UserCard(str(user_id), "Иван", "Иванов", birthdate, "Биография", "Москва")
@@ -0,0 +1,109 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from prometheus_client import REGISTRY
+
+from infra.db.config import prepared_statements
+from infra.db.config.prepared_statements import PreparedStatement, to_positional
+
+
+def make_connection():
+    """Создает мок Connection с настоящим словарем info, как у соединения из пула"""
+    connection = MagicMock()
+    connection.info = {}
+    return connection
+
+
+def executed_sql(connection):
+    return [str(call.args[0]) for call in connection.execute.call_args_list]
+
+
+class TestToPositional:
+    """Тесты преобразования параметров для PREPARE"""
+
+    def test_named_parameters_become_positional(self):
+        """Тест нумерации параметров в порядке первого появления"""
+        sql, names = to_positional("SELECT * FROM users WHERE a LIKE :p AND b LIKE :q AND c = :p")
+
+        assert sql == "SELECT * FROM users WHERE a LIKE $1 AND b LIKE $2 AND c = $1"
+        assert names == ("p", "q")
+
+    def test_type_casts_are_kept(self):
+        """Тест, что приведение типа (::text) не считается параметром"""
+        sql, names = to_positional("SELECT pg_current_wal_lsn()::text, :id::uuid")
+
+        assert sql == "SELECT pg_current_wal_lsn()::text, $1::uuid"
+        assert names == ("id",)
+
+
+class TestPreparedStatement:
+    """Тесты выполнения подготовленных запросов"""
+
+    def test_prepared_once_per_connection(self):
+        """Тест, что PREPARE выполняется один раз для соединения, дальше только EXECUTE"""
+        statement = PreparedStatement("test_get_user", "SELECT id FROM users WHERE id = :id")
+        connection = make_connection()
+
+        statement.execute(connection, {"id": "1"})
+        statement.execute(connection, {"id": "2"})
+
+        assert executed_sql(connection) == [
+            "PREPARE test_get_user AS SELECT id FROM users WHERE id = $1",
+            "EXECUTE test_get_user(:id)",
+            "EXECUTE test_get_user(:id)",
+        ]
+        assert connection.execute.call_args.args[1] == {"id": "2"}
+
+    def test_new_connection_prepares_again(self):
+        """Тест, что в новом соединении (пустой info) запрос подготавливается заново"""
+        statement = PreparedStatement("test_reconnect", "SELECT 1 WHERE :x = 1")
+        first, second = make_connection(), make_connection()
+
+        statement.execute(first, {"x": 1})
+        statement.execute(second, {"x": 1})
+
+        assert executed_sql(second)[0].startswith("PREPARE test_reconnect")
+
+    def test_custom_plan_forced_in_transaction(self):
+        """Тест, что для custom_plan перед EXECUTE отключается общий план"""
+        statement = PreparedStatement(
+            "test_custom_plan", "SELECT id FROM users WHERE name LIKE :prefix", custom_plan=True
+        )
+        connection = make_connection()
+        async_connection = AsyncMock()
+
+        statement.execute(connection, {"prefix": "ив%"})
+        asyncio.run(statement.execute_async(async_connection, {"prefix": "ив%"}))
+
+        assert executed_sql(connection) == [
+            "SET LOCAL plan_cache_mode = force_custom_plan",
+            "PREPARE test_custom_plan AS SELECT id FROM users WHERE name LIKE $1",
+            "EXECUTE test_custom_plan(:prefix)",
+        ]
+        assert str(async_connection.execute.await_args_list[0].args[0]) == (
+            "SET LOCAL plan_cache_mode = force_custom_plan"
+        )
+
+    def test_disabled_prepared_statements(self, monkeypatch):
+        """Тест выполнения обычного запроса, если подготовка отключена (PgBouncer)"""
+        monkeypatch.setattr(prepared_statements, "PREPARED_STATEMENTS_ENABLED", False)
+        statement = PreparedStatement("test_disabled", "SELECT id FROM users WHERE id = :id")
+        connection = make_connection()
+
+        statement.execute(connection, {"id": "1"})
+
+        assert executed_sql(connection) == ["SELECT id FROM users WHERE id = :id"]
+
+    def test_executions_are_counted(self):
+        """Тест счетчиков выполнений и подготовок, в том числе для асинхронного варианта"""
+        statement = PreparedStatement("test_counted", "SELECT :id")
+        connection = make_connection()
+        async_connection = AsyncMock()
+
+        statement.execute(connection, {"id": "1"})
+        statement.execute(connection, {"id": "1"})
+        asyncio.run(statement.execute_async(async_connection, {"id": "1"}))
+
+        assert REGISTRY.get_sample_value("db_statement_executions_total", {"statement": "test_counted"}) == 3
+        assert REGISTRY.get_sample_value("db_statement_prepares_total", {"statement": "test_counted"}) == 1
+        async_connection.execute.assert_awaited_once_with(statement.query, {"id": "1"})
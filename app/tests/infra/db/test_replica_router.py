@@ -0,0 +1,215 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from infra.db.config.replica_router import (
+    Replica,
+    ReplicaMonitor,
+    ReplicaRouter,
+    connect_for_read,
+    lsn_to_int,
+    parse_replica_urls,
+)
+
+
+def make_engine(lag=0.0, replay_lsn="0/100", error=None):
+    """Создает мок Engine, возвращающий заданное отставание и LSN или ошибку подключения"""
+    engine = MagicMock()
+    if error is not None:
+        engine.connect.side_effect = error
+    else:
+        connection = engine.connect.return_value.__enter__.return_value
+        connection.execute.return_value.one.return_value = (lag, replay_lsn)
+        # Проверка LSN в открытом соединении при чтении по токену
+        engine.connect.return_value.execute.return_value.scalar.return_value = replay_lsn
+    return engine
+
+
+def make_monitor(*engines, max_lag_seconds=5.0):
+    replicas = [
+        Replica(name=f"replica-{i + 1}", url=f"postgresql://replica-{i + 1}/db", engine=engine)
+        for i, engine in enumerate(engines)
+    ]
+    monitor = ReplicaMonitor(replicas, max_lag_seconds=max_lag_seconds, probe_interval=60)
+    # Фоновый поток в тестах не нужен: проверки вызываются явно
+    monitor._started = True
+    return monitor
+
+
+class TestParseReplicaUrls:
+    """Тесты разбора READ_REPLICA_URLS"""
+
+    def test_empty_value(self):
+        """Тест пустого значения"""
+        assert parse_replica_urls(None) == []
+        assert parse_replica_urls("") == []
+
+    def test_splits_by_semicolon(self):
+        """Тест разделения URL точкой с запятой"""
+        value = "postgresql://a/db?host=x,y ; postgresql://b/db;"
+
+        assert parse_replica_urls(value) == ["postgresql://a/db?host=x,y", "postgresql://b/db"]
+
+
+class TestReplicaMonitor:
+    """Тесты проверки и выбора реплик"""
+
+    def test_probe_marks_replica_healthy(self):
+        """Тест, что успешная проверка сохраняет отставание и делает реплику доступной"""
+        monitor = make_monitor(make_engine(lag=0.5))
+
+        monitor.probe_once()
+
+        replica = monitor.replicas[0]
+        assert replica.healthy
+        assert replica.lag_seconds == 0.5
+        assert replica.replay_lsn == 0x100
+        assert monitor.choose() == 0
+
+    def test_lagging_replica_is_excluded(self):
+        """Тест исключения реплики с отставанием больше порога"""
+        monitor = make_monitor(make_engine(lag=10), make_engine(lag=1), max_lag_seconds=5)
+
+        monitor.probe_once()
+
+        assert all(monitor.choose() == 1 for _ in range(20))
+
+    def test_failed_probe_excludes_replica(self):
+        """Тест исключения недоступной реплики"""
+        monitor = make_monitor(make_engine(error=OSError("connection refused")))
+
+        monitor.probe_once()
+
+        assert not monitor.replicas[0].healthy
+        assert monitor.replicas[0].last_error == "connection refused"
+        assert monitor.choose() is None
+
+    def test_replica_returns_after_successful_probe(self):
+        """Тест возврата реплики после успешной проверки"""
+        engine = make_engine(lag=0)
+        monitor = make_monitor(engine)
+        monitor.probe_once()
+        monitor.mark_failed(0, OSError("timeout"))
+        assert monitor.choose() is None
+
+        monitor.probe_once()
+
+        assert monitor.choose() == 0
+
+    def test_disconnected_replica_is_excluded(self):
+        """Тест, что реплика без WAL receiver (отставание NULL) не считается свежей"""
+        monitor = make_monitor(make_engine(lag=None, replay_lsn="0/200"))
+
+        monitor.probe_once()
+
+        assert monitor.replicas[0].healthy is False
+        assert "не получает WAL" in monitor.replicas[0].last_error
+        assert monitor.replicas[0].replay_lsn == lsn_to_int("0/200")
+        assert monitor.choose() is None
+
+    def test_first_choose_does_not_wait_for_probe(self):
+        """Тест, что первый выбор не ждет проверки: до нее чтение идет на мастер"""
+        probed = threading.Event()
+        engine = make_engine(lag=0)
+        connect = engine.connect.return_value
+
+        def slow_connect():
+            probed.wait()
+            return connect
+
+        engine.connect.side_effect = slow_connect
+        replicas = [Replica(name="replica-1", url="postgresql://replica-1/db", engine=engine)]
+        monitor = ReplicaMonitor(replicas, max_lag_seconds=5, probe_interval=60)
+        try:
+            assert monitor.choose() is None
+
+            probed.set()
+            deadline = time.monotonic() + 5
+            while not monitor.replicas[0].healthy and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert monitor.choose() == 0
+        finally:
+            monitor.stop()
+
+
+class TestReplicaRouter:
+    """Тесты маршрутизации чтения"""
+
+    def test_connects_to_chosen_replica(self):
+        """Тест подключения к подходящей реплике"""
+        replica_engine = make_engine(lag=0)
+        primary = MagicMock()
+        monitor = make_monitor(replica_engine)
+        monitor.probe_once()
+
+        connection = ReplicaRouter(monitor, primary).connect()
+
+        assert connection is replica_engine.connect.return_value
+        primary.connect.assert_not_called()
+
+    def test_falls_back_to_primary_without_replicas(self):
+        """Тест чтения с мастера, если подходящих реплик нет"""
+        primary = MagicMock()
+        monitor = make_monitor(make_engine(lag=100), max_lag_seconds=5)
+        monitor.probe_once()
+
+        connection = ReplicaRouter(monitor, primary).connect()
+
+        assert connection is primary.connect.return_value
+
+    def test_connect_error_marks_replica_failed(self):
+        """Тест, что ошибка подключения исключает реплику и запрос уходит на мастер"""
+        replica_engine = make_engine(lag=0)
+        primary = MagicMock()
+        monitor = make_monitor(replica_engine)
+        monitor.probe_once()
+        replica_engine.connect.side_effect = OSError("replica is down")
+
+        connection = ReplicaRouter(monitor, primary).connect()
+
+        assert connection is primary.connect.return_value
+        assert not monitor.replicas[0].healthy
+        assert monitor.choose() is None
+
+    def test_token_read_prefers_caught_up_replica(self):
+        """Тест, что чтение по токену уходит на реплику, уже применившую запись"""
+        behind, caught_up = make_engine(replay_lsn="0/100"), make_engine(replay_lsn="0/200")
+        monitor = make_monitor(behind, caught_up)
+        monitor.probe_once()
+
+        for _ in range(20):
+            connection = ReplicaRouter(monitor, MagicMock()).connect(min_lsn=lsn_to_int("0/180"))
+            assert connection is caught_up.connect.return_value
+
+    def test_token_read_checks_replica_position_in_place(self):
+        """Тест, что устаревшее состояние реплики перепроверяется в открытом соединении"""
+        replica_engine = make_engine(replay_lsn="0/100")
+        primary = MagicMock()
+        monitor = make_monitor(replica_engine)
+        monitor.probe_once()
+        replica_engine.connect.return_value.execute.return_value.scalar.return_value = "0/300"
+
+        connection = ReplicaRouter(monitor, primary).connect(min_lsn=lsn_to_int("0/200"))
+
+        assert connection is replica_engine.connect.return_value
+        assert monitor.replicas[0].replay_lsn == 0x300
+        primary.connect.assert_not_called()
+
+    def test_token_read_falls_back_to_primary_when_replica_is_behind(self):
+        """Тест чтения с мастера, если ни одна реплика не применила запись клиента"""
+        replica_engine = make_engine(replay_lsn="0/100")
+        primary = MagicMock()
+        monitor = make_monitor(replica_engine)
+        monitor.probe_once()
+
+        connection = ReplicaRouter(monitor, primary).connect(min_lsn=lsn_to_int("0/200"))
+
+        assert connection is primary.connect.return_value
+        replica_engine.connect.return_value.close.assert_called_once()
+
+    def test_token_read_without_router_uses_primary(self):
+        """Тест, что без монитора реплик чтение по токену выполняется на мастере"""
+        read_only, primary = MagicMock(), MagicMock()
+
+        assert connect_for_read(read_only, primary, min_lsn=1) is primary.connect.return_value
+        assert connect_for_read(read_only, primary) is read_only.connect.return_value
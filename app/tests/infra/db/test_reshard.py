@@ -0,0 +1,187 @@
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from infra.db.sharding import COPYING, MOVED, SWITCHED, DialogPlacement, HashRing, ShardLayout
+from infra.db.sharding.reshard import Resharder, ReshardError
+from model.dialog import DialogKey
+
+
+def make_keys(count):
+    return [DialogKey.of(uuid.uuid4(), uuid.uuid4()) for _ in range(count)]
+
+
+class RecordingResharder(Resharder):
+    """Resharder, который вместо запросов к базам записывает шаги переезда"""
+
+    def __init__(self, layout, dialogs=None):
+        super().__init__(MagicMock(), {"a": MagicMock(), "b": MagicMock(), "c": MagicMock()}, grace=7)
+        self.current_layout = layout
+        self.dialogs = dialogs or {}
+        self.steps = []
+        self.sleep = lambda seconds: self.steps.append(('wait',))
+
+    def layout(self):
+        return self.current_layout
+
+    def _dialog_keys(self, shard):
+        return iter(self.dialogs.get(shard, []))
+
+    def _copy(self, key, source, target):
+        self.steps.append(('copy', key, source, target))
+        return 1
+
+    def _delete(self, key, shard):
+        self.steps.append(('delete', key, shard))
+
+    def _save_placement(self, key, placement):
+        self.steps.append(('placement', key, placement))
+
+    def _delete_placement(self, key):
+        self.steps.append(('unpin', key))
+
+    def _save_ring(self, shards, next_shards, state):
+        self.steps.append(('ring', shards, next_shards, state))
+
+
+class TestMove:
+    """Тесты переезда одного диалога"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.ring = HashRing(["a", "b"])
+        self.key = make_keys(1)[0]
+        self.owner = self.ring.shard_for(self.key.routing_key())
+        self.other = "b" if self.owner == "a" else "a"
+
+    def test_move_to_another_shard(self):
+        """Тест порядка шагов: данные удаляются со старого шарда только после ожидания в каждом состоянии"""
+        resharder = RecordingResharder(ShardLayout(self.ring))
+
+        assert resharder.move(self.key, self.other)
+
+        key, source, target = self.key, self.owner, self.other
+        assert resharder.steps == [
+            ('placement', key, DialogPlacement(target, source, COPYING)),
+            ('wait',),
+            ('copy', key, source, target),
+            ('placement', key, DialogPlacement(target, source, SWITCHED)),
+            ('wait',),
+            ('placement', key, DialogPlacement(target, None, MOVED)),
+            ('wait',),
+            ('delete', key, source),
+        ]
+
+    def test_move_back_to_ring_shard_unpins_dialog(self):
+        """Тест, что диалог, вернувшийся на шард по кольцу, больше не закреплен"""
+        layout = ShardLayout(self.ring, placements={self.key.routing_key(): DialogPlacement(self.other, None, MOVED)})
+        resharder = RecordingResharder(layout)
+
+        resharder.move(self.key, self.owner)
+
+        assert ('copy', self.key, self.other, self.owner) in resharder.steps
+        assert resharder.steps[-3:] == [('unpin', self.key), ('wait',), ('delete', self.key, self.other)]
+
+    def test_move_to_current_shard(self):
+        """Тест, что переезд на текущий шард ничего не делает"""
+        resharder = RecordingResharder(ShardLayout(self.ring))
+
+        assert not resharder.move(self.key, self.owner)
+        assert resharder.steps == []
+
+    def test_resume_interrupted_move(self):
+        """Тест, что прерванный переезд продолжается с тем же исходным шардом"""
+        layout = ShardLayout(
+            self.ring, placements={self.key.routing_key(): DialogPlacement(self.other, self.owner, SWITCHED)}
+        )
+        resharder = RecordingResharder(layout)
+
+        resharder.move(self.key, self.other)
+
+        assert resharder.steps[2] == ('copy', self.key, self.owner, self.other)
+        assert resharder.steps[-1] == ('delete', self.key, self.owner)
+
+    def test_move_during_ring_change(self):
+        """Тест, что переезд не начинается во время смены кольца"""
+        resharder = RecordingResharder(ShardLayout(self.ring, HashRing(["a", "b", "c"]), COPYING))
+
+        with pytest.raises(ReshardError):
+            resharder.move(self.key, self.other)
+        assert resharder.steps == []
+
+    def test_dialog_moving_elsewhere(self):
+        """Тест, что переезд не начинается, пока диалог переезжает на другой шард"""
+        layout = ShardLayout(self.ring, placements={self.key.routing_key(): DialogPlacement("c", self.owner, COPYING)})
+        resharder = RecordingResharder(layout)
+
+        with pytest.raises(ReshardError):
+            resharder.move(self.key, self.other)
+        assert resharder.steps == []
+
+    def test_unknown_shard(self):
+        """Тест переезда на ненастроенный шард"""
+        with pytest.raises(ReshardError):
+            RecordingResharder(ShardLayout(self.ring)).move(self.key, "x")
+
+
+class TestChangeRing:
+    """Тесты смены состава кольца"""
+
+    def test_add_shard(self):
+        """Тест, что переезжают только диалоги нового шарда и удаляются они после смены кольца"""
+        old, new = HashRing(["a", "b"]), HashRing(["a", "b", "c"])
+        keys = make_keys(60)
+        pinned = next(key for key in keys if new.shard_for(key.routing_key()) == "c")
+        dialogs = {}
+        for key in keys:
+            dialogs.setdefault(old.shard_for(key.routing_key()), []).append(key)
+        placements = {pinned.routing_key(): DialogPlacement(old.shard_for(pinned.routing_key()), None, MOVED)}
+        resharder = RecordingResharder(ShardLayout(old, placements=placements), dialogs)
+
+        moved = resharder.change_ring(["c", "a", "b"])
+
+        expected = [
+            (key, old.shard_for(key.routing_key()), "c")
+            for key in keys if key != pinned and new.shard_for(key.routing_key()) == "c"
+        ]
+        assert moved == len(expected) > 0
+        steps = resharder.steps
+        ring_steps = [step for step in steps if step[0] == 'ring']
+        assert ring_steps == [
+            ('ring', ["a", "b"], ["a", "b", "c"], COPYING),
+            ('ring', ["a", "b"], ["a", "b", "c"], SWITCHED),
+            ('ring', ["a", "b", "c"], None, None),
+        ]
+        commit = steps.index(ring_steps[-1])
+        assert sorted(step[1:] for step in steps[:commit] if step[0] == 'copy') == sorted(expected)
+        assert sorted(step[1:] for step in steps[commit + 2:] if step[0] == 'delete') == sorted(
+            (key, source) for key, source, _ in expected
+        )
+        assert steps[commit + 1] == ('wait',)
+
+    def test_placement_on_new_ring_shard_is_dropped(self):
+        """Тест, что закрепление за шардом, который стал шардом диалога по кольцу, снимается"""
+        old, new = HashRing(["a"]), HashRing(["a", "b"])
+        key = next(key for key in make_keys(100) if new.shard_for(key.routing_key()) == "b")
+        layout = ShardLayout(old, placements={key.routing_key(): DialogPlacement("b", None, MOVED)})
+        resharder = RecordingResharder(layout)
+
+        resharder.change_ring(["a", "b"])
+
+        assert resharder.steps[-1] == ('unpin', key)
+
+    def test_same_ring(self):
+        """Тест, что смена кольца на тот же состав ничего не делает"""
+        resharder = RecordingResharder(ShardLayout(HashRing(["a", "b"])))
+
+        assert resharder.change_ring(["b", "a"]) == 0
+        assert resharder.steps == []
+
+    def test_unfinished_move_blocks_ring_change(self):
+        """Тест, что кольцо не меняется, пока какой-то диалог переезжает"""
+        key = make_keys(1)[0]
+        layout = ShardLayout(HashRing(["a"]), placements={key.routing_key(): DialogPlacement("b", "a", COPYING)})
+
+        with pytest.raises(ReshardError):
+            RecordingResharder(layout).change_ring(["a", "b"])
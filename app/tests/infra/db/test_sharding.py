@@ -0,0 +1,240 @@
+import uuid
+from collections import Counter
+from unittest.mock import MagicMock
+
+import pytest
+
+from infra.db.config.sharding import DEFAULT_SHARD_NAME, parse_shard_urls
+from infra.db.config.write_failover import DatabaseUnavailableError
+from infra.db.sharding import (
+    COPYING,
+    MOVED,
+    SWITCHED,
+    DialogPlacement,
+    HashRing,
+    LayoutDirectory,
+    ShardLayout,
+    ShardRouter,
+)
+from model.dialog import DialogKey
+
+
+def make_keys(count):
+    return [DialogKey.of(uuid.uuid4(), uuid.uuid4()) for _ in range(count)]
+
+
+def make_engine(ring_row=None, placements=(), error=None):
+    """Создает мок Engine основной базы, возвращающий строку dialog_ring и строки dialog_placements"""
+    engine = MagicMock()
+    if error is not None:
+        engine.connect.side_effect = error
+        return engine
+    connection = engine.connect.return_value.__enter__.return_value
+    ring_result, placements_result = MagicMock(), MagicMock()
+    ring_result.first.return_value = ring_row
+    placements_result.__iter__.side_effect = lambda: iter(placements)
+    connection.execute.side_effect = [ring_result, placements_result] * 10
+    return engine
+
+
+class TestParseShardUrls:
+    """Тесты разбора DIALOG_SHARD_URLS"""
+
+    def test_default_is_main_database(self, monkeypatch):
+        """Тест, что без настройки все диалоги хранятся в основной базе"""
+        monkeypatch.setenv("DATABASE_URL", "postgresql://main/db")
+
+        assert parse_shard_urls(None) == {DEFAULT_SHARD_NAME: "postgresql://main/db"}
+
+    def test_names_and_urls(self):
+        """Тест разбора пар имя=URL: знак равенства в параметрах URL не разделяет имя"""
+        value = "a=postgresql://a/db?target_session_attrs=primary ; b=postgresql://b/db;"
+
+        assert parse_shard_urls(value) == {
+            "a": "postgresql://a/db?target_session_attrs=primary",
+            "b": "postgresql://b/db",
+        }
+
+    @pytest.mark.parametrize("value", ["postgresql://a/db", "a=", "a=postgresql://a/db;a=postgresql://b/db"])
+    def test_invalid_value(self, value):
+        """Тест шарда без имени, без URL и повторного имени"""
+        with pytest.raises(ValueError):
+            parse_shard_urls(value)
+
+
+class TestHashRing:
+    """Тесты кольца консистентного хеширования"""
+
+    def test_keys_spread_evenly(self):
+        """Тест, что диалоги распределяются по шардам примерно поровну"""
+        ring = HashRing(["a", "b", "c", "d"])
+
+        counts = Counter(ring.shard_for(key.routing_key()) for key in make_keys(8000))
+
+        assert set(counts) == {"a", "b", "c", "d"}
+        assert all(1500 < count < 2500 for count in counts.values()), counts
+
+    def test_order_of_shards_does_not_matter(self):
+        """Тест, что раскладка не зависит от порядка шардов в настройках"""
+        keys = make_keys(100)
+
+        first, second = HashRing(["a", "b", "c"]), HashRing(["c", "a", "b"])
+
+        assert all(first.shard_for(key.routing_key()) == second.shard_for(key.routing_key()) for key in keys)
+
+    def test_new_shard_takes_only_its_share(self):
+        """Тест, что при добавлении шарда переезжает около 1/N диалогов и только на новый шард"""
+        keys = [key.routing_key() for key in make_keys(8000)]
+        old, new = HashRing(["a", "b", "c"]), HashRing(["a", "b", "c", "d"])
+
+        moved = [key for key in keys if old.shard_for(key) != new.shard_for(key)]
+
+        assert all(new.shard_for(key) == "d" for key in moved)
+        assert 0.15 < len(moved) / len(keys) < 0.35
+
+    def test_empty_ring(self):
+        """Тест, что кольцо без шардов не создается"""
+        with pytest.raises(ValueError):
+            HashRing([])
+
+
+class TestShardLayout:
+    """Тесты маршрутизации диалога по раскладке"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.ring = HashRing(["a", "b"])
+        self.key = make_keys(1)[0]
+        self.owner = self.ring.shard_for(self.key.routing_key())
+        self.other = "b" if self.owner == "a" else "a"
+
+    def placed(self, placement):
+        return ShardLayout(self.ring, placements={self.key.routing_key(): placement})
+
+    def test_ring_owner(self):
+        """Тест, что без переезда диалог читается и пишется в шард по кольцу"""
+        layout = ShardLayout(self.ring)
+
+        assert layout.route(self.key) == (self.owner, [self.owner])
+
+    @pytest.mark.parametrize("state, read_from_target, write_both", [
+        (COPYING, False, True),
+        (SWITCHED, True, True),
+        (MOVED, True, False),
+    ])
+    def test_placement_states(self, state, read_from_target, write_both):
+        """Тест чтения и записи переезжающего диалога: первым пишется шард, с которого диалог читается"""
+        source = None if state == MOVED else self.owner
+        layout = self.placed(DialogPlacement(self.other, source, state))
+
+        read_shard, write_shards = layout.route(self.key)
+
+        assert read_shard == (self.other if read_from_target else self.owner)
+        assert write_shards[0] == read_shard
+        assert set(write_shards) == ({self.owner, self.other} if write_both else {self.other})
+
+    def test_ring_transition(self):
+        """Тест, что при смене кольца переезжают только диалоги, у которых по новому кольцу другой шард"""
+        keys = make_keys(200)
+        next_ring = HashRing(["a", "b", "c"])
+        layout = ShardLayout(self.ring, next_ring, COPYING)
+
+        for key in keys:
+            old, new = self.ring.shard_for(key.routing_key()), next_ring.shard_for(key.routing_key())
+            expected = (old, [old]) if old == new else (old, [old, new])
+            assert layout.route(key) == expected
+            assert layout.owner(key) == new
+
+    def test_write_shards_without_duplicates(self):
+        """Тест переезда на тот же шард"""
+        layout = self.placed(DialogPlacement(self.owner, self.owner, COPYING))
+
+        assert layout.route(self.key) == (self.owner, [self.owner])
+
+    def test_shards(self):
+        """Тест списка шардов, упомянутых в раскладке"""
+        layout = ShardLayout(self.ring, HashRing(["c"]), COPYING, {"k": DialogPlacement("d", "e", COPYING)})
+
+        assert layout.shards() == {"a", "b", "c", "d", "e"}
+
+
+class TestLayoutDirectory:
+    """Тесты кэша раскладки"""
+
+    def make_directory(self, engine, max_staleness=10.0):
+        directory = LayoutDirectory(engine, ["a", "b"], refresh_interval=60, max_staleness=max_staleness)
+        # Фоновый поток в тестах не нужен: раскладка перечитывается явно
+        directory._started = True
+        return directory
+
+    def test_default_ring_from_settings(self):
+        """Тест, что без строки dialog_ring в кольце все настроенные шарды"""
+        directory = self.make_directory(make_engine())
+
+        directory.refresh()
+
+        assert directory.current().ring.shards == ["a", "b"]
+        assert directory.current().next_ring is None
+
+    def test_ring_and_placements_from_database(self):
+        """Тест загрузки смены кольца и закрепленных диалогов"""
+        key = make_keys(1)[0]
+        engine = make_engine(
+            ring_row=(["a"], ["a", "b"], COPYING),
+            placements=[(key.routing_key(), "b", None, MOVED)],
+        )
+        directory = self.make_directory(engine)
+
+        directory.refresh()
+
+        layout = directory.current()
+        assert layout.ring.shards == ["a"] and layout.next_ring.shards == ["a", "b"]
+        assert layout.ring_state == COPYING
+        assert layout.route(key) == ("b", ["b"])
+
+    def test_unknown_shard_keeps_previous_layout(self):
+        """Тест, что раскладка с ненастроенным шардом не применяется"""
+        directory = self.make_directory(make_engine())
+        directory.refresh()
+        directory.engine = make_engine(ring_row=(["a", "x"], None, None))
+
+        directory.refresh()
+
+        assert directory.current().ring.shards == ["a", "b"]
+
+    def test_stale_layout_is_not_used(self):
+        """Тест, что раскладка, которую не удалось перечитать дольше max_staleness, не используется"""
+        directory = self.make_directory(make_engine(), max_staleness=0.0)
+        directory.refresh()
+        directory.engine = make_engine(error=OSError("connection refused"))
+
+        directory.refresh()
+
+        with pytest.raises(DatabaseUnavailableError):
+            directory.current()
+
+    def test_never_loaded(self):
+        """Тест, что без загруженной раскладки запросы отклоняются"""
+        directory = self.make_directory(make_engine(error=OSError("connection refused")))
+
+        directory.refresh()
+
+        with pytest.raises(DatabaseUnavailableError):
+            directory.current()
+
+
+class TestShardRouter:
+    """Тесты выбора Engine шарда"""
+
+    def test_engines_by_layout(self):
+        """Тест, что маршрутизатор отдает Engine шардов из раскладки"""
+        key = make_keys(1)[0]
+        directory = MagicMock()
+        directory.current.return_value = ShardLayout(
+            HashRing(["a", "b"]), placements={key.routing_key(): DialogPlacement("b", "a", SWITCHED)}
+        )
+        engines = {"a": MagicMock(), "b": MagicMock()}
+        router = ShardRouter(directory, engines)
+
+        assert router.read_engine(key) == ("b", engines["b"])
+        assert router.write_engines(key) == [("b", engines["b"]), ("a", engines["a"])]
@@ -0,0 +1,26 @@
+import uuid
+from datetime import date
+
+from infra.db.repository.users import _users_to_copy_buffer
+from model.user import User
+
+
+class TestCopyBuffer:
+    """Тесты формирования данных для COPY пакетной регистрации"""
+
+    def test_special_characters_are_escaped(self):
+        """Тест экранирования табуляции, переводов строк и обратной косой черты"""
+        user_id = uuid.uuid4()
+        user = User(
+            user_id=user_id,
+            password="hash",
+            first_name="Иван",
+            second_name="Иванов",
+            birthdate=date(1990, 1, 1),
+            biography="a\tb\nc\\N",
+            city=None,
+        )
+
+        line = _users_to_copy_buffer([user]).read()
+
+        assert line == f"{user_id}\thash\tИван\tИванов\t1990-01-01\ta\\tb\\nc\\\\N\t\\N\n"
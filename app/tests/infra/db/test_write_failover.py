@@ -0,0 +1,90 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.exc import IntegrityError, InternalError, OperationalError
+
+from infra.db.config.write_failover import (
+    DatabaseUnavailableError,
+    WriteRetryPolicy,
+    is_failover_error,
+)
+
+
+class FakeDriverError(Exception):
+    """Ошибка драйвера с SQLSTATE, как у psycopg2"""
+
+    def __init__(self, pgcode=None):
+        super().__init__(f"pgcode={pgcode}")
+        self.pgcode = pgcode
+
+
+def make_error(error_class, pgcode=None):
+    return error_class("INSERT INTO users ...", {}, FakeDriverError(pgcode))
+
+
+class TestIsFailoverError:
+    """Тесты распознавания ошибок переключения мастера"""
+
+    def test_broken_connection(self):
+        """Тест разрыва соединения без SQLSTATE"""
+        assert is_failover_error(make_error(OperationalError))
+
+    def test_read_only_transaction(self):
+        """Тест записи в бывший мастер, ставший репликой"""
+        assert is_failover_error(make_error(InternalError, "25006"))
+
+    def test_admin_shutdown(self):
+        """Тест остановки сервера"""
+        assert is_failover_error(make_error(OperationalError, "57P01"))
+
+    def test_constraint_violation_is_not_retried(self):
+        """Тест, что ошибки данных не считаются переключением мастера"""
+        assert not is_failover_error(make_error(IntegrityError, "23505"))
+        assert not is_failover_error(ValueError("boom"))
+
+
+class TestWriteRetryPolicy:
+    """Тесты повторения записи при переключении мастера"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.engine = Mock()
+        self.sleeps = []
+        self.policy = WriteRetryPolicy(attempts=3, base_delay=0.1, max_delay=1, sleep=self.sleeps.append)
+
+    def test_retries_and_disposes_pool(self):
+        """Тест повтора после разрыва соединения со сбросом пула"""
+        operation = Mock(side_effect=[make_error(OperationalError), "ok"])
+
+        assert self.policy.run(self.engine, operation) == "ok"
+        assert operation.call_count == 2
+        self.engine.dispose.assert_called_once()
+        assert len(self.sleeps) == 1 and 0.05 <= self.sleeps[0] <= 0.1
+
+    def test_other_errors_are_not_retried(self):
+        """Тест, что прочие ошибки БД пробрасываются сразу"""
+        operation = Mock(side_effect=make_error(IntegrityError, "23505"))
+
+        with pytest.raises(IntegrityError):
+            self.policy.run(self.engine, operation)
+        assert operation.call_count == 1
+        self.engine.dispose.assert_not_called()
+
+    def test_gives_up_after_attempts(self):
+        """Тест, что после исчерпания попыток бросается DatabaseUnavailableError"""
+        operation = Mock(side_effect=make_error(InternalError, "25006"))
+
+        with pytest.raises(DatabaseUnavailableError):
+            self.policy.run(self.engine, operation)
+        assert operation.call_count == 3
+        assert len(self.sleeps) == 2
+
+    def test_async_retries_and_disposes_pool(self):
+        """Тест асинхронного повтора со сбросом пула AsyncEngine"""
+        engine = Mock(dispose=AsyncMock())
+        policy = WriteRetryPolicy(attempts=3, base_delay=0, max_delay=0)
+        operation = AsyncMock(side_effect=[make_error(OperationalError, "57P01"), "ok"])
+
+        assert asyncio.run(policy.run_async(engine, operation)) == "ok"
+        engine.dispose.assert_awaited_once()
@@ -0,0 +1,49 @@
+import random
+
+from infra.feed import merge_feed
+from model.ids import UUIDv7Generator
+from model.post import Post
+
+
+def make_posts(authors, count, seed=1):
+    """Посты в порядке публикации: автор выбирается случайно"""
+    rng = random.Random(seed)
+    clock = iter(range(1_700_000_000_000, 1_700_000_000_000 + count))
+    generator = UUIDv7Generator(clock=lambda: next(clock) * 1_000_000)
+    return [Post(str(generator()), f"Пост {i}", rng.choice(authors)) for i in range(count)]
+
+
+def newest_first(posts):
+    return sorted(posts, key=lambda post: post.id, reverse=True)
+
+
+class TestMergeFeed:
+    """Тесты слияния материализованной ленты с постами знаменитостей"""
+
+    def test_without_celebrities_returns_page(self):
+        """Тест, что без знаменитостей возвращается страница материализованной ленты"""
+        posts = newest_first(make_posts(['a', 'b'], 5))
+
+        assert merge_feed(posts, [], 3) == posts[:3]
+
+    def test_k_way_merge_by_publication_order(self):
+        """Тест слияния нескольких источников в порядке публикации"""
+        stars = ['star1', 'star2', 'star3']
+        posts = make_posts(['friend1', 'friend2'] + stars, 200)
+        materialized = newest_first(post for post in posts if post.author_user_id not in stars)
+        # Как из запроса: по автору, внутри автора - от новых к старым
+        celebrity_posts = [
+            post for star in stars for post in newest_first(post for post in posts if post.author_user_id == star)
+        ]
+
+        page = merge_feed(materialized, celebrity_posts, 50)
+
+        assert page == newest_first(posts)[:50]
+
+    def test_duplicates_are_dropped(self):
+        """Тест, что пост, разложенный до того, как автор стал знаменитостью, не повторяется"""
+        posts = newest_first(make_posts(['star'], 6))
+
+        page = merge_feed(posts[::2], posts, 10)
+
+        assert page == posts
@@ -0,0 +1,125 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from infra.logging.config import DeferredQueueHandler, LogLevelWatcher, set_log_level, setup_logging, shutdown_logging
+from infra.logging.formatters import JsonFormatter
+from infra.rest.middleware.logging import AccessLogSampler
+
+
+def make_record(msg="Пользователь %s найден", args=("42",), **kwargs):
+    return logging.LogRecord("app.test", logging.INFO, __file__, 1, msg, args, None, **kwargs)
+
+
+class TestSetupLogging:
+    """Тесты настройки логирования"""
+
+    def setup_method(self):
+        """Запоминает состояние корневого логгера"""
+        self.root = logging.getLogger()
+        self.handlers = list(self.root.handlers)
+        self.level = self.root.level
+
+    def teardown_method(self):
+        """Восстанавливает состояние корневого логгера"""
+        shutdown_logging()
+        self.root.handlers[:] = self.handlers
+        set_log_level(self.level)
+
+    def test_level_from_env(self, monkeypatch):
+        """Тест, что уровень берется из LOG_LEVEL и применяется к логгерам фреймворков"""
+        monkeypatch.setenv("LOG_LEVEL", "warning")
+
+        setup_logging()
+
+        assert self.root.level == logging.WARNING
+        assert logging.getLogger("connexion").level == logging.WARNING
+
+    def test_repeated_setup_keeps_single_queue_handler(self):
+        """Тест, что повторная настройка не дублирует вывод"""
+        setup_logging()
+        setup_logging()
+
+        assert sum(isinstance(h, DeferredQueueHandler) for h in self.root.handlers) == 1
+
+    def test_unknown_level_is_rejected(self):
+        """Тест отклонения неизвестного уровня"""
+        with pytest.raises(ValueError):
+            set_log_level("LOUD")
+
+    def test_level_watcher_applies_level_from_file(self, tmp_path):
+        """Тест изменения уровня во время работы через файл"""
+        level_file = tmp_path / "level"
+        level_file.write_text("DEBUG\n")
+
+        LogLevelWatcher(str(level_file), interval=60).check_once()
+
+        assert self.root.level == logging.DEBUG
+
+
+class TestDeferredQueueHandler:
+    """Тесты постановки записей в очередь"""
+
+    def test_record_is_queued_without_formatting(self):
+        """Тест, что сообщение не форматируется в потоке, который пишет в лог"""
+        log_queue = queue.SimpleQueue()
+        record = make_record()
+
+        DeferredQueueHandler(log_queue).handle(record)
+
+        queued = log_queue.get_nowait()
+        assert queued.msg == "Пользователь %s найден"
+        assert queued.args == ("42",)
+
+
+class TestJsonFormatter:
+    """Тесты JSON форматтера"""
+
+    def test_record_fields(self):
+        """Тест основных полей и полей из extra"""
+        record = make_record()
+        record.operation = "get_user_profile"
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "Пользователь 42 найден"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "app.test"
+        assert entry["operation"] == "get_user_profile"
+        assert "exception" not in entry
+
+    def test_exception_is_included(self):
+        """Тест вывода трассировки исключения"""
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            record = logging.LogRecord("app.test", logging.ERROR, __file__, 1, "Ошибка", (), sys.exc_info())
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert "RuntimeError: boom" in entry["exception"]
+
+
+class TestAccessLogSampler:
+    """Тесты выборки журнала доступа"""
+
+    def test_rate_bounds(self, caplog):
+        """Тест крайних значений доли логируемых запросов"""
+        caplog.set_level(logging.INFO, logger="infra.rest.middleware.logging")
+
+        assert not any(AccessLogSampler(rate=0).sample() for _ in range(100))
+        assert all(AccessLogSampler(rate=1).sample() for _ in range(100))
+
+    def test_disabled_level_skips_sampling(self, caplog):
+        """Тест, что при уровне выше INFO запросы не попадают в журнал"""
+        caplog.set_level(logging.WARNING, logger="infra.rest.middleware.logging")
+
+        assert not AccessLogSampler(rate=1).sample()
+
+    def test_server_errors_are_always_logged(self):
+        """Тест, что ответы 5xx логируются независимо от выборки"""
+        assert AccessLogSampler.is_error(503)
+        assert not AccessLogSampler.is_error(404)
@@ -0,0 +1,96 @@
+import asyncio
+
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from infra.metrics import (
+    JWT_DURATION,
+    instrument_engine,
+    observe_duration,
+    timed_repository_method,
+)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestInstrumentEngine:
+    """Тесты метрик пула соединений"""
+
+    def test_checkout_wait_and_connections_in_use(self):
+        """Тест учета ожидания соединения и количества выданных соединений"""
+        engine = instrument_engine(create_engine("sqlite://"), "test-engine")
+        before = sample("db_pool_checkout_wait_seconds_count", engine="test-engine")
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            assert sample("db_pool_connections_in_use", engine="test-engine") == 1
+
+        assert sample("db_pool_connections_in_use", engine="test-engine") == 0
+        assert sample("db_pool_checkout_wait_seconds_count", engine="test-engine") == before + 1
+
+    def test_metrics_survive_dispose(self):
+        """Тест, что метрики продолжают собираться после пересоздания пула"""
+        engine = instrument_engine(create_engine("sqlite://"), "disposed-engine")
+        engine.dispose()
+
+        with engine.connect():
+            assert sample("db_pool_connections_in_use", engine="disposed-engine") == 1
+
+        assert sample("db_pool_checkout_wait_seconds_count", engine="disposed-engine") == 1
+
+    def test_repeated_instrumentation_is_ignored(self):
+        """Тест, что повторное подключение метрик не удваивает измерения"""
+        engine = create_engine("sqlite://")
+        instrument_engine(engine, "twice-engine")
+        instrument_engine(engine, "twice-engine")
+
+        with engine.connect():
+            pass
+
+        assert sample("db_pool_checkout_wait_seconds_count", engine="twice-engine") == 1
+
+
+class Repository:
+    @timed_repository_method
+    def get(self):
+        return 1
+
+    @timed_repository_method
+    def iterate(self):
+        yield from range(3)
+
+    @timed_repository_method
+    async def get_async(self):
+        return 2
+
+
+class TestTimedRepositoryMethod:
+    """Тесты измерения времени методов репозитория"""
+
+    def test_methods_are_measured(self):
+        """Тест измерения обычных, асинхронных методов и генераторов"""
+        repository = Repository()
+
+        assert repository.get() == 1
+        assert list(repository.iterate()) == [0, 1, 2]
+        assert asyncio.run(repository.get_async()) == 2
+
+        for method in ("Repository.get", "Repository.iterate", "Repository.get_async"):
+            assert sample("repository_method_duration_seconds_count", method=method) == 1
+
+    def test_failed_call_is_measured(self):
+        """Тест, что время измеряется и при исключении"""
+        histogram = JWT_DURATION.labels(operation="test-failure")
+
+        @observe_duration(histogram)
+        def fail():
+            raise RuntimeError("boom")
+
+        try:
+            fail()
+        except RuntimeError:
+            pass
+
+        assert sample("jwt_duration_seconds_count", operation="test-failure") == 1
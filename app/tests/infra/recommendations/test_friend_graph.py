@@ -0,0 +1,70 @@
+import random
+from collections import Counter
+
+from infra.recommendations import FriendGraph
+
+
+def symmetric(pairs):
+    return [edge for a, b in pairs for edge in ((a, b), (b, a))]
+
+
+def brute_force(edges, user_id, top_k, max_degree):
+    friends = {}
+    for a, b in edges:
+        friends.setdefault(a, set()).add(b)
+    own = friends.get(user_id, set())
+    counts = Counter(
+        candidate
+        for friend in own if len(friends.get(friend, ())) <= max_degree
+        for candidate in friends.get(friend, ())
+        if candidate != user_id and candidate not in own
+    )
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+
+
+class TestFriendGraph:
+    """Тесты графа дружбы в массивах смежности"""
+
+    def test_adjacency_arrays(self):
+        """Тест, что друзья пользователя - упорядоченный срез общего массива"""
+        graph = FriendGraph([('b', 'c'), ('a', 'c'), ('a', 'b')])
+
+        assert graph.ids == ['a', 'b', 'c']
+        assert list(graph.offsets) == [0, 2, 3, 3]
+        assert list(graph.friends(graph.index_of('a'))) == [1, 2]
+        assert graph.degree(graph.index_of('c')) == 0
+        assert graph.index_of('x') == -1
+
+    def test_recommend_by_mutual_friends(self):
+        """Тест ранжирования по числу общих друзей без себя и существующих друзей"""
+        edges = symmetric([('u', 'a'), ('u', 'b'), ('a', 'x'), ('b', 'x'), ('a', 'y'), ('a', 'b')])
+        graph = FriendGraph(edges)
+
+        recommendations = dict(graph.recommend_all(['u'], top_k=10, max_degree=100))
+
+        assert recommendations['u'] == [('x', 2), ('y', 1)]
+
+    def test_max_degree_skips_popular_friends(self):
+        """Тест, что друзья популярного пользователя не рекомендуются через него"""
+        edges = symmetric([('u', 'star')] + [('star', f'fan{i}') for i in range(5)] + [('u', 'a'), ('a', 'fan0')])
+        graph = FriendGraph(edges)
+
+        recommendations = dict(graph.recommend_all(['u'], top_k=10, max_degree=3))
+
+        assert recommendations['u'] == [('fan0', 1)]
+
+    def test_unknown_user_gets_empty_list(self):
+        """Тест, что пользователь без друзей получает пустой список"""
+        graph = FriendGraph(symmetric([('a', 'b')]))
+
+        assert list(graph.recommend_all(['z'], top_k=5, max_degree=10)) == [('z', [])]
+
+    def test_matches_brute_force(self):
+        """Тест совпадения с прямым подсчетом на случайном направленном графе"""
+        rng = random.Random(42)
+        users = [f'user{i:03d}' for i in range(60)]
+        edges = list({(a, b) for a, b in ((rng.choice(users), rng.choice(users)) for _ in range(600)) if a != b})
+        graph = FriendGraph(edges)
+
+        for user_id, candidates in graph.recommend_all(users, top_k=5, max_degree=12):
+            assert candidates == brute_force(edges, user_id, 5, 12)
@@ -0,0 +1,42 @@
+from prometheus_client import REGISTRY
+
+from infra.rest.config import create_connexion_app
+
+
+def request_count(**labels):
+    return REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0.0
+
+
+class TestMetricsMiddleware:
+    """Тесты метрик HTTP запросов и эндпоинта /metrics"""
+
+    def setup_method(self):
+        """Настройка для каждого теста"""
+        self.client = create_connexion_app().test_client()
+
+    def test_request_is_measured_by_operation_id(self):
+        """Тест, что время запроса записывается с operationId из спецификации"""
+        before = request_count(operation="health_check", method="GET", status="200")
+
+        self.client.get("/health")
+
+        assert request_count(operation="health_check", method="GET", status="200") == before + 1
+        assert REGISTRY.get_sample_value("http_requests_in_progress", {"operation": "health_check"}) == 0
+
+    def test_unknown_path_is_measured_as_unmatched(self):
+        """Тест, что запросы вне спецификации не порождают новых меток"""
+        before = request_count(operation="unmatched", method="GET", status="404")
+
+        self.client.get("/no-such-path")
+
+        assert request_count(operation="unmatched", method="GET", status="404") == before + 1
+
+    def test_metrics_endpoint(self):
+        """Тест выдачи метрик в текстовом формате Prometheus"""
+        self.client.get("/health")
+
+        response = self.client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'http_request_duration_seconds_bucket{le="0.001",method="GET",operation="health_check"' in response.text
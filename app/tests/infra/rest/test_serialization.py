@@ -0,0 +1,87 @@
+import json
+import uuid
+from datetime import date
+
+from application.dialogs import DialogPage
+from application.posts import FeedPage
+from infra.rest.serialization import (
+    dump_dialog,
+    dump_feed,
+    dump_message,
+    dump_post,
+    dump_user,
+    dump_user_card_line,
+    dump_user_cards,
+)
+from model.dialog import Message
+from model.post import Post
+from model.user import User
+from tests.factories import make_card
+
+
+class TestSerialization:
+    """Тесты сериализации анкет через orjson"""
+
+    def test_dump_user_cards(self):
+        """Тест, что анкеты сериализуются в массив объектов с полями ответа"""
+        user_id = str(uuid.uuid4())
+
+        data = json.loads(dump_user_cards([make_card(user_id), make_card(user_id, birthdate=None)]))
+
+        assert data == [
+            {
+                "id": user_id,
+                "first_name": "Иван",
+                "second_name": "Иванов",
+                "birthdate": "1990-01-01",
+                "biography": "Биография",
+                "city": "Москва",
+            },
+            {
+                "id": user_id,
+                "first_name": "Иван",
+                "second_name": "Иванов",
+                "birthdate": None,
+                "biography": "Биография",
+                "city": "Москва",
+            },
+        ]
+
+    def test_non_ascii_is_not_escaped(self):
+        """Тест, что кириллица записывается в UTF-8, а не \\u-последовательностями"""
+        assert "Иван".encode() in dump_user_cards([make_card(str(uuid.uuid4()))])
+
+    def test_dump_user_card_line(self):
+        """Тест, что строка NDJSON заканчивается переводом строки"""
+        line = dump_user_card_line(make_card("1"))
+
+        assert line.endswith(b"\n") and line.count(b"\n") == 1
+        assert json.loads(line)["id"] == "1"
+
+    def test_dump_user_matches_card(self):
+        """Тест, что профиль сериализуется в тот же формат, что и анкета поиска, без пароля"""
+        user = User.create_for_registration(
+            password="secret", first_name="Иван", second_name="Иванов",
+            birthdate=date(1990, 1, 1), biography="Биография", city="Москва",
+        )
+
+        data = json.loads(dump_user(user))
+
+        assert data == json.loads(dump_user_card_line(make_card(str(user.id))))
+        assert "password" not in data
+
+    def test_dump_post_and_feed(self):
+        """Тест, что пост и лента сериализуются с полями ответа"""
+        post = Post(str(uuid.uuid4()), "Текст поста", str(uuid.uuid4()))
+        expected = {"id": post.id, "text": "Текст поста", "author_user_id": post.author_user_id}
+
+        assert json.loads(dump_post(post)) == expected
+        assert json.loads(dump_feed(FeedPage(posts=[post, post]))) == [expected, expected]
+
+    def test_dump_message_and_dialog(self):
+        """Тест, что сообщение и диалог сериализуются с полями ответа"""
+        message = Message(str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4()), "Привет")
+        expected = {"id": message.id, "from": message.from_user_id, "to": message.to_user_id, "text": "Привет"}
+
+        assert json.loads(dump_message(message)) == expected
+        assert json.loads(dump_dialog(DialogPage(messages=[message, message]))) == [expected, expected]
@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from application import injector
+from application.name_suggestions import NameSuggestionService
+from infra.db.config.database import BackgroundEngine
+from infra.rest.config import create_connexion_app
+
+FIRST_NAMES = [('иван', 'Иван', 10), ('игорь', 'Игорь', 3)]
+LAST_NAMES = [('иванов', 'Иванов', 7)]
+
+
+class TestSuggestNamesAsync:
+    """Тесты /user/suggest в асинхронном режиме приложения (без контекста Flask)"""
+
+    @pytest.fixture(autouse=True)
+    def async_app(self, monkeypatch):
+        monkeypatch.setenv('APP_MODE', 'async')
+        engine = MagicMock()
+        connection = engine.connect.return_value.__enter__.return_value
+        connection.execute.side_effect = [FIRST_NAMES, LAST_NAMES]
+        injector.binder.bind(BackgroundEngine, to=engine)
+        # Сервис собирается через Injector так же, как в обработчике: его зависимости
+        # не должны требовать db.engine и контекста приложения Flask.
+        # Сервис - singleton, поэтому состояние предыдущего теста сбрасывается
+        self.service = injector.get(NameSuggestionService)
+        self.service.frequency_repository.engine = engine
+        self.service._frequencies = None
+        self.service._started = True
+        self.client = create_connexion_app().test_client()
+        yield
+        self.service.stop()
+
+    def test_suggest_after_refresh(self):
+        """Тест подсказок после загрузки частот"""
+        self.service.refresh()
+
+        response = self.client.get('/user/suggest', params={'q': 'ив', 'limit': 5})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            'first_names': [{'name': 'Иван', 'count': 10}],
+            'last_names': [{'name': 'Иванов', 'count': 7}],
+        }
+
+    def test_not_ready_before_refresh(self):
+        """Тест ответа 503 с Retry-After, пока частоты не загружены"""
+        response = self.client.get('/user/suggest', params={'q': 'ив'})
+
+        assert response.status_code == 503
+        assert 'Retry-After' in response.headers
@@ -0,0 +1,226 @@
+import threading
+import uuid
+from bisect import bisect_left, bisect_right
+
+import pytest
+
+from application.user_search_query import UserSearchQuery
+from infra.db.repository.users import UserRepository
+from infra.search import NameIndex, NameIndexSearch, uuid7_bound, write_name_index
+from infra.search.name_index import _bisect
+from model import ids
+from model.ids import UUIDv7Generator
+from model.user import UserCard
+
+FIRST_NAMES = ['Иван', 'Игорь', 'Илья', 'Анна', 'Алла']
+SECOND_NAMES = ['Иванов', 'Ивашкин', 'Петров', 'Петренко']
+
+
+def make_card(user_id, first_name, second_name, city='Москва'):
+    return UserCard(str(user_id), first_name, second_name, '1990-01-01', None, city)
+
+
+def make_cards(count, start_ms=1_700_000_000_000):
+    generator = UUIDv7Generator(clock=lambda: start_ms * 1_000_000)
+    return [
+        make_card(generator(), FIRST_NAMES[i % len(FIRST_NAMES)], SECOND_NAMES[i % len(SECOND_NAMES)])
+        for i in range(count)
+    ]
+
+
+def brute_force(cards, first_name_prefix, last_name_prefix, after=None, limit=None):
+    found = [
+        card for card in cards
+        if card.first_name.lower().startswith(first_name_prefix)
+        and card.second_name.lower().startswith(last_name_prefix)
+        and (after is None or card.id > after)
+    ]
+    return found if limit is None else found[:limit]
+
+
+@pytest.fixture
+def cards():
+    return make_cards(200)
+
+
+@pytest.fixture
+def index_path(tmp_path, cards):
+    path = str(tmp_path / 'name_index.bin')
+    write_name_index(path, cards, built_at_ms=1_700_000_000_000)
+    return path
+
+
+class TestNameIndex:
+    """Тесты снимка индекса имен"""
+
+    @pytest.mark.parametrize('first_name_prefix, last_name_prefix', [
+        ('и', 'ив'), ('ил', ''), ('', 'петр'), ('', ''), ('анна', 'иванов'), ('я', ''),
+    ])
+    @pytest.mark.parametrize('limit', [None, 1, 7, 1000])
+    def test_search_matches_brute_force(self, index_path, cards, first_name_prefix, last_name_prefix, limit):
+        """Тест совпадения результатов поиска с перебором для разных префиксов и размеров страницы"""
+        index = NameIndex(index_path)
+
+        assert index.search(first_name_prefix, last_name_prefix, limit=limit) == brute_force(
+            cards, first_name_prefix, last_name_prefix, limit=limit
+        )
+
+    def test_keyset_pagination(self, index_path, cards):
+        """Тест, что страницы после ID последнего пользователя покрывают все результаты без повторов"""
+        index = NameIndex(index_path)
+        pages, after = [], None
+        while True:
+            page = index.search('и', 'ив', after=after, limit=10)
+            if not page:
+                break
+            pages.extend(page)
+            after = page[-1].id
+
+        assert pages == brute_force(cards, 'и', 'ив')
+
+    def test_null_fields_and_header(self, tmp_path):
+        """Тест сохранения NULL и пустых строк в полях анкеты"""
+        path = str(tmp_path / 'nulls.bin')
+        card = UserCard(str(uuid.UUID(int=1)), 'Иван', None, None, '', None)
+        write_name_index(path, [card], built_at_ms=42)
+
+        index = NameIndex(path)
+
+        assert len(index) == 1
+        assert index.built_at_ms == 42
+        assert index.search('иван', '') == [card]
+        assert index.contains(card.id)
+        assert not index.contains(str(uuid.UUID(int=2)))
+
+    def test_unordered_cards_rejected(self, tmp_path):
+        """Тест, что анкеты не в порядке ID не записываются"""
+        cards = [make_card(uuid.UUID(int=2), 'Иван', 'Иванов'), make_card(uuid.UUID(int=1), 'Иван', 'Иванов')]
+
+        with pytest.raises(ValueError):
+            write_name_index(str(tmp_path / 'bad.bin'), cards)
+
+    def test_not_an_index_file(self, tmp_path):
+        """Тест ошибки при открытии файла другого формата"""
+        path = tmp_path / 'other.bin'
+        path.write_bytes(b'\0' * 128)
+
+        with pytest.raises(ValueError):
+            NameIndex(str(path))
+
+    def test_bisect_matches_stdlib(self):
+        """Тест бинарного поиска по ключу (без key= у bisect, которого нет в Python 3.9)"""
+        values = [b'a', b'b', b'b', b'b', b'd']
+
+        for value in (b'', b'a', b'b', b'c', b'd', b'e'):
+            assert _bisect(range(len(values)), value, values.__getitem__) == bisect_left(values, value)
+            assert _bisect(range(len(values)), value, values.__getitem__, right=True) == bisect_right(values, value)
+        assert _bisect(range(len(values)), b'b', values.__getitem__, lo=2) == 2
+
+
+class TestNameIndexSearch:
+    """Тесты поиска по снимку с догрузкой новых пользователей"""
+
+    def test_disabled_without_path(self):
+        """Тест, что без файла снимка поиск выполняется в БД"""
+        search = NameIndexSearch(path='', database_url='sqlite://')
+
+        assert search.search(UserSearchQuery(first_name='Ив', last_name='Ив')) is None
+
+    def test_uuid4_ids_rejected(self, monkeypatch):
+        """Тест, что индекс не включается со случайными UUIDv4: окно догрузки задается временем в ID"""
+        monkeypatch.setattr(ids, 'USER_ID_VERSION', 'v4')
+
+        with pytest.raises(ValueError):
+            NameIndexSearch(path='/tmp/names.bin', database_url='sqlite://')
+        assert not NameIndexSearch(path='', database_url='sqlite://').enabled
+
+    def test_missing_snapshot_falls_back(self, tmp_path):
+        """Тест, что до построения снимка поиск выполняется в БД"""
+        search = NameIndexSearch(path=str(tmp_path / 'missing.bin'), database_url='sqlite://', refresh_interval=60)
+        try:
+            assert search.search(UserSearchQuery(first_name='Ив', last_name='Ив')) is None
+        finally:
+            search.stop()
+
+    def test_first_search_does_not_wait_for_snapshot(self, index_path, cards, monkeypatch):
+        """Тест, что снимок загружается в фоне, а до загрузки поиск выполняется в БД"""
+        search = NameIndexSearch(path=index_path, database_url='sqlite://', refresh_interval=60)
+        release, loaded = threading.Event(), threading.Event()
+        reload_snapshot = search._reload_snapshot
+
+        def slow_reload():
+            release.wait(5)
+            reload_snapshot()
+            loaded.set()
+
+        monkeypatch.setattr(search, '_reload_snapshot', slow_reload)
+        monkeypatch.setattr(search, '_poll_feed', lambda: None)
+        query = UserSearchQuery(first_name='И', last_name='Ив', limit=1000)
+        try:
+            assert search.search(query) is None
+
+            release.set()
+            assert loaded.wait(5)
+            assert search.search(query) == brute_force(cards, 'и', 'ив')
+        finally:
+            release.set()
+            search.stop()
+
+    def test_recent_users_are_merged(self, index_path, cards):
+        """Тест слияния снимка с догруженными пользователями в порядке ID"""
+        search = NameIndexSearch(path=index_path, database_url='sqlite://', refresh_interval=60)
+        search._reload_snapshot()
+        search._started = True
+        recent = make_cards(5, start_ms=1_700_000_100_000)
+
+        search.add(recent + cards[:3])
+        query = UserSearchQuery(first_name=' И', last_name='ИВ', limit=1000)
+
+        assert search.search(query) == brute_force(cards + recent, 'и', 'ив')
+        assert list(search.iter_search(query)) == brute_force(cards + recent, 'и', 'ив')
+        assert len(search._recent) == 5
+
+    def test_new_snapshot_drops_recent_users(self, index_path, cards):
+        """Тест, что пользователи из нового снимка удаляются из догруженных"""
+        search = NameIndexSearch(path=index_path, database_url='sqlite://', refresh_interval=60)
+        search._reload_snapshot()
+        recent = make_cards(5, start_ms=1_700_000_100_000)
+        search.add(recent)
+
+        write_name_index(index_path, cards + recent[:2], built_at_ms=1_700_000_100_000)
+        search._reload_snapshot()
+
+        assert sorted(search._recent) == sorted(card.id for card in recent[2:])
+        assert len(search._snapshot) == len(cards) + 2
+
+    def test_uuid7_bound(self):
+        """Тест границ диапазона UUIDv7 для миллисекунды"""
+        generator = UUIDv7Generator(clock=lambda: 1_700_000_000_000 * 1_000_000)
+        user_id = str(generator())
+
+        assert uuid7_bound(1_700_000_000_000) < user_id <= uuid7_bound(1_700_000_000_000, upper=True)
+        assert uuid7_bound(1_700_000_000_001) > user_id
+
+
+class FakeNameIndex:
+    def __init__(self, cards):
+        self.cards = cards
+
+    def search(self, search_query):
+        return self.cards
+
+    def iter_search(self, search_query):
+        return iter(self.cards) if self.cards is not None else None
+
+
+class TestRepositoryNameIndex:
+    """Тесты поиска в репозитории через индекс имен"""
+
+    def test_search_served_from_index(self):
+        """Тест, что без токена согласованности поиск не обращается к БД"""
+        cards = [make_card(uuid.UUID(int=1), 'Иван', 'Иванов')]
+        repository = UserRepository(None, None, None, FakeNameIndex(cards))
+        query = UserSearchQuery(first_name='Ив', last_name='Ив')
+
+        assert repository.search_users(query) == cards
+        assert list(repository.iter_search_users(query)) == cards
@@ -0,0 +1,39 @@
+import uuid
+
+from pytest import raises
+from model.dialog import DialogKey, new_message_id
+
+
+class TestDialogKey:
+    """Тесты ключа диалога"""
+
+    def test_key_does_not_depend_on_order(self):
+        """Тест, что диалог A с B и B с A - один диалог"""
+        a, b = uuid.uuid4(), uuid.uuid4()
+
+        key = DialogKey.of(a, b)
+
+        assert key == DialogKey.of(b, a)
+        assert key.user_low < key.user_high
+        assert key.routing_key() == f"{key.user_low}:{key.user_high}"
+
+    def test_other(self):
+        """Тест получения собеседника"""
+        a, b = uuid.uuid4(), uuid.uuid4()
+
+        key = DialogKey.of(a, b)
+
+        assert key.other(a) == b and key.other(b) == a
+
+    def test_dialog_with_self_rejected(self):
+        """Тест, что диалог с самим собой не поддерживается"""
+        user_id = uuid.uuid4()
+
+        with raises(ValueError):
+            DialogKey.of(user_id, user_id)
+
+    def test_message_ids_grow(self):
+        """Тест, что ID сообщений - возрастающие UUIDv7"""
+        first, second = new_message_id(), new_message_id()
+
+        assert first.version == 7 and second > first
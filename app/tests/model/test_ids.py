@@ -0,0 +1,66 @@
+import uuid
+
+from pytest import raises
+from model.ids import UUIDv7Generator, get_id_generator, uuid7
+
+
+class FakeClock:
+    """Часы с ручным управлением (время в наносекундах)"""
+
+    def __init__(self, ms: int):
+        self.ms = ms
+
+    def __call__(self) -> int:
+        return self.ms * 1_000_000
+
+
+class TestUUIDv7Generator:
+    """Unit тесты генератора UUIDv7"""
+
+    def test_version_variant_and_timestamp(self):
+        """Тест, что ID имеет версию 7, вариант RFC и время в старших 48 битах"""
+        user_id = UUIDv7Generator(FakeClock(1_700_000_000_123))()
+
+        assert user_id.version == 7
+        assert user_id.variant == uuid.RFC_4122
+        assert user_id.int >> 80 == 1_700_000_000_123
+
+    def test_ids_are_ordered_within_millisecond(self):
+        """Тест, что ID одной миллисекунды возрастают за счет счетчика"""
+        generator = UUIDv7Generator(FakeClock(1_700_000_000_000))
+
+        ids = [generator() for _ in range(5000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_ids_are_ordered_when_clock_goes_back(self):
+        """Тест, что перевод часов назад не нарушает порядок ID"""
+        clock = FakeClock(1_700_000_000_000)
+        generator = UUIDv7Generator(clock)
+        first = generator()
+
+        clock.ms -= 1000
+        second = generator()
+
+        assert second > first
+
+    def test_string_order_matches_time_order(self):
+        """Тест, что строковое представление тоже упорядочено по времени"""
+        ids = [uuid7() for _ in range(1000)]
+
+        assert [str(i) for i in ids] == sorted(str(i) for i in ids)
+
+
+class TestGetIdGenerator:
+    """Тесты выбора генератора ID"""
+
+    def test_known_versions(self):
+        """Тест выбора v4 и v7"""
+        assert get_id_generator('v4')().version == 4
+        assert get_id_generator('v7')().version == 7
+
+    def test_unknown_version(self):
+        """Тест, что неизвестная версия бросает ValueError"""
+        with raises(ValueError):
+            get_id_generator('v1')
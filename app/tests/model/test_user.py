@@ -2,7 +2,7 @@ import uuid
 from datetime import date
 
 from pytest import raises
-from model.user import User
+from model.user import User, UserCard
 
 
 class TestUser:
@@ -37,6 +37,7 @@ class TestUser:
         assert user.city == city
         assert user.password == password
         assert isinstance(user.id, uuid.UUID)
+        assert user.id.version == 7
 
     def test_create_for_registration_without_parameters(self):
         """Тест, что вызов без параметров бросает TypeError"""
@@ -49,3 +50,21 @@ class TestUser:
             "User.create_for_registration() missing 6 required positional arguments: "
             "'password', 'first_name', 'second_name', 'birthdate', 'biography', and 'city'"
         )
+
+    def test_user_has_no_instance_dict(self):
+        """Тест, что User хранит поля в слотах"""
+        user = User.create_for_registration("secret", "Иван", "Иванов", date(1990, 1, 1), "-", "Москва")
+
+        assert not hasattr(user, "__dict__")
+
+
+class TestUserCard:
+    """Unit тесты для анкеты результатов поиска"""
+
+    def test_make_from_row(self):
+        """Тест создания анкеты из строки результата запроса"""
+        card = UserCard._make(("id-1", "Иван", "Иванов", "1990-01-01", "-", "Москва"))
+
+        assert card.id == "id-1"
+        assert card.birthdate == "1990-01-01"
+        assert card.city == "Москва"
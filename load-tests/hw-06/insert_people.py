@@ -12,13 +12,16 @@
 
 import sys
 import csv
-import uuid
 import psycopg2
 import logging
 import os
 import tempfile
 from typing import List, Tuple
 
+# ID генерируются тем же генератором, что и при регистрации через API (по умолчанию UUIDv7)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'app'))
+from model.ids import new_user_id
+
 # Настройка логирования
 logging.basicConfig(
     level=logging.INFO,
@@ -96,7 +99,7 @@ def import_users(csv_file_path: str, connection_string: str) -> None:
                     first_name, second_name, birthdate, city, biography = parse_csv_line(','.join(row))
                     
                     # Генерируем данные для пользователя
-                    user_id = str(uuid.uuid4())
+                    user_id = new_user_id()
                     password = DEFAULT_PASSWORD_HASH
                     
                     # Записываем в формате для COPY FROM (разделитель - табуляция)